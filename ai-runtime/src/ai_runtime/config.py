@@ -25,6 +25,17 @@ class Settings(BaseSettings):
     openai_embedding_model: str = "text-embedding-3-small"  # 1536 dimensions, cheapest
     openai_chat_model: str = "gpt-4o-mini"               # For generating answers in /retrieve
 
+    # --- OpenAI client-side rate limiting (shared by embedding + chat calls) ---
+    # Set these to your account's tier limits; x-ratelimit-* response headers
+    # override them at runtime once the first response comes back.
+    openai_rpm_limit: int = 3000          # requests per minute
+    openai_tpm_limit: int = 1_000_000     # tokens per minute
+    openai_max_retries: int = 5           # retries on 429 / connection / 5xx errors
+    openai_retry_base_seconds: float = 0.5
+    openai_retry_max_seconds: float = 30.0
+    rate_limit_max_wait_seconds: float = 60.0  # longest a call waits for budget before trying anyway
+    chat_completion_token_estimate: int = 500  # expected answer length, counted against TPM
+
     # --- Milvus (pure vector search, frozen) ---
     milvus_host: str = "localhost"
     milvus_port: int = 19530
@@ -33,9 +44,25 @@ class Settings(BaseSettings):
     weaviate_host: str = "localhost"
     weaviate_port: int = 8080
     weaviate_alpha: float = 0.5  # 0.0 = pure BM25, 1.0 = pure vector, 0.5 = balanced hybrid
+    weaviate_query_timeout_seconds: float = 30.0  # client-level query timeout: bounds calls abandoned by Deadline.run
     rerank_top_k: int = 20       # candidates to fetch before reranking
     rerank_top_n: int = 5        # results to keep after reranking (≤ rerank_top_k)
 
+    # --- Weaviate batch writer (see services/weaviate_batch.py) ---
+    weaviate_batch_size: int = 200                   # objects per insert_many request
+    weaviate_batch_concurrency: int = 4              # insert_many requests in flight
+    weaviate_batch_flush_interval_seconds: float = 0.1  # longest a partial batch waits for more objects
+    weaviate_batch_max_retries: int = 3              # retries for objects Weaviate rejected
+
+    # --- Project rebuilds (shadow collection + routing swap, see services/rebuild_service.py) ---
+    weaviate_routing_ttl_seconds: float = 5.0     # how long a worker trusts its copy of the routing table
+    rebuild_max_chunks_per_second: float = 100.0  # throttle for writes into the shadow collection
+    rebuild_drop_grace_seconds: float = 15.0      # wait after the swap before dropping the old collection (> routing TTL)
+
+    # --- Knowledge-base snapshots (see services/snapshot_service.py) ---
+    snapshot_dir: str = "./snapshots"   # one dir per snapshot: vectors.npy + chunks.jsonl + manifest.json
+    snapshot_batch_size: int = 1000     # chunks per cursor page on export / per write on import
+
     # --- Reranking (Amazon Bedrock, Cohere Rerank model) ---
     # Set RERANK_ENABLED=true in .env to activate.
     # AWS credentials are read from ~/.aws/credentials automatically by boto3;
@@ -44,12 +71,88 @@ class Settings(BaseSettings):
     rerank_enabled: bool = False
     aws_region: str = "us-east-1"
     bedrock_rerank_model_id: str = "cohere.rerank-v3-5:0"
+    bedrock_read_timeout_seconds: float = 30.0  # boto3 read timeout: bounds calls abandoned by Deadline.run
+
+    # --- Shared cache (L1 in-process LRU → L2 Redis) ---
+    # CACHE_BACKEND=redis shares entries across all uvicorn workers;
+    # "memory" keeps them per worker (dev / tests, no Redis needed).
+    cache_backend: str = "memory"
+    redis_url: str = "redis://localhost:6379/0"
+    cache_local_max_entries: int = 4096        # L1 entries per worker
+    cache_memory_max_entries: int = 50_000     # CACHE_BACKEND=memory: L2 entries per worker (LRU)
+    cache_memory_sweep_seconds: float = 60.0   # CACHE_BACKEND=memory: how often expired entries are dropped
+    cache_ttl_seconds: int = 3600              # default TTL for retrieval results
+    cache_generation_check_seconds: float = 1.0  # how stale another worker's invalidation may be
+    embedding_cache_enabled: bool = True
+    embedding_cache_ttl_seconds: int = 7 * 24 * 3600  # embeddings are deterministic per model (query embeddings only)
+    retrieval_cache_enabled: bool = True
+
+    # --- Answer cache (skip repeated chat completions) ---
+    # Key: project + chat model + prompt version + exact retrieved (doc_id, chunk_id) set.
+    # With a similarity threshold, a differently-phrased query whose embedding is
+    # at least that cosine-similar to a cached one also counts as a hit.
+    answer_cache_enabled: bool = True
+    answer_cache_ttl_seconds: int = 3600
+    answer_cache_similarity_threshold: float | None = None  # e.g. 0.97; None = exact query only
+
+    # --- Answer context packing (see services/context_packer.py) ---
+    answer_context_token_budget: int = 3000   # max estimated prompt tokens spent on retrieved context
+    context_dedup_threshold: float = 0.9      # passages ≥ this shingle-similar to a better one are dropped
+
+    # --- Federated search (project_ids) ---
+    retrieve_max_projects: int = 20   # projects one /retrieve-document may fan out to
+    fusion_rrf_k: int = 60            # RRF constant: score = Σ 1 / (k + rank)
+    fusion_candidate_limit: int = 100  # Alpha sweeps: BM25 + vector candidates fetched per query
+
+    # --- Retrieval evaluation (/evaluate-retrieval) ---
+    eval_max_cases: int = 10_000
+    eval_max_k: int = 100                 # largest k in k_values (= retrieval depth per case)
+    eval_max_concurrency: int = 16        # parallel retrievals per evaluation run
+    eval_embedding_batch_size: int = 512  # queries per embeddings API call
+
+    # --- Offline batch answers (/retrieve-document/batch) ---
+    # "openai" = OpenAI Batch API, "local" = in-process stand-in (tests / dev)
+    batch_backend: str = "openai"
+    batch_work_dir: str = "./batch-jobs"   # one dir per job: input.jsonl + manifest.json
+    batch_completion_window: str = "24h"
+    batch_max_cases: int = 50_000           # OpenAI's per-batch request limit
+
+    # --- Latency budget + circuit breakers (retrieve) ---
+    # With a budget, optional stages (rerank, answer) are skipped when their
+    # recent p-th percentile latency no longer fits into the time left.
+    retrieve_latency_budget_ms: int | None = None  # default budget; None = never degrade
+    latency_budget_percentile: float = 95.0
+    latency_window_size: int = 200               # recent samples kept per stage
+    circuit_failure_threshold: int = 5           # consecutive failures before a breaker opens
+    circuit_reset_seconds: float = 30.0          # open → half-open (one trial call) after this
+
+    # --- Shadow traffic (mirror sampled retrievals to Milvus, see services/shadow_traffic.py) ---
+    shadow_sample_rate: float = 0.0   # fraction of single-project /retrieve-document queries mirrored; 0 = off
+    shadow_max_in_flight: int = 4     # concurrent mirrored searches; further samples are dropped
+    shadow_window_size: int = 1000    # recent mirrored queries kept for GET /shadow/stats
+
+    # --- Request profiling (opt-in cProfile, see ai_runtime/profiling.py) ---
+    profiling_token: str | None = None       # X-Profile header value that enables profiling; None = off
+    profiling_dir: str = "./profiles"        # {route}-p{project_id}-{timestamp}-{id}.prof files
+    profiling_max_files: int = 200           # older profiles are deleted
+    profiling_max_window_seconds: float = 600.0  # longest POST /profiling/window
+
+    # --- Tracing (see ai_runtime/tracing.py) ---
+    tracing_exporter: str = "none"        # none | console | file | otlp (needs the opentelemetry packages)
+    tracing_file: str = "./traces.jsonl"  # file exporter: one JSON span per line
+    tracing_sample_rate: float = 1.0      # share of traces started here that are recorded
+    tracing_service_name: str = "ai-runtime"
+    tracing_otlp_endpoint: str | None = None  # None = OTEL_EXPORTER_OTLP_ENDPOINT / SDK default
 
     # --- Document processing ---
     chunk_size: int = 500        # Max characters per chunk
     chunk_overlap: int = 50      # Overlap between consecutive chunks
     embedding_dimensions: int = 1536  # Must match the embedding model's output
     retrieve_top_k: int = 5      # Default number of search results (Milvus)
+    retrieve_default_timeout_ms: int | None = None  # Budget when the caller sends none (None = unbounded)
+    retrieve_max_expand_neighbors: int = 3  # Largest expand_neighbors window a request may ask for
+    ingest_window_chunks: int = 64  # Streaming upload: chunks embedded + stored per window
+    delete_max_doc_ids: int = 1000  # Most doc_ids one DELETE /documents request may name
 
     model_config = {
         "env_file": ".env",      # Load variables from this file
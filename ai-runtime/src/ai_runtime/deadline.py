@@ -0,0 +1,156 @@
+"""
+End-to-end request deadlines.
+
+Why?
+  Platform API gives up on a /retrieve-document call after its own timeout.
+  Without a deadline, ai-runtime keeps working on that request anyway — a
+  slow Bedrock rerank or chat completion can hold a worker thread for tens
+  of seconds after nobody is waiting for the result. Under load those
+  stuck requests pile up.
+
+How it works:
+  The caller sends its budget, either as the `X-Request-Timeout-Ms` header
+  or as `timeout_ms` in the request body (relative milliseconds, so client
+  and server clocks don't need to agree). A Deadline is created when the
+  request arrives and passed down to every stage:
+    - OpenAI calls get the remaining budget as their HTTP timeout
+    - Weaviate / Bedrock calls (no per-call timeout in their SDKs) run via
+      Deadline.run(), which stops waiting when the budget is spent
+    - between stages, check() raises DeadlineExceededError (→ 504)
+
+What Deadline.run() abandons keeps running: the SDK call can't be
+interrupted, so it holds one of the DEADLINE_RUNNER_THREADS threads until
+it returns. That is bounded by the SDK's client-level timeout —
+WEAVIATE_QUERY_TIMEOUT_SECONDS and BEDROCK_READ_TIMEOUT_SECONDS — so
+keep those near the largest budget callers send. abandoned_in_flight()
+counts such calls; when they fill the pool, new calls queue and their
+requests run into their own deadlines (504) rather than hang.
+
+A Deadline with no budget (Deadline.none()) never expires, so every
+parameter that accepts one can default to "no deadline".
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, TypeVar
+
+from ai_runtime.exceptions import DeadlineExceededError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+TIMEOUT_HEADER = "X-Request-Timeout-Ms"
+
+DEADLINE_RUNNER_THREADS = 32
+
+# Runs SDK calls that have no per-call timeout, so the request thread can stop
+# waiting for them. Abandoned calls finish in the background (bounded by the
+# SDK's own client-level timeout) and their results are discarded.
+_executor = ThreadPoolExecutor(max_workers=DEADLINE_RUNNER_THREADS, thread_name_prefix="deadline")
+
+_abandoned = 0
+_abandoned_lock = threading.Lock()
+
+
+def abandoned_in_flight() -> int:
+    """Calls given up on by Deadline.run() that are still occupying a runner thread."""
+    return _abandoned
+
+
+def _abandoned_done(_future):
+    global _abandoned
+    with _abandoned_lock:
+        _abandoned -= 1
+
+
+class Deadline:
+    def __init__(self, timeout_seconds: float | None, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.timeout_seconds = timeout_seconds
+        self.expires_at = None if timeout_seconds is None else clock() + timeout_seconds
+
+    @classmethod
+    def none(cls) -> "Deadline":
+        """A deadline that never expires."""
+        return cls(None)
+
+    @classmethod
+    def from_request(
+        cls,
+        body_timeout_ms: int | None,
+        header_value: str | None,
+        default_timeout_ms: int | None = None,
+    ) -> "Deadline":
+        """
+        Build the request's deadline. The tightest of body field and header
+        wins; the configured default applies only when neither is sent.
+        """
+        candidates = []
+        if body_timeout_ms is not None:
+            candidates.append(body_timeout_ms)
+        if header_value:
+            try:
+                candidates.append(int(float(header_value)))
+            except ValueError:
+                logger.warning("Ignoring invalid %s header: %r", TIMEOUT_HEADER, header_value)
+        if not candidates and default_timeout_ms:
+            candidates.append(default_timeout_ms)
+        if not candidates:
+            return cls.none()
+        return cls(max(0, min(candidates)) / 1000)
+
+    @property
+    def bounded(self) -> bool:
+        return self.expires_at is not None
+
+    def remaining(self) -> float | None:
+        """Seconds left (never negative), or None if unbounded."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and self._clock() >= self.expires_at
+
+    def check(self, stage: str):
+        """Raise DeadlineExceededError if the budget is spent before `stage` starts."""
+        if self.expired():
+            raise DeadlineExceededError(
+                f"Request deadline of {self.timeout_seconds * 1000:.0f} ms exceeded before {stage}"
+            )
+
+    def timeout_for(self, stage: str) -> float | None:
+        """Remaining budget to use as a client timeout for `stage` (None = SDK default)."""
+        self.check(stage)
+        return self.remaining()
+
+    def run(self, stage: str, fn: Callable[[], T]) -> T:
+        """
+        Run fn() but stop waiting once the deadline passes. For SDK calls that
+        can't take a per-call timeout (Weaviate, boto3).
+        """
+        if not self.bounded:
+            return fn()
+
+        timeout = self.timeout_for(stage)
+        context = contextvars.copy_context()
+        future = _executor.submit(context.run, fn)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            global _abandoned
+            if not future.cancel():   # already running: it holds a runner thread until the SDK call returns
+                with _abandoned_lock:
+                    _abandoned += 1
+                future.add_done_callback(_abandoned_done)
+            logger.warning(
+                "Abandoned %s: request deadline exceeded (%d abandoned calls still running)",
+                stage, _abandoned,
+            )
+            raise DeadlineExceededError(
+                f"Request deadline of {self.timeout_seconds * 1000:.0f} ms exceeded during {stage}"
+            ) from None
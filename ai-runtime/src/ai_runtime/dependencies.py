@@ -12,16 +12,46 @@ In FastAPI:
 
 Controllers (routers) declare their dependencies in function parameters,
 and FastAPI automatically provides the correct instances.
+
+Lifecycle (like Spring's eager singletons + @PreDestroy):
+  - warm_up_services() is called from the FastAPI lifespan hook in main.py,
+    so every client is built and connected before the worker takes traffic.
+  - close_services() is called on shutdown, after uvicorn has drained
+    in-flight requests, and closes every connection that was opened.
 """
 
+import logging
 from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
+
+from fastapi import Depends
 
 from ai_runtime.config import Settings
-from ai_runtime.services.milvus_service import MilvusService
+from ai_runtime.profiling import Profiler
 from ai_runtime.services.weaviate_service import WeaviateService
 from ai_runtime.services.embedding_service import EmbeddingService
 from ai_runtime.services.document_service import DocumentService
-from ai_runtime.services.rerank_service import RerankService
+from ai_runtime.services.answer_cache import AnswerCache
+from ai_runtime.services.answer_service import AnswerService
+from ai_runtime.services.batch_answer_service import BatchAnswerService, build_batch_client
+from ai_runtime.services.cache_service import TieredCache, build_cache
+from ai_runtime.services.evaluation_service import EvaluationService
+from ai_runtime.services.resilience import Resilience
+from ai_runtime.services.retrieval_service import RetrievalService
+from ai_runtime.services.single_flight import SingleFlight
+from ai_runtime.services.rate_limiter import RateLimiter
+from ai_runtime.services.rebuild_service import RebuildService
+from ai_runtime.services.shadow_traffic import ShadowTraffic
+from ai_runtime.services.snapshot_service import SnapshotService
+
+# Optional backends: imported only when configured (see get_milvus_service /
+# get_rerank_service). pymilvus pulls in pandas/grpc and boto3 pulls in
+# botocore — together ~1s of import time and tens of MB per worker.
+if TYPE_CHECKING:
+    from ai_runtime.services.milvus_service import MilvusService
+    from ai_runtime.services.rerank_service import RerankService
+
+logger = logging.getLogger(__name__)
 
 
 @lru_cache()
@@ -36,8 +66,59 @@ def get_settings() -> Settings:
 
 
 @lru_cache()
-def get_milvus_service() -> MilvusService:
-    """Singleton MilvusService instance (pure vector search, frozen)."""
+def get_cache() -> TieredCache:
+    """Singleton TieredCache: in-process LRU in front of Redis (or an in-memory stand-in)."""
+    return build_cache(get_settings())
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
+    """Singleton RateLimiter — one RPM/TPM budget shared by embedding and chat calls."""
+    return RateLimiter(get_settings())
+
+
+@lru_cache()
+def get_search_flight() -> SingleFlight:
+    """Singleton SingleFlight for the search layer (RetrievalService is per request)."""
+    return SingleFlight("search")
+
+
+@lru_cache()
+def get_resilience() -> Resilience:
+    """Singleton Resilience — per-stage latency percentiles and circuit breakers for /retrieve-document."""
+    return Resilience(get_settings())
+
+
+@lru_cache()
+def get_evaluation_resilience() -> Resilience:
+    """
+    Singleton Resilience for /evaluate-retrieval: its own breakers and latency
+    windows, so an evaluation run can neither trip the serving breakers nor
+    skew the percentiles the serving latency budget is based on.
+    """
+    return Resilience(get_settings())
+
+
+@lru_cache()
+def get_profiler() -> Profiler:
+    """Singleton Profiler — opt-in cProfile of retrieve / index requests (PROFILING_TOKEN)."""
+    return Profiler(get_settings())
+
+
+@lru_cache()
+def get_shadow_traffic() -> ShadowTraffic:
+    """
+    Singleton ShadowTraffic — mirrors sampled retrievals to Milvus
+    (SHADOW_SAMPLE_RATE > 0). Milvus is only connected on the first mirrored query.
+    """
+    return ShadowTraffic(get_settings(), backend="milvus", backend_factory=get_milvus_service)
+
+
+@lru_cache()
+def get_milvus_service() -> "MilvusService":
+    """Singleton MilvusService instance (pure vector search, frozen). Imports pymilvus on first use."""
+    from ai_runtime.services.milvus_service import MilvusService
+
     return MilvusService(get_settings())
 
 
@@ -49,14 +130,50 @@ def get_weaviate_service() -> WeaviateService:
 
 @lru_cache()
 def get_embedding_service() -> EmbeddingService:
-    """Singleton EmbeddingService instance."""
-    return EmbeddingService(get_settings())
+    """Singleton EmbeddingService instance (query/chunk embeddings cached in the TieredCache)."""
+    settings = get_settings()
+    return EmbeddingService(
+        settings,
+        cache=get_cache() if settings.embedding_cache_enabled else None,
+        rate_limiter=get_rate_limiter(),
+    )
+
+
+@lru_cache()
+def get_rerank_service() -> "RerankService | None":
+    """
+    Singleton RerankService instance (Bedrock Cohere Rerank), or None when
+    RERANK_ENABLED=false — in that case boto3 is never imported and no
+    Bedrock client is built.
+    """
+    settings = get_settings()
+    if not settings.rerank_enabled:
+        return None
+    from ai_runtime.services.rerank_service import RerankService
+
+    return RerankService(settings)
+
+
+@lru_cache()
+def get_answer_cache() -> AnswerCache | None:
+    """Singleton AnswerCache, or None when ANSWER_CACHE_ENABLED=false."""
+    settings = get_settings()
+    if not settings.answer_cache_enabled:
+        return None
+    return AnswerCache(settings, get_cache())
+
+
+@lru_cache()
+def get_answer_service() -> AnswerService:
+    """Singleton AnswerService (OpenAI chat + answer cache)."""
+    return AnswerService(get_settings(), cache=get_answer_cache(), rate_limiter=get_rate_limiter())
 
 
 @lru_cache()
-def get_rerank_service() -> RerankService:
-    """Singleton RerankService instance (Bedrock Cohere Rerank)."""
-    return RerankService(get_settings())
+def get_batch_answer_service() -> BatchAnswerService:
+    """Singleton BatchAnswerService (OpenAI Batch API, or the local stand-in when BATCH_BACKEND=local)."""
+    settings = get_settings()
+    return BatchAnswerService(settings, get_answer_service(), build_batch_client(settings))
 
 
 @lru_cache()
@@ -68,3 +185,162 @@ def get_document_service() -> DocumentService:
         embedding_service=get_embedding_service(),
         settings=get_settings(),
     )
+
+
+@lru_cache()
+def get_rebuild_service() -> RebuildService:
+    """Singleton RebuildService (shadow-collection rebuilds run on its background threads)."""
+    return RebuildService(
+        weaviate_service=get_weaviate_service(),
+        embedding_service=get_embedding_service(),
+        cache=get_cache(),
+        settings=get_settings(),
+    )
+
+
+@lru_cache()
+def get_snapshot_service() -> SnapshotService:
+    """Singleton SnapshotService (export / import of a project's chunks and vectors)."""
+    return SnapshotService(
+        settings=get_settings(),
+        weaviate_service=get_weaviate_service(),
+        cache=get_cache(),
+        milvus_factory=get_milvus_service,   # pymilvus is imported only for backend="milvus"
+    )
+
+
+def get_retrieval_service(
+    weaviate_service: WeaviateService = Depends(get_weaviate_service),
+    embedding_service: EmbeddingService = Depends(get_embedding_service),
+    rerank_service: "RerankService | None" = Depends(get_rerank_service),
+    settings: Settings = Depends(get_settings),
+    cache: TieredCache = Depends(get_cache),
+    search_flight: SingleFlight = Depends(get_search_flight),
+    resilience: Resilience = Depends(get_resilience),
+) -> RetrievalService:
+    """
+    RetrievalService assembled per request from the singletons above.
+
+    Not cached on purpose: it holds no connections of its own (construction
+    is just attribute assignment), and resolving its parts through Depends
+    means app.dependency_overrides on any of them also apply here.
+    """
+    return RetrievalService(
+        weaviate_service=weaviate_service,
+        embedding_service=embedding_service,
+        rerank_service=rerank_service,
+        settings=settings,
+        cache=cache,
+        search_flight=search_flight,
+        resilience=resilience,
+    )
+
+
+def get_evaluation_service(
+    weaviate_service: WeaviateService = Depends(get_weaviate_service),
+    embedding_service: EmbeddingService = Depends(get_embedding_service),
+    rerank_service: "RerankService | None" = Depends(get_rerank_service),
+    settings: Settings = Depends(get_settings),
+    resilience: Resilience = Depends(get_evaluation_resilience),
+) -> EvaluationService:
+    """
+    EvaluationService per request, on its own RetrievalService: no retrieval
+    cache (scores must reflect the index, not earlier results), no search
+    coalescing with serving traffic, and the evaluation breakers.
+    """
+    retrieval_service = RetrievalService(
+        weaviate_service=weaviate_service,
+        embedding_service=embedding_service,
+        rerank_service=rerank_service,
+        settings=settings,
+        cache=None,
+        search_flight=SingleFlight("eval-search"),
+        resilience=resilience,
+    )
+    return EvaluationService(retrieval_service, settings)
+
+
+# ──────────────────────────────────────
+# Startup / shutdown
+# ──────────────────────────────────────
+
+def _startup_providers(settings: Settings) -> list[Callable]:
+    """Singletons to build at startup, in dependency order."""
+    providers = [
+        get_cache,
+        get_embedding_service,
+        get_weaviate_service,
+        get_answer_service,
+        get_document_service,
+    ]
+    if settings.rerank_enabled:
+        providers.append(get_rerank_service)
+    return providers
+
+
+def warm_up_services(overrides: dict[Callable, Callable] | None = None) -> dict[str, str]:
+    """
+    Build (and thereby connect) every singleton before the worker is ready.
+
+    Args:
+        overrides: app.dependency_overrides — honored so tests that swap a
+                   service for a mock don't open real connections at startup.
+
+    Returns:
+        {provider name: "ok" | error message}
+
+    Settings errors (e.g. missing OPENAI_API_KEY) are raised: the worker
+    must not start with an invalid configuration. Upstream failures (e.g.
+    Weaviate not up yet) are only logged — GET /ready reports them and the
+    service is built again lazily on the next request.
+    """
+    overrides = overrides or {}
+
+    def resolve(provider: Callable):
+        return overrides.get(provider, provider)()
+
+    settings = resolve(get_settings)
+    status: dict[str, str] = {}
+    for provider in _startup_providers(settings):
+        try:
+            resolve(provider)
+            status[provider.__name__] = "ok"
+        except Exception as e:
+            logger.warning("Warm-up of %s failed: %s", provider.__name__, e)
+            status[provider.__name__] = str(e)
+
+    logger.info("Warm-up complete: %s", status)
+    return status
+
+
+def close_services():
+    """
+    Close every singleton that was actually created, in reverse order,
+    then forget it so a later call builds a fresh one.
+    """
+    providers = [
+        get_snapshot_service,
+        get_rebuild_service,
+        get_document_service,
+        get_batch_answer_service,
+        get_answer_service,
+        get_answer_cache,
+        get_rerank_service,
+        get_embedding_service,
+        get_weaviate_service,
+        get_shadow_traffic,
+        get_milvus_service,
+        get_cache,
+    ]
+    for provider in providers:
+        if provider.cache_info().currsize == 0:
+            continue
+        instance = provider()
+        close = getattr(instance, "close", None)
+        if close is not None:
+            try:
+                close()
+                logger.info("Closed %s", type(instance).__name__)
+            except Exception as e:
+                logger.warning("Error closing %s: %s", type(instance).__name__, e)
+        provider.cache_clear()
@@ -0,0 +1,74 @@
+"""
+Compact response encodings for retrieval results.
+
+Why?
+  A default /retrieve-document response carries every chunk's full text
+  and title, and FastAPI builds and validates one ChunkResult model per
+  hit before serializing it. Evaluation and batch clients that only need
+  ids and scores pay for kilobytes of JSON per hit, on both ends.
+
+What a client can ask for:
+  - include_text=false: results keep ids, scores and char offsets
+    (char_start / char_end into the source document) — no text, no title
+  - Accept: application/msgpack: the same payload as MessagePack
+    (msgpack is imported lazily; without it the response falls back to JSON)
+  - Accept-Encoding: gzip: large responses are compressed (GZipMiddleware
+    in main.py, for every endpoint)
+
+Compact responses are built from the raw result dicts and encoded
+directly, skipping the per-result Pydantic models.
+"""
+
+import json
+import logging
+
+from fastapi import Response
+
+logger = logging.getLogger(__name__)
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+JSON_MEDIA_TYPE = "application/json"
+
+# Result fields that are only present when set (keeps compact payloads small)
+OPTIONAL_FIELDS = ("project_id", "neighbor_of")
+
+
+def wants_msgpack(accept: str | None) -> bool:
+    """True if the Accept header names a MessagePack media type."""
+    if not accept:
+        return False
+    media_types = {part.split(";")[0].strip().lower() for part in accept.split(",")}
+    return any(media_type in media_types for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def compact_result(result: dict, include_text: bool) -> dict:
+    """One search result as a plain dict; without text, offsets replace text and title."""
+    out = {"doc_id": result["doc_id"], "chunk_id": result["chunk_id"], "score": result["score"]}
+    for field in OPTIONAL_FIELDS:
+        if result.get(field) is not None:
+            out[field] = result[field]
+    start = result.get("char_start")
+    if include_text:
+        out["title"] = result["title"]
+        out["text"] = result["text"]
+        if start is not None:
+            out["char_start"] = start
+    elif start is not None:
+        out["char_start"] = start
+        out["char_end"] = start + len(result["text"] or "")
+    return out
+
+
+def encode(payload: dict, accept: str | None) -> Response:
+    """Encode a response payload as MessagePack if the client accepts it, JSON otherwise."""
+    if wants_msgpack(accept):
+        try:
+            import msgpack
+        except ImportError:
+            logger.warning("msgpack requested but not installed — responding with JSON")
+        else:
+            return Response(content=msgpack.packb(payload), media_type=MSGPACK_MEDIA_TYPES[0])
+    return Response(
+        content=json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode(),
+        media_type=JSON_MEDIA_TYPE,
+    )
@@ -73,6 +73,81 @@ class RerankError(AIRuntimeError):
     pass
 
 
+class AnswerGenerationError(AIRuntimeError):
+    """
+    Raised when the OpenAI chat completion for an answer fails.
+
+    The retrieve router catches this and still returns the search
+    results, just without an answer.
+    """
+    pass
+
+
+class DeadlineExceededError(AIRuntimeError):
+    """
+    Raised when a request's deadline (X-Request-Timeout-Ms / timeout_ms)
+    runs out before or during a stage. The caller has already given up,
+    so the remaining work is abandoned.
+    """
+    pass
+
+
+class CircuitOpenError(AIRuntimeError):
+    """
+    Raised when an upstream's circuit breaker is open: it kept failing or
+    timing out, so calls to it fail fast until the cool-down has passed.
+    """
+
+    def __init__(self, stage: str, retry_after: float):
+        super().__init__(f"{stage} is temporarily unavailable (circuit open, retry in {retry_after:.0f}s)")
+        self.stage = stage
+        self.retry_after = retry_after
+
+
+class BatchJobError(AIRuntimeError):
+    """
+    Raised when submitting or polling an offline batch job fails
+    (OpenAI Files / Batches API errors).
+    """
+    pass
+
+
+class BatchJobNotFoundError(BatchJobError):
+    """Raised when a batch job id has no manifest in the batch work dir."""
+    pass
+
+
+class RebuildError(AIRuntimeError):
+    """
+    Raised when a project rebuild (shadow collection + routing swap)
+    cannot be started or looked up.
+    """
+    pass
+
+
+class RebuildInProgressError(RebuildError):
+    """Raised when a rebuild is requested for a project that is already being rebuilt."""
+    pass
+
+
+class RebuildJobNotFoundError(RebuildError):
+    """Raised when a rebuild job id is unknown to this worker."""
+    pass
+
+
+class SnapshotError(AIRuntimeError):
+    """
+    Raised when a knowledge-base snapshot cannot be exported or imported
+    (e.g. its vectors come from another embedding model).
+    """
+    pass
+
+
+class SnapshotNotFoundError(SnapshotError):
+    """Raised when a snapshot id has no manifest in the snapshot dir."""
+    pass
+
+
 class DocumentProcessingError(AIRuntimeError):
     """
     Raised when the document processing pipeline fails.
@@ -5,14 +5,48 @@ FastAPI application for AI workflow execution and knowledge base management.
 """
 
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from ai_runtime.routers.index_router import router as index_router
 from ai_runtime.routers.retrieve_router import router as retrieve_router
-from ai_runtime.exceptions import AIRuntimeError, EmbeddingError, MilvusError
+from ai_runtime.routers.evaluation_router import router as evaluation_router
+from ai_runtime.routers.batch_router import router as batch_router
+from ai_runtime.routers.rebuild_router import router as rebuild_router
+from ai_runtime.routers.snapshot_router import router as snapshot_router
+from ai_runtime.routers.shadow_router import router as shadow_router
+from ai_runtime.routers.profiling_router import router as profiling_router
+from ai_runtime.exceptions import (
+    AIRuntimeError,
+    BatchJobError,
+    BatchJobNotFoundError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    EmbeddingError,
+    MilvusError,
+    RebuildInProgressError,
+    RebuildJobNotFoundError,
+    SnapshotError,
+    SnapshotNotFoundError,
+)
+from ai_runtime import tracing
+from ai_runtime.config import Settings
+from ai_runtime.dependencies import (
+    close_services,
+    get_cache,
+    get_embedding_service,
+    get_settings,
+    get_weaviate_service,
+    warm_up_services,
+)
+from ai_runtime.services.cache_service import TieredCache
+from ai_runtime.services.embedding_service import EmbeddingService
+from ai_runtime.services.weaviate_service import WeaviateService
 
 # Configure logging for the whole application
 logging.basicConfig(
@@ -22,13 +56,42 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+GZIP_MINIMUM_SIZE = 1024   # bytes
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup: set up tracing, then build and connect every client before the
+    worker accepts traffic, so the first request after a deploy doesn't pay for it.
+    Shutdown: runs after uvicorn has drained in-flight requests; closes
+    connections, then flushes the trace exporter.
+    """
+    tracing.configure(app.dependency_overrides.get(get_settings, get_settings)())
+    logger.info("Warming up services")
+    await run_in_threadpool(warm_up_services, app.dependency_overrides)
+    yield
+    logger.info("Shutting down: closing service connections")
+    await run_in_threadpool(close_services)
+    tracing.shutdown()
+
+
 # Create FastAPI application instance
 app = FastAPI(
     title="AI Runtime Service",
     description="AI Runtime Service with FastAPI and LangChain",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Compress large responses for clients that send Accept-Encoding: gzip
+# (retrieval / evaluation payloads; small ones aren't worth the CPU).
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
+# One server span per request, joined to the caller's trace via `traceparent`
+# (a pass-through while TRACING_EXPORTER=none).
+app.add_middleware(tracing.TracingMiddleware)
+
 
 # ──────────────────────────────────────
 # Global exception handlers
@@ -48,6 +111,83 @@ async def embedding_error_handler(request: Request, exc: EmbeddingError):
     )
 
 
+@app.exception_handler(DeadlineExceededError)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError):
+    """Handle requests that ran out of their caller-supplied budget → 504."""
+    logger.warning("Deadline exceeded on %s: %s", request.url.path, exc)
+    return JSONResponse(
+        status_code=504,
+        content={"error": "deadline_exceeded", "message": str(exc)},
+    )
+
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """Handle calls to an upstream whose circuit breaker is open → 503 (fail fast)."""
+    logger.warning("CircuitOpenError on %s: %s", request.url.path, exc)
+    return JSONResponse(
+        status_code=503,
+        content={"error": "upstream_unavailable", "message": str(exc)},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+
+@app.exception_handler(BatchJobNotFoundError)
+async def batch_job_not_found_handler(request: Request, exc: BatchJobNotFoundError):
+    """Unknown batch job id → 404."""
+    return JSONResponse(
+        status_code=404,
+        content={"error": "batch_job_not_found", "message": str(exc)},
+    )
+
+
+@app.exception_handler(BatchJobError)
+async def batch_job_error_handler(request: Request, exc: BatchJobError):
+    """Handle OpenAI Batch API failures → 502 (upstream service failed)."""
+    logger.error("BatchJobError on %s: %s", request.url.path, exc)
+    return JSONResponse(
+        status_code=502,
+        content={"error": "batch_error", "message": str(exc)},
+    )
+
+
+@app.exception_handler(RebuildJobNotFoundError)
+async def rebuild_job_not_found_handler(request: Request, exc: RebuildJobNotFoundError):
+    """Unknown rebuild job id → 404."""
+    return JSONResponse(
+        status_code=404,
+        content={"error": "rebuild_job_not_found", "message": str(exc)},
+    )
+
+
+@app.exception_handler(RebuildInProgressError)
+async def rebuild_in_progress_handler(request: Request, exc: RebuildInProgressError):
+    """A rebuild of the same project is still running → 409."""
+    return JSONResponse(
+        status_code=409,
+        content={"error": "rebuild_in_progress", "message": str(exc)},
+    )
+
+
+@app.exception_handler(SnapshotNotFoundError)
+async def snapshot_not_found_handler(request: Request, exc: SnapshotNotFoundError):
+    """Unknown snapshot id → 404."""
+    return JSONResponse(
+        status_code=404,
+        content={"error": "snapshot_not_found", "message": str(exc)},
+    )
+
+
+@app.exception_handler(SnapshotError)
+async def snapshot_error_handler(request: Request, exc: SnapshotError):
+    """Snapshot that can't be used here (other embedding model, incomplete) → 422."""
+    logger.warning("SnapshotError on %s: %s", request.url.path, exc)
+    return JSONResponse(
+        status_code=422,
+        content={"error": "snapshot_error", "message": str(exc)},
+    )
+
+
 @app.exception_handler(MilvusError)
 async def milvus_error_handler(request: Request, exc: MilvusError):
     """Handle Milvus failures → 502 (upstream service failed)."""
@@ -74,6 +214,12 @@ async def ai_runtime_error_handler(request: Request, exc: AIRuntimeError):
 
 app.include_router(index_router)
 app.include_router(retrieve_router)
+app.include_router(evaluation_router)
+app.include_router(batch_router)
+app.include_router(rebuild_router)
+app.include_router(snapshot_router)
+app.include_router(shadow_router)
+app.include_router(profiling_router)
 
 
 # ──────────────────────────────────────
@@ -95,6 +241,37 @@ def health_check():
     }
 
 
+@app.get("/ready")
+def readiness_check(
+    weaviate_svc: WeaviateService = Depends(get_weaviate_service),
+    embedding_svc: EmbeddingService = Depends(get_embedding_service),
+    cache: TieredCache = Depends(get_cache),
+    settings: Settings = Depends(get_settings),
+):
+    """
+    Readiness check — unlike /health, verifies upstream reachability.
+
+    Returns 200 when Weaviate, OpenAI and the cache backend all respond,
+    503 otherwise (the load balancer should stop routing to this worker).
+    """
+    checks = {
+        "weaviate": "ok" if weaviate_svc.is_ready() else "unreachable",
+        "openai": "ok" if embedding_svc.is_ready() else "unreachable",
+        "cache": "ok" if cache.backend.ping() else "unreachable",
+    }
+    ready = all(v == "ok" for v in checks.values())
+    checks["rerank"] = "enabled" if settings.rerank_enabled else "disabled"
+
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "READY" if ready else "NOT_READY",
+            "timestamp": datetime.now().isoformat(),
+            "checks": checks,
+        },
+    )
+
+
 @app.get("/")
 def root():
     """
@@ -8,7 +8,10 @@ FastAPI uses these to:
   3. Serialize response objects to JSON
 """
 
-from pydantic import BaseModel
+from datetime import datetime, timezone
+from typing import Literal
+
+from pydantic import BaseModel, field_validator
 
 
 # ──────────────────────────────────────
@@ -32,17 +35,165 @@ class IndexResponse(BaseModel):
     message: str
 
 
+# ──────────────────────────────────────
+# DELETE /documents endpoints
+# ──────────────────────────────────────
+
+class DeleteResponse(BaseModel):
+    """Response body for DELETE /documents/..."""
+    project_id: int
+    doc_ids: list[int] | None = None   # None = the whole project was deleted
+    deleted_chunks: int | None = None  # None when a whole collection was dropped
+    status: str    # "SUCCESS" or "NOT_FOUND" (project had no collection)
+    message: str
+
+
+# ──────────────────────────────────────
+# /rebuild endpoint
+# ──────────────────────────────────────
+
+class RebuildRequest(BaseModel):
+    """Request body for POST /rebuild — rebuild a project into a shadow collection and swap."""
+    project_id: int
+    chunk_size: int | None = None            # None = keep the project's current chunking
+    chunk_overlap: int | None = None
+    hnsw_ef_construction: int | None = None  # HNSW settings of the new collection (None = Weaviate default)
+    hnsw_max_connections: int | None = None
+    hnsw_ef: int | None = None
+
+
+class RebuildJobResponse(BaseModel):
+    """Response body for POST /rebuild and GET /rebuild/{job_id}."""
+    job_id: str
+    project_id: int
+    status: str                  # pending, copying, catching_up, draining, completed, failed
+    chunk_size: int
+    chunk_overlap: int
+    source_collection: str | None = None
+    target_collection: str | None = None
+    documents_total: int
+    documents_done: int
+    chunks_written: int
+    vectors_reused: bool         # same chunking: vectors copied, nothing re-embedded
+    error: str | None = None
+    started_at: datetime
+    finished_at: datetime | None = None
+
+
+# ──────────────────────────────────────
+# /shadow/stats endpoint
+# ──────────────────────────────────────
+
+class ShadowStatsResponse(BaseModel):
+    """Response body for GET /shadow/stats (secondary backend vs Weaviate, recent window)."""
+    enabled: bool
+    backend: str
+    sample_rate: float
+    mirrored: int                # mirrored searches completed
+    dropped: int                 # sampled but skipped (too many in flight)
+    errors: int                  # mirrored searches that failed
+    latency_ms: dict[str, dict]  # {"primary" | "shadow": {count, p50, p95, p99}}
+    topk_overlap: dict           # {count, mean, p50} of |primary ∩ shadow| / k
+    score_correlation: dict      # {count, mean, p50} of Spearman correlations
+
+
+# ──────────────────────────────────────
+# /profiling endpoints
+# ──────────────────────────────────────
+
+class ProfilingWindowRequest(BaseModel):
+    """Request body for POST /profiling/window — profile matching requests for a while."""
+    duration_seconds: float
+    sample_rate: float = 1.0         # fraction of matching requests profiled
+    project_id: int | None = None    # None = requests of every project
+
+
+class ProfilingStatusResponse(BaseModel):
+    """Response body for the /profiling endpoints."""
+    window_remaining_seconds: float | None = None   # None = no window open
+    window_sample_rate: float | None = None
+    window_project_id: int | None = None
+    profiles: list[dict]             # [{name, size_bytes}], newest first
+
+
+# ──────────────────────────────────────
+# /snapshots endpoints
+# ──────────────────────────────────────
+
+class SnapshotExportRequest(BaseModel):
+    """Request body for POST /snapshots/export."""
+    project_id: int
+    backend: Literal["weaviate", "milvus"] = "weaviate"   # store to read the project from
+
+
+class SnapshotImportRequest(BaseModel):
+    """Request body for POST /snapshots/import."""
+    snapshot_id: str
+    project_id: int | None = None                         # None = the project it was exported from
+    backend: Literal["weaviate", "milvus"] = "weaviate"   # store to write the chunks into
+
+
+class SnapshotResponse(BaseModel):
+    """Response body for POST /snapshots/export and GET /snapshots/{snapshot_id} (the manifest)."""
+    snapshot_id: str
+    project_id: int
+    backend: str
+    chunks: int
+    dimensions: int
+    embedding_model: str
+    chunk_size: int
+    chunk_overlap: int
+    created_at: float            # unix time
+
+
+class SnapshotImportResponse(BaseModel):
+    """Response body for POST /snapshots/import."""
+    snapshot_id: str
+    project_id: int
+    backend: str
+    chunks: int                  # chunks written
+
+
 # ──────────────────────────────────────
 # /retrieve-document endpoint
 # ──────────────────────────────────────
 
+class SearchFilter(BaseModel):
+    """
+    Metadata pre-filter, pushed down into the vector store query (all set fields must match).
+
+    Chunks indexed before indexed_at was recorded have no timestamp and
+    never match indexed_after.
+    """
+    doc_ids: list[int] | None = None       # only these documents
+    title_like: str | None = None          # title pattern, "*" = any characters (e.g. "Release notes*")
+    indexed_after: datetime | None = None  # only chunks indexed after this time (naive = UTC)
+
+    @field_validator("indexed_after")
+    @classmethod
+    def _assume_utc(cls, value: datetime | None) -> datetime | None:
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    def is_empty(self) -> bool:
+        return self.doc_ids is None and self.title_like is None and self.indexed_after is None
+
+
 class RetrieveRequest(BaseModel):
     """Request body for POST /retrieve-document — search the knowledge base."""
     project_id: int
     query: str
+    project_ids: list[int] | None = None  # Also search these projects; results are merged into one top-k
+    fusion: Literal["rrf", "score"] = "rrf"  # How multi-project rankings are merged (rank- or score-based)
     top_k: int = 5              # Default: return top 5 results
     generate_answer: bool = True  # Whether to call LLM to generate a final answer
     alpha: float | None = None  # Hybrid search blend: 0.0=BM25, 1.0=vector, None=use Milvus (pure vector)
+    latency_budget_ms: int | None = None  # Skip rerank/answer when they'd overrun this (None = settings default)
+    timeout_ms: int | None = None  # Caller's budget; also via X-Request-Timeout-Ms
+    expand_neighbors: int = 0   # Also return chunk_id ± n around every hit (0 = off)
+    filters: SearchFilter | None = None  # Search only matching chunks (doc ids, title, indexed time)
+    include_text: bool = True   # False: results carry ids, scores and char offsets only (no text/title)
 
 
 class ChunkResult(BaseModel):
@@ -52,11 +203,125 @@ class ChunkResult(BaseModel):
     text: str
     score: float   # Similarity score (0.0 ~ 1.0, higher = more similar)
     title: str     # Source document title, for citation
+    project_id: int | None = None  # Project the chunk came from
+    neighbor_of: int | None = None  # Set on chunks added by expand_neighbors: the hit's chunk_id
+    char_start: int | None = None   # Offset of the chunk in its document (None: indexed before offsets were stored)
 
 
 class RetrieveResponse(BaseModel):
     """Response body for POST /retrieve-document."""
     project_id: int
     query: str
+    project_ids: list[int] = []  # Every project searched (project_id first)
     results: list[ChunkResult]
     answer: str | None = None  # Optional LLM-generated answer
+    skipped_stages: list[str] = []  # Optional stages skipped to meet the latency budget / open circuit ("rerank", "answer")
+
+
+# ──────────────────────────────────────
+# /retrieve-document/alpha-sweep endpoint
+# ──────────────────────────────────────
+
+class AlphaSweepRequest(BaseModel):
+    """Request body for POST /retrieve-document/alpha-sweep — rank one query for many alphas."""
+    project_id: int
+    query: str
+    alphas: list[float]          # e.g. [0.0, 0.25, 0.5, 0.75, 1.0]
+    top_k: int = 5
+    fusion: Literal["relative_score", "rrf"] = "relative_score"
+    filters: SearchFilter | None = None
+
+
+class AlphaResults(BaseModel):
+    """Ranking for one alpha value."""
+    alpha: float
+    results: list[ChunkResult]
+
+
+class AlphaSweepResponse(BaseModel):
+    """Response body for POST /retrieve-document/alpha-sweep."""
+    project_id: int
+    query: str
+    rankings: list[AlphaResults]
+
+
+# ──────────────────────────────────────
+# /evaluate-retrieval endpoint
+# ──────────────────────────────────────
+
+class RelevantItem(BaseModel):
+    """A labeled relevant result: a whole document (chunk_id=None) or one chunk."""
+    doc_id: int
+    chunk_id: int | None = None
+
+
+class EvaluationCase(BaseModel):
+    """One labeled query."""
+    query: str
+    relevant: list[RelevantItem]
+    filters: SearchFilter | None = None  # Scope the search, e.g. to the case's candidate documents
+
+
+class EvaluationRequest(BaseModel):
+    """Request body for POST /evaluate-retrieval — score retrieval on a labeled dataset."""
+    project_id: int
+    cases: list[EvaluationCase]
+    k_values: list[int] = [1, 3, 5, 10]   # cut-offs for hit_rate@k, recall@k, ndcg@k
+    alpha: float | None = None           # serving pipeline at this alpha (None = settings default)
+    alphas: list[float] | None = None    # or: score a whole alpha grid from one candidate fetch per query
+    fusion: Literal["relative_score", "rrf"] = "relative_score"  # local fusion for the alpha grid
+    concurrency: int | None = None       # parallel retrievals (capped by settings)
+
+
+class EvaluationRun(BaseModel):
+    """Metrics for one alpha value."""
+    alpha: float
+    metrics: dict[str, float]   # e.g. {"recall@5": 0.82, "ndcg@5": 0.71, "hit_rate@5": 0.9, "mrr": 0.66}
+
+
+class EvaluationResponse(BaseModel):
+    """Response body for POST /evaluate-retrieval."""
+    project_id: int
+    cases: int
+    runs: list[EvaluationRun]
+    latency_ms: dict[str, float]   # per-case retrieval latency: p50, p95, p99, mean, max
+    embedding_ms: float            # batched query embedding, all cases
+    elapsed_ms: float
+
+
+# ──────────────────────────────────────
+# /retrieve-document/batch endpoints
+# ──────────────────────────────────────
+
+class BatchRetrieveCase(BaseModel):
+    """One query of an offline batch."""
+    query: str
+    custom_id: str | None = None   # your id for joining results back (default: the case's index)
+
+
+class BatchRetrieveRequest(BaseModel):
+    """Request body for POST /retrieve-document/batch — retrieve now, answer via the Batch API."""
+    project_id: int
+    cases: list[BatchRetrieveCase]
+    top_k: int = 5
+    alpha: float | None = None
+
+
+class BatchCaseResult(BaseModel):
+    """One case of a batch job, joined with its answer once the batch has finished."""
+    custom_id: str
+    query: str
+    results: list[ChunkResult]
+    answer: str | None = None
+    error: str | None = None
+
+
+class BatchJobResponse(BaseModel):
+    """Response body for the /retrieve-document/batch endpoints."""
+    job_id: str
+    project_id: int
+    status: str          # OpenAI batch status: validating, in_progress, finalizing, completed, failed, expired, ...
+    cases: int
+    answered: int
+    failed: int
+    results: list[BatchCaseResult] | None = None   # once the batch has finished
@@ -0,0 +1,279 @@
+"""
+Opt-in request profiling (cProfile) for the retrieve and index routes.
+
+Why?
+  When one project's retrievals get slow, latency percentiles say *that*
+  a stage is slow but not where the CPU time inside ai-runtime goes
+  (fusion, packing, JSON, splitting, ...). A profile of the actual slow
+  request answers that.
+
+How a request gets profiled (PROFILING_TOKEN must be set, otherwise the
+whole facility is off):
+  - per request: send `X-Profile: <PROFILING_TOKEN>`
+  - for a time window: POST /profiling/window (same header) with
+    duration_seconds, sample_rate and optionally project_id — matching
+    requests on that worker are profiled until the window ends
+
+Each profile is written to PROFILING_DIR as
+  {route}-p{project_id}-{UTC timestamp}-{id}.prof
+(standard pstats format: `python -m pstats`, snakeviz, ...). Only the
+newest PROFILING_MAX_FILES are kept.
+
+Which threads a profile covers:
+  - Python < 3.12: only the threads that ran the request's work (the
+    request thread, or each profiling.call thread); time spent waiting on
+    helper pools (deadline runner, federated fan-out) shows up as waiting
+  - Python 3.12+ (our target runtime): cProfile is built on sys.monitoring
+    and records every thread of the process while a profile is active. The
+    profile then also contains whatever else the worker ran meanwhile —
+    other requests, rebuild jobs, shadow searches — and those pay the
+    profiler overhead for that time. Profile on a quiet worker (or with a
+    low window sample rate) and read the profile with that in mind; the
+    request's own work is under its route function in the call tree.
+  Nothing is serialized or locked for profiling: other requests never
+  wait for a profile.
+
+Overhead:
+  - off (no header, no window): one comparison per request
+  - one profile at a time per worker; requests asking for a profile while
+    another is being taken run unprofiled
+
+Async routes (index-document/stream) do their work in the threadpool;
+they run those calls through profiling.call() so the work is profiled
+in whichever thread executes it.
+"""
+
+import contextvars
+import cProfile
+import functools
+import hmac
+import inspect
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, TypeVar
+
+from fastapi import Depends, Header
+
+from ai_runtime.config import Settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_SUFFIX = ".prof"
+
+# Session of the request being profiled (propagates into run_in_threadpool)
+_current: contextvars.ContextVar["ProfileSession | None"] = contextvars.ContextVar("profile_session", default=None)
+
+
+@dataclass
+class ProfilingWindow:
+    until: float                 # monotonic
+    sample_rate: float
+    project_id: int | None = None
+
+
+class ProfileSession:
+    """One request's profile; run() can be called from several threads, one at a time."""
+
+    def __init__(self, route: str, project_id: int | None, path: str):
+        self.route = route
+        self.project_id = project_id
+        self.path = path
+        self._profile = cProfile.Profile()
+        self.started = time.perf_counter()
+
+    def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        self._profile.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._profile.disable()
+
+    def save(self) -> str:
+        self._profile.dump_stats(self.path)
+        return self.path
+
+
+class Profiler:
+    def __init__(
+        self,
+        settings: Settings,
+        clock: Callable[[], float] = time.monotonic,
+        sampler: Callable[[], float] = random.random,
+    ):
+        self.token = settings.profiling_token
+        self.profile_dir = settings.profiling_dir
+        self.max_files = settings.profiling_max_files
+        self.max_window_seconds = settings.profiling_max_window_seconds
+        self._clock = clock
+        self._sampler = sampler
+        self._window: ProfilingWindow | None = None
+        self._busy = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def authorized(self, token: str | None) -> bool:
+        """Whether `token` (the X-Profile header) is the configured profiling token."""
+        return self.enabled and token is not None and hmac.compare_digest(token, self.token)
+
+    # ── time window ──
+
+    def start_window(self, duration_seconds: float, sample_rate: float = 1.0, project_id: int | None = None):
+        self._window = ProfilingWindow(self._clock() + duration_seconds, sample_rate, project_id)
+        logger.info(
+            "Profiling window open for %.0fs (sample_rate=%.2f, project=%s)", duration_seconds, sample_rate, project_id,
+        )
+
+    def stop_window(self):
+        self._window = None
+
+    def window(self) -> ProfilingWindow | None:
+        window = self._window
+        if window is not None and window.until <= self._clock():
+            return None
+        return window
+
+    def status(self) -> dict:
+        """Open window (remaining seconds, sample rate, project) and the profiles on disk."""
+        window = self.window()
+        return {
+            "window_remaining_seconds": None if window is None else round(max(0.0, window.until - self._clock()), 1),
+            "window_sample_rate": None if window is None else window.sample_rate,
+            "window_project_id": None if window is None else window.project_id,
+            "profiles": self.profiles(),
+        }
+
+    # ── sessions ──
+
+    def session(self, route: str, project_id: int | None, token: str | None) -> ProfileSession | None:
+        """A session if this request is to be profiled, else None."""
+        window = self._window
+        if token is None and window is None:
+            return None   # fast path: profiling off
+
+        if token is not None:
+            if not self.authorized(token):
+                logger.warning("Ignoring %s header with an invalid token", PROFILE_HEADER)
+                return None
+        else:
+            window = self.window()
+            if window is None:
+                return None
+            if window.project_id is not None and window.project_id != project_id:
+                return None
+            if self._sampler() >= window.sample_rate:
+                return None
+
+        if not self._busy.acquire(blocking=False):
+            logger.info("Not profiling %s (project=%s): another request is being profiled", route, project_id)
+            return None
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        name = f"{route}-p{project_id}-{stamp}-{uuid.uuid4().hex[:8]}{PROFILE_SUFFIX}"
+        return ProfileSession(route, project_id, os.path.join(self.profile_dir, name))
+
+    def finish(self, session: ProfileSession):
+        """Write the profile and let the next request be profiled."""
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = session.save()
+            logger.info(
+                "Profiled %s (project=%s) in %.1f ms → %s",
+                session.route, session.project_id, (time.perf_counter() - session.started) * 1000, path,
+            )
+            self._prune()
+        except Exception as e:
+            logger.warning("Could not write profile %s: %s", session.path, e)
+        finally:
+            self._busy.release()
+
+    def profiles(self) -> list[dict]:
+        """Profiles on disk, newest first: [{name, size_bytes}]."""
+        try:
+            entries = [e for e in os.scandir(self.profile_dir) if e.name.endswith(PROFILE_SUFFIX)]
+        except FileNotFoundError:
+            return []
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        return [{"name": e.name, "size_bytes": e.stat().st_size} for e in entries]
+
+    def _prune(self):
+        for stale in self.profiles()[self.max_files:]:
+            os.remove(os.path.join(self.profile_dir, stale["name"]))
+
+
+def call(fn: Callable[..., T], *args, **kwargs) -> T:
+    """fn(*args, **kwargs), profiled if the current request is being profiled."""
+    session = _current.get()
+    if session is None:
+        return fn(*args, **kwargs)
+    return session.run(fn, *args, **kwargs)
+
+
+def _project_id(kwargs: dict) -> int | None:
+    if kwargs.get("project_id") is not None:
+        return kwargs["project_id"]
+    return getattr(kwargs.get("request"), "project_id", None)
+
+
+def profiled(route: str):
+    """
+    Route decorator: profile the request when asked to (header or window).
+
+    Adds the X-Profile header and the Profiler to the route's signature,
+    so FastAPI resolves them like any other parameter; the route itself
+    doesn't see them. The project id is taken from a `project_id`
+    parameter or the `request` body's project_id.
+    """
+    from ai_runtime.dependencies import get_profiler   # dependencies imports this module
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        extra = [
+            inspect.Parameter(
+                "profile_token", inspect.Parameter.KEYWORD_ONLY,
+                default=Header(None, alias=PROFILE_HEADER), annotation=str | None,
+            ),
+            inspect.Parameter(
+                "profiler", inspect.Parameter.KEYWORD_ONLY,
+                default=Depends(get_profiler), annotation=Profiler,
+            ),
+        ]
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, profile_token: str | None = None, profiler: Profiler, **kwargs):
+                session = profiler.session(route, _project_id(kwargs), profile_token)
+                if session is None:
+                    return await fn(*args, **kwargs)
+                reset = _current.set(session)
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    _current.reset(reset)
+                    profiler.finish(session)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, profile_token: str | None = None, profiler: Profiler, **kwargs):
+                session = profiler.session(route, _project_id(kwargs), profile_token)
+                if session is None:
+                    return fn(*args, **kwargs)
+                reset = _current.set(session)
+                try:
+                    return session.run(fn, *args, **kwargs)
+                finally:
+                    _current.reset(reset)
+                    profiler.finish(session)
+
+        wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), *extra])
+        return wrapper
+
+    return decorator
@@ -0,0 +1,112 @@
+"""
+Offline batch endpoints for the answer step of /retrieve-document.
+
+POST /retrieve-document/batch
+    Retrieves the chunks for every case right away (same pipeline as
+    /retrieve-document), then submits all answer prompts as one OpenAI
+    Batch job instead of one chat completion per case. Returns a job id.
+
+GET /retrieve-document/batch/{job_id}
+    Polls the job. Once the batch has finished, every case comes back
+    with its retrieved chunks and its answer (or the per-case error).
+
+Meant for large evaluation runs: batch requests are billed at half price
+and don't consume the interactive RPM/TPM quota.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from ai_runtime.config import Settings
+from ai_runtime.models import (
+    BatchCaseResult,
+    BatchJobResponse,
+    BatchRetrieveRequest,
+    ChunkResult,
+)
+from ai_runtime.services.batch_answer_service import TERMINAL_STATUSES, BatchAnswerService
+from ai_runtime.services.retrieval_service import RetrievalService
+from ai_runtime.dependencies import (
+    get_batch_answer_service,
+    get_retrieval_service,
+    get_settings,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["batch"])
+
+
+def _job_response(manifest: dict) -> BatchJobResponse:
+    cases = manifest["cases"]
+    finished = manifest["status"] in TERMINAL_STATUSES
+    return BatchJobResponse(
+        job_id=manifest["job_id"],
+        project_id=manifest["project_id"],
+        status=manifest["status"],
+        cases=len(cases),
+        answered=sum(1 for c in cases if c["answer"] is not None),
+        failed=sum(1 for c in cases if c["error"] is not None),
+        results=[BatchCaseResult(**c) for c in cases] if finished else None,
+    )
+
+
+@router.post("/retrieve-document/batch", response_model=BatchJobResponse)
+def submit_batch(
+    request: BatchRetrieveRequest,
+    retrieval_svc: RetrievalService = Depends(get_retrieval_service),
+    batch_svc: BatchAnswerService = Depends(get_batch_answer_service),
+    settings: Settings = Depends(get_settings),
+) -> BatchJobResponse:
+    """
+    Retrieve for every case now; generate the answers as an offline batch job.
+
+    Flow:
+      1. Embed all queries in batches
+      2. Search every query (bounded concurrency, cached like /retrieve-document)
+      3. Write the answer prompts to JSONL and submit them as one batch
+    """
+    logger.info("POST /retrieve-document/batch: project=%d, cases=%d", request.project_id, len(request.cases))
+    if len(request.cases) > settings.batch_max_cases:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.batch_max_cases} cases can be submitted per batch",
+        )
+    custom_ids = [c.custom_id or str(i) for i, c in enumerate(request.cases)]
+    if len(set(custom_ids)) != len(custom_ids):
+        raise HTTPException(status_code=422, detail="custom_id values must be unique within a batch")
+
+    queries = [c.query for c in request.cases]
+    alpha = max(0.0, min(1.0, request.alpha if request.alpha is not None else settings.weaviate_alpha))
+    embeddings = retrieval_svc.embed_queries(queries, batch_size=settings.eval_embedding_batch_size)
+    rankings = retrieval_svc.search_each(
+        project_id=request.project_id,
+        queries=queries,
+        query_embeddings=embeddings,
+        alpha=alpha,
+        top_k=request.top_k or settings.retrieve_top_k,
+        concurrency=settings.eval_max_concurrency,
+    )
+
+    manifest = batch_svc.submit(
+        project_id=request.project_id,
+        cases=[
+            {
+                "custom_id": custom_id,
+                "query": query,
+                "results": [ChunkResult(project_id=request.project_id, **r) for r in results],
+            }
+            for custom_id, query, results in zip(custom_ids, queries, rankings)
+        ],
+    )
+    return _job_response(manifest)
+
+
+@router.get("/retrieve-document/batch/{job_id}", response_model=BatchJobResponse)
+def poll_batch(
+    job_id: str,
+    batch_svc: BatchAnswerService = Depends(get_batch_answer_service),
+) -> BatchJobResponse:
+    """Check a batch job; finished jobs include every case with its answer."""
+    return _job_response(batch_svc.poll(job_id))
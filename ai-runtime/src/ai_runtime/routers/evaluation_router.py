@@ -0,0 +1,73 @@
+"""
+POST /evaluate-retrieval endpoint.
+
+Scores retrieval quality on a labeled dataset (query → relevant doc/chunk
+ids): hit_rate@k, recall@k, ndcg@k and MRR, plus latency percentiles of
+the same run. With `alphas`, one request evaluates a whole alpha grid from
+a single candidate fetch per query.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from ai_runtime.config import Settings
+from ai_runtime.models import EvaluationRequest, EvaluationResponse, EvaluationRun
+from ai_runtime.services.evaluation_service import EvaluationService
+from ai_runtime.dependencies import get_evaluation_service, get_settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["evaluation"])
+
+
+@router.post("/evaluate-retrieval", response_model=EvaluationResponse)
+def evaluate_retrieval(
+    request: EvaluationRequest,
+    eval_svc: EvaluationService = Depends(get_evaluation_service),
+    settings: Settings = Depends(get_settings),
+) -> EvaluationResponse:
+    """
+    Run every case through retrieval and score the rankings.
+
+    Flow:
+      1. Embed all queries in batches
+      2. Retrieve with bounded concurrency (serving pipeline without the
+         retrieval cache, or one candidate fetch per query for an alpha grid)
+      3. Compute the metrics as NumPy reductions over the relevance matrix
+    """
+    logger.info(
+        "POST /evaluate-retrieval: project=%d, cases=%d, alphas=%s",
+        request.project_id, len(request.cases), request.alphas or request.alpha,
+    )
+    if len(request.cases) > settings.eval_max_cases:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.eval_max_cases} cases can be evaluated per request",
+        )
+    if not request.k_values or min(request.k_values) < 1:
+        raise HTTPException(status_code=422, detail="k_values must be positive integers")
+    if max(request.k_values) > settings.eval_max_k:
+        raise HTTPException(
+            status_code=422,
+            detail=f"k_values must not exceed {settings.eval_max_k}",
+        )
+
+    report = eval_svc.evaluate(
+        project_id=request.project_id,
+        cases=request.cases,
+        k_values=request.k_values,
+        alpha=request.alpha,
+        alphas=request.alphas,
+        fusion=request.fusion,
+        concurrency=request.concurrency,
+    )
+
+    return EvaluationResponse(
+        project_id=request.project_id,
+        cases=len(request.cases),
+        runs=[EvaluationRun(**run) for run in report["runs"]],
+        latency_ms=report["latency_ms"],
+        embedding_ms=report["embedding_ms"],
+        elapsed_ms=report["elapsed_ms"],
+    )
@@ -1,21 +1,36 @@
 """
-POST /index-document endpoint.
+POST /index-document, POST /index-document/stream and DELETE /documents endpoints.
 
 Called by Platform API after a document is uploaded.
 Chunks the document, generates embeddings, and stores them in Milvus.
 
+/index-document/stream takes the raw document text as the request body
+(plain or chunked transfer encoding) and indexes it window by window as
+it arrives, so very large documents never sit in memory in full.
+
+DELETE /documents/... removes one document, a list of documents (one
+`doc_id IN (...)` delete in Weaviate) or a whole project (its collection is
+dropped), then drops the project's cached retrievals and answers.
+
 Error handling: Exceptions from services (EmbeddingError, MilvusError)
 are NOT caught here — they bubble up to the global exception handlers
 in main.py, which return clean JSON error responses.
 """
 
+import codecs
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
 
-from ai_runtime.models import IndexRequest, IndexResponse
+from ai_runtime.config import Settings
+from ai_runtime import profiling
+from ai_runtime.models import DeleteResponse, IndexRequest, IndexResponse
+from ai_runtime.profiling import profiled
+from ai_runtime.tracing import traced
+from ai_runtime.services.cache_service import TieredCache
 from ai_runtime.services.document_service import DocumentService
-from ai_runtime.dependencies import get_document_service
+from ai_runtime.dependencies import get_cache, get_document_service, get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +38,18 @@ router = APIRouter(tags=["indexing"])
 
 
 @router.post("/index-document", response_model=IndexResponse)
+@profiled("index")
+@traced("route.index")
 def index_document(
     request: IndexRequest,
     doc_service: DocumentService = Depends(get_document_service),
+    cache: TieredCache = Depends(get_cache),
 ) -> IndexResponse:
     """
     Index a document into the vector database.
 
     Flow: receive document → chunk → embed → store in Milvus
+    → drop the project's cached retrievals and answers (its knowledge base changed)
     """
     logger.info("POST /index-document: project=%d, doc_id=%d", request.project_id, request.doc_id)
 
@@ -40,6 +59,8 @@ def index_document(
         title=request.title,
         content=request.content,
     )
+    cache.invalidate_project(request.project_id)
+
     return IndexResponse(
         project_id=request.project_id,
         doc_id=request.doc_id,
@@ -47,3 +68,132 @@ def index_document(
         status="SUCCESS",
         message=f"Indexed {chunks_count} chunks for document {request.doc_id}",
     )
+
+
+@router.post("/index-document/stream", response_model=IndexResponse)
+@profiled("index_stream")
+@traced("route.index_stream")
+async def index_document_stream(
+    request: Request,
+    project_id: int = Query(...),
+    doc_id: int = Query(...),
+    title: str = Query(...),
+    doc_service: DocumentService = Depends(get_document_service),
+    cache: TieredCache = Depends(get_cache),
+) -> IndexResponse:
+    """
+    Index a document streamed in the request body.
+
+    Flow: read body piece by piece → decode UTF-8 incrementally → feed the
+    streaming indexer, which embeds + stores every full window of chunks.
+    A body that isn't valid UTF-8 is rejected (400); on any failure the
+    windows already stored are deleted, so no partial document remains.
+
+    The body is read on the event loop; everything blocking (routing
+    lookup, embedding and Weaviate calls, cache invalidation) runs in the
+    threadpool like the sync endpoints — the indexing calls through
+    profiling.call, so a profiled request covers them.
+    """
+    logger.info("POST /index-document/stream: project=%d, doc_id=%d", project_id, doc_id)
+
+    # open_stream may load the project routing table from Weaviate — blocking, so off the loop
+    indexer = await run_in_threadpool(doc_service.open_stream, project_id=project_id, doc_id=doc_id, title=title)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="strict")
+
+    try:
+        async for piece in request.stream():
+            text = decoder.decode(piece)
+            if text:
+                await run_in_threadpool(profiling.call, indexer.feed, text)
+
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            await run_in_threadpool(profiling.call, indexer.feed, tail)
+        chunks_count = await run_in_threadpool(profiling.call, indexer.finish)
+    except UnicodeDecodeError as e:
+        await run_in_threadpool(indexer.abort)
+        raise HTTPException(status_code=400, detail=f"Request body is not valid UTF-8: {e}") from e
+    except Exception:
+        # Indexing failures were cleaned up by the indexer; this covers the rest (client gone, ...)
+        await run_in_threadpool(indexer.abort)
+        raise
+    await run_in_threadpool(cache.invalidate_project, project_id)   # a Redis INCR per namespace
+
+    return IndexResponse(
+        project_id=project_id,
+        doc_id=doc_id,
+        chunks_count=chunks_count,
+        status="SUCCESS",
+        message=f"Indexed {chunks_count} chunks for document {doc_id}",
+    )
+
+
+@router.delete("/documents/{project_id}/{doc_id}", response_model=DeleteResponse)
+def delete_document(
+    project_id: int,
+    doc_id: int,
+    doc_service: DocumentService = Depends(get_document_service),
+    cache: TieredCache = Depends(get_cache),
+) -> DeleteResponse:
+    """Delete every chunk of one document."""
+    logger.info("DELETE /documents: project=%d, doc_id=%d", project_id, doc_id)
+
+    deleted = doc_service.delete_document(project_id=project_id, doc_id=doc_id)
+    cache.invalidate_project(project_id)
+
+    return DeleteResponse(
+        project_id=project_id,
+        doc_ids=[doc_id],
+        deleted_chunks=deleted,
+        status="SUCCESS",
+        message=f"Deleted {deleted} chunks of document {doc_id}",
+    )
+
+
+@router.delete("/documents/{project_id}", response_model=DeleteResponse)
+def delete_documents(
+    project_id: int,
+    doc_ids: list[int] | None = Query(None),
+    all_documents: bool = Query(False, alias="all"),
+    doc_service: DocumentService = Depends(get_document_service),
+    cache: TieredCache = Depends(get_cache),
+    settings: Settings = Depends(get_settings),
+) -> DeleteResponse:
+    """
+    Delete several documents (`?doc_ids=1&doc_ids=2`) in one filtered delete,
+    or the whole project (`?all=true`, drops its collection).
+
+    One of the two is required, so a request missing its doc_ids can never
+    wipe a project by accident.
+    """
+    if all_documents == bool(doc_ids):
+        raise HTTPException(status_code=422, detail="Pass either doc_ids or all=true")
+
+    if all_documents:
+        logger.info("DELETE /documents: project=%d, all documents", project_id)
+        existed = doc_service.delete_project(project_id)
+        cache.invalidate_project(project_id)
+        return DeleteResponse(
+            project_id=project_id,
+            status="SUCCESS" if existed else "NOT_FOUND",
+            message=f"Deleted project {project_id}" if existed else f"Project {project_id} has no documents",
+        )
+
+    if len(doc_ids) > settings.delete_max_doc_ids:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.delete_max_doc_ids} doc_ids per request",
+        )
+    doc_ids = list(dict.fromkeys(doc_ids))
+    logger.info("DELETE /documents: project=%d, %d documents", project_id, len(doc_ids))
+
+    deleted = doc_service.delete_documents(project_id=project_id, doc_ids=doc_ids)
+    cache.invalidate_project(project_id)
+
+    return DeleteResponse(
+        project_id=project_id,
+        doc_ids=doc_ids,
+        deleted_chunks=deleted,
+        status="SUCCESS",
+        message=f"Deleted {deleted} chunks of {len(doc_ids)} documents",
+    )
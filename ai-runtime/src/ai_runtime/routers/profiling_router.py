@@ -0,0 +1,78 @@
+"""
+Request profiling admin endpoints (ai_runtime/profiling.py).
+
+Every call needs `X-Profile: <PROFILING_TOKEN>`; with no token configured
+profiling is off and these endpoints return 404. A window applies to the
+worker that receives the call.
+
+GET /profiling
+    Open window (if any) and the profiles written so far, newest first.
+
+POST /profiling/window
+    Profile matching retrieve / index requests (optionally one project,
+    a sampled fraction) for duration_seconds.
+
+DELETE /profiling/window
+    Close the window early.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from ai_runtime.models import ProfilingStatusResponse, ProfilingWindowRequest
+from ai_runtime.profiling import PROFILE_HEADER, Profiler
+from ai_runtime.dependencies import get_profiler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["profiling"])
+
+
+def _authorize(profiler: Profiler, token: str | None):
+    if not profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is not enabled")
+    if not profiler.authorized(token):
+        raise HTTPException(status_code=403, detail=f"Missing or invalid {PROFILE_HEADER} header")
+
+
+@router.get("/profiling", response_model=ProfilingStatusResponse)
+def profiling_status(
+    profiler: Profiler = Depends(get_profiler),
+    token: str | None = Header(None, alias=PROFILE_HEADER),
+) -> ProfilingStatusResponse:
+    """Profiling window and profiles on this worker."""
+    _authorize(profiler, token)
+    return ProfilingStatusResponse(**profiler.status())
+
+
+@router.post("/profiling/window", response_model=ProfilingStatusResponse)
+def open_profiling_window(
+    request: ProfilingWindowRequest,
+    profiler: Profiler = Depends(get_profiler),
+    token: str | None = Header(None, alias=PROFILE_HEADER),
+) -> ProfilingStatusResponse:
+    """Profile matching requests on this worker for a while."""
+    _authorize(profiler, token)
+    if not 0 < request.duration_seconds <= profiler.max_window_seconds:
+        raise HTTPException(
+            status_code=422,
+            detail=f"duration_seconds must be between 0 and {profiler.max_window_seconds:.0f}",
+        )
+    if not 0 < request.sample_rate <= 1:
+        raise HTTPException(status_code=422, detail="sample_rate must be in (0, 1]")
+
+    logger.info("POST /profiling/window: %.0fs, project=%s", request.duration_seconds, request.project_id)
+    profiler.start_window(request.duration_seconds, request.sample_rate, request.project_id)
+    return ProfilingStatusResponse(**profiler.status())
+
+
+@router.delete("/profiling/window", response_model=ProfilingStatusResponse)
+def close_profiling_window(
+    profiler: Profiler = Depends(get_profiler),
+    token: str | None = Header(None, alias=PROFILE_HEADER),
+) -> ProfilingStatusResponse:
+    """Close the profiling window."""
+    _authorize(profiler, token)
+    profiler.stop_window()
+    return ProfilingStatusResponse(**profiler.status())
@@ -0,0 +1,73 @@
+"""
+Project rebuild endpoints (services/rebuild_service.py).
+
+POST /rebuild
+    Starts rebuilding a project into a shadow collection with new chunking
+    and/or HNSW settings. Queries keep being served from the current
+    collection until the job swaps the project over. Returns the job.
+
+GET /rebuild/{job_id}
+    Job progress: documents copied, chunks written, current phase.
+    Jobs run on the worker that accepted them, so poll through the same
+    worker (or the same pod when running a single worker per pod).
+"""
+
+import logging
+from dataclasses import asdict
+
+import weaviate.classes as wvc
+from fastapi import APIRouter, Depends, HTTPException
+
+from ai_runtime.models import RebuildJobResponse, RebuildRequest
+from ai_runtime.services.rebuild_service import RebuildJob, RebuildService
+from ai_runtime.dependencies import get_rebuild_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["rebuild"])
+
+
+def _job_response(job: RebuildJob) -> RebuildJobResponse:
+    return RebuildJobResponse(**asdict(job))
+
+
+@router.post("/rebuild", response_model=RebuildJobResponse, status_code=202)
+def start_rebuild(
+    request: RebuildRequest,
+    rebuild_svc: RebuildService = Depends(get_rebuild_service),
+) -> RebuildJobResponse:
+    """Start a zero-downtime rebuild of one project."""
+    logger.info("POST /rebuild: project=%d", request.project_id)
+    current_size, current_overlap = rebuild_svc.current_chunking(request.project_id)
+    chunk_size = request.chunk_size or current_size
+    chunk_overlap = request.chunk_overlap if request.chunk_overlap is not None else current_overlap
+    if chunk_size <= 0 or not 0 <= chunk_overlap < chunk_size:
+        raise HTTPException(
+            status_code=422,
+            detail="chunk_size must be positive and 0 <= chunk_overlap < chunk_size",
+        )
+
+    hnsw = {
+        "ef_construction": request.hnsw_ef_construction,
+        "max_connections": request.hnsw_max_connections,
+        "ef": request.hnsw_ef,
+    }
+    hnsw = {k: v for k, v in hnsw.items() if v is not None}
+    vector_index_config = wvc.config.Configure.VectorIndex.hnsw(**hnsw) if hnsw else None
+
+    job = rebuild_svc.start(
+        project_id=request.project_id,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        vector_index_config=vector_index_config,
+    )
+    return _job_response(job)
+
+
+@router.get("/rebuild/{job_id}", response_model=RebuildJobResponse)
+def rebuild_status(
+    job_id: str,
+    rebuild_svc: RebuildService = Depends(get_rebuild_service),
+) -> RebuildJobResponse:
+    """Progress of a rebuild job."""
+    return _job_response(rebuild_svc.get(job_id))
@@ -4,26 +4,41 @@ POST /retrieve-document endpoint.
 All searches go through Weaviate hybrid search (vector + BM25).
 alpha controls the blend: 0.0 = pure keyword, 1.0 = pure vector, default = 0.5.
 
-# MILVUS (dead code — kept for rollback):
-# MilvusService and get_milvus_service are imported in dependencies.py
-# but not injected here. To re-enable: add the Depends parameter back.
+# MILVUS (kept for rollback):
+# get_milvus_service is still defined in dependencies.py (pymilvus is imported
+# lazily on first call) but not injected here. To re-enable: add the Depends parameter back.
+# With SHADOW_SAMPLE_RATE > 0 a sample of queries is mirrored to Milvus in the
+# background to compare the two (services/shadow_traffic.py, GET /shadow/stats).
 """
 
 import logging
 
-import openai
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 
 from ai_runtime.config import Settings
-from ai_runtime.models import RetrieveRequest, RetrieveResponse, ChunkResult
-from ai_runtime.services.weaviate_service import WeaviateService
-from ai_runtime.services.embedding_service import EmbeddingService
-from ai_runtime.services.rerank_service import RerankService
+from ai_runtime.deadline import TIMEOUT_HEADER, Deadline
+from ai_runtime.encoding import compact_result, encode, wants_msgpack
+from ai_runtime.exceptions import AnswerGenerationError, CircuitOpenError
+from ai_runtime.profiling import profiled
+from ai_runtime.tracing import traced
+from ai_runtime.models import (
+    AlphaResults,
+    AlphaSweepRequest,
+    AlphaSweepResponse,
+    ChunkResult,
+    RetrieveRequest,
+    RetrieveResponse,
+)
+from ai_runtime.services.retrieval_service import RetrievalService
+from ai_runtime.services.answer_service import AnswerService
+from ai_runtime.services.resilience import Resilience
+from ai_runtime.services.shadow_traffic import ShadowTraffic
 from ai_runtime.dependencies import (
-    get_weaviate_service,
-    get_embedding_service,
-    get_rerank_service,
+    get_retrieval_service,
+    get_answer_service,
+    get_resilience,
     get_settings,
+    get_shadow_traffic,
 )
 
 logger = logging.getLogger(__name__)
@@ -32,102 +47,197 @@ router = APIRouter(tags=["retrieval"])
 
 
 @router.post("/retrieve-document", response_model=RetrieveResponse)
+@profiled("retrieve")
+@traced("route.retrieve")
 def retrieve(
     request: RetrieveRequest,
-    weaviate_svc: WeaviateService = Depends(get_weaviate_service),
-    embedding_svc: EmbeddingService = Depends(get_embedding_service),
-    rerank_svc: RerankService = Depends(get_rerank_service),
+    retrieval_svc: RetrievalService = Depends(get_retrieval_service),
+    answer_svc: AnswerService = Depends(get_answer_service),
     settings: Settings = Depends(get_settings),
-) -> RetrieveResponse:
+    resilience: Resilience = Depends(get_resilience),
+    shadow: ShadowTraffic = Depends(get_shadow_traffic),
+    timeout_header: str | None = Header(None, alias=TIMEOUT_HEADER),
+    accept: str | None = Header(None),
+) -> RetrieveResponse | Response:
     """
     Search the knowledge base and optionally generate an answer.
 
     Flow:
       1. Embed the query text → get a vector
       2. Weaviate hybrid search (vector + BM25, blended by alpha)
-      3. (Optional) Send chunks + query to OpenAI chat → get a human-readable answer
+      3. (Optional) Rerank with Bedrock Cohere Rerank
+         (Optional) Expand every hit with its chunk_id ± expand_neighbors neighbors
+      4. (Optional) Send chunks + query to OpenAI chat → get a human-readable answer
+
+    The caller's budget (timeout_ms or the X-Request-Timeout-Ms header) is
+    enforced across all steps; running out returns 504.
+
+    With a latency budget (latency_budget_ms), steps 3 and 4 are skipped when
+    their recent p95 latency no longer fits — or while their circuit breaker
+    is open — and the response lists them in skipped_stages.
+
+    include_text=false or `Accept: application/msgpack` selects the compact
+    encoding (see ai_runtime/encoding.py).
     """
     logger.info(
         "POST /retrieve-document: project=%d, query='%s', alpha=%s",
         request.project_id, request.query[:80], request.alpha,
     )
 
+    # project_id first, then any extra project_ids (deduplicated, order kept)
+    project_ids = list(dict.fromkeys([request.project_id, *(request.project_ids or [])]))
+    if len(project_ids) > settings.retrieve_max_projects:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.retrieve_max_projects} projects can be searched at once",
+        )
+    if not 0 <= request.expand_neighbors <= settings.retrieve_max_expand_neighbors:
+        raise HTTPException(
+            status_code=422,
+            detail=f"expand_neighbors must be between 0 and {settings.retrieve_max_expand_neighbors}",
+        )
+
+    deadline = Deadline.from_request(request.timeout_ms, timeout_header, settings.retrieve_default_timeout_ms)
+    budget = resilience.budget(
+        request.latency_budget_ms if request.latency_budget_ms is not None else settings.retrieve_latency_budget_ms
+    )
+
     # Step 1: Embed the query (needed by both Milvus and Weaviate)
-    query_vector = embedding_svc.embed_single(request.query)
+    query_vector = retrieval_svc.embed_query(request.query, deadline=deadline)
     top_k = request.top_k or settings.retrieve_top_k
 
-    # Step 2: Weaviate hybrid search (default path)
+    # Steps 2-3: Weaviate hybrid search (default path) + optional reranking
     # Milvus code is kept but no longer routed to.
+    # Several projects → searched concurrently, rankings merged (RRF / score).
     alpha = max(0.0, min(1.0, request.alpha if request.alpha is not None else settings.weaviate_alpha))
-    logger.info("Using Weaviate hybrid search (alpha=%.2f)", alpha)
-    raw_results = weaviate_svc.hybrid_search(
-        project_id=request.project_id,
-        query=request.query,
-        query_embedding=query_vector,
-        alpha=alpha,
-        top_k=top_k,
-    )
-
-    # Step 3: Optional reranking
-    # When enabled, fetch more candidates (rerank_top_k) then let the
-    # Cross-Encoder score them and keep only the best rerank_top_n.
-    if settings.rerank_enabled and raw_results:
-        logger.info("Reranking enabled — reranking %d candidates", len(raw_results))
-        raw_results = rerank_svc.rerank(
+    if len(project_ids) == 1:
+        raw_results = [
+            {**r, "project_id": request.project_id}
+            for r in retrieval_svc.search(
+                project_id=request.project_id,
+                query=request.query,
+                query_embedding=query_vector,
+                alpha=alpha,
+                top_k=top_k,
+                deadline=deadline,
+                budget=budget,
+                filters=request.filters,
+            )
+        ]
+        # Shadow mode: mirror a sample to Milvus in the background (the response never waits)
+        shadow.maybe_mirror(
+            request.project_id, query_vector, top_k, request.filters, raw_results, retrieval_svc.search_seconds,
+        )
+    else:
+        raw_results = retrieval_svc.search_many(
+            project_ids=project_ids,
             query=request.query,
-            chunks=raw_results,
-            top_n=settings.rerank_top_n,
+            query_embedding=query_vector,
+            alpha=alpha,
+            top_k=top_k,
+            fusion=request.fusion,
+            deadline=deadline,
+            budget=budget,
+            filters=request.filters,
         )
+    skipped_stages = list(dict.fromkeys(retrieval_svc.skipped_stages))
 
-    results = [ChunkResult(**r) for r in raw_results]
+    # Optional: surround every hit with its neighboring chunks (one fetch per project)
+    if request.expand_neighbors:
+        raw_results = retrieval_svc.expand_neighbors(raw_results, request.expand_neighbors, deadline=deadline)
+
+    # Compact responses skip the per-result models unless the answer step needs them
+    compact = not request.include_text or wants_msgpack(accept)
+    results = [ChunkResult(**r) for r in raw_results] if not compact or request.generate_answer else []
     logger.info(
-        "Final results: %d chunks for project %d (rerank=%s)",
-        len(results), request.project_id, settings.rerank_enabled,
+        "Final results: %d chunks for projects %s (rerank=%s)",
+        len(raw_results), project_ids, settings.rerank_enabled,
     )
 
-    # Step 4: Optional LLM answer generation (unchanged)
+    # Step 4: Optional LLM answer generation
     # If LLM fails, we still return the search results (just without an answer).
+    # Repeated questions over the same chunks are served from the answer cache.
+    # Running late (or OpenAI chat keeps failing) → skip it and say so.
     answer: str | None = None
     if request.generate_answer and results:
-        try:
-            client = openai.OpenAI(api_key=settings.openai_api_key)
-
-            context = "\n\n".join(
-                [f"[Source: {r.title}]\n{r.text}" for r in results]
-            )
-
-            # --- Prompts (edit here to tune LLM behavior) ---
-            system_prompt = (
-                "You are a helpful assistant that answers questions strictly based on "
-                "the provided context documents.\n\n"
-                "## Rules\n"
-                "- Answer ONLY from the context below. Do not use outside knowledge.\n"
-                "- Cite the source title(s) at the end of your answer, e.g. *Source: Title*.\n"
-                "- If the context does not contain enough information, say so clearly."
-            )
-
-            user_prompt = (
-                f"## Context\n\n{context}\n\n"
-                f"## Question\n\n{request.query}"
-            )
-            # --- End prompts ---
-
-            response = client.chat.completions.create(
-                model=settings.openai_chat_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user",   "content": user_prompt},
-                ],
-            )
-            answer = response.choices[0].message.content
-            logger.info("LLM answer generated successfully")
-        except Exception as e:
-            logger.warning("LLM answer generation failed (returning results without answer): %s", e)
-            answer = None
+        generated = False
+        if budget.allows("answer") and resilience.available("answer"):
+            try:
+                answer = resilience.call("answer", lambda: answer_svc.generate(
+                    project_id=request.project_id,
+                    query=request.query,
+                    results=results,
+                    query_embedding=query_vector,
+                    deadline=deadline,
+                    cacheable=len(project_ids) == 1,
+                ), deadline)
+                generated = True
+            except CircuitOpenError:
+                pass   # breaker opened since available() — skip like below
+            except AnswerGenerationError as e:
+                logger.warning("LLM answer generation failed (returning results without answer): %s", e)
+                generated = True
+        if not generated:
+            logger.warning("Skipping answer generation (latency budget or open circuit)")
+            skipped_stages.append("answer")
+
+    if compact:
+        return encode({
+            "project_id": request.project_id,
+            "query": request.query,
+            "project_ids": project_ids,
+            "results": [compact_result(r, request.include_text) for r in raw_results],
+            "answer": answer,
+            "skipped_stages": skipped_stages,
+        }, accept)
 
     return RetrieveResponse(
         project_id=request.project_id,
         query=request.query,
+        project_ids=project_ids,
         results=results,
         answer=answer,
+        skipped_stages=skipped_stages,
+    )
+
+
+@router.post("/retrieve-document/alpha-sweep", response_model=AlphaSweepResponse)
+def alpha_sweep(
+    request: AlphaSweepRequest,
+    retrieval_svc: RetrievalService = Depends(get_retrieval_service),
+    settings: Settings = Depends(get_settings),
+    timeout_header: str | None = Header(None, alias=TIMEOUT_HEADER),
+) -> AlphaSweepResponse:
+    """
+    Rank one query for a whole grid of alpha values.
+
+    BM25 and vector candidates are fetched once; fusion for every alpha runs
+    locally (no rerank, no answer, no cache). Meant for tuning weaviate_alpha.
+    """
+    logger.info(
+        "POST /retrieve-document/alpha-sweep: project=%d, query='%s', %d alphas",
+        request.project_id, request.query[:80], len(request.alphas),
+    )
+    deadline = Deadline.from_request(None, timeout_header, settings.retrieve_default_timeout_ms)
+    alphas = [max(0.0, min(1.0, a)) for a in request.alphas]
+
+    query_vector = retrieval_svc.embed_query(request.query, deadline=deadline)
+    grid = retrieval_svc.search_alpha_grid(
+        project_id=request.project_id,
+        query=request.query,
+        query_embedding=query_vector,
+        alphas=alphas,
+        top_k=request.top_k,
+        fusion=request.fusion,
+        deadline=deadline,
+        filters=request.filters,
+    )
+
+    return AlphaSweepResponse(
+        project_id=request.project_id,
+        query=request.query,
+        rankings=[
+            AlphaResults(alpha=alpha, results=[ChunkResult(project_id=request.project_id, **r) for r in grid[alpha]])
+            for alpha in alphas
+        ],
     )
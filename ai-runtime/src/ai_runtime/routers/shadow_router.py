@@ -0,0 +1,23 @@
+"""
+Shadow traffic stats (services/shadow_traffic.py).
+
+GET /shadow/stats
+    How the secondary backend (Milvus) compares with Weaviate on the
+    mirrored sample of /retrieve-document queries: latency percentiles of
+    both, top-k overlap and score rank correlation over the recent window,
+    plus mirrored / dropped / failed counters. Per worker.
+"""
+
+from fastapi import APIRouter, Depends
+
+from ai_runtime.models import ShadowStatsResponse
+from ai_runtime.services.shadow_traffic import ShadowTraffic
+from ai_runtime.dependencies import get_shadow_traffic
+
+router = APIRouter(tags=["shadow"])
+
+
+@router.get("/shadow/stats", response_model=ShadowStatsResponse)
+def shadow_stats(shadow: ShadowTraffic = Depends(get_shadow_traffic)) -> ShadowStatsResponse:
+    """Shadow traffic measurements of this worker."""
+    return ShadowStatsResponse(**shadow.stats())
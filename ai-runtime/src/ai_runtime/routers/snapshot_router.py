@@ -0,0 +1,63 @@
+"""
+Knowledge-base snapshot endpoints (services/snapshot_service.py).
+
+POST /snapshots/export
+    Writes every chunk of a project (ids, titles, texts, vectors) from
+    Weaviate or Milvus into a new snapshot. Returns its manifest.
+
+POST /snapshots/import
+    Loads a snapshot into a project (the same or another one, on Weaviate
+    or Milvus) — no embedding calls. Refused when the snapshot was made
+    with another embedding model.
+
+GET /snapshots/{snapshot_id}
+    The snapshot's manifest.
+
+Export and import run in the request (streaming, memory stays flat);
+large projects take minutes, so call them with a generous timeout.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends
+
+from ai_runtime.models import SnapshotExportRequest, SnapshotImportRequest, SnapshotImportResponse, SnapshotResponse
+from ai_runtime.services.snapshot_service import SnapshotService
+from ai_runtime.dependencies import get_snapshot_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["snapshots"])
+
+
+@router.post("/snapshots/export", response_model=SnapshotResponse)
+def export_snapshot(
+    request: SnapshotExportRequest,
+    snapshot_svc: SnapshotService = Depends(get_snapshot_service),
+) -> SnapshotResponse:
+    """Export a project to a new snapshot."""
+    logger.info("POST /snapshots/export: project=%d, backend=%s", request.project_id, request.backend)
+    return SnapshotResponse(**snapshot_svc.export(request.project_id, backend=request.backend))
+
+
+@router.post("/snapshots/import", response_model=SnapshotImportResponse)
+def import_snapshot(
+    request: SnapshotImportRequest,
+    snapshot_svc: SnapshotService = Depends(get_snapshot_service),
+) -> SnapshotImportResponse:
+    """Import a snapshot into a project."""
+    logger.info(
+        "POST /snapshots/import: snapshot=%s, project=%s, backend=%s",
+        request.snapshot_id, request.project_id, request.backend,
+    )
+    result = snapshot_svc.import_snapshot(request.snapshot_id, project_id=request.project_id, backend=request.backend)
+    return SnapshotImportResponse(**result)
+
+
+@router.get("/snapshots/{snapshot_id}", response_model=SnapshotResponse)
+def get_snapshot(
+    snapshot_id: str,
+    snapshot_svc: SnapshotService = Depends(get_snapshot_service),
+) -> SnapshotResponse:
+    """A snapshot's manifest."""
+    return SnapshotResponse(**snapshot_svc.load(snapshot_id))
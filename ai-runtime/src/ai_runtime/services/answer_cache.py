@@ -0,0 +1,130 @@
+"""
+Cache for LLM-generated answers, stored in the shared TieredCache.
+
+Why?
+  Evaluation runs and end-users often ask the same (or nearly the same)
+  question against a knowledge base that hasn't changed. Every repeat would
+  otherwise pay for a full chat completion (~1-5 s, plus tokens).
+
+Cache key:
+  (project_id, chat model, prompt version, sorted (doc_id, chunk_id) pairs)
+
+  The retrieved chunk set is part of the key, so an answer is only reused
+  when the LLM would see exactly the same context. Under one key we keep a
+  few (query, query embedding, answer) entries:
+    - same query text                         → hit
+    - cosine(query embeddings) ≥ threshold    → hit (only if a threshold is configured)
+
+Invalidation:
+  Re-indexing a project calls TieredCache.invalidate_project(), which
+  covers the "answer" namespace (see cache_service.PROJECT_NAMESPACES).
+"""
+
+import base64
+import json
+import logging
+import time
+
+import numpy as np
+
+from ai_runtime.config import Settings
+from ai_runtime.services.cache_service import TieredCache, encode_vector
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "answer"
+
+# Entries kept per key (different phrasings of the same question)
+MAX_ENTRIES_PER_KEY = 8
+
+AnswerCacheKey = tuple[int, str, str, tuple[tuple[int, int], ...]]
+
+
+class AnswerCache:
+    def __init__(self, settings: Settings, cache: TieredCache):
+        self.cache = cache
+        self.ttl_seconds = settings.answer_cache_ttl_seconds
+        self.similarity_threshold = settings.answer_cache_similarity_threshold
+
+    @staticmethod
+    def make_key(
+        project_id: int,
+        model: str,
+        prompt_version: str,
+        chunks: list[tuple[int, int]],
+    ) -> AnswerCacheKey:
+        """Build the cache key from the retrieved (doc_id, chunk_id) pairs."""
+        return (project_id, model, prompt_version, tuple(sorted(chunks)))
+
+    def get(self, key: AnswerCacheKey, query: str, query_embedding: list[float] | None = None) -> str | None:
+        """Return a cached answer for this key + query, or None."""
+        entries = self._load(key)
+        if not entries:
+            return None
+
+        for entry in entries:
+            if entry["query"] == query:
+                return entry["answer"]
+
+        if self.similarity_threshold is None or query_embedding is None:
+            return None
+
+        vector = np.asarray(query_embedding, dtype=np.float32)
+        norm = _norm(vector)
+        for entry in entries:
+            if entry.get("embedding") is None:
+                continue
+            cached = np.frombuffer(base64.b64decode(entry["embedding"]), dtype=np.float32)
+            similarity = _cosine(vector, norm, cached, entry["norm"])
+            if similarity >= self.similarity_threshold:
+                logger.info("Answer cache semantic hit (similarity=%.4f)", similarity)
+                return entry["answer"]
+
+        return None
+
+    def put(self, key: AnswerCacheKey, query: str, answer: str, query_embedding: list[float] | None = None):
+        """Store an answer under the key (read-modify-write of the key's entry list)."""
+        entry = {"query": query, "answer": answer, "created_at": time.time()}
+        if query_embedding is not None:
+            packed = encode_vector(query_embedding)
+            entry["embedding"] = base64.b64encode(packed).decode("ascii")
+            entry["norm"] = _norm(np.frombuffer(packed, dtype=np.float32))
+
+        entries = [e for e in self._load(key) if e["query"] != query]
+        entries.append(entry)
+        entries = entries[-MAX_ENTRIES_PER_KEY:]
+
+        self.cache.set(
+            NAMESPACE, _key_string(key), json.dumps(entries).encode(),
+            project_id=key[0], ttl_seconds=self.ttl_seconds,
+        )
+
+    def generation(self, project_id: int) -> int:
+        """The project's current answer-cache generation (changes on every invalidation)."""
+        return self.cache.generation(NAMESPACE, project_id)
+
+    def invalidate_project(self, project_id: int):
+        """Drop every cached answer for a project."""
+        self.cache.invalidate_project(project_id, namespaces=(NAMESPACE,))
+
+    def _load(self, key: AnswerCacheKey) -> list[dict]:
+        raw = self.cache.get(NAMESPACE, _key_string(key), project_id=key[0])
+        if raw is None:
+            return []
+        now = time.time()
+        return [e for e in json.loads(raw) if now - e["created_at"] < self.ttl_seconds]
+
+
+def _key_string(key: AnswerCacheKey) -> str:
+    _, model, prompt_version, chunks = key
+    return f"{model}|{prompt_version}|" + ",".join(f"{d}:{c}" for d, c in chunks)
+
+
+def _norm(values: np.ndarray) -> float:
+    return float(np.linalg.norm(values))
+
+
+def _cosine(a: np.ndarray, a_norm: float, b: np.ndarray, b_norm: float) -> float:
+    if not a_norm or not b_norm or a.shape != b.shape:
+        return 0.0
+    return float(np.dot(a, b)) / (a_norm * b_norm)
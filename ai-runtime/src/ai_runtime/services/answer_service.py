@@ -0,0 +1,217 @@
+"""
+LLM answer generation service.
+
+Turns the retrieved chunks + the user's question into a final answer
+using an OpenAI chat model. Used by POST /retrieve-document when
+generate_answer=true.
+
+Answers are looked up in / stored to the AnswerCache first, so repeated
+questions against an unchanged knowledge base skip the chat completion.
+Concurrent identical requests share one completion (SingleFlight).
+The chat call's HTTP timeout is the request's remaining Deadline budget.
+
+The context is packed first (services/context_packer.py): overlapping and
+adjacent chunks of a document are merged, near-duplicates dropped and the
+rest cut to answer_context_token_budget.
+"""
+
+import logging
+
+import openai
+
+from ai_runtime import tracing
+from ai_runtime.config import Settings
+from ai_runtime.deadline import Deadline
+from ai_runtime.exceptions import AnswerGenerationError, DeadlineExceededError
+from ai_runtime.models import ChunkResult
+from ai_runtime.services.answer_cache import AnswerCache, AnswerCacheKey
+from ai_runtime.services.context_packer import pack_context
+from ai_runtime.services.rate_limiter import RateLimiter, build_openai_client, estimate_tokens
+from ai_runtime.services.single_flight import SingleFlight
+from ai_runtime.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the prompts below change — it is part of the answer cache key,
+# so answers produced by an older prompt are never served for the new one.
+PROMPT_VERSION = "v2"
+
+# --- Prompts (edit here to tune LLM behavior) ---
+SYSTEM_PROMPT = (
+    "You are a helpful assistant that answers questions strictly based on "
+    "the provided context documents.\n\n"
+    "## Rules\n"
+    "- Answer ONLY from the context below. Do not use outside knowledge.\n"
+    "- Cite the source title(s) at the end of your answer, e.g. *Source: Title*.\n"
+    "- If the context does not contain enough information, say so clearly."
+)
+# --- End prompts ---
+
+
+class AnswerService:
+    def __init__(
+        self,
+        settings: Settings,
+        cache: AnswerCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self.client = build_openai_client(settings.openai_api_key, rate_limiter)
+        self.rate_limiter = rate_limiter
+        self.model = settings.openai_chat_model
+        self.completion_token_estimate = settings.chat_completion_token_estimate
+        self.context_token_budget = settings.answer_context_token_budget
+        self.context_dedup_threshold = settings.context_dedup_threshold
+        self.chunk_overlap = settings.chunk_overlap
+        self.cache = cache
+        self._inflight = SingleFlight("answer")
+
+    def close(self):
+        """Close the OpenAI client's HTTP connection pool."""
+        self.client.close()
+
+    def build_messages(self, query: str, results: list[ChunkResult]) -> list[dict]:
+        """Build the chat messages (system + user) for a question and its packed context chunks."""
+        passages = pack_context(
+            results,
+            token_budget=self.context_token_budget,
+            max_overlap=self.chunk_overlap,
+            dedup_threshold=self.context_dedup_threshold,
+        )
+        context = "\n\n".join(
+            [f"[Source: {p.title}]\n{p.text}" for p in passages]
+        )
+        user_prompt = (
+            f"## Context\n\n{context}\n\n"
+            f"## Question\n\n{query}"
+        )
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user",   "content": user_prompt},
+        ]
+
+    @traced("answer.generate")
+    def generate(
+        self,
+        project_id: int,
+        query: str,
+        results: list[ChunkResult],
+        query_embedding: list[float] | None = None,
+        deadline: Deadline | None = None,
+        cacheable: bool = True,
+    ) -> str | None:
+        """
+        Generate an answer for the query from the given chunks.
+
+        Args:
+            project_id:      used for the cache key and per-project invalidation
+            query:           the user's question
+            results:         chunks to use as context (already searched/reranked)
+            query_embedding: enables semantic cache hits when a similarity threshold is set
+            deadline:        the request's remaining budget (default: none)
+            cacheable:       False for answers over several projects' chunks — the
+                             cache is invalidated per project, so they are not stored
+
+        Raises:
+            AnswerGenerationError: the chat completion failed.
+            DeadlineExceededError: the request's budget ran out.
+        """
+        deadline = deadline or Deadline.none()
+        key = AnswerCache.make_key(
+            project_id, self.model, PROMPT_VERSION,
+            [(r.doc_id, r.chunk_id) for r in results],
+        )
+        try:
+            return self._inflight.do(
+                (key, query, tuple(r.project_id for r in results)),
+                lambda: self._generate(key, query, results, query_embedding, deadline, cacheable),
+                timeout=deadline.remaining(),
+            )
+        except TimeoutError as e:
+            raise DeadlineExceededError("Request deadline exceeded waiting for in-flight answer") from e
+
+    def cache_generation(self, project_id: int) -> int | None:
+        """The project's answer-cache generation, or None without a cache."""
+        if self.cache is None:
+            return None
+        return self.cache.generation(project_id)
+
+    def remember(
+        self,
+        project_id: int,
+        query: str,
+        results: list[ChunkResult],
+        answer: str,
+        generation: int | None = None,
+    ):
+        """
+        Store an answer produced elsewhere (e.g. a batch job) for this query + chunks.
+
+        generation: the cache_generation() seen when the chunks were retrieved.
+        If the project was re-indexed since, the chunk texts behind the same
+        (doc_id, chunk_id) pairs may have changed, so the answer is not stored.
+        """
+        if self.cache is None or not answer:
+            return
+        if generation is not None and self.cache.generation(project_id) != generation:
+            logger.info("Not caching answer for project %d: re-indexed since retrieval", project_id)
+            return
+        key = AnswerCache.make_key(
+            project_id, self.model, PROMPT_VERSION,
+            [(r.doc_id, r.chunk_id) for r in results],
+        )
+        self.cache.put(key, query, answer)
+
+    def _generate(
+        self,
+        key: AnswerCacheKey,
+        query: str,
+        results: list[ChunkResult],
+        query_embedding: list[float] | None,
+        deadline: Deadline,
+        cacheable: bool = True,
+    ) -> str | None:
+        cache = self.cache if cacheable else None
+        if cache is not None:
+            cached = cache.get(key, query, query_embedding)
+            if cached is not None:
+                logger.info("LLM answer served from cache (project=%d)", key[0])
+                tracing.set_attribute("cache.hit", True)
+                return cached
+
+        messages = self.build_messages(query, results)
+
+        def create():
+            kwargs = {}
+            if deadline.bounded:
+                kwargs["timeout"] = deadline.timeout_for("answer generation")
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                **kwargs,
+            )
+
+        try:
+            if self.rate_limiter is not None:
+                estimated = estimate_tokens([m["content"] for m in messages]) + self.completion_token_estimate
+                response = self.rate_limiter.call(
+                    create, estimated_tokens=estimated, description="OpenAI chat", deadline=deadline,
+                )
+            else:
+                response = create()
+            answer = response.choices[0].message.content
+            usage = getattr(response, "usage", None)
+            tracing.set_attribute("openai.prompt_tokens", getattr(usage, "prompt_tokens", None))
+            tracing.set_attribute("openai.completion_tokens", getattr(usage, "completion_tokens", None))
+        except DeadlineExceededError:
+            raise
+        except openai.APITimeoutError as e:
+            if deadline.expired():
+                raise DeadlineExceededError(f"Request deadline exceeded during answer generation: {e}") from e
+            raise AnswerGenerationError(f"Chat completion failed: {e}") from e
+        except Exception as e:
+            raise AnswerGenerationError(f"Chat completion failed: {e}") from e
+
+        logger.info("LLM answer generated successfully")
+        if cache is not None and answer:
+            cache.put(key, query, answer, query_embedding)
+        return answer
@@ -0,0 +1,355 @@
+"""
+Offline batch mode for answer generation (OpenAI Batch API).
+
+Why?
+  Large evaluation runs don't need interactive latency, but every answer
+  sent as a synchronous chat completion counts against the per-minute
+  RPM/TPM quota and is billed at the full rate. The Batch API takes a JSONL
+  file of requests, runs it within a completion window (24h) at half the
+  price, and has its own, much larger quota.
+
+Flow (one job):
+  1. submit(): the retrieved chunks for every case are turned into chat
+     messages (AnswerService.build_messages — the same prompt as the
+     interactive path), written to {work_dir}/{job_id}/input.jsonl and
+     submitted as a batch. A manifest.json next to it records the cases
+     and their retrieved chunks.
+  2. poll(): checks the batch; once it is completed, downloads the output
+     JSONL, joins every answer back to its case by custom_id, stores the
+     answers in the answer cache (so the same question asked interactively
+     later is a cache hit) and records the final state in the manifest.
+     Answers are only cached if the project's answer-cache generation is
+     still the one recorded at submit — after a re-index the same
+     (doc_id, chunk_id) pairs may hold different text.
+
+The manifest is the job's only state, so a job can be polled from any
+worker or after a restart.
+
+Backends (BATCH_BACKEND):
+  - "openai": the real Files + Batches API
+  - "local":  LocalBatchClient, an in-process stand-in that emulates the
+              same file/batch lifecycle (tests, local development)
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Callable
+
+import openai
+
+from ai_runtime.config import Settings
+from ai_runtime.exceptions import BatchJobError, BatchJobNotFoundError
+from ai_runtime.models import ChunkResult
+from ai_runtime.services.answer_service import AnswerService
+
+logger = logging.getLogger(__name__)
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+
+# Batch statuses after which nothing changes any more
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class OpenAIBatchClient:
+    """Thin wrapper over the OpenAI Files + Batches API."""
+
+    def __init__(self, client: openai.OpenAI, completion_window: str = "24h"):
+        self.client = client
+        self.completion_window = completion_window
+
+    def upload(self, path: str) -> str:
+        with open(path, "rb") as f:
+            return self.client.files.create(file=f, purpose="batch").id
+
+    def create_batch(self, input_file_id: str, metadata: dict[str, str]) -> dict:
+        batch = self.client.batches.create(
+            input_file_id=input_file_id,
+            endpoint=CHAT_ENDPOINT,
+            completion_window=self.completion_window,
+            metadata=metadata,
+        )
+        return self._as_dict(batch)
+
+    def retrieve_batch(self, batch_id: str) -> dict:
+        return self._as_dict(self.client.batches.retrieve(batch_id))
+
+    def download(self, file_id: str) -> str:
+        return self.client.files.content(file_id).text
+
+    def close(self):
+        self.client.close()
+
+    @staticmethod
+    def _as_dict(batch) -> dict:
+        return {
+            "id": batch.id,
+            "status": batch.status,
+            "output_file_id": batch.output_file_id,
+            "error_file_id": batch.error_file_id,
+        }
+
+
+class LocalBatchClient:
+    """
+    In-process stand-in for the Batch API: same calls, same JSONL formats.
+
+    The batch "runs" on the first retrieve_batch() after creation: every
+    request line is answered by `complete(body)` (default: a canned answer
+    naming the question), so a test sees validating → completed just like
+    a real poll loop would.
+    """
+
+    def __init__(self, complete: Callable[[dict], str] | None = None):
+        self.complete = complete or self._canned_answer
+        self._files: dict[str, str] = {}
+        self._batches: dict[str, dict] = {}
+
+    @staticmethod
+    def _canned_answer(body: dict) -> str:
+        question = body["messages"][-1]["content"].rsplit("## Question\n\n", 1)[-1]
+        return f"[local batch answer] {question}"
+
+    def upload(self, path: str) -> str:
+        file_id = f"file-local-{uuid.uuid4().hex[:12]}"
+        with open(path, encoding="utf-8") as f:
+            self._files[file_id] = f.read()
+        return file_id
+
+    def create_batch(self, input_file_id: str, metadata: dict[str, str]) -> dict:
+        batch_id = f"batch-local-{uuid.uuid4().hex[:12]}"
+        self._batches[batch_id] = {
+            "id": batch_id,
+            "status": "validating",
+            "input_file_id": input_file_id,
+            "output_file_id": None,
+            "error_file_id": None,
+        }
+        return self._public(self._batches[batch_id])
+
+    def retrieve_batch(self, batch_id: str) -> dict:
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            raise KeyError(f"No such batch: {batch_id}")
+        if batch["status"] == "validating":
+            self._run(batch)
+        return self._public(batch)
+
+    def download(self, file_id: str) -> str:
+        return self._files[file_id]
+
+    def close(self):
+        pass
+
+    def _run(self, batch: dict):
+        lines = []
+        for line in self._files[batch["input_file_id"]].splitlines():
+            request = json.loads(line)
+            try:
+                content = self.complete(request["body"])
+                lines.append({
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {"role": "assistant", "content": content}}]},
+                    },
+                    "error": None,
+                })
+            except Exception as e:
+                lines.append({
+                    "custom_id": request["custom_id"],
+                    "response": None,
+                    "error": {"code": "local_error", "message": str(e)},
+                })
+        output_id = f"file-local-{uuid.uuid4().hex[:12]}"
+        self._files[output_id] = "\n".join(json.dumps(line) for line in lines) + "\n"
+        batch["output_file_id"] = output_id
+        batch["status"] = "completed"
+
+    @staticmethod
+    def _public(batch: dict) -> dict:
+        return {k: batch[k] for k in ("id", "status", "output_file_id", "error_file_id")}
+
+
+BatchClient = OpenAIBatchClient | LocalBatchClient
+
+
+def build_batch_client(settings: Settings) -> BatchClient:
+    """Pick the batch backend from settings.batch_backend."""
+    if settings.batch_backend == "local":
+        return LocalBatchClient()
+    return OpenAIBatchClient(openai.OpenAI(api_key=settings.openai_api_key), settings.batch_completion_window)
+
+
+class BatchAnswerService:
+    def __init__(self, settings: Settings, answer_service: AnswerService, client: BatchClient):
+        self.settings = settings
+        self.answers = answer_service
+        self.client = client
+        self.work_dir = settings.batch_work_dir
+
+    def close(self):
+        self.client.close()
+
+    # ── submit ──
+
+    def submit(self, project_id: int, cases: list[dict]) -> dict:
+        """
+        Submit the answer step for many cases as one batch job.
+
+        Args:
+            cases: [{"custom_id": str, "query": str, "results": list[ChunkResult]}]
+                   (custom_ids must be unique within the job)
+
+        Returns:
+            The job manifest (job_id, batch_id, status, cases, ...).
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = self._job_dir(job_id)
+        os.makedirs(job_dir, exist_ok=True)
+
+        input_path = os.path.join(job_dir, "input.jsonl")
+        requests = 0
+        with open(input_path, "w", encoding="utf-8") as f:
+            for case in cases:
+                if not case["results"]:
+                    continue   # nothing to answer from — recorded as answer=None
+                requests += 1
+                f.write(json.dumps({
+                    "custom_id": case["custom_id"],
+                    "method": "POST",
+                    "url": CHAT_ENDPOINT,
+                    "body": {
+                        "model": self.answers.model,
+                        "messages": self.answers.build_messages(case["query"], case["results"]),
+                    },
+                }) + "\n")
+
+        if requests == 0:
+            # The Batch API rejects empty files — nothing to do, the job is done
+            file_id, batch = None, {"id": None, "status": "completed"}
+        else:
+            try:
+                file_id = self.client.upload(input_path)
+                batch = self.client.create_batch(
+                    file_id, metadata={"job_id": job_id, "project_id": str(project_id)},
+                )
+            except Exception as e:
+                raise BatchJobError(f"Failed to submit batch job {job_id}: {e}") from e
+
+        manifest = {
+            "job_id": job_id,
+            "project_id": project_id,
+            "batch_id": batch["id"],
+            "input_file_id": file_id,
+            "status": batch["status"],
+            "created_at": time.time(),
+            "model": self.answers.model,
+            # Answers are cached at poll time only if the project wasn't re-indexed meanwhile
+            "cache_generation": self.answers.cache_generation(project_id),
+            "cases": [
+                {
+                    "custom_id": case["custom_id"],
+                    "query": case["query"],
+                    "results": [r.model_dump() for r in case["results"]],
+                    "answer": None,
+                    "error": None,
+                }
+                for case in cases
+            ],
+        }
+        self._save(manifest)
+        logger.info(
+            "Submitted batch job %s (batch=%s, %d requests for %d cases, project=%d)",
+            job_id, batch["id"], requests, len(cases), project_id,
+        )
+        return manifest
+
+    # ── poll ──
+
+    def poll(self, job_id: str) -> dict:
+        """
+        Refresh the job's status; when the batch has finished, join the
+        answers back to the cases (once) and return the final manifest.
+
+        Raises:
+            BatchJobNotFoundError: unknown job id.
+            BatchJobError:         the batch API call failed.
+        """
+        manifest = self._load(job_id)
+        if manifest["status"] in TERMINAL_STATUSES:
+            return manifest
+
+        try:
+            batch = self.client.retrieve_batch(manifest["batch_id"])
+        except Exception as e:
+            raise BatchJobError(f"Failed to poll batch job {job_id}: {e}") from e
+
+        manifest["status"] = batch["status"]
+        if batch["status"] in TERMINAL_STATUSES:
+            self._join(manifest, batch)
+        self._save(manifest)
+        return manifest
+
+    def _join(self, manifest: dict, batch: dict):
+        """Attach every output line to its case by custom_id; store answers in the answer cache."""
+        outputs: dict[str, dict] = {}
+        for file_id in (batch.get("output_file_id"), batch.get("error_file_id")):
+            if not file_id:
+                continue
+            for line in self.client.download(file_id).splitlines():
+                if line.strip():
+                    record = json.loads(line)
+                    outputs[record["custom_id"]] = record
+
+        answered = 0
+        for case in manifest["cases"]:
+            if not case["results"]:
+                continue
+            record = outputs.get(case["custom_id"])
+            if record is None:
+                case["error"] = f"no output (batch {batch['status']})"
+                continue
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                case["error"] = json.dumps(record.get("error") or response.get("body"))
+                continue
+            case["answer"] = response["body"]["choices"][0]["message"]["content"]
+            answered += 1
+            self.answers.remember(
+                project_id=manifest["project_id"],
+                query=case["query"],
+                results=[ChunkResult(**r) for r in case["results"]],
+                answer=case["answer"],
+                generation=manifest.get("cache_generation"),
+            )
+
+        manifest["completed_at"] = time.time()
+        logger.info(
+            "Batch job %s finished (%s): %d/%d cases answered",
+            manifest["job_id"], batch["status"], answered, len(manifest["cases"]),
+        )
+
+    # ── manifest storage ──
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.work_dir, job_id)
+
+    def _save(self, manifest: dict):
+        path = os.path.join(self._job_dir(manifest["job_id"]), "manifest.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, path)   # atomic: a concurrent poll never reads half a manifest
+
+    def _load(self, job_id: str) -> dict:
+        if not job_id.isalnum():
+            raise BatchJobNotFoundError(f"Unknown batch job: {job_id}")
+        path = os.path.join(self._job_dir(job_id), "manifest.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise BatchJobNotFoundError(f"Unknown batch job: {job_id}") from None
@@ -0,0 +1,344 @@
+"""
+Two-level cache shared by embeddings, retrievals and answers.
+
+Why two levels?
+  With N uvicorn workers, a per-process cache warms up N times and each
+  worker only sees its own hits. Redis (already in docker-compose) is
+  shared by all workers, but every lookup is a network round trip.
+
+    get(key)
+      → L1: in-process LRU (OrderedDict)       ~microseconds
+      → L2: CacheBackend (Redis or in-memory)  ~sub-millisecond on localhost
+      → miss: caller computes and calls set()
+
+Namespaces and invalidation:
+  Every key lives in a namespace ("emb", "retrieval", "answer") and
+  optionally belongs to a project. Per-project invalidation bumps a
+  generation counter stored in the backend; the generation is part of
+  every key, so old entries simply stop matching and expire by TTL —
+  no key scans. Workers re-read generations at most every
+  cache_generation_check_seconds, so another worker's invalidation is
+  visible after at most that long.
+
+Values are raw bytes. Embedding vectors are stored as packed float32
+(encode_vector / decode_vector) — 6 KB for a 1536-dim vector instead of
+~30 KB of JSON floats.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from ai_runtime.config import Settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "airt"
+
+# Namespaces holding per-project data — invalidated when a project is re-indexed
+PROJECT_NAMESPACES = ("retrieval", "answer")
+
+
+def encode_vector(values) -> bytes:
+    """Pack a vector (list or NumPy array) as little-endian float32 bytes."""
+    return np.asarray(values, dtype="<f4").tobytes()
+
+
+def decode_vector(data: bytes) -> list[float]:
+    """Inverse of encode_vector."""
+    values = array("f")
+    values.frombytes(data)
+    return values.tolist()
+
+
+class CacheBackend:
+    """
+    L2 storage interface. Implementations must be safe to call from
+    several threads, and should treat their own failures as cache misses.
+    """
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def get_with_ttl(self, key: str) -> tuple[bytes | None, float | None]:
+        """(value, seconds until it expires) — None when the backend can't tell."""
+        return self.get(key), None
+
+    def set(self, key: str, value: bytes, ttl_seconds: int):
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer counter, returning the new value."""
+        raise NotImplementedError
+
+    def get_int(self, key: str) -> int:
+        raw = self.get(key)
+        return int(raw) if raw is not None else 0
+
+    def ping(self) -> bool:
+        """Readiness probe."""
+        return True
+
+    def close(self):
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Process-local stand-in for Redis.
+
+    Used in tests and for single-worker dev setups (CACHE_BACKEND=memory).
+    Same semantics as RedisCacheBackend, just not shared across processes.
+
+    Bounded like a Redis with maxmemory-policy=allkeys-lru: at most
+    `max_entries` values (least recently used evicted first), and expired
+    values are swept every `sweep_seconds` instead of waiting to be read.
+    Generation counters are kept apart and never evicted — losing one
+    would make invalidated entries match again.
+    """
+
+    def __init__(self, max_entries: int = 50_000, sweep_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.sweep_seconds = sweep_seconds
+        self._data: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._next_sweep = time.monotonic() + sweep_seconds
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        return self.get_with_ttl(key)[0]
+
+    def get_with_ttl(self, key: str) -> tuple[bytes | None, float | None]:
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is not None:
+                return str(counter).encode(), None
+            item = self._data.get(key)
+            if item is None:
+                return None, None
+            value, expires_at = item
+            now = time.monotonic()
+            if now >= expires_at:
+                del self._data[key]
+                return None, None
+            self._data.move_to_end(key)
+            return value, expires_at - now
+
+    def set(self, key: str, value: bytes, ttl_seconds: int):
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            self._data[key] = (value, now + ttl_seconds)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            new_value = self._counters.get(key, 0) + 1
+            self._counters[key] = new_value   # counters never expire
+            return new_value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _sweep(self, now: float):
+        expired = [key for key, (_, expires_at) in self._data.items() if now >= expires_at]
+        for key in expired:
+            del self._data[key]
+        self._next_sweep = now + self.sweep_seconds
+        if expired:
+            logger.debug("Cache: swept %d expired entries", len(expired))
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis-backed L2, shared by all workers.
+
+    redis-py is imported lazily so deployments using CACHE_BACKEND=memory
+    don't need it installed. Connection errors are logged and treated as
+    misses — a Redis outage makes requests slower, never failing.
+    """
+
+    def __init__(self, url: str, client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self.client = client
+        self.url = url
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self.client.get(key)
+        except Exception as e:
+            logger.warning("Redis GET failed (treating as miss): %s", e)
+            return None
+
+    def get_with_ttl(self, key: str) -> tuple[bytes | None, float | None]:
+        """GET + PTTL in one round trip."""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            value, pttl = pipe.execute()
+        except Exception as e:
+            logger.warning("Redis GET failed (treating as miss): %s", e)
+            return None, None
+        # PTTL: -1 no expiry, -2 key gone since the GET
+        return value, (pttl / 1000 if pttl is not None and pttl > 0 else None)
+
+    def set(self, key: str, value: bytes, ttl_seconds: int):
+        try:
+            self.client.set(key, value, ex=ttl_seconds)
+        except Exception as e:
+            logger.warning("Redis SET failed (value not cached): %s", e)
+
+    def incr(self, key: str) -> int:
+        try:
+            return int(self.client.incr(key))
+        except Exception as e:
+            logger.warning("Redis INCR failed (invalidation is local only): %s", e)
+            return -1
+
+    def ping(self) -> bool:
+        try:
+            return bool(self.client.ping())
+        except Exception as e:
+            logger.warning("Redis readiness check failed: %s", e)
+            return False
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception as e:
+            logger.warning("Error closing Redis client: %s", e)
+
+
+class TieredCache:
+    def __init__(self, backend: CacheBackend, settings: Settings):
+        self.backend = backend
+        self.local_max_entries = settings.cache_local_max_entries
+        self.default_ttl = settings.cache_ttl_seconds
+        self.generation_check_seconds = settings.cache_generation_check_seconds
+
+        self._local: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._generations: dict[tuple[str, int], tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    # ── public API ─────────────────────────────────────────────
+
+    def get(self, namespace: str, key: str, project_id: int | None = None) -> bytes | None:
+        full_key = self._full_key(namespace, key, project_id)
+        now = time.monotonic()
+
+        with self._lock:
+            item = self._local.get(full_key)
+            if item is not None:
+                value, expires_at = item
+                if now < expires_at:
+                    self._local.move_to_end(full_key)
+                    return value
+                del self._local[full_key]
+
+        value, remaining = self.backend.get_with_ttl(full_key)
+        if value is not None:
+            # TTL on the backend is authoritative: the local copy never outlives
+            # the L2 entry (entries set with a short ttl_seconds stay short)
+            ttl = self.default_ttl if remaining is None else min(remaining, self.default_ttl)
+            self._set_local(full_key, value, ttl)
+        return value
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: bytes,
+        project_id: int | None = None,
+        ttl_seconds: int | None = None,
+    ):
+        ttl = ttl_seconds or self.default_ttl
+        full_key = self._full_key(namespace, key, project_id)
+        self._set_local(full_key, value, ttl)
+        self.backend.set(full_key, value, ttl)
+
+    def invalidate_project(self, project_id: int, namespaces: tuple[str, ...] = PROJECT_NAMESPACES):
+        """
+        Invalidate all entries of a project in the given namespaces
+        (default: every per-project namespace). Visible immediately in this
+        worker, and in other workers within cache_generation_check_seconds.
+        """
+        for namespace in namespaces:
+            gen_key = self._generation_key(namespace, project_id)
+            new_gen = self.backend.incr(gen_key)
+            with self._lock:
+                current, _ = self._generations.get((namespace, project_id), (0, 0.0))
+                # Backend failure (-1): still move on locally so this worker never serves stale data
+                self._generations[(namespace, project_id)] = (
+                    new_gen if new_gen > current else current + 1,
+                    time.monotonic(),
+                )
+        logger.info("Cache: invalidated project %d in namespaces %s", project_id, ", ".join(namespaces))
+
+    def generation(self, namespace: str, project_id: int) -> int:
+        """Current invalidation generation of a project's namespace (bumped by invalidate_project)."""
+        return self._generation(namespace, project_id)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+            self._generations.clear()
+
+    def close(self):
+        self.clear_local()
+        self.backend.close()
+
+    # ── internals ──────────────────────────────────────────────
+
+    def _set_local(self, full_key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._local[full_key] = (value, time.monotonic() + ttl)
+            self._local.move_to_end(full_key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def _generation_key(self, namespace: str, project_id: int) -> str:
+        return f"{KEY_PREFIX}:gen:{namespace}:p{project_id}"
+
+    def _generation(self, namespace: str, project_id: int) -> int:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._generations.get((namespace, project_id))
+            if cached is not None and now - cached[1] < self.generation_check_seconds:
+                return cached[0]
+
+        generation = self.backend.get_int(self._generation_key(namespace, project_id))
+        with self._lock:
+            if cached is not None and cached[0] > generation:
+                generation = cached[0]   # local bump not yet reflected in the backend
+            self._generations[(namespace, project_id)] = (generation, now)
+        return generation
+
+    def _full_key(self, namespace: str, key: str, project_id: int | None) -> str:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        if project_id is None:
+            return f"{KEY_PREFIX}:{namespace}:{digest}"
+        generation = self._generation(namespace, project_id)
+        return f"{KEY_PREFIX}:{namespace}:p{project_id}:g{generation}:{digest}"
+
+
+def build_cache(settings: Settings) -> TieredCache:
+    """Create the TieredCache with the backend selected by CACHE_BACKEND."""
+    if settings.cache_backend == "redis":
+        logger.info("Cache: in-process LRU in front of Redis at %s", settings.redis_url)
+        backend: CacheBackend = RedisCacheBackend(settings.redis_url)
+    else:
+        logger.info("Cache: in-process LRU in front of in-memory backend (not shared across workers)")
+        backend = InMemoryCacheBackend(settings.cache_memory_max_entries, settings.cache_memory_sweep_seconds)
+    return TieredCache(backend, settings)
@@ -0,0 +1,140 @@
+"""
+Context packing: turn retrieved chunks into a compact LLM context.
+
+Why?
+  Chunks are cut with chunk_overlap characters of overlap, and the top
+  results often include neighbouring chunks of the same document — joined
+  as-is, the prompt repeats the overlapping text, and boilerplate that
+  appears in many documents (headers, disclaimers) shows up several times.
+  That costs prompt tokens and chat latency without adding information.
+
+Steps:
+  1. group results by document (project_id, doc_id)
+  2. within a document, merge runs of consecutive chunk_ids into one
+     passage, cutting the text the next chunk repeats from the previous one
+  3. drop passages that are (near-)duplicates of a better-ranked passage
+     (word-shingle Jaccard similarity ≥ context_dedup_threshold)
+  4. fill the token budget in rank order (a passage ranks as its best chunk)
+
+Every passage keeps its document title and chunk ids, so citations
+("Source: Title") survive packing.
+"""
+
+import re
+
+from ai_runtime.models import ChunkResult
+from ai_runtime.services.rate_limiter import CHARS_PER_TOKEN, estimate_tokens
+
+SHINGLE_WORDS = 3
+
+# Shorter suffix/prefix matches are treated as coincidence, not chunk overlap
+# (e.g. one chunk ending and the next starting with "the").
+MIN_OVERLAP_CHARS = 10
+
+
+class Passage:
+    """One or more consecutive chunks of a document, merged."""
+
+    def __init__(self, chunk: ChunkResult, rank: int):
+        self.project_id = chunk.project_id
+        self.doc_id = chunk.doc_id
+        self.title = chunk.title
+        self.chunk_ids = [chunk.chunk_id]
+        self.text = chunk.text
+        self.rank = rank   # best (lowest) rank of its chunks in the retrieved list
+
+    def append(self, chunk: ChunkResult, rank: int, max_overlap: int):
+        overlap = overlap_length(self.text, chunk.text, max_overlap)
+        if overlap:
+            self.text += chunk.text[overlap:]
+        else:
+            self.text += "\n" + chunk.text
+        self.chunk_ids.append(chunk.chunk_id)
+        self.rank = min(self.rank, rank)
+
+
+def overlap_length(previous: str, current: str, max_overlap: int) -> int:
+    """Length of the longest suffix of `previous` that `current` starts with (≤ max_overlap), or 0."""
+    for length in range(min(len(previous), len(current), max_overlap), MIN_OVERLAP_CHARS - 1, -1):
+        if previous.endswith(current[:length]):
+            return length
+    return 0
+
+
+def _shingles(text: str) -> set[tuple[str, ...]]:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {tuple(words)}
+    return {tuple(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def _similarity(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def merge_adjacent(results: list[ChunkResult], max_overlap: int) -> list[Passage]:
+    """Group by document and merge consecutive chunk_id runs; passages in rank order."""
+    by_doc: dict[tuple, list[tuple[int, ChunkResult]]] = {}
+    for rank, chunk in enumerate(results):
+        by_doc.setdefault((chunk.project_id, chunk.doc_id), []).append((rank, chunk))
+
+    passages: list[Passage] = []
+    for chunks in by_doc.values():
+        chunks.sort(key=lambda item: item[1].chunk_id)
+        current: Passage | None = None
+        for rank, chunk in chunks:
+            if current is not None and chunk.chunk_id == current.chunk_ids[-1]:
+                current.rank = min(current.rank, rank)   # same chunk retrieved twice
+            elif current is not None and chunk.chunk_id == current.chunk_ids[-1] + 1:
+                current.append(chunk, rank, max_overlap)
+            else:
+                current = Passage(chunk, rank)
+                passages.append(current)
+
+    passages.sort(key=lambda p: p.rank)
+    return passages
+
+
+def drop_near_duplicates(passages: list[Passage], threshold: float) -> list[Passage]:
+    """Keep a passage only if it isn't ≥ threshold similar to a better-ranked kept one."""
+    kept: list[tuple[Passage, set]] = []
+    for passage in passages:
+        shingles = _shingles(passage.text)
+        if any(_similarity(shingles, other) >= threshold for _, other in kept):
+            continue
+        kept.append((passage, shingles))
+    return [passage for passage, _ in kept]
+
+
+def fit_budget(passages: list[Passage], token_budget: int) -> list[Passage]:
+    """
+    Take passages in rank order while they fit into the token budget (a
+    passage that doesn't fit is skipped; smaller ones after it may still
+    fit). If even the best passage is too long, it is truncated.
+    """
+    packed: list[Passage] = []
+    used = 0
+    for passage in passages:
+        tokens = estimate_tokens([passage.text])
+        if used + tokens <= token_budget:
+            packed.append(passage)
+            used += tokens
+    if not packed and passages:
+        best = passages[0]
+        best.text = best.text[: token_budget * CHARS_PER_TOKEN]
+        packed.append(best)
+    return packed
+
+
+def pack_context(
+    results: list[ChunkResult],
+    token_budget: int,
+    max_overlap: int,
+    dedup_threshold: float,
+) -> list[Passage]:
+    """Merge, de-duplicate and budget the retrieved chunks (see module docstring)."""
+    passages = merge_adjacent(results, max_overlap)
+    passages = drop_near_duplicates(passages, dedup_threshold)
+    return fit_budget(passages, token_budget)
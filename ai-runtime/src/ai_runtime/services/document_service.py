@@ -4,6 +4,16 @@ Document processing service.
 Orchestrates the full indexing pipeline:
   Markdown text → split into chunks → generate embeddings → store in Weaviate
 
+Two entry points:
+  - process_document(): the whole document arrives as one string (POST /index-document)
+  - open_stream():      the document arrives in pieces (POST /index-document/stream);
+                        chunks are embedded and stored in fixed-size windows so
+                        memory stays flat regardless of document size
+
+A project rebuilt with its own chunk_size / chunk_overlap (see
+services/rebuild_service.py) keeps that chunking for every document
+indexed afterwards: the splitter is picked per project from its route.
+
 # MILVUS (dead code — kept for rollback):
 # MilvusService parameter is still accepted in __init__ and stored as self.milvus,
 # but insert_chunks and delete_by_doc_id are no longer called.
@@ -11,22 +21,38 @@ Orchestrates the full indexing pipeline:
 """
 
 import logging
+from typing import TYPE_CHECKING
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from ai_runtime import tracing
 from ai_runtime.config import Settings
-from ai_runtime.services.milvus_service import MilvusService
 from ai_runtime.services.weaviate_service import WeaviateService
 from ai_runtime.services.embedding_service import EmbeddingService
 from ai_runtime.exceptions import DocumentProcessingError, AIRuntimeError
+from ai_runtime.tracing import traced
+
+if TYPE_CHECKING:
+    from ai_runtime.services.milvus_service import MilvusService   # pymilvus: not imported at runtime
 
 logger = logging.getLogger(__name__)
 
 
+def make_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    # NOTE:
+    # separators define where to split the document. starting from ##: markdown second headline.
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n## ", "\n### ", "\n\n", "\n", " ", ""],
+        add_start_index=True,   # chunk offsets: stored as char_start, and the streaming indexer cuts its buffer there
+    )
+
+
 class DocumentService:
     def __init__(
         self,
-        milvus_service: MilvusService | None,   # None = Milvus phased out
+        milvus_service: "MilvusService | None",   # None = Milvus phased out
         weaviate_service: WeaviateService,
         embedding_service: EmbeddingService,
         settings: Settings,
@@ -34,15 +60,24 @@ class DocumentService:
         self.milvus = milvus_service   # dead code — kept for rollback, currently None
         self.weaviate = weaviate_service
         self.embedding = embedding_service
+        self.window_chunks = settings.ingest_window_chunks
+        self.chunk_size = settings.chunk_size
+        self.chunk_overlap = settings.chunk_overlap
+        self.splitter = make_splitter(settings.chunk_size, settings.chunk_overlap)
+        self._splitters = {(settings.chunk_size, settings.chunk_overlap): self.splitter}
 
-        # NOTE:
-        # separators define where to split the document. starting from ##: markdown second headline.
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=settings.chunk_size,
-            chunk_overlap=settings.chunk_overlap,
-            separators=["\n## ", "\n### ", "\n\n", "\n", " ", ""],
-        )
+    def splitter_for(self, project_id: int) -> tuple[RecursiveCharacterTextSplitter, int]:
+        """The project's splitter and its chunk_size (a rebuilt project keeps its own chunking)."""
+        route = self.weaviate.project_route(project_id)
+        if route is None or route.chunk_size is None:
+            return self.splitter, self.chunk_size
+        key = (route.chunk_size, route.chunk_overlap if route.chunk_overlap is not None else self.chunk_overlap)
+        splitter = self._splitters.get(key)
+        if splitter is None:
+            splitter = self._splitters[key] = make_splitter(*key)
+        return splitter, key[0]
 
+    @traced("document.process_document")
     def process_document(
         self,
         project_id: int,
@@ -68,15 +103,17 @@ class DocumentService:
         )
 
         try:
-            # Step 1: Split
-            chunks = self.splitter.split_text(content)
+            # Step 1: Split (keeping each chunk's character offset in the document)
+            splitter, _ = self.splitter_for(project_id)
+            documents = splitter.create_documents([content])
+            chunks = [d.page_content for d in documents]
             if not chunks:
                 logger.warning("No chunks produced for doc_id=%d (content may be empty)", doc_id)
                 return 0
             logger.info("Split into %d chunks", len(chunks))
 
-            # Step 2: Embed
-            embeddings = self.embedding.embed_texts(chunks)
+            # Step 2: Embed (one float32 matrix, passed through to Weaviate as-is)
+            embeddings = self.embedding.embed_texts(chunks, use_cache=False)
 
             doc_ids = [doc_id] * len(chunks)
             chunk_ids = list(range(len(chunks)))
@@ -97,6 +134,7 @@ class DocumentService:
                 titles=titles,
                 texts=chunks,
                 embeddings=embeddings,
+                char_starts=[d.metadata["start_index"] for d in documents],
             )
             logger.info("Weaviate insert complete: %d chunks", len(chunks))
 
@@ -116,9 +154,206 @@ class DocumentService:
                 f"Failed to process document {doc_id} in project {project_id}: {e}"
             ) from e
 
-    def delete_document(self, project_id: int, doc_id: int):
-        """Remove all chunks for a document from Weaviate."""
+    def open_stream(self, project_id: int, doc_id: int, title: str) -> "StreamingIndexer":
+        """
+        Start a streaming indexing session for one document.
+
+        Usage:
+            indexer = doc_service.open_stream(project_id, doc_id, title)
+            for piece in pieces:
+                indexer.feed(piece)
+            chunks_count = indexer.finish()
+        """
+        logger.info(
+            "Opening indexing stream: project=%d, doc_id=%d, title='%s', window=%d chunks",
+            project_id, doc_id, title, self.window_chunks,
+        )
+        return StreamingIndexer(self, project_id, doc_id, title)
+
+    @traced("document.delete_document")
+    def delete_document(self, project_id: int, doc_id: int) -> int:
+        """Remove all chunks for a document from Weaviate. Returns the number of chunks deleted."""
         logger.info("Deleting document: project=%d, doc_id=%d", project_id, doc_id)
         # MILVUS (dead code — kept for rollback):
         # self.milvus.delete_by_doc_id(project_id, doc_id)
-        self.weaviate.delete_by_doc_id(project_id, doc_id)
+        return self.weaviate.delete_by_doc_id(project_id, doc_id)
+
+    @traced("document.delete_documents")
+    def delete_documents(self, project_id: int, doc_ids: list[int]) -> int:
+        """Remove all chunks of several documents in one filtered delete. Returns the chunks deleted."""
+        logger.info("Deleting %d documents from project %d", len(doc_ids), project_id)
+        return self.weaviate.delete_documents(project_id, doc_ids)
+
+    @traced("document.delete_project")
+    def delete_project(self, project_id: int) -> bool:
+        """Remove a project's whole knowledge base (drops its collection). False if it had none."""
+        logger.info("Deleting project %d", project_id)
+        return self.weaviate.delete_project(project_id)
+
+
+class StreamingIndexer:
+    """
+    Incremental chunk → embed → store pipeline for one document.
+
+    Text is buffered until there is roughly one window's worth of characters,
+    then the buffer is split. Every chunk except the last is final; the last
+    one may continue in the next piece, so the raw text from its start offset
+    is carried over and re-split together with the next piece.
+
+    Finished chunks are embedded and inserted once `window_chunks` of them are
+    pending, so at any time we hold at most:
+      - ~window_chunks * chunk_size characters of buffered text
+      - window_chunks chunks and their embeddings
+
+    Chunk ids are deterministic, so re-indexing a document overwrites its
+    previous version in place: finish() then drops the previous version's
+    trailing chunks (chunk_id >= the new count). If the stream fails after
+    windows were written, abort() deletes the chunk ids this stream wrote
+    rather than leave a partial document searchable; chunks it never
+    reached are left alone.
+    """
+
+    def __init__(self, doc_service: DocumentService, project_id: int, doc_id: int, title: str):
+        self.doc_service = doc_service
+        self.project_id = project_id
+        self.doc_id = doc_id
+        self.title = title
+
+        self._buffer = ""
+        self._buffer_offset = 0   # document offset of self._buffer[0]
+        self._pending: list[tuple[str, int]] = []   # (chunk text, char_start)
+        self._next_chunk_id = 0
+        self._splitter, chunk_size = doc_service.splitter_for(project_id)
+        self._split_threshold = doc_service.window_chunks * chunk_size
+        self._finished = False
+        self._written = 0   # chunk ids below this may have been written by this stream
+
+    @property
+    def chunks_count(self) -> int:
+        """Number of chunks stored so far."""
+        return self._next_chunk_id
+
+    def feed(self, text: str):
+        """Append the next piece of document text."""
+        if self._finished:
+            raise DocumentProcessingError(f"Indexing stream for document {self.doc_id} is already finished")
+        if not text:
+            return
+
+        self._buffer += text
+        if len(self._buffer) < self._split_threshold:
+            return
+
+        self._guarded(self._split_buffer, final=False)
+
+    def finish(self) -> int:
+        """
+        Flush the remaining text and return the total number of chunks stored.
+        """
+        if self._finished:
+            return self._next_chunk_id
+
+        self._guarded(self._split_buffer, final=True)
+        self._guarded(self._remove_stale_chunks)
+        self._finished = True
+
+        if self._next_chunk_id == 0:
+            logger.warning("No chunks produced for doc_id=%d (content may be empty)", self.doc_id)
+        logger.info(
+            "Streaming indexing complete: doc_id=%d, %d chunks stored", self.doc_id, self._next_chunk_id,
+        )
+        return self._next_chunk_id
+
+    def abort(self):
+        """
+        End the stream after a failure: delete the chunk ids this stream
+        already wrote, so no partial document stays searchable. Idempotent,
+        and never raises — a failed cleanup is logged, the original error wins.
+        """
+        self._finished = True
+        if not self._written:
+            return
+        written, self._written = self._written, 0
+        try:
+            deleted = self.doc_service.weaviate.delete_chunk_range(self.project_id, self.doc_id, 0, written)
+            logger.warning(
+                "Indexing stream for doc_id=%d in project %d failed: removed %d partially stored chunks",
+                self.doc_id, self.project_id, deleted,
+            )
+        except Exception as e:
+            logger.error(
+                "Could not remove partially stored doc_id=%d in project %d: %s",
+                self.doc_id, self.project_id, e, exc_info=True,
+            )
+
+    def _split_buffer(self, final: bool):
+        documents = self._splitter.create_documents([self._buffer])
+        offset = self._buffer_offset
+
+        def located(docs) -> list[tuple[str, int]]:
+            return [(d.page_content, offset + d.metadata["start_index"]) for d in docs]
+
+        if final:
+            self._buffer = ""
+            self._pending.extend(located(documents))
+        elif len(documents) > 1:
+            # Keep the (possibly incomplete) last chunk as raw text for the next round
+            carry_from = documents[-1].metadata["start_index"]
+            self._buffer = self._buffer[carry_from:]
+            self._buffer_offset += carry_from
+            self._pending.extend(located(documents[:-1]))
+
+        window = self.doc_service.window_chunks
+        while len(self._pending) >= window or (final and self._pending):
+            batch, self._pending = self._pending[:window], self._pending[window:]
+            self._store(batch)
+
+    def _store(self, window: list[tuple[str, int]]):
+        """Embed and insert one window of chunks with consecutive chunk_ids."""
+        chunks = [text for text, _ in window]
+        first_id = self._next_chunk_id
+        with tracing.span("document.stream_store", project_id=self.project_id, doc_id=self.doc_id, **{"chunks.count": len(chunks)}):
+            embeddings = self.doc_service.embedding.embed_texts(chunks, use_cache=False)
+            self._written = first_id + len(chunks)
+            self.doc_service.weaviate.insert_chunks(
+                project_id=self.project_id,
+                doc_ids=[self.doc_id] * len(chunks),
+                chunk_ids=list(range(first_id, first_id + len(chunks))),
+                titles=[self.title] * len(chunks),
+                texts=chunks,
+                embeddings=embeddings,
+                char_starts=[start for _, start in window],
+            )
+        self._next_chunk_id += len(chunks)
+        logger.info(
+            "Stored window of %d chunks for doc_id=%d (total so far: %d)",
+            len(chunks), self.doc_id, self._next_chunk_id,
+        )
+
+    def _remove_stale_chunks(self):
+        """Drop chunks of a previous, longer version of the document (chunk_id >= the new count)."""
+        removed = self.doc_service.weaviate.delete_chunk_range(self.project_id, self.doc_id, self._next_chunk_id)
+        if removed:
+            logger.info(
+                "Removed %d stale chunks of the previous version of doc_id=%d", removed, self.doc_id,
+            )
+
+    def _guarded(self, step, **kwargs):
+        """
+        Same error contract as process_document: AIRuntimeError passes through,
+        the rest is wrapped. Either way the partially stored document is removed.
+        """
+        try:
+            step(**kwargs)
+        except AIRuntimeError:
+            self.abort()
+            raise
+        except Exception as e:
+            self.abort()
+            logger.error(
+                "Unexpected error streaming doc_id=%d in project %d: %s",
+                self.doc_id, self.project_id, e, exc_info=True,
+            )
+            raise DocumentProcessingError(
+                f"Failed to process document {self.doc_id} in project {self.project_id}: {e}"
+            ) from e
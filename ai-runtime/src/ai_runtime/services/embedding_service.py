@@ -4,46 +4,169 @@ OpenAI embedding service.
 Converts text into numerical vectors (embeddings) using OpenAI's API.
 These vectors capture the "meaning" of the text — similar texts produce
 similar vectors, which enables semantic search in Milvus.
+
+Embeddings are deterministic for a given (model, text), so query
+embeddings are cached in the shared TieredCache ("emb" namespace, packed
+float32) and repeated queries skip the OpenAI call entirely. The indexing
+path passes use_cache=False: chunk texts are practically never requested
+twice, and caching every indexed chunk would grow the cache with the corpus.
+
+Vectors are requested base64-encoded (encoding_format="base64") and decoded
+straight into one contiguous float32 NumPy matrix per call: 6 KB per
+1536-dim vector instead of 1536 boxed Python floats (~50 KB), and nothing
+for the GC to track. The indexing path keeps the matrix as-is until the
+Weaviate client serializes it; query embeddings are converted to a plain
+list (one small vector per request).
 """
 
+import base64
 import logging
 
+import numpy as np
 import openai
 
+from ai_runtime import tracing
 from ai_runtime.config import Settings
-from ai_runtime.exceptions import EmbeddingError
+from ai_runtime.deadline import Deadline
+from ai_runtime.exceptions import DeadlineExceededError, EmbeddingError
+from ai_runtime.services.cache_service import TieredCache, encode_vector
+from ai_runtime.services.rate_limiter import RateLimiter, build_openai_client, estimate_tokens
+from ai_runtime.services.single_flight import SingleFlight
+from ai_runtime.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+CACHE_NAMESPACE = "emb"
+
+
+def decode_embeddings(data) -> np.ndarray:
+    """
+    Decode the `data` items of an embeddings response into a (n, dim)
+    float32 matrix: base64 payloads are joined and viewed in one go (plain
+    float lists, e.g. from a proxy that ignores encoding_format, still work).
+    """
+    if data and isinstance(data[0].embedding, str):
+        raw = b"".join(base64.b64decode(item.embedding) for item in data)
+        return np.frombuffer(raw, dtype="<f4").reshape(len(data), -1)
+    return np.array([item.embedding for item in data], dtype=np.float32)
+
 
 class EmbeddingService:
-    def __init__(self, settings: Settings):
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+    def __init__(
+        self,
+        settings: Settings,
+        cache: TieredCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self.client = build_openai_client(settings.openai_api_key, rate_limiter)
+        self.rate_limiter = rate_limiter
         self.model = settings.openai_embedding_model
+        self.cache = cache
+        self.cache_ttl_seconds = settings.embedding_cache_ttl_seconds
+        self._inflight = SingleFlight("embedding")
+
+    def is_ready(self) -> bool:
+        """
+        Readiness probe: True if OpenAI is reachable and the key can see the model.
+        models.retrieve is free (no tokens), so it is safe to call from probes.
+        """
+        try:
+            self.client.models.retrieve(self.model, timeout=5)
+            return True
+        except Exception as e:
+            logger.warning("OpenAI readiness check failed: %s", e)
+            return False
 
-    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+    def close(self):
+        """Close the OpenAI client's HTTP connection pool."""
+        self.client.close()
+
+    @traced("embedding.embed_texts")
+    def embed_texts(
+        self, texts: list[str], deadline: Deadline | None = None, use_cache: bool = True,
+    ) -> np.ndarray:
         """
         Convert a list of texts into embedding vectors.
 
         Args:
             texts: e.g. ["chunk 1 text", "chunk 2 text", "chunk 3 text"]
+            use_cache: False to neither read nor fill the embedding cache (indexing)
 
         Returns:
-            A list of vectors, one per text.
-            Each vector is a list of 1536 floats.
-            e.g. [[0.12, 0.85, ...], [0.34, 0.21, ...], [0.56, 0.78, ...]]
+            A float32 array of shape (len(texts), 1536), one row per text.
         """
         if not texts:
-            return []
+            return np.empty((0, 0), dtype=np.float32)
+        if self.cache is None or not use_cache:
+            return self._embed_uncached(texts, deadline)
+
+        vectors: list[np.ndarray | None] = [None] * len(texts)
+        missing: list[int] = []
+        for i, text in enumerate(texts):
+            cached = self.cache.get(CACHE_NAMESPACE, f"{self.model}|{text}")
+            if cached is not None:
+                vectors[i] = np.frombuffer(cached, dtype="<f4")   # encode_vector layout
+            else:
+                missing.append(i)
+
+        tracing.set_attribute("cache.hits", len(texts) - len(missing))
+        if not missing:
+            return np.vstack(vectors)
+
+        logger.info("Embedding cache: %d hits, %d misses", len(texts) - len(missing), len(missing))
+        fresh = self._embed_uncached([texts[i] for i in missing], deadline)
+        if len(missing) == len(texts):
+            matrix = fresh
+        else:
+            matrix = np.empty((len(texts), fresh.shape[1]), dtype=np.float32)
+            for i, vector in enumerate(vectors):
+                if vector is not None:
+                    matrix[i] = vector
+            matrix[missing] = fresh
+        for i, vector in zip(missing, fresh):
+            self.cache.set(
+                CACHE_NAMESPACE, f"{self.model}|{texts[i]}", encode_vector(vector),
+                ttl_seconds=self.cache_ttl_seconds,
+            )
+        return matrix
 
-        try:
-            logger.info("Embedding %d texts with model=%s", len(texts), self.model)
-            response = self.client.embeddings.create(
+    def _embed_uncached(self, texts: list[str], deadline: Deadline | None = None) -> np.ndarray:
+        """Call the OpenAI embeddings API for all texts (no cache)."""
+        deadline = deadline or Deadline.none()
+
+        def create():
+            kwargs = {}
+            if deadline.bounded:
+                kwargs["timeout"] = deadline.timeout_for("embedding")
+            return self.client.embeddings.create(
                 model=self.model,
                 input=texts,
+                encoding_format="base64",
+                **kwargs,
             )
+
+        try:
+            logger.info("Embedding %d texts with model=%s", len(texts), self.model)
+            if self.rate_limiter is not None:
+                response = self.rate_limiter.call(
+                    create, estimated_tokens=estimate_tokens(texts),
+                    description="OpenAI embeddings", deadline=deadline,
+                )
+            else:
+                response = create()
             logger.info("Embedding complete: %d vectors returned", len(response.data))
-            return [item.embedding for item in response.data]
+            usage = getattr(response, "usage", None)
+            tracing.set_attribute("openai.total_tokens", getattr(usage, "total_tokens", None))
+            return decode_embeddings(response.data)
+
+        except DeadlineExceededError:
+            raise
+
+        except openai.APITimeoutError as e:
+            if deadline.expired():
+                raise DeadlineExceededError(f"Request deadline exceeded during embedding: {e}") from e
+            logger.error("OpenAI embedding request timed out: %s", e)
+            raise EmbeddingError(f"OpenAI API error: {e}") from e
 
         except openai.AuthenticationError as e:
             logger.error("OpenAI authentication failed: %s", e)
@@ -61,9 +184,20 @@ class EmbeddingService:
             logger.error("Unexpected error during embedding: %s", e, exc_info=True)
             raise EmbeddingError(f"Failed to generate embeddings: {e}") from e
 
-    def embed_single(self, text: str) -> list[float]:
+    @traced("embedding.embed_single")
+    def embed_single(self, text: str, deadline: Deadline | None = None) -> list[float]:
         """
-        Convert a single text into an embedding vector.
+        Convert a single text into an embedding vector (as a list of floats).
         Convenience wrapper around embed_texts for search queries.
+
+        Concurrent calls for the same text share one API call.
         """
-        return self.embed_texts([text])[0]
+        deadline = deadline or Deadline.none()
+        try:
+            return self._inflight.do(
+                (self.model, text),
+                lambda: self.embed_texts([text], deadline)[0].tolist(),
+                timeout=deadline.remaining(),
+            )
+        except TimeoutError as e:
+            raise DeadlineExceededError("Request deadline exceeded waiting for query embedding") from e
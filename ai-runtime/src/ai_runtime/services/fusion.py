@@ -0,0 +1,146 @@
+"""
+Rank and score fusion, done locally.
+
+1. merge_ranked_lists: merge several ranked result lists into one.
+
+Used by federated search (one hybrid search per project, merged into a
+single top-k). Scores from different projects are not directly comparable
+— Weaviate's hybrid score is normalized per query, i.e. per project — so
+lists are merged by rank (RRF) or by per-list min-max normalized score.
+
+  - "rrf":   score = Σ 1 / (k + rank)   (Reciprocal Rank Fusion, k=60 by default)
+             robust, ignores score scale entirely
+  - "score": score = (s - min) / (max - min) within each list
+             keeps "how much better" information, sensitive to outliers
+
+Results are dicts as returned by RetrievalService.search; a merged result
+keeps its fields and gets the fused value as its "score".
+
+2. fuse_alpha_grid: hybrid (BM25 + vector) fusion for many alpha values at once.
+
+Tuning alpha with Weaviate's server-side hybrid search costs one query per
+alpha per question. Instead, WeaviateService.fetch_candidates returns the
+BM25 and vector candidates once with their raw scores, and the fusion runs
+here as numpy array operations — a (n_alphas × n_candidates) matrix in one
+shot:
+  - "relative_score": min-max normalize each modality over its hits
+                      (misses count 0), then alpha·vector + (1-alpha)·bm25
+                      — the same formula as Weaviate's RELATIVE_SCORE fusion
+  - "rrf":            alpha/(k + vector rank) + (1-alpha)/(k + bm25 rank)
+"""
+
+from typing import Literal
+
+import numpy as np
+
+FusionMethod = Literal["rrf", "score"]
+AlphaFusionMethod = Literal["relative_score", "rrf"]
+
+DEFAULT_RRF_K = 60
+
+
+def _identity(result: dict) -> tuple:
+    return (result.get("project_id"), result["doc_id"], result["chunk_id"])
+
+
+def normalize_scores(results: list[dict]) -> list[float]:
+    """Min-max normalize the scores of one ranked list to [0, 1] (all equal → 1.0)."""
+    if not results:
+        return []
+    scores = [r["score"] for r in results]
+    low, high = min(scores), max(scores)
+    if high == low:
+        return [1.0] * len(scores)
+    return [(s - low) / (high - low) for s in scores]
+
+
+def merge_ranked_lists(
+    ranked_lists: list[list[dict]],
+    top_k: int,
+    method: FusionMethod = "rrf",
+    rrf_k: int = DEFAULT_RRF_K,
+) -> list[dict]:
+    """
+    Merge ranked lists into one top-k list, best first.
+
+    A result appearing in several lists (same project/doc/chunk) is counted
+    once, with its contributions summed. Ties are broken by the normalized
+    score, then by the original list order.
+    """
+    fused: dict[tuple, float] = {}
+    tiebreak: dict[tuple, float] = {}
+    merged: dict[tuple, dict] = {}
+
+    for results in ranked_lists:
+        normalized = normalize_scores(results)
+        for rank, (result, norm) in enumerate(zip(results, normalized), start=1):
+            key = _identity(result)
+            contribution = 1.0 / (rrf_k + rank) if method == "rrf" else norm
+            fused[key] = fused.get(key, 0.0) + contribution
+            tiebreak[key] = max(tiebreak.get(key, 0.0), norm)
+            merged.setdefault(key, result)
+
+    order = sorted(fused, key=lambda key: (fused[key], tiebreak[key]), reverse=True)
+    return [{**merged[key], "score": fused[key]} for key in order[:top_k]]
+
+
+def candidate_scores(candidates: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    """(bm25, vector) raw score arrays for fetch_candidates() output; NaN = not a hit."""
+    def column(field: str) -> np.ndarray:
+        return np.array(
+            [np.nan if c[field] is None else c[field] for c in candidates], dtype=np.float64,
+        )
+
+    return column("bm25_score"), column("vector_score")
+
+
+def _relative(scores: np.ndarray) -> np.ndarray:
+    """Min-max normalize the hits of one modality; misses (NaN) become 0."""
+    hits = ~np.isnan(scores)
+    out = np.zeros_like(scores)
+    if not hits.any():
+        return out
+    low, high = scores[hits].min(), scores[hits].max()
+    out[hits] = 1.0 if high == low else (scores[hits] - low) / (high - low)
+    return out
+
+
+def _reciprocal_rank(scores: np.ndarray, rrf_k: int) -> np.ndarray:
+    """1 / (k + rank) within one modality (rank 1 = best); misses (NaN) become 0."""
+    hits = ~np.isnan(scores)
+    out = np.zeros_like(scores)
+    order = np.argsort(-scores[hits], kind="stable")
+    ranks = np.empty(order.size, dtype=np.float64)
+    ranks[order] = np.arange(1, order.size + 1)
+    out[hits] = 1.0 / (rrf_k + ranks)
+    return out
+
+
+def fuse_alpha_grid(
+    bm25: np.ndarray,
+    vector: np.ndarray,
+    alphas: np.ndarray,
+    method: AlphaFusionMethod = "relative_score",
+    rrf_k: int = DEFAULT_RRF_K,
+) -> np.ndarray:
+    """
+    Fused scores for every alpha: shape (len(alphas), len(candidates)).
+    alpha 0.0 = pure BM25, 1.0 = pure vector (same convention as hybrid_search).
+    """
+    if method == "rrf":
+        b, v = _reciprocal_rank(bm25, rrf_k), _reciprocal_rank(vector, rrf_k)
+    else:
+        b, v = _relative(bm25), _relative(vector)
+    alphas = np.asarray(alphas, dtype=np.float64)[:, None]
+    return alphas * v + (1.0 - alphas) * b
+
+
+def top_k_indices(fused: np.ndarray, top_k: int) -> np.ndarray:
+    """Per row, candidate indices of the top_k fused scores, best first: shape (rows, min(top_k, n))."""
+    n = fused.shape[1]
+    k = min(top_k, n)
+    if k == 0:
+        return np.empty((fused.shape[0], 0), dtype=np.intp)
+    part = np.argpartition(-fused, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(fused, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
@@ -8,7 +8,11 @@ Handles:
   - Deleting chunks when a document is re-indexed
 """
 
+import json
 import logging
+import time
+from datetime import datetime, timezone
+from typing import Iterator
 
 from pymilvus import (
   connections,
@@ -21,6 +25,8 @@ from pymilvus import (
 
 from ai_runtime.config import Settings
 from ai_runtime.exceptions import MilvusError
+from ai_runtime.models import SearchFilter
+from ai_runtime.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +45,10 @@ class MilvusService:
       logger.error("Failed to connect to Milvus: %s", e)
       raise MilvusError(f"Cannot connect to Milvus at {settings.milvus_host}:{settings.milvus_port}: {e}") from e
 
+  def close(self):
+    """Drop the default Milvus connection."""
+    connections.disconnect("default")
+
   def _collection_name(self, project_id: int) -> str:
     """Generate collection name for a project: kb_1, kb_2, etc."""
     return f"kb_{project_id}"
@@ -48,13 +58,14 @@ class MilvusService:
     Create a Milvus collection for the project if it doesn't exist.
     If it already exists, just return it.
 
-    Collection schema (6 fields):
-      - id:        INT64, primary key, auto-generated
-      - doc_id:    INT64, which document this chunk belongs to
-      - chunk_id:  INT64, chunk index within the document (0, 1, 2, ...)
-      - title:     VARCHAR(512), document title for citations
-      - text:      VARCHAR(8192), the actual chunk text
-      - embedding: FLOAT_VECTOR(1536), the embedding vector
+    Collection schema (7 fields):
+      - id:         INT64, primary key, auto-generated
+      - doc_id:     INT64, which document this chunk belongs to
+      - chunk_id:   INT64, chunk index within the document (0, 1, 2, ...)
+      - title:      VARCHAR(512), document title for citations
+      - text:       VARCHAR(8192), the actual chunk text
+      - embedding:  FLOAT_VECTOR(1536), the embedding vector
+      - indexed_at: INT64, insert time (unix seconds) for indexed_after filters
 
     Index: IVF_FLAT with COSINE metric on the embedding field.
     """
@@ -79,6 +90,7 @@ class MilvusService:
             dtype=DataType.FLOAT_VECTOR,
             dim=self.settings.embedding_dimensions,
         ),
+        FieldSchema(name="indexed_at", dtype=DataType.INT64),
       ]
 
       schema = CollectionSchema(fields,
@@ -103,6 +115,7 @@ class MilvusService:
       logger.error("Failed to ensure collection %s: %s", name, e, exc_info=True)
       raise MilvusError(f"Failed to create/access collection {name}: {e}") from e
 
+  @traced("milvus.insert_chunks")
   def insert_chunks(
       self,
       project_id: int,
@@ -111,6 +124,7 @@ class MilvusService:
       titles: list[str],
       texts: list[str],
       embeddings: list[list[float]],
+      indexed_at: list[datetime | None] | None = None,
   ) -> int:
     """
     Insert a batch of chunks into the Milvus collection.
@@ -118,12 +132,21 @@ class MilvusService:
     Each parameter is a list of the same length. For example, if we have
     3 chunks, then doc_ids has 3 elements, chunk_ids has 3, etc.
 
+    indexed_at keeps original per-chunk timestamps (snapshot restores);
+    missing ones are set to now. Collections created before indexed_at
+    existed are written without it.
+
     Returns the number of chunks inserted.
     """
     try:
       collection = self.ensure_collection(project_id)
       logger.info("Inserting %d chunks into project %d", len(doc_ids), project_id)
-      collection.insert([doc_ids, chunk_ids, titles, texts, embeddings])
+      columns = [doc_ids, chunk_ids, titles, texts, embeddings]
+      if self._has_indexed_at(collection):
+        now = int(time.time())
+        stamps = indexed_at or [None] * len(doc_ids)
+        columns.append([int(t.timestamp()) if t is not None else now for t in stamps])
+      collection.insert(columns)
       collection.flush()
       logger.info("Insert complete: %d chunks flushed", len(doc_ids))
       return len(doc_ids)
@@ -134,11 +157,87 @@ class MilvusService:
       logger.error("Failed to insert chunks into project %d: %s", project_id, e, exc_info=True)
       raise MilvusError(f"Failed to insert chunks into project {project_id}: {e}") from e
 
+  def iter_chunks(self, project_id: int, batch_size: int) -> Iterator[list[dict]]:
+    """
+    Every chunk of the project with its vector, in batches of `batch_size`
+    (Milvus query iterator, so memory stays at one batch).
+
+    Yields:
+        Lists of dicts with: doc_id, chunk_id, title, text, char_start (always
+        None — Milvus doesn't store offsets), indexed_at, vector
+    """
+    name = self._collection_name(project_id)
+    if not utility.has_collection(name):
+      logger.warning("Collection %s does not exist, no chunks to read", name)
+      return
+
+    try:
+      collection = Collection(name)
+      collection.load()
+      has_indexed_at = self._has_indexed_at(collection)
+      output_fields = ["doc_id", "chunk_id", "title", "text", "embedding"]
+      if has_indexed_at:
+        output_fields.append("indexed_at")
+      iterator = collection.query_iterator(batch_size=batch_size, expr="id >= 0", output_fields=output_fields)
+      try:
+        while rows := iterator.next():
+          yield [
+              {
+                  "doc_id": row["doc_id"],
+                  "chunk_id": row["chunk_id"],
+                  "title": row["title"],
+                  "text": row["text"],
+                  "char_start": None,
+                  "indexed_at": (
+                      datetime.fromtimestamp(row["indexed_at"], tz=timezone.utc) if has_indexed_at else None
+                  ),
+                  "vector": row["embedding"],
+              }
+              for row in rows
+          ]
+      finally:
+        iterator.close()
+
+    except Exception as e:
+      logger.error("Failed to read chunks of project %d: %s", project_id, e, exc_info=True)
+      raise MilvusError(f"Failed to read chunks of project {project_id}: {e}") from e
+
+  @staticmethod
+  def _has_indexed_at(collection) -> bool:
+    """False for collections created before the indexed_at field existed."""
+    return any(field.name == "indexed_at" for field in collection.schema.fields)
+
+  @classmethod
+  def _expr(cls, filters: SearchFilter | None, collection=None) -> str | None:
+    """
+    Translate a SearchFilter into a Milvus boolean expression (None = no filtering).
+
+    Raises:
+        MilvusError: indexed_after on a collection without indexed_at — its
+                     chunks have no timestamp to compare, and dropping the
+                     clause would silently widen the search.
+    """
+    if filters is None or filters.is_empty():
+      return None
+    clauses = []
+    if filters.doc_ids is not None:
+      clauses.append(f"doc_id in {[int(d) for d in filters.doc_ids]}")
+    if filters.title_like is not None:
+      # json.dumps gives a double-quoted, escaped string literal
+      clauses.append(f"title like {json.dumps(filters.title_like.replace('*', '%'))}")
+    if filters.indexed_after is not None:
+      if collection is not None and not cls._has_indexed_at(collection):
+        raise MilvusError("indexed_after filter is not supported on collections created without indexed_at")
+      clauses.append(f"indexed_at > {int(filters.indexed_after.timestamp())}")
+    return " and ".join(clauses)
+
+  @traced("milvus.search")
   def search(
       self,
       project_id: int,
       query_embedding: list[float],
       top_k: int = 5,
+      filters: SearchFilter | None = None,
   ) -> list[dict]:
     """
     Search for the most similar chunks in the collection.
@@ -147,6 +246,7 @@ class MilvusService:
         project_id: which project's knowledge base to search
         query_embedding: the embedding vector of the user's query
         top_k: how many results to return
+        filters: metadata pre-filter, evaluated by Milvus before the ANN search
 
     Returns:
         A list of dicts, each with: doc_id, chunk_id, title, text, score
@@ -168,6 +268,7 @@ class MilvusService:
           anns_field="embedding",
           param={"metric_type": "COSINE", "params": {"nprobe": 16}},
           limit=top_k,
+          expr=self._expr(filters, collection),
           output_fields=["doc_id", "chunk_id", "title", "text"],
       )
 
@@ -188,10 +289,13 @@ class MilvusService:
           # hit: every one doc of a top-k result return
       ]
 
+    except MilvusError:
+      raise
     except Exception as e:
       logger.error("Search failed on collection %s: %s", name, e, exc_info=True)
       raise MilvusError(f"Search failed on project {project_id}: {e}") from e
 
+  @traced("milvus.delete_by_doc_id")
   def delete_by_doc_id(self, project_id: int, doc_id: int):
     """Delete all chunks belonging to a specific document."""
     name = self._collection_name(project_id)
@@ -0,0 +1,249 @@
+"""
+Client-side rate limiter for OpenAI calls (embeddings + chat).
+
+Why?
+  OpenAI enforces per-minute budgets on requests (RPM) and tokens (TPM).
+  Without coordination, a bulk index fires embedding calls as fast as it
+  can, hits 429 and fails — and answer generation on the same key gets
+  throttled too. Instead, every OpenAI call first takes from two shared
+  token buckets and waits if the budget is used up.
+
+How it works:
+  - Two token buckets: requests (capacity = RPM) and tokens (capacity = TPM),
+    both refilled continuously over 60 s.
+  - acquire(estimated_tokens) blocks until both buckets have enough.
+    Token cost is estimated from text length (~4 chars per token).
+  - Every OpenAI HTTP response reports the real limits and remaining budget
+    in x-ratelimit-* headers (wired in via an httpx response hook, see
+    http_event_hooks()). The buckets adopt those values, so our view of the
+    budget tracks the server's — including usage from other workers.
+  - On 429 or transient errors, call() retries with exponential backoff and
+    full jitter, honoring Retry-After, and blocks the shared limiter for
+    that long so other callers back off as well.
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from typing import Callable, TypeVar
+
+import openai
+
+from ai_runtime.config import Settings
+from ai_runtime.deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CHARS_PER_TOKEN = 4
+
+# Errors worth retrying: the request may succeed if sent again later
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def estimate_tokens(texts: list[str]) -> int:
+    """Rough token count for a list of texts (no tokenizer dependency)."""
+    return max(1, sum(len(t) for t in texts) // CHARS_PER_TOKEN)
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Parse OpenAI reset durations like '1s', '6m0s', '20ms' into seconds."""
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(n) * _DURATION_UNITS[unit] for n, unit in parts)
+
+
+def build_openai_client(api_key: str, rate_limiter: "RateLimiter | None") -> openai.OpenAI:
+    """
+    OpenAI client wired to the limiter: response headers feed the buckets, and
+    the SDK's own retries are off because RateLimiter.call() coordinates them.
+    """
+    if rate_limiter is None:
+        return openai.OpenAI(api_key=api_key)
+    return openai.OpenAI(
+        api_key=api_key,
+        max_retries=0,
+        http_client=openai.DefaultHttpxClient(event_hooks=rate_limiter.http_event_hooks()),
+    )
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int, now: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.updated = now
+
+    def refill(self, now: float):
+        rate = self.capacity / 60.0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (amounts above capacity wait for a full bucket)."""
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / (self.capacity / 60.0)
+
+    def adopt(self, limit: int | None, remaining: int | None):
+        """Align with the server's view of this budget."""
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining), self.capacity)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        settings: Settings,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._clock = clock
+        self._sleep = sleep
+        now = clock()
+        self.requests = TokenBucket(settings.openai_rpm_limit, now)
+        self.tokens = TokenBucket(settings.openai_tpm_limit, now)
+        self.max_retries = settings.openai_max_retries
+        self.retry_base_seconds = settings.openai_retry_base_seconds
+        self.retry_max_seconds = settings.openai_retry_max_seconds
+        self.max_wait_seconds = settings.rate_limit_max_wait_seconds
+
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    # ── budget ─────────────────────────────────────────────────
+
+    def acquire(self, estimated_tokens: int, max_wait: float | None = None):
+        """
+        Block until one request and `estimated_tokens` tokens are available,
+        then take them. Gives up waiting after max_wait (default:
+        rate_limit_max_wait_seconds) and lets the request through — the
+        server's 429 then drives the retry.
+        """
+        max_wait = self.max_wait_seconds if max_wait is None else min(max_wait, self.max_wait_seconds)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.requests.refill(now)
+                self.tokens.refill(now)
+                wait = max(
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(estimated_tokens),
+                    self._blocked_until - now,
+                )
+                if wait <= 0 or waited >= max_wait:
+                    self.requests.tokens -= 1
+                    self.tokens.tokens -= min(estimated_tokens, self.tokens.capacity)
+                    return
+
+            wait = min(wait, max_wait - waited)
+            if waited == 0:
+                logger.info("Rate limiter: waiting %.2fs for OpenAI budget", wait)
+            self._sleep(wait)
+            waited += wait
+
+    def update_from_headers(self, headers):
+        """Adopt limits / remaining budget from x-ratelimit-* response headers."""
+        def as_int(name: str) -> int | None:
+            value = headers.get(name)
+            try:
+                return int(value) if value is not None else None
+            except ValueError:
+                return None
+
+        remaining_requests = as_int("x-ratelimit-remaining-requests")
+        remaining_tokens = as_int("x-ratelimit-remaining-tokens")
+        if remaining_requests is None and remaining_tokens is None:
+            return
+
+        with self._lock:
+            now = self._clock()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            self.requests.adopt(as_int("x-ratelimit-limit-requests"), remaining_requests)
+            self.tokens.adopt(as_int("x-ratelimit-limit-tokens"), remaining_tokens)
+
+            # Budget exhausted on the server: nobody sends until it resets
+            for remaining, reset_header in (
+                (remaining_requests, "x-ratelimit-reset-requests"),
+                (remaining_tokens, "x-ratelimit-reset-tokens"),
+            ):
+                reset = parse_duration(headers.get(reset_header))
+                if remaining == 0 and reset:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+
+    def block_for(self, seconds: float):
+        """Stop all callers from sending for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+    def http_event_hooks(self) -> dict:
+        """httpx event hooks that feed every OpenAI response's headers into the limiter."""
+        def on_response(response):
+            self.update_from_headers(response.headers)
+        return {"response": [on_response]}
+
+    # ── calls ──────────────────────────────────────────────────
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        estimated_tokens: int,
+        description: str = "OpenAI call",
+        deadline: Deadline | None = None,
+    ) -> T:
+        """
+        Run fn() within the budget, retrying rate-limit and transient errors
+        with jittered exponential backoff. The last error is re-raised.
+
+        With a bounded deadline, waiting for budget never outlasts it and no
+        retry is attempted that couldn't finish in time.
+        """
+        deadline = deadline or Deadline.none()
+        attempt = 0
+        while True:
+            self.acquire(estimated_tokens, max_wait=deadline.remaining())
+            deadline.check(description)
+            try:
+                return fn()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+
+                backoff = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt)
+                delay = random.uniform(0, backoff)   # full jitter
+                response = getattr(e, "response", None)
+                if response is not None:
+                    self.update_from_headers(response.headers)
+                    retry_after = parse_duration(response.headers.get("retry-after"))
+                    if retry_after:
+                        delay = max(delay, retry_after)
+
+                remaining = deadline.remaining()
+                if remaining is not None and delay >= remaining:
+                    raise   # no time left for another attempt
+
+                logger.warning(
+                    "%s failed (%s), retry %d/%d in %.2fs",
+                    description, type(e).__name__, attempt + 1, self.max_retries, delay,
+                )
+                if isinstance(e, openai.RateLimitError):
+                    self.block_for(delay)   # back off every caller, not just this one
+                else:
+                    self._sleep(delay)
+                attempt += 1
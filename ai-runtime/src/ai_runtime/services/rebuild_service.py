@@ -0,0 +1,294 @@
+"""
+Zero-downtime project rebuilds: shadow collection + routing swap.
+
+Why?
+  Changing chunk_size / chunk_overlap or the HNSW index settings used to
+  mean deleting and re-indexing a live project — queries came back empty
+  until every document was indexed again.
+
+Flow (one job, on a background thread of the worker that received it):
+  1. create the shadow collection "Kb{project_id}_r{timestamp}" (with the
+     requested HNSW settings)
+  2. walk the live collection document by document:
+       - same chunking → chunks are copied with their stored vectors
+         (no embedding calls)
+       - new chunking → the document text is reassembled from its chunks
+         (char_start offsets; overlap matching for chunks stored before
+         offsets existed), split again, embedded and written
+     writes are throttled to `rebuild_max_chunks_per_second` so the
+     rebuild doesn't starve live traffic of Weaviate / OpenAI capacity
+  3. catch up: documents (re)indexed into the live collection while the
+     copy ran are copied again, deleted ones removed from the shadow
+  4. swap: the routing table (services/weaviate_routing.py) points the
+     project at the shadow collection — one object write
+  5. after `rebuild_drop_grace_seconds` (longer than the routing TTL, so
+     every worker has followed the swap), documents that other workers
+     still indexed into the old collection are copied over, then the old
+     collection is dropped (deletes that reached the old collection in
+     that window are not replayed)
+
+Progress is reported on the RebuildJob (GET /rebuild/{job_id} on the
+worker that runs it).
+
+Out of scope: changing the embedding model — queries are embedded with
+the global model, so a project's vectors must come from it too.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+
+from ai_runtime.config import Settings
+from ai_runtime.exceptions import RebuildInProgressError, RebuildJobNotFoundError
+from ai_runtime.services.cache_service import TieredCache
+from ai_runtime.services.context_packer import overlap_length
+from ai_runtime.services.document_service import make_splitter
+from ai_runtime.services.embedding_service import EmbeddingService
+from ai_runtime.services.weaviate_routing import ProjectRoute
+from ai_runtime.services.weaviate_service import WeaviateService
+
+logger = logging.getLogger(__name__)
+
+# Job statuses after which nothing changes any more
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+@dataclass
+class RebuildJob:
+    job_id: str
+    project_id: int
+    chunk_size: int
+    chunk_overlap: int
+    source_collection: str | None = None
+    target_collection: str | None = None
+    status: str = "pending"   # pending → copying → catching_up → draining → completed | failed
+    documents_total: int = 0
+    documents_done: int = 0
+    chunks_written: int = 0
+    vectors_reused: bool = False
+    error: str | None = None
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = None
+
+
+def reassemble(chunks: list[dict]) -> str:
+    """
+    A document's text rebuilt from its chunks (ordered by chunk_id).
+
+    Chunks are placed at their char_start; the whitespace the splitter
+    stripped between two chunks comes back as a newline. Chunks without an
+    offset are joined on their longest overlap with the text so far.
+    """
+    text = ""
+    for chunk in chunks:
+        piece, start = chunk["text"] or "", chunk.get("char_start")
+        if start is None:
+            text += piece[overlap_length(text, piece, max_overlap=len(piece)):] if text else piece
+        elif start >= len(text):
+            gap = start - len(text)   # keeps new char_start values pointing into the original document
+            text += ("\n" + " " * (gap - 1) if text and gap else " " * gap) + piece
+        else:
+            text += piece[len(text) - start:]
+    return text
+
+
+class RebuildService:
+    def __init__(
+        self,
+        weaviate_service: WeaviateService,
+        embedding_service: EmbeddingService,
+        cache: TieredCache,
+        settings: Settings,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.weaviate = weaviate_service
+        self.embedding = embedding_service
+        self.cache = cache
+        self.settings = settings
+        self.max_chunks_per_second = settings.rebuild_max_chunks_per_second
+        self.drop_grace_seconds = settings.rebuild_drop_grace_seconds
+        self._clock = clock
+        self._jobs: dict[str, RebuildJob] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(
+        self,
+        project_id: int,
+        chunk_size: int | None = None,
+        chunk_overlap: int | None = None,
+        vector_index_config=None,
+    ) -> RebuildJob:
+        """
+        Start rebuilding a project on a background thread.
+
+        Unset chunk parameters keep the project's current chunking;
+        `vector_index_config` (wvc.config.Configure.VectorIndex) sets the
+        shadow collection's index, None = Weaviate's defaults.
+        """
+        current_size, current_overlap = self.current_chunking(project_id)
+        job = RebuildJob(
+            job_id=uuid.uuid4().hex,
+            project_id=project_id,
+            chunk_size=chunk_size or current_size,
+            chunk_overlap=chunk_overlap if chunk_overlap is not None else current_overlap,
+        )
+        job.vectors_reused = (job.chunk_size, job.chunk_overlap) == (current_size, current_overlap)
+        with self._lock:
+            running = next(
+                (j for j in self._jobs.values() if j.project_id == project_id and j.status not in TERMINAL_STATUSES),
+                None,
+            )
+            if running is not None:
+                raise RebuildInProgressError(f"Project {project_id} is already being rebuilt (job {running.job_id})")
+            self._jobs[job.job_id] = job
+
+        logger.info(
+            "Starting rebuild %s of project %d: chunk_size=%d, chunk_overlap=%d, reuse vectors=%s",
+            job.job_id, project_id, job.chunk_size, job.chunk_overlap, job.vectors_reused,
+        )
+        threading.Thread(
+            target=self._run, args=(job, vector_index_config), name=f"rebuild-{project_id}", daemon=True,
+        ).start()
+        return job
+
+    def get(self, job_id: str) -> RebuildJob:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise RebuildJobNotFoundError(f"Rebuild job {job_id} not found")
+        return job
+
+    def close(self):
+        """Interrupt running rebuilds (shadow collections not swapped in yet are dropped)."""
+        self._stop.set()
+
+    def current_chunking(self, project_id: int) -> tuple[int, int]:
+        """(chunk_size, chunk_overlap) the project is indexed with now."""
+        route = self.weaviate.project_route(project_id)
+        size = route.chunk_size if route is not None and route.chunk_size is not None else self.settings.chunk_size
+        overlap = (
+            route.chunk_overlap if route is not None and route.chunk_overlap is not None
+            else self.settings.chunk_overlap
+        )
+        return size, overlap
+
+    def _run(self, job: RebuildJob, vector_index_config):
+        swapped = False
+        try:
+            job.source_collection = source = self.weaviate.collection_name(job.project_id)
+            job.target_collection = target = f"Kb{job.project_id}_r{int(time.time())}"
+            self.weaviate.ensure_collection(job.project_id, name=target, vector_index_config=vector_index_config)
+            splitter = make_splitter(job.chunk_size, job.chunk_overlap)
+            t0 = self._clock()
+
+            def copy(doc_id: int, indexed_at: datetime | None):
+                self._copy(job, splitter, source, target, doc_id, indexed_at)
+                self._throttle(job, t0)
+
+            # 2. copy every document
+            job.status = "copying"
+            copy_started = datetime.now(timezone.utc)
+            documents = self.weaviate.document_index(source)
+            job.documents_total = len(documents)
+            for doc_id, indexed_at in documents.items():
+                copy(doc_id, indexed_at)
+                job.documents_done += 1
+
+            # 3. catch up with writes to the live collection during the copy
+            job.status = "catching_up"
+            live = self._catch_up(job, source, target, since=copy_started, copy=copy)
+            # anything indexed into the old collection later is newer than what we have seen
+            seen_until = max((t for t in live.values() if t is not None), default=copy_started)
+            gone = [doc_id for doc_id in documents if doc_id not in live]
+            if gone:
+                self.weaviate.delete_documents(job.project_id, gone, collection=target)
+
+            # 4. swap
+            self.weaviate.routing.set(
+                job.project_id, ProjectRoute(target, chunk_size=job.chunk_size, chunk_overlap=job.chunk_overlap),
+            )
+            swapped = True
+            self.cache.invalidate_project(job.project_id)
+            logger.info("Rebuild %s: project %d now served from %s", job.job_id, job.project_id, target)
+
+            # 5. let stale routes expire, pick up their last writes, drop the old collection
+            job.status = "draining"
+            if self._stop.wait(self.drop_grace_seconds):
+                raise InterruptedError("shutting down")
+            self._catch_up(job, source, target, since=seen_until, copy=copy)
+            self.weaviate.drop_collection(source)
+            self.cache.invalidate_project(job.project_id)
+            job.finished_at = datetime.now(timezone.utc)
+            job.status = "completed"
+            logger.info(
+                "Rebuild %s of project %d complete: %d documents, %d chunks",
+                job.job_id, job.project_id, job.documents_done, job.chunks_written,
+            )
+
+        except Exception as e:
+            logger.error("Rebuild %s of project %d failed: %s", job.job_id, job.project_id, e, exc_info=True)
+            if not swapped and job.target_collection:
+                try:
+                    self.weaviate.drop_collection(job.target_collection)
+                except Exception as drop_error:
+                    logger.warning("Could not drop shadow collection %s: %s", job.target_collection, drop_error)
+            job.error = str(e)
+            job.finished_at = datetime.now(timezone.utc)
+            job.status = "failed"
+
+    def _catch_up(self, job: RebuildJob, source: str, target: str, since: datetime, copy) -> dict:
+        """Copy documents indexed into `source` after `since` again; returns source's document index."""
+        live = self.weaviate.document_index(source)
+        changed = [doc_id for doc_id, indexed_at in live.items() if indexed_at is not None and indexed_at > since]
+        if changed:
+            logger.info("Rebuild %s: %d documents changed during the rebuild", job.job_id, len(changed))
+            self.weaviate.delete_documents(job.project_id, changed, collection=target)
+            for doc_id in changed:
+                copy(doc_id, live[doc_id])
+        return live
+
+    def _copy(self, job: RebuildJob, splitter, source: str, target: str, doc_id: int, indexed_at: datetime | None):
+        """Write one document into the shadow collection (same chunks + vectors, or re-chunked + embedded)."""
+        chunks = self.weaviate.fetch_document(source, doc_id, include_vector=job.vectors_reused)
+        if not chunks:
+            return
+        title = chunks[0]["title"]
+
+        if job.vectors_reused:
+            texts = [c["text"] for c in chunks]
+            chunk_ids = [c["chunk_id"] for c in chunks]
+            starts = [c["char_start"] for c in chunks]
+            embeddings = [c["vector"] for c in chunks]
+        else:
+            documents = splitter.create_documents([reassemble(chunks)])
+            texts = [d.page_content for d in documents]
+            chunk_ids = list(range(len(texts)))
+            starts = [d.metadata["start_index"] for d in documents]
+            embeddings = self.embedding.embed_texts(texts, use_cache=False) if texts else []
+        if not texts:
+            return
+
+        self.weaviate.insert_chunks(
+            project_id=job.project_id,
+            doc_ids=[doc_id] * len(texts),
+            chunk_ids=chunk_ids,
+            titles=[title] * len(texts),
+            texts=texts,
+            embeddings=embeddings,
+            char_starts=starts if None not in starts else None,
+            collection=target,
+            indexed_at=indexed_at,
+        )
+        job.chunks_written += len(texts)
+
+    def _throttle(self, job: RebuildJob, t0: float):
+        """Sleep until the write rate is back under max_chunks_per_second."""
+        if self.max_chunks_per_second <= 0:
+            return
+        ahead = job.chunks_written / self.max_chunks_per_second - (self._clock() - t0)
+        if ahead > 0 and self._stop.wait(ahead):
+            raise InterruptedError("shutting down")
@@ -24,10 +24,12 @@ Flow:
 import json
 import logging
 import boto3
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
 from ai_runtime.config import Settings
 from ai_runtime.exceptions import RerankError
+from ai_runtime.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -46,10 +48,17 @@ class RerankService:
             self._client = boto3.client(
                 "bedrock-runtime",
                 region_name=settings.aws_region,
+                # invoke_model takes no per-call timeout; this caps how long one abandoned by Deadline.run lingers
+                config=Config(read_timeout=settings.bedrock_read_timeout_seconds),
             )
         except Exception as e:
             raise RerankError(f"Failed to initialize Bedrock client: {e}") from e
 
+    def close(self):
+        """Close the boto3 client's connection pool."""
+        self._client.close()
+
+    @traced("rerank.rerank")
     def rerank(self, query: str, chunks: list[dict], top_n: int) -> list[dict]:
         """
         Rerank chunks by relevance to the query using Cohere Rerank on Bedrock.
@@ -0,0 +1,268 @@
+"""
+Latency tracking, latency budgets and circuit breakers for the retrieval path.
+
+Why?
+  p99 of /retrieve-document is dominated by the optional stages: a slow
+  Bedrock rerank or chat completion can triple a request's latency. When a
+  caller sets a latency budget we would rather return un-reranked results
+  (or no answer) on time than the best results late. And when an upstream
+  keeps failing or timing out, every request paying its timeout first
+  only makes things worse — a circuit breaker fails fast until it recovers.
+
+Pieces:
+  - LatencyTracker: rolling window of recent durations per stage
+                    ("embedding", "search", "rerank", "answer"), with percentiles.
+  - LatencyBudget:  one per request; allows() says whether a stage's recent
+                    p95 still fits into what is left of the budget.
+  - CircuitBreaker: closed → open after N consecutive failures → half-open
+                    after a cool-down (one trial call) → closed on success.
+  - Resilience:     the per-worker singleton holding the tracker and one
+                    breaker per stage; call(stage, fn) runs fn through both.
+
+Mandatory stages (embedding, search) raise CircuitOpenError (→ 503) while
+their breaker is open. Optional stages (rerank, answer) are skipped instead,
+and the response lists them in skipped_stages.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, TypeVar
+
+from ai_runtime.config import Settings
+from ai_runtime.deadline import Deadline
+from ai_runtime.exceptions import CircuitOpenError, DeadlineExceededError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STAGES = ("embedding", "search", "rerank", "answer")
+OPTIONAL_STAGES = ("rerank", "answer")
+
+# Percentiles from fewer samples than this are noise — treat the stage as unknown.
+MIN_SAMPLES = 5
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, stage: str, q: float) -> float | None:
+        """q-th percentile (0-100, nearest rank) of recent durations, or None if too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(stage, ()))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        rank = max(1, math.ceil(q / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def snapshot(self) -> dict[str, dict]:
+        """{stage: {count, p50, p95, p99}} in milliseconds — for logs and debugging."""
+        with self._lock:
+            stages = list(self._samples)
+        out = {}
+        for stage in stages:
+            out[stage] = {"count": len(self._samples[stage])}
+            for q in (50, 95, 99):
+                value = self.percentile(stage, q)
+                out[stage][f"p{q}"] = None if value is None else round(value * 1000, 1)
+        return out
+
+
+class LatencyBudget:
+    """A request's latency budget, measured from when the request arrived."""
+
+    def __init__(
+        self,
+        budget_seconds: float | None,
+        tracker: LatencyTracker,
+        percentile: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.budget_seconds = budget_seconds
+        self.tracker = tracker
+        self.percentile = percentile
+        self._clock = clock
+        self.started_at = clock()
+
+    def elapsed(self) -> float:
+        return self._clock() - self.started_at
+
+    def allows(self, stage: str) -> bool:
+        """
+        True if `stage` is expected to finish within the budget: elapsed time
+        plus the stage's recent p-th percentile latency. Stages without
+        enough history are allowed while any budget is left.
+        """
+        if self.budget_seconds is None:
+            return True
+        remaining = self.budget_seconds - self.elapsed()
+        expected = self.tracker.percentile(stage, self.percentile)
+        if expected is None:
+            return remaining > 0
+        return expected <= remaining
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._cooled_down():
+                return self.HALF_OPEN
+            return self._state
+
+    def _cooled_down(self) -> bool:
+        return self._clock() - self._opened_at >= self.reset_seconds
+
+    def available(self) -> bool:
+        """Would a call be let through right now? (Does not reserve the half-open trial.)"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                return self._cooled_down()
+            return not self._trial_in_flight
+
+    def acquire(self) -> bool:
+        """Let a call through? In half-open state only one trial call at a time is allowed."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if not self._cooled_down():
+                    return False
+                self._state = self.HALF_OPEN
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a trial call through."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_seconds - (self._clock() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit %s closed (upstream recovered)", self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """The call ended without saying anything about the upstream: free the half-open trial slot."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._trial_in_flight = False
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(
+                        "Circuit %s opened after %d consecutive failures (retry in %.0fs)",
+                        self.name, self._failures, self.reset_seconds,
+                    )
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+
+class Resilience:
+    """Per-worker latency tracker + one circuit breaker per retrieval stage."""
+
+    def __init__(self, settings: Settings, clock: Callable[[], float] = time.monotonic):
+        self.settings = settings
+        self._clock = clock
+        self.tracker = LatencyTracker(window=settings.latency_window_size)
+        self.breakers = {
+            stage: CircuitBreaker(
+                stage,
+                failure_threshold=settings.circuit_failure_threshold,
+                reset_seconds=settings.circuit_reset_seconds,
+                clock=clock,
+            )
+            for stage in STAGES
+        }
+
+    def budget(self, budget_ms: int | None) -> LatencyBudget:
+        """Start a request's latency budget (None = no degradation)."""
+        return LatencyBudget(
+            None if budget_ms is None else budget_ms / 1000,
+            self.tracker,
+            self.settings.latency_budget_percentile,
+            clock=self._clock,
+        )
+
+    def available(self, stage: str) -> bool:
+        return self.breakers[stage].available()
+
+    def call(self, stage: str, fn: Callable[[], T], deadline: Deadline | None = None) -> T:
+        """
+        Run fn() for `stage` through its circuit breaker and record its latency.
+
+        Any exception counts as a failure of the upstream, except the
+        request's own deadline running out (before or during the stage):
+        that is the caller's budget, not the upstream's health — otherwise
+        clients sending tiny X-Request-Timeout-Ms values could open a
+        breaker for everyone.
+
+        Raises:
+            CircuitOpenError: the stage's breaker is open.
+        """
+        if deadline is not None:
+            deadline.check(stage)
+
+        breaker = self.breakers[stage]
+        if not breaker.acquire():
+            raise CircuitOpenError(stage, breaker.retry_after())
+
+        started = self._clock()
+        try:
+            result = fn()
+        except DeadlineExceededError:
+            breaker.release()   # cut short by the caller's deadline: neither success nor failure
+            raise
+        except Exception:
+            breaker.record_failure()
+            self.tracker.record(stage, self._clock() - started)
+            raise
+        self.tracker.record(stage, self._clock() - started)
+        breaker.record_success()
+        return result
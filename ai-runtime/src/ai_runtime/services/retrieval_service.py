@@ -0,0 +1,414 @@
+"""
+Retrieval pipeline service.
+
+Orchestrates the search side of POST /retrieve-document, the same way
+DocumentService orchestrates indexing:
+  query → embed → Weaviate hybrid search → (optional) rerank
+
+Final results are cached in the shared TieredCache ("retrieval" namespace,
+per project), keyed by embedding model, query, alpha, top_k, filters and the
+rerank configuration.
+Re-indexing a project invalidates its entries.
+
+Concurrent identical searches are coalesced with a SingleFlight shared by
+all requests (see dependencies.get_search_flight), so a burst of the same
+query costs one Weaviate search (+ one rerank).
+"""
+
+import contextvars
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+from ai_runtime.config import Settings
+from ai_runtime.deadline import Deadline
+from ai_runtime.exceptions import CircuitOpenError, DeadlineExceededError
+from ai_runtime.models import SearchFilter
+from ai_runtime.services.cache_service import TieredCache
+from ai_runtime.services.embedding_service import EmbeddingService
+from ai_runtime.services.fusion import (
+    AlphaFusionMethod,
+    FusionMethod,
+    candidate_scores,
+    fuse_alpha_grid,
+    merge_ranked_lists,
+    top_k_indices,
+)
+from ai_runtime.services.resilience import LatencyBudget, Resilience
+from ai_runtime.services.single_flight import SingleFlight
+from ai_runtime.services.weaviate_service import WeaviateService
+
+if TYPE_CHECKING:
+    from ai_runtime.services.rerank_service import RerankService   # boto3: imported only when enabled
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAMESPACE = "retrieval"
+
+T = TypeVar("T")
+
+# Federated search fans out one search per project on this pool (shared by
+# all requests, so a burst of multi-project queries can't spawn unbounded threads).
+_fanout_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="fanout")
+
+
+class RetrievalService:
+    def __init__(
+        self,
+        weaviate_service: WeaviateService,
+        embedding_service: EmbeddingService,
+        rerank_service: "RerankService | None",
+        settings: Settings,
+        cache: TieredCache | None = None,
+        search_flight: SingleFlight | None = None,
+        resilience: Resilience | None = None,
+    ):
+        self.weaviate = weaviate_service
+        self.embedding = embedding_service
+        self.rerank = rerank_service
+        self.settings = settings
+        self.cache = cache if settings.retrieval_cache_enabled else None
+        self.search_flight = search_flight or SingleFlight("search")
+        self.resilience = resilience
+        self.skipped_stages: list[str] = []
+        # Duration of the last Weaviate search this request ran itself
+        # (None: served from cache or by a coalesced request) — for shadow traffic
+        self.search_seconds: float | None = None
+
+    def _guarded(self, stage: str, fn: Callable[[], T], deadline: Deadline | None = None) -> T:
+        """Run an upstream call through its circuit breaker / latency tracker (if configured)."""
+        if self.resilience is None:
+            return fn()
+        return self.resilience.call(stage, fn, deadline)
+
+    def embed_query(self, query: str, deadline: Deadline | None = None) -> list[float]:
+        """Embed the query text (needed by both Milvus and Weaviate)."""
+        return self._guarded("embedding", lambda: self.embedding.embed_single(query, deadline=deadline), deadline)
+
+    def embed_queries(self, queries: list[str], batch_size: int) -> list[list[float]]:
+        """
+        Embed many queries with one embeddings API call per batch_size queries
+        (cached ones are free). Returned as lists, like embed_query.
+        """
+        embeddings: list[list[float]] = []
+        for start in range(0, len(queries), batch_size):
+            embeddings.extend(self.embedding.embed_texts(queries[start:start + batch_size]).tolist())
+        return embeddings
+
+    def search_each(
+        self,
+        project_id: int,
+        queries: list[str],
+        query_embeddings: list[list[float]],
+        alpha: float,
+        top_k: int,
+        concurrency: int,
+    ) -> list[list[dict]]:
+        """search() every query on a bounded thread pool; results in query order."""
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="search-each") as pool:
+            return list(pool.map(
+                lambda i: self.search(project_id, queries[i], query_embeddings[i], alpha, top_k),
+                range(len(queries)),
+            ))
+
+    def search(
+        self,
+        project_id: int,
+        query: str,
+        query_embedding: list[float],
+        alpha: float,
+        top_k: int,
+        deadline: Deadline | None = None,
+        budget: LatencyBudget | None = None,
+        filters: SearchFilter | None = None,
+    ) -> list[dict]:
+        """
+        Hybrid search + optional reranking for one project.
+
+        `filters` are pushed down into the Weaviate query, so only matching
+        chunks are searched (and top_k counts matching chunks only).
+
+        Returns:
+            List of dicts with: doc_id, chunk_id, title, text, score
+
+        Raises:
+            DeadlineExceededError: the request's budget ran out.
+            CircuitOpenError:      Weaviate's circuit breaker is open.
+        """
+        deadline = deadline or Deadline.none()
+        rerank_enabled = self.settings.rerank_enabled and self.rerank is not None
+        # The embedding model is part of the key: results for one model's query vector
+        # must not be served once the service embeds queries with another
+        cache_key = (
+            f"{self.settings.openai_embedding_model}|{query}|{alpha:.4f}|{top_k}"
+            f"|{rerank_enabled}|{self.settings.rerank_top_n}"
+        )
+        if filters is not None and not filters.is_empty():
+            cache_key += f"|{filters.model_dump_json()}"
+
+        try:
+            results, skipped, over_budget = self.search_flight.do(
+                (project_id, cache_key),
+                lambda: self._search(
+                    project_id, query, query_embedding, alpha, top_k, rerank_enabled, cache_key, deadline, budget,
+                    filters,
+                ),
+                timeout=deadline.remaining(),
+                # rerank skipped for the leader's latency budget: followers run under their own
+                shareable=lambda outcome: not outcome[2],
+            )
+        except TimeoutError as e:
+            raise DeadlineExceededError("Request deadline exceeded waiting for in-flight search") from e
+        self.skipped_stages.extend(skipped)
+        # Results may be shared with concurrent callers — hand out copies
+        return [dict(r) for r in results]
+
+    def search_many(
+        self,
+        project_ids: list[int],
+        query: str,
+        query_embedding: list[float],
+        alpha: float,
+        top_k: int,
+        fusion: FusionMethod = "rrf",
+        deadline: Deadline | None = None,
+        budget: LatencyBudget | None = None,
+        filters: SearchFilter | None = None,
+    ) -> list[dict]:
+        """
+        Federated search: search() every project concurrently and merge the
+        per-project rankings into one top-k (see services/fusion.py).
+
+        Each project goes through search() on its own, so caching, request
+        coalescing and rerank apply per project. The query is embedded once
+        by the caller.
+
+        Returns:
+            List of dicts with: project_id, doc_id, chunk_id, title, text, score
+            (score is the fused score)
+        """
+        futures = [
+            _fanout_executor.submit(
+                contextvars.copy_context().run,   # keeps the request's trace span
+                self.search, project_id, query, query_embedding, alpha, top_k, deadline, budget, filters,
+            )
+            for project_id in project_ids
+        ]
+        ranked_lists = [
+            [{**r, "project_id": project_id} for r in future.result()]
+            for project_id, future in zip(project_ids, futures)
+        ]
+        logger.info(
+            "Federated search over %d projects: %s candidates, fusion=%s",
+            len(project_ids), [len(r) for r in ranked_lists], fusion,
+        )
+        return merge_ranked_lists(ranked_lists, top_k, method=fusion, rrf_k=self.settings.fusion_rrf_k)
+
+    def search_alpha_grid(
+        self,
+        project_id: int,
+        query: str,
+        query_embedding: list[float],
+        alphas: list[float],
+        top_k: int,
+        fusion: AlphaFusionMethod = "relative_score",
+        deadline: Deadline | None = None,
+        filters: SearchFilter | None = None,
+    ) -> dict[float, list[dict]]:
+        """
+        Rank one query for many alpha values from a single candidate fetch.
+
+        BM25 and vector candidates are fetched once (fusion_candidate_limit
+        each) and fused locally for the whole alpha grid (services/fusion.py).
+        No rerank, no cache — this is for tuning alpha, not for serving.
+
+        Returns:
+            {alpha: list of dicts with doc_id, chunk_id, title, text, score}
+        """
+        deadline = deadline or Deadline.none()
+        limit = max(top_k, self.settings.fusion_candidate_limit)
+
+        def fetch():
+            return self.weaviate.fetch_candidates(
+                project_id=project_id, query=query, query_embedding=query_embedding, limit=limit,
+                filters=filters,
+            )
+
+        candidates = self._guarded("search", lambda: deadline.run("candidate fetch", fetch), deadline)
+        return self.fuse_candidates(candidates, alphas, top_k, fusion)
+
+    def fuse_candidates(
+        self,
+        candidates: list[dict],
+        alphas: list[float],
+        top_k: int,
+        fusion: AlphaFusionMethod = "relative_score",
+    ) -> dict[float, list[dict]]:
+        """Fuse a fetch_candidates() pool for every alpha; see search_alpha_grid."""
+        if not candidates:
+            return {alpha: [] for alpha in alphas}
+
+        bm25, vector = candidate_scores(candidates)
+        fused = fuse_alpha_grid(bm25, vector, alphas, method=fusion, rrf_k=self.settings.fusion_rrf_k)
+        best = top_k_indices(fused, top_k)
+
+        grid = {}
+        for row, alpha in enumerate(alphas):
+            grid[alpha] = [
+                {
+                    "doc_id": candidates[i]["doc_id"],
+                    "chunk_id": candidates[i]["chunk_id"],
+                    "title": candidates[i]["title"],
+                    "text": candidates[i]["text"],
+                    "score": float(fused[row, i]),
+                }
+                for i in best[row]
+            ]
+        return grid
+
+    def expand_neighbors(
+        self,
+        results: list[dict],
+        window: int,
+        deadline: Deadline | None = None,
+    ) -> list[dict]:
+        """
+        Add the chunks chunk_id - window … chunk_id + window around every hit.
+
+        Missing neighbors are fetched with one WeaviateService.fetch_chunks
+        call per project (projects concurrently), never one query per hit.
+        A chunk is returned once even when it neighbors several hits or is
+        itself a hit; hits keep their own entry and score.
+
+        Args:
+            results: ranked hits with project_id set (as returned to the router)
+
+        Returns:
+            The hits in their original order, each surrounded by its neighbors
+            in chunk order. A neighbor carries its hit's score and
+            neighbor_of = the hit's chunk_id.
+        """
+        if window <= 0 or not results:
+            return results
+        deadline = deadline or Deadline.none()
+
+        def key(r: dict) -> tuple:
+            return (r["project_id"], r["doc_id"], r["chunk_id"])
+
+        known = {key(r): r for r in results}
+        missing: dict[int, set[tuple[int, int]]] = {}
+        for r in results:
+            for chunk_id in range(max(0, r["chunk_id"] - window), r["chunk_id"] + window + 1):
+                if (r["project_id"], r["doc_id"], chunk_id) not in known:
+                    missing.setdefault(r["project_id"], set()).add((r["doc_id"], chunk_id))
+
+        def fetch(project_id: int, keys: set[tuple[int, int]]) -> list[dict]:
+            return self._guarded(
+                "search",
+                lambda: deadline.run("neighbor fetch", lambda: self.weaviate.fetch_chunks(project_id, sorted(keys))),
+                deadline,
+            )
+
+        futures = {
+            project_id: _fanout_executor.submit(contextvars.copy_context().run, fetch, project_id, keys)
+            for project_id, keys in missing.items()
+        }
+        fetched = {
+            (project_id, c["doc_id"], c["chunk_id"]): c
+            for project_id, future in futures.items()
+            for c in future.result()
+        }
+
+        expanded: list[dict] = []
+        seen: set[tuple] = set()
+        for hit in results:
+            project_id, doc_id, hit_chunk = key(hit)
+            for chunk_id in range(max(0, hit_chunk - window), hit_chunk + window + 1):
+                k = (project_id, doc_id, chunk_id)
+                if k in seen:
+                    continue
+                if k in known:
+                    expanded.append(known[k])
+                elif k in fetched:
+                    expanded.append({
+                        **fetched[k], "project_id": project_id, "score": hit["score"], "neighbor_of": hit_chunk,
+                    })
+                else:
+                    continue
+                seen.add(k)
+
+        logger.info(
+            "Neighbor expansion (±%d): %d hits → %d chunks (%d fetched from %d project(s))",
+            window, len(results), len(expanded), len(fetched), len(futures),
+        )
+        return expanded
+
+    def _search(
+        self,
+        project_id: int,
+        query: str,
+        query_embedding: list[float],
+        alpha: float,
+        top_k: int,
+        rerank_enabled: bool,
+        cache_key: str,
+        deadline: Deadline,
+        budget: LatencyBudget | None,
+        filters: SearchFilter | None = None,
+    ) -> tuple[list[dict], tuple[str, ...], bool]:
+        """(results, skipped stages, whether rerank was skipped for this request's latency budget)."""
+        if self.cache is not None:
+            cached = self.cache.get(CACHE_NAMESPACE, cache_key, project_id=project_id)
+            if cached is not None:
+                logger.info("Retrieval cache hit (project=%d)", project_id)
+                return json.loads(cached), (), False
+
+        logger.info("Using Weaviate hybrid search (alpha=%.2f)", alpha)
+        def hybrid_search():
+            return self.weaviate.hybrid_search(
+                project_id=project_id,
+                query=query,
+                query_embedding=query_embedding,
+                alpha=alpha,
+                top_k=top_k,
+                filters=filters,
+            )
+
+        started = time.perf_counter()
+        results = self._guarded("search", lambda: deadline.run("hybrid search", hybrid_search), deadline)
+        self.search_seconds = time.perf_counter() - started
+
+        # When enabled, fetch more candidates (rerank_top_k) then let the
+        # Cross-Encoder score them and keep only the best rerank_top_n.
+        skipped: tuple[str, ...] = ()
+        over_budget = False
+        if rerank_enabled and results:
+            reranked = None
+            over_budget = budget is not None and not budget.allows("rerank")
+            if not over_budget and self._rerank_available():
+                logger.info("Reranking enabled — reranking %d candidates", len(results))
+                candidates = results
+
+                def rerank():
+                    return self.rerank.rerank(query=query, chunks=candidates, top_n=self.settings.rerank_top_n)
+
+                try:
+                    reranked = self._guarded("rerank", lambda: deadline.run("rerank", rerank), deadline)
+                except CircuitOpenError:
+                    pass   # breaker opened since _rerank_available() — skip like below
+            if reranked is None:
+                logger.warning("Skipping rerank (latency budget or open circuit) for project %d", project_id)
+                results = results[:self.settings.rerank_top_n]
+                skipped = ("rerank",)
+            else:
+                results = reranked
+
+        # Degraded results are not cached — the next request may get the full pipeline
+        if self.cache is not None and not skipped:
+            self.cache.set(CACHE_NAMESPACE, cache_key, json.dumps(results).encode(), project_id=project_id)
+        return results, skipped, over_budget
+
+    def _rerank_available(self) -> bool:
+        return self.resilience is None or self.resilience.available("rerank")
@@ -0,0 +1,205 @@
+"""
+Shadow traffic: mirror sampled /retrieve-document queries to a second backend.
+
+Why?
+  MilvusService is kept for rollback, but nobody knows how it compares with
+  Weaviate on our real query mix. Shadow mode answers that with
+  measurements instead of guesses.
+
+Flow (per sampled single-project request, after the primary search):
+  1. the router hands over the query vector, top_k, filters and the
+     (doc_id, chunk_id, score) ranking the caller is getting
+  2. the mirrored search runs on a small background pool — the response
+     never waits for it, and its failures are only counted
+  3. per mirrored query we record:
+       - latency of both backends (primary = the Weaviate search the
+         request actually ran; cache hits / coalesced requests have none)
+       - top-k overlap: |primary ∩ shadow| / max(|primary|, |shadow|)
+       - score correlation: Spearman rank correlation of the two backends'
+         scores over the chunks both returned (scales differ — hybrid vs
+         cosine — so ranks are compared, not raw values)
+
+GET /shadow/stats reports the recent window (`shadow_window_size` queries).
+
+Guard rails:
+  - SHADOW_SAMPLE_RATE=0 (default) turns it off: one float comparison per request
+  - at most `shadow_max_in_flight` mirrored searches at a time; samples
+    beyond that are dropped (and counted), never queued
+  - the secondary backend is built lazily on the pool (pymilvus is not
+    imported on the request path)
+
+The primary ranking is what the caller got — reranked when rerank is on —
+so with rerank enabled the overlap also reflects the reranker.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import numpy as np
+
+from ai_runtime.config import Settings
+from ai_runtime.models import SearchFilter
+from ai_runtime.services.resilience import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# Spearman over fewer shared chunks than this is meaningless
+MIN_SHARED_FOR_CORRELATION = 3
+
+
+def topk_overlap(primary: list[tuple], shadow: list[tuple]) -> float | None:
+    """Share of (doc_id, chunk_id) keys both rankings contain; None when both are empty."""
+    size = max(len(primary), len(shadow))
+    if size == 0:
+        return None
+    return len(set(primary) & set(shadow)) / size
+
+
+def rank_correlation(primary: dict[tuple, float], shadow: dict[tuple, float]) -> float | None:
+    """Spearman correlation of the scores of the keys both rankings share (None if too few / constant)."""
+    shared = [key for key in primary if key in shadow]
+    if len(shared) < MIN_SHARED_FOR_CORRELATION:
+        return None
+    a = np.argsort(np.argsort([primary[k] for k in shared])).astype(float)
+    b = np.argsort(np.argsort([shadow[k] for k in shared])).astype(float)
+    if a.std() == 0 or b.std() == 0:
+        return None
+    return float(np.corrcoef(a, b)[0, 1])
+
+
+class ShadowTraffic:
+    def __init__(
+        self,
+        settings: Settings,
+        backend: str,
+        backend_factory: Callable,   # builds the secondary service, e.g. dependencies.get_milvus_service
+        sampler: Callable[[], float] = random.random,
+    ):
+        self.sample_rate = settings.shadow_sample_rate
+        self.backend = backend
+        self.max_in_flight = settings.shadow_max_in_flight
+        self.backend_factory = backend_factory
+        self._sampler = sampler
+        self._executor = ThreadPoolExecutor(max_workers=max(1, self.max_in_flight), thread_name_prefix="shadow")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.latency = LatencyTracker(window=settings.shadow_window_size)
+        self._overlap: deque[float] = deque(maxlen=settings.shadow_window_size)
+        self._correlation: deque[float] = deque(maxlen=settings.shadow_window_size)
+        self.mirrored = 0
+        self.dropped = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def maybe_mirror(
+        self,
+        project_id: int,
+        query_embedding: list[float],
+        top_k: int,
+        filters: SearchFilter | None,
+        primary_results: list[dict],
+        primary_seconds: float | None,
+    ) -> bool:
+        """
+        Mirror this query to the secondary backend if it is sampled.
+
+        Never raises and never blocks on the mirrored search.
+
+        Returns:
+            True when a mirrored search was scheduled.
+        """
+        if self.sample_rate <= 0 or self._sampler() >= self.sample_rate:
+            return False
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self.dropped += 1
+                return False
+            self._in_flight += 1
+
+        primary = [(r["doc_id"], r["chunk_id"], r["score"]) for r in primary_results]
+        try:
+            self._executor.submit(
+                self._mirror, project_id, query_embedding, top_k, filters, primary, primary_seconds,
+            )
+        except RuntimeError:   # shut down
+            with self._lock:
+                self._in_flight -= 1
+            return False
+        return True
+
+    def _mirror(
+        self,
+        project_id: int,
+        query_embedding: list[float],
+        top_k: int,
+        filters: SearchFilter | None,
+        primary: list[tuple],
+        primary_seconds: float | None,
+    ):
+        try:
+            backend = self.backend_factory()
+            started = time.perf_counter()
+            hits = backend.search(project_id=project_id, query_embedding=query_embedding, top_k=top_k, filters=filters)
+            shadow_seconds = time.perf_counter() - started
+
+            primary_scores = {(doc_id, chunk_id): score for doc_id, chunk_id, score in primary}
+            shadow_scores = {(h["doc_id"], h["chunk_id"]): h["score"] for h in hits}
+            overlap = topk_overlap(list(primary_scores), list(shadow_scores))
+            correlation = rank_correlation(primary_scores, shadow_scores)
+
+            self.latency.record("shadow", shadow_seconds)
+            if primary_seconds is not None:
+                self.latency.record("primary", primary_seconds)
+            with self._lock:
+                self.mirrored += 1
+                if overlap is not None:
+                    self._overlap.append(overlap)
+                if correlation is not None:
+                    self._correlation.append(correlation)
+            logger.debug(
+                "Shadow %s search (project=%d): %.1f ms, overlap=%s, correlation=%s",
+                self.backend, project_id, shadow_seconds * 1000, overlap, correlation,
+            )
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            logger.warning("Shadow %s search failed (project=%d): %s", self.backend, project_id, e)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> dict:
+        """Counters plus latency / overlap / correlation over the recent window."""
+        with self._lock:
+            overlap = list(self._overlap)
+            correlation = list(self._correlation)
+            counters = {"mirrored": self.mirrored, "dropped": self.dropped, "errors": self.errors}
+
+        def summary(values: list[float]) -> dict:
+            if not values:
+                return {"count": 0, "mean": None, "p50": None}
+            return {"count": len(values), "mean": round(float(np.mean(values)), 4),
+                    "p50": round(float(np.median(values)), 4)}
+
+        latency = self.latency.snapshot()
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend,
+            "sample_rate": self.sample_rate,
+            **counters,
+            "latency_ms": {side: latency.get(side, {"count": 0}) for side in ("primary", "shadow")},
+            "topk_overlap": summary(overlap),
+            "score_correlation": summary(correlation),
+        }
+
+    def close(self):
+        """Drop queued mirrored searches, wait for the running ones."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
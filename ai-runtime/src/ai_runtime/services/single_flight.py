@@ -0,0 +1,117 @@
+"""
+Single-flight request coalescing.
+
+Why?
+  A dashboard refresh or a parallel eval run fires many identical
+  /retrieve-document requests at once. Caches don't help the first burst:
+  every request misses at the same time and all of them call OpenAI and
+  Weaviate. With single-flight, the first caller for a key does the work
+  and every concurrent caller with the same key waits for — and shares —
+  its result (or its exception).
+
+Same idea as Go's golang.org/x/sync/singleflight. Routes are sync
+(FastAPI runs them in a threadpool), so this is thread-based.
+
+Used at three layers, each with its own instance (its own key space):
+  - EmbeddingService.embed_single   key: (model, text)
+  - RetrievalService.search         key: (project, query, alpha, top_k, rerank config)
+  - AnswerService.generate          key: answer cache key + query
+
+Shared results are returned to several callers: callers must not mutate them.
+
+What the leader got because of its own deadline or latency budget is not
+shared — a follower with a larger budget shouldn't inherit it:
+  - a DeadlineExceededError from the leader sends followers back to run
+    (or join) the call themselves, under their own deadline
+  - do(shareable=...) marks results as the leader's alone (e.g. a search
+    whose rerank was skipped for the leader's budget); followers re-run too
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Hashable, TypeVar
+
+from ai_runtime.exceptions import DeadlineExceededError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+        self.shared = True   # False: the result is the leader's alone, followers re-run
+        self.followers = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], T],
+        timeout: float | None = None,
+        shareable: Callable[[T], bool] | None = None,
+    ) -> T:
+        """
+        Run fn() for this key, unless a call with the same key is already in
+        flight — then wait for that call and return its result instead.
+
+        timeout bounds how long a follower waits (in total) for leaders; on
+        expiry TimeoutError is raised (the leader's call keeps running).
+        shareable(result) False keeps the result to the leader: followers
+        run the call again (one of them leading the next round).
+        """
+        wait_until = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is not None:
+                    call.followers += 1
+                    leader = False
+                else:
+                    call = _Call()
+                    self._calls[key] = call
+                    leader = True
+
+            if leader:
+                return self._lead(key, call, fn, shareable)
+
+            remaining = None if wait_until is None else max(0.0, wait_until - time.monotonic())
+            if not call.done.wait(remaining):
+                raise TimeoutError(f"Timed out waiting for in-flight {self.name} call")
+            if isinstance(call.error, DeadlineExceededError):
+                continue   # the leader's deadline, not ours
+            if call.error is not None:
+                raise call.error
+            if call.shared:
+                return call.result
+            logger.info("Single-flight [%s]: leader's result not shareable, running again", self.name)
+
+    def _lead(self, key: Hashable, call: _Call, fn: Callable[[], T], shareable: Callable[[T], bool] | None) -> T:
+        try:
+            call.result = fn()
+            call.shared = shareable is None or shareable(call.result)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.followers:
+                logger.info("Single-flight [%s]: %d duplicate calls coalesced", self.name, call.followers)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
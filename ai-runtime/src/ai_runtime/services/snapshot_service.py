@@ -0,0 +1,238 @@
+"""
+Knowledge-base snapshots: export / import a project without re-embedding.
+
+Why?
+  Moving a project between environments, or from Weaviate to Milvus (and
+  back), used to mean re-indexing every document — one embedding call per
+  chunk. The vectors already exist; a snapshot carries them along.
+
+Layout ({snapshot_dir}/{snapshot_id}/):
+  - vectors.npy    float32 matrix, one row per chunk (NumPy .npy, memory-mappable)
+  - chunks.jsonl   one line per chunk, same order: doc_id, chunk_id, title,
+                   text, char_start, indexed_at
+  - manifest.json  project, source backend, chunk count, dimensions,
+                   embedding model and chunking the vectors were made with
+
+Memory stays flat on both sides:
+  - export reads the store through its cursor (Weaviate iterator / Milvus
+    query iterator) `snapshot_batch_size` chunks at a time; vectors are
+    appended to a raw float32 file and the .npy header is written once the
+    row count is known
+  - import memory-maps vectors.npy and streams chunks.jsonl, writing
+    batches of `snapshot_batch_size` chunks (Weaviate: through the batch
+    writer; chunks keep their UUIDs, so re-importing overwrites)
+
+A snapshot can only be imported when this deployment embeds queries with
+the same model and dimensions — otherwise its vectors would be unusable.
+Arrow/Parquet would need pyarrow, which the runtime doesn't ship; .npy +
+JSONL needs nothing beyond NumPy.
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime
+from typing import Callable
+
+import numpy as np
+
+from ai_runtime.config import Settings
+from ai_runtime.exceptions import SnapshotError, SnapshotNotFoundError
+from ai_runtime.services.cache_service import TieredCache
+from ai_runtime.services.weaviate_service import WeaviateService
+
+logger = logging.getLogger(__name__)
+
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+class SnapshotService:
+    def __init__(
+        self,
+        settings: Settings,
+        weaviate_service: WeaviateService,
+        cache: TieredCache,
+        milvus_factory: Callable | None = None,   # imports pymilvus on first use only
+    ):
+        self.settings = settings
+        self.weaviate = weaviate_service
+        self.cache = cache
+        self.milvus_factory = milvus_factory
+        self.snapshot_dir = settings.snapshot_dir
+        self.batch_size = settings.snapshot_batch_size
+
+    def _store(self, backend: str):
+        if backend == "weaviate":
+            return self.weaviate
+        if backend == "milvus" and self.milvus_factory is not None:
+            return self.milvus_factory()
+        raise SnapshotError(f"Unsupported snapshot backend: {backend}")
+
+    # ── export ──
+
+    def export(self, project_id: int, backend: str = "weaviate") -> dict:
+        """
+        Write every chunk of a project (ids, titles, texts, vectors) to a new snapshot.
+
+        Returns:
+            The snapshot manifest.
+        """
+        store = self._store(backend)
+        snapshot_id = uuid.uuid4().hex
+        snapshot_dir = self._dir(snapshot_id)
+        os.makedirs(snapshot_dir, exist_ok=True)
+        raw_path = os.path.join(snapshot_dir, "vectors.f32")
+
+        count, dimensions = 0, None
+        started = time.monotonic()
+        try:
+            with open(raw_path, "wb") as raw, open(os.path.join(snapshot_dir, "chunks.jsonl"), "w", encoding="utf-8") as lines:
+                for batch in store.iter_chunks(project_id, batch_size=self.batch_size):
+                    vectors = np.asarray([c["vector"] for c in batch], dtype=VECTOR_DTYPE)
+                    if dimensions is None:
+                        dimensions = vectors.shape[1]
+                    elif vectors.shape[1] != dimensions:
+                        raise SnapshotError(f"Mixed vector dimensions in project {project_id}")
+                    raw.write(vectors.tobytes())
+                    for c in batch:
+                        lines.write(json.dumps({
+                            "doc_id": c["doc_id"],
+                            "chunk_id": c["chunk_id"],
+                            "title": c["title"],
+                            "text": c["text"],
+                            "char_start": c["char_start"],
+                            "indexed_at": c["indexed_at"].isoformat() if c["indexed_at"] else None,
+                        }, ensure_ascii=False) + "\n")
+                    count += len(batch)
+
+            # Header last: the row count is only known now
+            dimensions = dimensions or self.settings.embedding_dimensions
+            with open(os.path.join(snapshot_dir, "vectors.npy"), "wb") as out, open(raw_path, "rb") as raw:
+                np.lib.format.write_array_header_1_0(out, {
+                    "descr": np.lib.format.dtype_to_descr(VECTOR_DTYPE),
+                    "fortran_order": False,
+                    "shape": (count, dimensions),
+                })
+                shutil.copyfileobj(raw, out)
+        except Exception:
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+            raise
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+        route = self.weaviate.project_route(project_id) if backend == "weaviate" else None
+        manifest = {
+            "snapshot_id": snapshot_id,
+            "project_id": project_id,
+            "backend": backend,
+            "chunks": count,
+            "dimensions": dimensions,
+            "embedding_model": self.settings.openai_embedding_model,
+            "chunk_size": route.chunk_size if route and route.chunk_size else self.settings.chunk_size,
+            "chunk_overlap": route.chunk_overlap if route and route.chunk_overlap is not None else self.settings.chunk_overlap,
+            "created_at": time.time(),
+        }
+        self._save(manifest)
+        logger.info(
+            "Exported project %d from %s to snapshot %s: %d chunks in %.1fs",
+            project_id, backend, snapshot_id, count, time.monotonic() - started,
+        )
+        return manifest
+
+    # ── import ──
+
+    def import_snapshot(self, snapshot_id: str, project_id: int | None = None, backend: str = "weaviate") -> dict:
+        """
+        Load a snapshot into a project (default: the project it was exported from).
+
+        Chunks are added to the target project; in Weaviate a chunk that
+        already exists (same doc_id / chunk_id) is overwritten.
+
+        Returns:
+            {"snapshot_id", "project_id", "backend", "chunks"}
+        """
+        manifest = self.load(snapshot_id)
+        store = self._store(backend)
+        if manifest["embedding_model"] != self.settings.openai_embedding_model:
+            raise SnapshotError(
+                f"Snapshot {snapshot_id} was embedded with {manifest['embedding_model']}, "
+                f"this deployment uses {self.settings.openai_embedding_model}"
+            )
+        if manifest["chunks"] and manifest["dimensions"] != self.settings.embedding_dimensions:
+            raise SnapshotError(
+                f"Snapshot {snapshot_id} has {manifest['dimensions']}-dim vectors, "
+                f"expected {self.settings.embedding_dimensions}"
+            )
+        target = manifest["project_id"] if project_id is None else project_id
+
+        snapshot_dir = self._dir(snapshot_id)
+        vectors = np.load(os.path.join(snapshot_dir, "vectors.npy"), mmap_mode="r")
+        if vectors.shape[0] != manifest["chunks"]:
+            raise SnapshotError(f"Snapshot {snapshot_id} is incomplete: {vectors.shape[0]}/{manifest['chunks']} vectors")
+
+        started = time.monotonic()
+        imported = 0
+        batch: list[dict] = []
+        with open(os.path.join(snapshot_dir, "chunks.jsonl"), encoding="utf-8") as lines:
+            for line in lines:
+                batch.append(json.loads(line))
+                if len(batch) >= self.batch_size:
+                    imported += self._write(store, backend, target, batch, vectors[imported:imported + len(batch)])
+                    batch = []
+            if batch:
+                imported += self._write(store, backend, target, batch, vectors[imported:imported + len(batch)])
+
+        if imported != manifest["chunks"]:
+            raise SnapshotError(f"Snapshot {snapshot_id} is incomplete: {imported}/{manifest['chunks']} chunks")
+        self.cache.invalidate_project(target)
+        logger.info(
+            "Imported snapshot %s into %s project %d: %d chunks in %.1fs",
+            snapshot_id, backend, target, imported, time.monotonic() - started,
+        )
+        return {"snapshot_id": snapshot_id, "project_id": target, "backend": backend, "chunks": imported}
+
+    def _write(self, store, backend: str, project_id: int, chunks: list[dict], vectors: np.ndarray) -> int:
+        indexed_at = [datetime.fromisoformat(c["indexed_at"]) if c["indexed_at"] else None for c in chunks]
+        columns = dict(
+            project_id=project_id,
+            doc_ids=[c["doc_id"] for c in chunks],
+            chunk_ids=[c["chunk_id"] for c in chunks],
+            titles=[c["title"] for c in chunks],
+            texts=[c["text"] for c in chunks],
+            indexed_at=indexed_at,
+        )
+        if backend == "milvus":
+            store.insert_chunks(embeddings=np.asarray(vectors).tolist(), **columns)
+        else:
+            store.insert_chunks(
+                embeddings=np.asarray(vectors),
+                char_starts=[c["char_start"] for c in chunks],
+                **columns,
+            )
+        return len(chunks)
+
+    # ── manifest storage ──
+
+    def load(self, snapshot_id: str) -> dict:
+        """The snapshot's manifest."""
+        if not snapshot_id.isalnum():
+            raise SnapshotNotFoundError(f"Unknown snapshot: {snapshot_id}")
+        try:
+            with open(os.path.join(self._dir(snapshot_id), "manifest.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise SnapshotNotFoundError(f"Unknown snapshot: {snapshot_id}") from None
+
+    def _dir(self, snapshot_id: str) -> str:
+        return os.path.join(self.snapshot_dir, snapshot_id)
+
+    def _save(self, manifest: dict):
+        path = os.path.join(self._dir(manifest["snapshot_id"]), "manifest.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, path)   # written last: a snapshot without a manifest is incomplete
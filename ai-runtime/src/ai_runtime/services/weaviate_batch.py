@@ -0,0 +1,234 @@
+"""
+Long-lived Weaviate batch writer, one per project collection.
+
+Why?
+  insert_chunks used to open a fresh `collection.batch.dynamic()` context
+  per call: every document paid the batcher's start-up, small documents
+  produced tiny batches, and `failed_objects` was never checked — objects
+  Weaviate rejected were silently lost.
+
+How it works:
+  - write(objects) queues a document's objects in the project's writer and
+    returns a BatchTicket; insert_chunks waits on it
+  - queued objects from all documents are sent together with
+    `collection.data.insert_many` in batches of `batch_size`:
+      * as soon as a full batch is queued
+      * otherwise after `flush_interval` (a background flusher thread),
+        so a lone small document waits at most that long
+  - batches are sent on a thread pool shared by all writers
+    (`concurrency` requests in flight)
+  - insert_many reports errors per object; failed objects are retried
+    (exponential backoff, `max_retries` times) and what still fails is
+    reported on the ticket of the document it belongs to
+
+Objects carry deterministic UUIDs (collection/doc/chunk), so retrying a batch
+that may have partially landed overwrites instead of duplicating.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+RETRY_BACKOFF_SECONDS = 0.5   # first retry delay; doubles per attempt
+
+
+@dataclass
+class WriteResult:
+    """Outcome of one write(): how many objects landed, and why the rest didn't."""
+    inserted: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class BatchTicket:
+    """Completion handle for the objects of one write() call."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._result = WriteResult()
+        self._settled = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        if size == 0:
+            self._done.set()
+
+    def _settle(self, inserted: int, errors: list[str]):
+        with self._lock:
+            self._result.inserted += inserted
+            self._result.errors.extend(errors)
+            self._settled += inserted + len(errors)
+            if self._settled >= self.size:
+                self._done.set()
+
+    def wait(self, timeout: float | None = None) -> WriteResult:
+        """Block until every object was inserted or finally failed."""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Batch write of {self.size} objects not finished after {timeout}s")
+        return self._result
+
+
+class ProjectBatchWriter:
+    """Queue + batched insert_many for one collection (see module docstring)."""
+
+    def __init__(
+        self,
+        collection,
+        name: str,
+        batch_size: int,
+        flush_interval: float,
+        max_retries: int,
+        executor: ThreadPoolExecutor,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.collection = collection
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._executor = executor
+        self._clock = clock
+        self._pending: list[tuple[object, BatchTicket]] = []
+        self._oldest: float | None = None
+        self._lock = threading.Lock()
+
+    def write(self, objects: list) -> BatchTicket:
+        """Queue objects (weaviate DataObjects); full batches are sent right away."""
+        ticket = BatchTicket(len(objects))
+        with self._lock:
+            if not self._pending:
+                self._oldest = self._clock()
+            self._pending.extend((obj, ticket) for obj in objects)
+            full = len(self._pending) - len(self._pending) % self.batch_size
+            batches = self._take(full)
+        self._submit(batches)
+        return ticket
+
+    def flush(self):
+        """Send everything queued now."""
+        with self._lock:
+            batches = self._take(len(self._pending))
+        self._submit(batches)
+
+    def flush_if_due(self):
+        """Send a partial batch once its oldest object has waited flush_interval."""
+        with self._lock:
+            due = self._oldest is not None and self._clock() - self._oldest >= self.flush_interval
+            batches = self._take(len(self._pending)) if due else []
+        self._submit(batches)
+
+    def _take(self, count: int) -> list[list[tuple[object, BatchTicket]]]:
+        """Remove the first `count` queued objects, split into batches (lock held)."""
+        if count == 0:
+            return []
+        taken, self._pending = self._pending[:count], self._pending[count:]
+        self._oldest = self._clock() if self._pending else None
+        return [taken[i:i + self.batch_size] for i in range(0, len(taken), self.batch_size)]
+
+    def _submit(self, batches: list[list[tuple[object, BatchTicket]]]):
+        for batch in batches:
+            self._executor.submit(self._send, batch)
+
+    def _send(self, batch: list[tuple[object, BatchTicket]]):
+        """insert_many with per-object retries; settles every object's ticket exactly once."""
+        todo = batch
+        failed: list[tuple[object, BatchTicket, str]] = []
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            try:
+                result = self.collection.data.insert_many([obj for obj, _ in todo])
+                errors = {i: error.message for i, error in result.errors.items()}
+            except Exception as e:
+                errors = {i: str(e) for i in range(len(todo))}
+
+            failed = []
+            for i, (obj, ticket) in enumerate(todo):
+                if i in errors:
+                    failed.append((obj, ticket, errors[i]))
+                else:
+                    ticket._settle(1, [])
+            if not failed:
+                return
+            logger.warning(
+                "Weaviate batch into %s: %d/%d objects failed (attempt %d/%d): %s",
+                self.name, len(failed), len(todo), attempt + 1, self.max_retries + 1, failed[0][2],
+            )
+            todo = [(obj, ticket) for obj, ticket, _ in failed]
+
+        for _, ticket, error in failed:
+            ticket._settle(0, [error])
+
+
+class WeaviateBatchWriter:
+    """
+    The per-project ProjectBatchWriters of one Weaviate client, their shared
+    send pool and the background flusher.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        concurrency: int = 4,
+        flush_interval: float = 0.1,
+        max_retries: int = 3,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="weaviate-batch")
+        self._writers: dict[str, ProjectBatchWriter] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def get(self, name: str) -> ProjectBatchWriter | None:
+        """The collection's writer, if one was created."""
+        with self._lock:
+            return self._writers.get(name)
+
+    def writer(self, name: str, collection) -> ProjectBatchWriter:
+        """The long-lived writer for a collection (created on first use)."""
+        with self._lock:
+            writer = self._writers.get(name)
+            if writer is None:
+                writer = self._writers[name] = ProjectBatchWriter(
+                    collection, name, self.batch_size, self.flush_interval, self.max_retries, self._executor,
+                )
+                self._start_flusher()
+            return writer
+
+    def discard(self, name: str):
+        """Flush and forget a collection's writer (e.g. before the collection is dropped)."""
+        with self._lock:
+            writer = self._writers.pop(name, None)
+        if writer is not None:
+            writer.flush()
+
+    def close(self):
+        """Flush every writer and wait for in-flight batches."""
+        self._stop.set()
+        with self._lock:
+            writers = list(self._writers.values())
+        for writer in writers:
+            writer.flush()
+        self._executor.shutdown(wait=True)
+
+    def _start_flusher(self):
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="weaviate-batch-flusher", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        tick = max(self.flush_interval / 2, 0.005)
+        while not self._stop.wait(tick):
+            with self._lock:
+                writers = list(self._writers.values())
+            for writer in writers:
+                try:
+                    writer.flush_if_due()
+                except Exception as e:
+                    logger.error("Weaviate batch flush failed for %s: %s", writer.name, e, exc_info=True)
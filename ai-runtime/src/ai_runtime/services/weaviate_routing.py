@@ -0,0 +1,136 @@
+"""
+Project → Weaviate collection routing table.
+
+Why?
+  A project's chunks normally live in the collection "Kb{project_id}". A
+  rebuild (services/rebuild_service.py) fills a new shadow collection and
+  then has to repoint the project to it in one step, for every worker.
+  Weaviate only has collection aliases from 1.32 on (we run 1.28), so the
+  mapping is kept in a small collection of its own, "KbRouting": one object
+  per rebuilt project, with a deterministic UUID, so a swap is one object
+  write.
+
+Each entry also records the chunking the collection was built with, so
+documents indexed after a rebuild are split the same way as the rest.
+
+Lookups are served from an in-process copy of the whole table, reloaded
+every `ttl_seconds`; after a swap, other workers follow within that time
+(the rebuild waits longer than that before dropping the old collection).
+Projects without an entry use "Kb{project_id}".
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import weaviate.classes as wvc
+from weaviate.util import generate_uuid5
+
+from ai_runtime.exceptions import WeaviateError
+
+logger = logging.getLogger(__name__)
+
+ROUTING_COLLECTION = "KbRouting"
+
+
+@dataclass(frozen=True)
+class ProjectRoute:
+    """Where a project's chunks live, and how they were chunked (None = the global settings)."""
+    collection: str
+    chunk_size: int | None = None
+    chunk_overlap: int | None = None
+
+
+class RoutingTable:
+    def __init__(self, client, ttl_seconds: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._routes: dict[int, ProjectRoute] | None = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, project_id: int) -> ProjectRoute | None:
+        """The project's route, or None if it was never rebuilt."""
+        return self._table().get(project_id)
+
+    def set(self, project_id: int, route: ProjectRoute):
+        """Point a project at a collection (one object write: atomic for readers)."""
+        uuid = generate_uuid5(f"route:{project_id}")
+        properties = {
+            "project_id": project_id,
+            "collection": route.collection,
+            "chunk_size": route.chunk_size,
+            "chunk_overlap": route.chunk_overlap,
+        }
+        try:
+            self._ensure_collection()
+            routes = self.client.collections.get(ROUTING_COLLECTION)
+            if routes.data.exists(uuid):
+                routes.data.replace(uuid=uuid, properties=properties)
+            else:
+                routes.data.insert(properties=properties, uuid=uuid)
+            logger.info("Project %d now routed to Weaviate collection %s", project_id, route.collection)
+        except Exception as e:
+            raise WeaviateError(f"Failed to route project {project_id} to {route.collection}: {e}") from e
+        finally:
+            self.invalidate()
+
+    def remove(self, project_id: int):
+        """Forget a project's route (it falls back to Kb{project_id})."""
+        try:
+            if self.client.collections.exists(ROUTING_COLLECTION):
+                self.client.collections.get(ROUTING_COLLECTION).data.delete_by_id(
+                    generate_uuid5(f"route:{project_id}")
+                )
+        except Exception as e:
+            raise WeaviateError(f"Failed to remove the route of project {project_id}: {e}") from e
+        finally:
+            self.invalidate()
+
+    def invalidate(self):
+        """Reload the table on the next lookup."""
+        with self._lock:
+            self._expires = 0.0
+
+    def _table(self) -> dict[int, ProjectRoute]:
+        with self._lock:
+            if self._routes is not None and self._clock() < self._expires:
+                return self._routes
+            try:
+                self._routes = self._load()
+            except Exception as e:
+                if self._routes is None:
+                    raise WeaviateError(f"Failed to load the Weaviate routing table: {e}") from e
+                logger.warning("Weaviate routing table reload failed, keeping the last copy: %s", e)
+            self._expires = self._clock() + self.ttl_seconds
+            return self._routes
+
+    def _load(self) -> dict[int, ProjectRoute]:
+        if not self.client.collections.exists(ROUTING_COLLECTION):
+            return {}
+        routes = {}
+        for obj in self.client.collections.get(ROUTING_COLLECTION).iterator():
+            p = obj.properties
+            routes[int(p["project_id"])] = ProjectRoute(
+                collection=p["collection"],
+                chunk_size=p.get("chunk_size"),
+                chunk_overlap=p.get("chunk_overlap"),
+            )
+        return routes
+
+    def _ensure_collection(self):
+        if self.client.collections.exists(ROUTING_COLLECTION):
+            return
+        self.client.collections.create(
+            name=ROUTING_COLLECTION,
+            vectorizer_config=wvc.config.Configure.Vectorizer.none(),
+            properties=[
+                wvc.config.Property(name="project_id", data_type=wvc.config.DataType.INT),
+                wvc.config.Property(name="collection", data_type=wvc.config.DataType.TEXT),
+                wvc.config.Property(name="chunk_size", data_type=wvc.config.DataType.INT),
+                wvc.config.Property(name="chunk_overlap", data_type=wvc.config.DataType.INT),
+            ],
+        )
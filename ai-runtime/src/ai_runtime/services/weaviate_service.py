@@ -12,20 +12,34 @@ Contrast with MilvusService (pure vector search, frozen):
 
 Collection naming: same convention as Milvus — one collection per project,
 named "Kb{project_id}" (e.g., Kb1, Kb4). Weaviate requires class names
-to start with an uppercase letter.
+to start with an uppercase letter. A rebuilt project lives in a shadow
+collection "Kb{project_id}_r{timestamp}" instead; the routing table
+(services/weaviate_routing.py) maps it.
 """
 
 import logging
+from datetime import datetime, timezone
+from typing import Iterator
 
+import numpy as np
 import weaviate
 import weaviate.classes as wvc
+from weaviate.classes.init import AdditionalConfig, Timeout
 from weaviate.classes.query import HybridFusion
+from weaviate.util import generate_uuid5
 
 from ai_runtime.config import Settings
 from ai_runtime.exceptions import WeaviateError
+from ai_runtime.models import SearchFilter
+from ai_runtime.services.weaviate_batch import WeaviateBatchWriter
+from ai_runtime.services.weaviate_routing import ProjectRoute, RoutingTable
+from ai_runtime.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+DELETE_MANY_LIMIT = 10_000   # Weaviate's default QUERY_MAXIMUM_RESULTS: most objects one delete_many removes
+FETCH_DOCUMENT_PAGE_SIZE = 1000   # fetch_document pages through a document this many chunks at a time
+
 
 class WeaviateService:
     def __init__(self, settings: Settings):
@@ -34,6 +48,8 @@ class WeaviateService:
             self.client = weaviate.connect_to_local(
                 host=settings.weaviate_host,
                 port=settings.weaviate_port,
+                # Queries take no per-call timeout; this caps how long one abandoned by Deadline.run lingers
+                additional_config=AdditionalConfig(timeout=Timeout(query=settings.weaviate_query_timeout_seconds)),
             )
             logger.info(
                 "Connected to Weaviate at %s:%s",
@@ -45,26 +61,66 @@ class WeaviateService:
             raise WeaviateError(
                 f"Cannot connect to Weaviate at {settings.weaviate_host}:{settings.weaviate_port}: {e}"
             ) from e
+        self.batch_writer = WeaviateBatchWriter(
+            batch_size=settings.weaviate_batch_size,
+            concurrency=settings.weaviate_batch_concurrency,
+            flush_interval=settings.weaviate_batch_flush_interval_seconds,
+            max_retries=settings.weaviate_batch_max_retries,
+        )
+        self.routing = RoutingTable(self.client, ttl_seconds=settings.weaviate_routing_ttl_seconds)
+
+    def is_ready(self) -> bool:
+        """Readiness probe: True if the Weaviate server answers its ready check."""
+        try:
+            return bool(self.client.is_ready())
+        except Exception as e:
+            logger.warning("Weaviate readiness check failed: %s", e)
+            return False
+
+    def close(self):
+        """Flush pending batch writes, then close the client's HTTP and gRPC connections."""
+        self.batch_writer.close()
+        self.client.close()
+        logger.info("Weaviate connection closed")
 
     def _collection_name(self, project_id: int) -> str:
-        """Weaviate class names must start with uppercase: Kb1, Kb4, ..."""
-        return f"Kb{project_id}"
+        """Weaviate class names must start with uppercase: Kb1, Kb4, ... (or the project's rebuilt collection)."""
+        route = self.routing.get(project_id)
+        return route.collection if route is not None else f"Kb{project_id}"
+
+    def collection_name(self, project_id: int) -> str:
+        """The collection currently serving the project."""
+        return self._collection_name(project_id)
+
+    def project_route(self, project_id: int) -> ProjectRoute | None:
+        """The project's routing entry (collection + chunking), None if it was never rebuilt."""
+        return self.routing.get(project_id)
 
-    def ensure_collection(self, project_id: int):
+    @traced("weaviate.ensure_collection")
+    def ensure_collection(self, project_id: int, name: str | None = None, vector_index_config=None):
         """
         Create a Weaviate collection for the project if it doesn't exist.
 
-        Schema (5 properties + 1 vector):
-          - doc_id   INT    which document this chunk belongs to (MySQL kb_docs.id)
-          - chunk_id INT    chunk index within the document (0, 1, 2, ...)
-          - title    TEXT   document title for citations
-          - text     TEXT   the actual chunk text (BM25 indexes this automatically)
-          - vector   FLOAT[] 1536-dim embedding (stored as the object vector)
+        `name` overrides the routed collection (rebuilds create their shadow
+        collection this way); `vector_index_config` (wvc.config.Configure.VectorIndex)
+        overrides Weaviate's default HNSW settings.
+
+        Schema (7 properties + 1 vector):
+          - doc_id     INT    which document this chunk belongs to (MySQL kb_docs.id)
+          - chunk_id   INT    chunk index within the document (0, 1, 2, ...)
+          - title      TEXT   document title for citations
+          - text       TEXT   the actual chunk text (BM25 indexes this automatically)
+          - indexed_at DATE   when the chunk was inserted (for indexed_after filters)
+          - char_start INT    offset of the chunk's first character in the document
+          - vector     FLOAT[] 1536-dim embedding (stored as the object vector)
+
+        Collections created before indexed_at / char_start existed get them from
+        Weaviate's auto-schema on the next insert.
 
         BM25 in Weaviate is automatic — any TEXT property is indexed for
         keyword search with no extra configuration needed.
         """
-        name = self._collection_name(project_id)
+        name = name or self._collection_name(project_id)
         try:
             if self.client.collections.exists(name):
                 logger.debug("Weaviate collection %s already exists", name)
@@ -74,6 +130,7 @@ class WeaviateService:
             self.client.collections.create(
                 name=name,
                 vectorizer_config=wvc.config.Configure.Vectorizer.none(),
+                vector_index_config=vector_index_config,
                 properties=[
                     wvc.config.Property(
                         name="doc_id",
@@ -91,6 +148,14 @@ class WeaviateService:
                         name="text",
                         data_type=wvc.config.DataType.TEXT,
                     ),
+                    wvc.config.Property(
+                        name="indexed_at",
+                        data_type=wvc.config.DataType.DATE,
+                    ),
+                    wvc.config.Property(
+                        name="char_start",
+                        data_type=wvc.config.DataType.INT,
+                    ),
                 ],
             )
             logger.info("Weaviate collection %s created", name)
@@ -101,6 +166,7 @@ class WeaviateService:
             logger.error("Failed to ensure Weaviate collection %s: %s", name, e, exc_info=True)
             raise WeaviateError(f"Failed to create/access Weaviate collection {name}: {e}") from e
 
+    @traced("weaviate.insert_chunks")
     def insert_chunks(
         self,
         project_id: int,
@@ -108,42 +174,63 @@ class WeaviateService:
         chunk_ids: list[int],
         titles: list[str],
         texts: list[str],
-        embeddings: list[list[float]],
+        embeddings: np.ndarray | list[list[float]],
+        char_starts: list[int] | None = None,
+        collection: str | None = None,
+        indexed_at: datetime | list[datetime | None] | None = None,
     ) -> int:
         """
-        Insert a batch of chunks into the Weaviate collection.
+        Insert a batch of chunks into the Weaviate collection
+        (`collection` overrides the project's routed collection; `indexed_at`
+        keeps original timestamps — one for all chunks or one per chunk — when
+        chunks are copied between collections or restored from a snapshot).
 
         Each chunk is stored as a Weaviate object with:
-          - properties: doc_id, chunk_id, title, text
-          - vector: the 1536-dim embedding (passed explicitly since vectorizer=none)
-
-        Uses batch insert for efficiency.
-
-        Returns the number of chunks inserted.
+          - properties: doc_id, chunk_id, title, text, indexed_at (now, UTC),
+                        char_start (when given)
+          - vector: the 1536-dim embedding (passed explicitly since vectorizer=none);
+                    rows of EmbeddingService's float32 matrix are handed to the
+                    client as-is and only serialized when the batch is sent
+
+        Objects go through the project's long-lived batch writer (see
+        services/weaviate_batch.py), so chunks of concurrently indexed documents
+        share insert_many batches; rejected objects are retried there. Object
+        UUIDs are derived from (project, doc_id, chunk_id), so a retried or
+        re-indexed chunk overwrites its previous copy.
+
+        Returns the number of chunks inserted. Raises WeaviateError if any
+        chunk still failed after the retries.
         """
         try:
-            self.ensure_collection(project_id)
-            name = self._collection_name(project_id)
-            collection = self.client.collections.get(name)
+            name = collection or self._collection_name(project_id)
+            writer = self.batch_writer.get(name)
+            if writer is None:
+                self.ensure_collection(project_id, name=name)
+                writer = self.batch_writer.writer(name, self.client.collections.get(name))
 
             logger.info("Inserting %d chunks into Weaviate project %d", len(doc_ids), project_id)
-
-            with collection.batch.dynamic() as batch:
-                for doc_id, chunk_id, title, text, embedding in zip(
-                    doc_ids, chunk_ids, titles, texts, embeddings
-                ):
-                    batch.add_object(
-                        properties={
-                            "doc_id": doc_id,
-                            "chunk_id": chunk_id,
-                            "title": title,
-                            "text": text,
-                        },
-                        vector=embedding,
-                    )
-
-            logger.info("Weaviate insert complete: %d chunks", len(doc_ids))
-            return len(doc_ids)
+            now = datetime.now(timezone.utc)
+
+            objects = []
+            for i, (doc_id, chunk_id, title, text, embedding) in enumerate(zip(
+                doc_ids, chunk_ids, titles, texts, embeddings
+            )):
+                properties = {
+                    "doc_id": doc_id,
+                    "chunk_id": chunk_id,
+                    "title": title,
+                    "text": text,
+                    "indexed_at": (indexed_at[i] if isinstance(indexed_at, list) else indexed_at) or now,
+                }
+                if char_starts is not None and char_starts[i] is not None:
+                    properties["char_start"] = char_starts[i]
+                objects.append(wvc.data.DataObject(
+                    properties=properties,
+                    vector=embedding,
+                    uuid=generate_uuid5(f"{name}:{doc_id}:{chunk_id}"),
+                ))
+
+            result = writer.write(objects).wait()
 
         except WeaviateError:
             raise
@@ -155,6 +242,35 @@ class WeaviateService:
                 f"Failed to insert chunks into Weaviate project {project_id}: {e}"
             ) from e
 
+        if result.errors:
+            logger.error(
+                "Weaviate insert into project %d: %d inserted, %d failed (first error: %s)",
+                project_id, result.inserted, len(result.errors), result.errors[0],
+            )
+            raise WeaviateError(
+                f"Failed to insert chunks into Weaviate project {project_id}: "
+                f"{result.inserted} inserted, {len(result.errors)} failed ({result.errors[0]})"
+            )
+
+        logger.info("Weaviate insert complete: %d chunks", result.inserted)
+        return result.inserted
+
+    @staticmethod
+    def _where(filters: SearchFilter | None):
+        """Translate a SearchFilter into a Weaviate filter (None = no filtering)."""
+        if filters is None or filters.is_empty():
+            return None
+        Filter = wvc.query.Filter
+        clauses = []
+        if filters.doc_ids is not None:
+            clauses.append(Filter.by_property("doc_id").contains_any(filters.doc_ids))
+        if filters.title_like is not None:
+            clauses.append(Filter.by_property("title").like(filters.title_like))
+        if filters.indexed_after is not None:
+            clauses.append(Filter.by_property("indexed_at").greater_than(filters.indexed_after))
+        return Filter.all_of(clauses)
+
+    @traced("weaviate.hybrid_search")
     def hybrid_search(
         self,
         project_id: int,
@@ -162,6 +278,7 @@ class WeaviateService:
         query_embedding: list[float],
         alpha: float,
         top_k: int,
+        filters: SearchFilter | None = None,
     ) -> list[dict]:
         """
         Hybrid search: combine vector similarity + BM25 keyword search.
@@ -172,9 +289,11 @@ class WeaviateService:
             query_embedding: vector of the query (used for semantic matching)
             alpha:           blend ratio — 0.0 = pure BM25, 1.0 = pure vector
             top_k:           number of results to return
+            filters:         metadata pre-filter, applied inside Weaviate to
+                             both the vector and the BM25 search
 
         Returns:
-            List of dicts with: doc_id, chunk_id, title, text, score
+            List of dicts with: doc_id, chunk_id, title, text, char_start, score
 
         Weaviate's hybrid search runs both paths in parallel and merges
         results using RRF (Reciprocal Rank Fusion) internally.
@@ -186,12 +305,15 @@ class WeaviateService:
                 "Weaviate collection %s does not exist, returning empty results", name
             )
             return []
+        if filters is not None and filters.doc_ids == []:
+            return []   # scoped to no documents
 
         try:
             collection = self.client.collections.get(name)
+            where = self._where(filters)
             logger.info(
-                "Weaviate hybrid search: collection=%s, alpha=%.2f, top_k=%d",
-                name, alpha, top_k,
+                "Weaviate hybrid search: collection=%s, alpha=%.2f, top_k=%d, filtered=%s",
+                name, alpha, top_k, where is not None,
             )
 
             response = collection.query.hybrid(
@@ -200,6 +322,7 @@ class WeaviateService:
                 alpha=alpha,
                 limit=top_k,
                 fusion_type=HybridFusion.RELATIVE_SCORE,
+                filters=where,
                 return_metadata=wvc.query.MetadataQuery(score=True),
             )
 
@@ -210,6 +333,7 @@ class WeaviateService:
                     "chunk_id": obj.properties.get("chunk_id"),
                     "title": obj.properties.get("title"),
                     "text": obj.properties.get("text"),
+                    "char_start": obj.properties.get("char_start"),
                     "score": obj.metadata.score if obj.metadata else 0.0,
                 })
 
@@ -222,30 +346,405 @@ class WeaviateService:
             )
             raise WeaviateError(f"Hybrid search failed on project {project_id}: {e}") from e
 
-    def delete_by_doc_id(self, project_id: int, doc_id: int):
-        """Delete all chunks belonging to a specific document."""
+    @traced("weaviate.fetch_candidates")
+    def fetch_candidates(
+        self,
+        project_id: int,
+        query: str,
+        query_embedding: list[float],
+        limit: int,
+        filters: SearchFilter | None = None,
+    ) -> list[dict]:
+        """
+        Fetch BM25 and vector candidates separately, with raw per-modality scores.
+
+        Unlike hybrid_search (which fuses server-side for one alpha), this
+        returns the union of the top `limit` BM25 hits and the top `limit`
+        vector hits, so fusion for any number of alpha values can run
+        locally on the same pool (see services/fusion.py).
+
+        Returns:
+            List of dicts with: doc_id, chunk_id, title, text,
+            bm25_score (None if not a BM25 hit), vector_score (1 - cosine
+            distance; None if not a vector hit)
+        """
         name = self._collection_name(project_id)
 
+        if not self.client.collections.exists(name):
+            logger.warning(
+                "Weaviate collection %s does not exist, returning no candidates", name
+            )
+            return []
+        if filters is not None and filters.doc_ids == []:
+            return []
+
+        try:
+            collection = self.client.collections.get(name)
+            where = self._where(filters)
+            bm25 = collection.query.bm25(
+                query=query,
+                limit=limit,
+                filters=where,
+                return_metadata=wvc.query.MetadataQuery(score=True),
+            )
+            vector = collection.query.near_vector(
+                near_vector=query_embedding,
+                limit=limit,
+                filters=where,
+                return_metadata=wvc.query.MetadataQuery(distance=True),
+            )
+
+            candidates: dict[tuple, dict] = {}
+
+            def candidate(obj) -> dict:
+                key = (obj.properties.get("doc_id"), obj.properties.get("chunk_id"))
+                if key not in candidates:
+                    candidates[key] = {
+                        "doc_id": key[0],
+                        "chunk_id": key[1],
+                        "title": obj.properties.get("title"),
+                        "text": obj.properties.get("text"),
+                        "bm25_score": None,
+                        "vector_score": None,
+                    }
+                return candidates[key]
+
+            for obj in bm25.objects:
+                candidate(obj)["bm25_score"] = obj.metadata.score if obj.metadata else 0.0
+            for obj in vector.objects:
+                distance = obj.metadata.distance if obj.metadata else None
+                candidate(obj)["vector_score"] = 1.0 - distance if distance is not None else 0.0
+
+            logger.info(
+                "Weaviate candidates for project %d: %d BM25, %d vector, %d unique",
+                project_id, len(bm25.objects), len(vector.objects), len(candidates),
+            )
+            return list(candidates.values())
+
+        except Exception as e:
+            logger.error(
+                "Weaviate candidate fetch failed on project %d: %s", project_id, e, exc_info=True
+            )
+            raise WeaviateError(f"Candidate fetch failed on project {project_id}: {e}") from e
+
+    @traced("weaviate.fetch_chunks")
+    def fetch_chunks(self, project_id: int, keys: list[tuple[int, int]]) -> list[dict]:
+        """
+        Fetch specific chunks by (doc_id, chunk_id) in one filtered query.
+
+        The wanted chunk_ids of each document are collapsed into contiguous
+        ranges, so neighbor windows (chunk_id ± n) become one
+        `doc_id = d AND lo <= chunk_id <= hi` clause each, OR-ed together.
+
+        Returns:
+            List of dicts with: doc_id, chunk_id, title, text, char_start (chunks that
+            don't exist, e.g. past the end of a document, are simply absent)
+        """
+        name = self._collection_name(project_id)
+        wanted = set(keys)
+        if not wanted:
+            return []
+
+        if not self.client.collections.exists(name):
+            logger.warning(
+                "Weaviate collection %s does not exist, returning no chunks", name
+            )
+            return []
+
+        by_doc: dict[int, list[int]] = {}
+        for doc_id, chunk_id in sorted(wanted):
+            by_doc.setdefault(doc_id, []).append(chunk_id)
+
+        Filter = wvc.query.Filter
+        clauses = []
+        for doc_id, chunk_ids in by_doc.items():
+            start = previous = chunk_ids[0]
+            for chunk_id in chunk_ids[1:] + [None]:
+                if chunk_id is not None and chunk_id == previous + 1:
+                    previous = chunk_id
+                    continue
+                clauses.append(
+                    Filter.by_property("doc_id").equal(doc_id)
+                    & Filter.by_property("chunk_id").greater_or_equal(start)
+                    & Filter.by_property("chunk_id").less_or_equal(previous)
+                )
+                if chunk_id is not None:
+                    start = previous = chunk_id
+
+        try:
+            collection = self.client.collections.get(name)
+            response = collection.query.fetch_objects(
+                filters=Filter.any_of(clauses),
+                limit=len(wanted),
+            )
+
+            chunks = []
+            for obj in response.objects:
+                key = (obj.properties.get("doc_id"), obj.properties.get("chunk_id"))
+                if key in wanted:
+                    chunks.append({
+                        "doc_id": key[0],
+                        "chunk_id": key[1],
+                        "title": obj.properties.get("title"),
+                        "text": obj.properties.get("text"),
+                        "char_start": obj.properties.get("char_start"),
+                    })
+
+            logger.info(
+                "Weaviate fetched %d/%d chunks (%d ranges) from project %d",
+                len(chunks), len(wanted), len(clauses), project_id,
+            )
+            return chunks
+
+        except Exception as e:
+            logger.error(
+                "Weaviate chunk fetch failed on project %d: %s", project_id, e, exc_info=True
+            )
+            raise WeaviateError(f"Chunk fetch failed on project {project_id}: {e}") from e
+
+    def delete_by_doc_id(self, project_id: int, doc_id: int) -> int:
+        """Delete all chunks belonging to a specific document."""
+        return self.delete_documents(project_id, [doc_id])
+
+    @traced("weaviate.delete_documents")
+    def delete_documents(self, project_id: int, doc_ids: list[int], collection: str | None = None) -> int:
+        """
+        Delete all chunks of the given documents with one `doc_id IN (...)` filter
+        (`collection` overrides the project's routed collection).
+
+        Weaviate caps one delete_many at QUERY_MAXIMUM_RESULTS objects, so the
+        call is repeated while it keeps hitting that cap (_delete_where).
+
+        Returns the number of chunks deleted.
+        """
+        if not doc_ids:
+            return 0
+        name = collection or self._collection_name(project_id)
+
         if not self.client.collections.exists(name):
             logger.warning(
                 "Weaviate collection %s does not exist, nothing to delete", name
             )
-            return
+            return 0
 
         try:
             collection = self.client.collections.get(name)
             logger.info(
-                "Deleting Weaviate chunks with doc_id=%d from %s", doc_id, name
+                "Deleting Weaviate chunks of %d documents from %s", len(doc_ids), name
+            )
+            where = wvc.query.Filter.by_property("doc_id").contains_any(doc_ids)
+            deleted = self._delete_where(collection, where, project_id)
+            logger.info(
+                "Weaviate delete complete: %d chunks of %d documents in %s", deleted, len(doc_ids), name
+            )
+            return deleted
+
+        except WeaviateError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Weaviate delete failed for doc_ids=%s in %s: %s", doc_ids, name, e, exc_info=True
+            )
+            raise WeaviateError(
+                f"Failed to delete doc_ids={doc_ids} from Weaviate project {project_id}: {e}"
+            ) from e
+
+    @traced("weaviate.delete_chunk_range")
+    def delete_chunk_range(self, project_id: int, doc_id: int, start: int, stop: int | None = None) -> int:
+        """
+        Delete one document's chunks with start <= chunk_id < stop (no stop:
+        every chunk from start on). Used by streaming indexing to undo its own
+        writes, or to drop a previous version's trailing chunks, without
+        touching the rest of the document.
+
+        Returns the number of chunks deleted.
+        """
+        name = self._collection_name(project_id)
+        if not self.client.collections.exists(name):
+            return 0
+
+        try:
+            collection = self.client.collections.get(name)
+            where = (
+                wvc.query.Filter.by_property("doc_id").equal(doc_id)
+                & wvc.query.Filter.by_property("chunk_id").greater_or_equal(start)
             )
-            collection.data.delete_many(
-                where=wvc.query.Filter.by_property("doc_id").equal(doc_id)
+            if stop is not None:
+                where = where & wvc.query.Filter.by_property("chunk_id").less_than(stop)
+            deleted = self._delete_where(collection, where, project_id)
+            logger.info(
+                "Weaviate delete complete: %d chunks of doc_id=%d (chunk_id %d..%s) in %s",
+                deleted, doc_id, start, "" if stop is None else stop - 1, name,
             )
-            logger.info("Weaviate delete complete for doc_id=%d in %s", doc_id, name)
+            return deleted
 
+        except WeaviateError:
+            raise
         except Exception as e:
             logger.error(
-                "Weaviate delete failed for doc_id=%d in %s: %s", doc_id, name, e, exc_info=True
+                "Weaviate chunk delete failed for doc_id=%d in %s: %s", doc_id, name, e, exc_info=True
             )
             raise WeaviateError(
-                f"Failed to delete doc_id={doc_id} from Weaviate project {project_id}: {e}"
+                f"Failed to delete chunks of doc_id={doc_id} from Weaviate project {project_id}: {e}"
             ) from e
+
+    @staticmethod
+    def _delete_where(collection, where, project_id: int) -> int:
+        """
+        delete_many(where) until everything matching is gone — Weaviate caps one
+        call at QUERY_MAXIMUM_RESULTS objects. Returns the number deleted.
+        """
+        deleted = 0
+        while True:
+            result = collection.data.delete_many(where=where)
+            deleted += result.successful
+            if result.failed:
+                raise WeaviateError(
+                    f"Failed to delete {result.failed} of {result.matches} chunks "
+                    f"from Weaviate project {project_id}"
+                )
+            if result.matches < DELETE_MANY_LIMIT:
+                return deleted
+
+    @traced("weaviate.delete_project")
+    def delete_project(self, project_id: int) -> bool:
+        """
+        Drop the project's whole collection (all documents, schema included)
+        and its routing entry, if it was rebuilt.
+
+        Returns False if the collection did not exist.
+        """
+        name = self._collection_name(project_id)
+        existed = self.drop_collection(name)
+        if name != f"Kb{project_id}":
+            self.routing.remove(project_id)
+        return existed
+
+    def drop_collection(self, name: str) -> bool:
+        """
+        Drop one collection by name. Queued batch writes are flushed and its
+        writer discarded first, so the next insert re-creates the collection.
+
+        Returns False if the collection did not exist.
+        """
+        try:
+            self.batch_writer.discard(name)
+            if not self.client.collections.exists(name):
+                logger.warning(
+                    "Weaviate collection %s does not exist, nothing to drop", name
+                )
+                return False
+            logger.info("Dropping Weaviate collection %s", name)
+            self.client.collections.delete(name)
+            return True
+
+        except Exception as e:
+            logger.error("Failed to drop Weaviate collection %s: %s", name, e, exc_info=True)
+            raise WeaviateError(f"Failed to drop Weaviate collection {name}: {e}") from e
+
+    def document_index(self, name: str) -> dict[int, datetime | None]:
+        """
+        Every document in a collection with its latest indexed_at (None if
+        never recorded). Walks the collection with a cursor, reading only
+        these two properties.
+        """
+        try:
+            documents: dict[int, datetime | None] = {}
+            for obj in self.client.collections.get(name).iterator(return_properties=["doc_id", "indexed_at"]):
+                doc_id = obj.properties.get("doc_id")
+                indexed_at = obj.properties.get("indexed_at")
+                latest = documents.get(doc_id)
+                documents[doc_id] = indexed_at if latest is None or (indexed_at and indexed_at > latest) else latest
+            return documents
+
+        except Exception as e:
+            logger.error("Failed to list documents of Weaviate collection %s: %s", name, e, exc_info=True)
+            raise WeaviateError(f"Failed to list documents of Weaviate collection {name}: {e}") from e
+
+    def iter_chunks(self, project_id: int, batch_size: int) -> Iterator[list[dict]]:
+        """
+        Every chunk of the project with its vector, in batches of `batch_size`.
+
+        Uses Weaviate's cursor API (after-UUID paging), so memory stays at one
+        batch however large the project is.
+
+        Yields:
+            Lists of dicts with: doc_id, chunk_id, title, text, char_start,
+            indexed_at, vector
+        """
+        name = self._collection_name(project_id)
+        if not self.client.collections.exists(name):
+            logger.warning("Weaviate collection %s does not exist, no chunks to read", name)
+            return
+        try:
+            batch = []
+            for obj in self.client.collections.get(name).iterator(include_vector=True, cache_size=batch_size):
+                vector = obj.vector
+                batch.append({
+                    "doc_id": obj.properties.get("doc_id"),
+                    "chunk_id": obj.properties.get("chunk_id"),
+                    "title": obj.properties.get("title"),
+                    "text": obj.properties.get("text"),
+                    "char_start": obj.properties.get("char_start"),
+                    "indexed_at": obj.properties.get("indexed_at"),
+                    "vector": vector.get("default") if isinstance(vector, dict) else vector,
+                })
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        except Exception as e:
+            logger.error("Failed to read chunks of Weaviate project %d: %s", project_id, e, exc_info=True)
+            raise WeaviateError(f"Failed to read chunks of Weaviate project {project_id}: {e}") from e
+
+    @traced("weaviate.fetch_document")
+    def fetch_document(self, name: str, doc_id: int, include_vector: bool = False) -> list[dict]:
+        """
+        All chunks of one document in a collection, ordered by chunk_id.
+
+        Pages through the document by chunk_id (keyset paging: `chunk_id >
+        last seen`, sorted), so documents of any size come back complete —
+        a single fetch_objects would stop at QUERY_MAXIMUM_RESULTS and a
+        rebuild would silently swap in a truncated document.
+
+        Returns:
+            List of dicts with: doc_id, chunk_id, title, text, char_start,
+            vector (only with include_vector)
+        """
+        try:
+            collection = self.client.collections.get(name)
+            chunks = []
+            last_chunk_id = None
+            while True:
+                filters = wvc.query.Filter.by_property("doc_id").equal(doc_id)
+                if last_chunk_id is not None:
+                    filters = filters & wvc.query.Filter.by_property("chunk_id").greater_than(last_chunk_id)
+                response = collection.query.fetch_objects(
+                    filters=filters,
+                    sort=wvc.query.Sort.by_property("chunk_id", ascending=True),
+                    limit=FETCH_DOCUMENT_PAGE_SIZE,
+                    include_vector=include_vector,
+                )
+                for obj in response.objects:
+                    chunk = {
+                        "doc_id": obj.properties.get("doc_id"),
+                        "chunk_id": obj.properties.get("chunk_id"),
+                        "title": obj.properties.get("title"),
+                        "text": obj.properties.get("text"),
+                        "char_start": obj.properties.get("char_start"),
+                    }
+                    if include_vector:
+                        vector = obj.vector
+                        chunk["vector"] = vector.get("default") if isinstance(vector, dict) else vector
+                    chunks.append(chunk)
+                if len(response.objects) < FETCH_DOCUMENT_PAGE_SIZE:
+                    return chunks
+                last_chunk_id = chunks[-1]["chunk_id"]
+
+        except Exception as e:
+            logger.error(
+                "Failed to fetch doc_id=%d from Weaviate collection %s: %s", doc_id, name, e, exc_info=True
+            )
+            raise WeaviateError(f"Failed to fetch doc_id={doc_id} from Weaviate collection {name}: {e}") from e
@@ -0,0 +1,426 @@
+"""
+Request tracing: spans around routes and upstream calls, W3C trace context.
+
+Why?
+  A slow Platform API call could be slow in Platform API, in ai-runtime,
+  or in OpenAI / Weaviate / Bedrock behind it — per-service logs can't
+  say which. Spans that join the caller's trace can.
+
+What is traced:
+  - every HTTP request (TracingMiddleware): one server span, child of the
+    caller's span when a `traceparent` header is sent
+  - routes and service methods decorated with @traced(name): one span per
+    call with project_id / doc_id / top_k / alpha / top_n, `<arg>.count`
+    for list arguments (texts, doc_ids, chunks, keys) and `result.count`
+  - service code adds its own attributes to the current span with
+    set_attribute() (OpenAI token counts, cache hits, ...)
+
+Exporters (TRACING_EXPORTER):
+  - none     (default) nothing is recorded; @traced costs one check per call
+  - console  one JSON line per finished span on stderr
+  - file     one JSON line per finished span appended to TRACING_FILE
+  - otlp     OpenTelemetry SDK + OTLP/HTTP exporter (TRACING_OTLP_ENDPOINT);
+             needs opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http,
+             which are optional — without them tracing stays off (logged)
+
+TRACING_SAMPLE_RATE applies to traces that start here; an incoming
+traceparent's sampled flag is followed. The current span lives in a
+contextvar, so it follows run_in_threadpool and Deadline.run into worker
+threads; plain executor submits need contextvars.copy_context().run.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import numpy as np
+
+from ai_runtime.config import Settings
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+
+# Scalar arguments recorded as span attributes by @traced
+TRACED_ARGUMENTS = ("project_id", "doc_id", "top_k", "alpha", "top_n", "window")
+# List arguments recorded as "<name>.count"
+COUNTED_ARGUMENTS = ("texts", "doc_ids", "chunks", "keys", "project_ids")
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str    # 32 hex digits
+    span_id: str     # 16 hex digits
+    sampled: bool = True
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    """SpanContext from a W3C `traceparent` header (version 00), None if absent or malformed."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or parts[0] == "ff" or len(parts[0]) != 2:
+        return None
+    trace_id, span_id, flags = parts[1], parts[2], parts[3]
+    try:
+        if len(trace_id) != 32 or len(span_id) != 16 or len(flags) != 2:
+            return None
+        if int(trace_id, 16) == 0 or int(span_id, 16) == 0:
+            return None
+        sampled = bool(int(flags, 16) & 0x01)
+    except ValueError:
+        return None
+    return SpanContext(trace_id.lower(), span_id.lower(), sampled)
+
+
+def format_traceparent(context: SpanContext) -> str:
+    return f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+
+
+class Span:
+    """A span of the built-in tracer (console / file exporters)."""
+
+    def __init__(self, name: str, context: SpanContext, parent_id: str | None, attributes: dict):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms: float | None = None
+        self.status = "ok"
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def update_name(self, name: str):
+        self.name = name
+
+    def record_exception(self, exc: BaseException):
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def end(self):
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stands in for a span when tracing is off or the trace isn't sampled."""
+
+    def set_attribute(self, key: str, value):
+        pass
+
+    def update_name(self, name: str):
+        pass
+
+    def record_exception(self, exc: BaseException):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+# Current span of the built-in tracer (NOOP_SPAN inside an unsampled trace)
+_current: contextvars.ContextVar["Span | _NoopSpan | None"] = contextvars.ContextVar("span", default=None)
+
+
+# ── exporters (built-in tracer) ──
+
+class ConsoleExporter:
+    def __init__(self, stream=None):
+        self._stream = stream or sys.stderr
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            print(line, file=self._stream, flush=True)
+
+    def close(self):
+        pass
+
+
+class FileExporter:
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", buffering=1)   # line-buffered
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+# ── tracers ──
+
+class Tracer:
+    """Built-in tracer: spans in a contextvar, handed to an exporter when they end."""
+
+    def __init__(self, exporter, sample_rate: float = 1.0, sampler: Callable[[], float] = random.random):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self._sampler = sampler
+
+    @contextmanager
+    def span(self, name: str, parent: SpanContext | None = None, **attributes) -> Iterator[Span | _NoopSpan]:
+        current = _current.get()
+        if parent is None and isinstance(current, _NoopSpan):
+            yield NOOP_SPAN   # inside an unsampled trace
+            return
+        if parent is None and current is not None:
+            parent = current.context
+
+        sampled = parent.sampled if parent is not None else self._sampler() < self.sample_rate
+        if not sampled:
+            reset = _current.set(NOOP_SPAN)
+            try:
+                yield NOOP_SPAN
+            finally:
+                _current.reset(reset)
+            return
+
+        context = SpanContext(
+            trace_id=parent.trace_id if parent is not None else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+        )
+        span = Span(name, context, parent.span_id if parent is not None else None, attributes)
+        reset = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current.reset(reset)
+            span.end()
+            try:
+                self.exporter.export(span)
+            except Exception as e:
+                logger.warning("Could not export span %s: %s", name, e)
+
+    def current_span(self) -> Span | _NoopSpan:
+        return _current.get() or NOOP_SPAN
+
+    def shutdown(self):
+        self.exporter.close()
+
+
+class OtelTracer:
+    """OpenTelemetry SDK tracer with the OTLP/HTTP exporter (optional dependencies)."""
+
+    def __init__(self, settings: Settings):
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+        from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+        self._trace = trace
+        self._propagator = TraceContextTextMapPropagator()
+        self._provider = TracerProvider(
+            resource=Resource.create({"service.name": settings.tracing_service_name}),
+            sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_rate)),
+        )
+        endpoint = settings.tracing_otlp_endpoint
+        exporter = OTLPSpanExporter(endpoint=endpoint) if endpoint else OTLPSpanExporter()
+        self._provider.add_span_processor(BatchSpanProcessor(exporter))
+        self._tracer = self._provider.get_tracer("ai_runtime")
+
+    @contextmanager
+    def span(self, name: str, parent: SpanContext | None = None, **attributes):
+        context = None
+        if parent is not None:
+            context = self._propagator.extract({TRACEPARENT_HEADER: format_traceparent(parent)})
+        with self._tracer.start_as_current_span(name, context=context, attributes=attributes) as span:
+            yield span
+
+    def current_span(self):
+        return self._trace.get_current_span()
+
+    def shutdown(self):
+        self._provider.shutdown()
+
+
+_tracer: Tracer | OtelTracer | None = None
+
+
+def configure(settings: Settings):
+    """Set up the tracer for TRACING_EXPORTER (called once at startup)."""
+    global _tracer
+    shutdown()
+    exporter = settings.tracing_exporter
+    if exporter == "none":
+        return
+    if exporter == "otlp":
+        try:
+            _tracer = OtelTracer(settings)
+        except ImportError as e:
+            logger.warning("TRACING_EXPORTER=otlp but OpenTelemetry is not installed (%s) — tracing off", e)
+            return
+    elif exporter == "console":
+        _tracer = Tracer(ConsoleExporter(), settings.tracing_sample_rate)
+    elif exporter == "file":
+        _tracer = Tracer(FileExporter(settings.tracing_file), settings.tracing_sample_rate)
+    else:
+        logger.warning("Unknown TRACING_EXPORTER %r — tracing off", exporter)
+        return
+    logger.info("Tracing enabled: exporter=%s, sample_rate=%.2f", exporter, settings.tracing_sample_rate)
+
+
+def shutdown():
+    """Flush and close the exporter; tracing is off afterwards."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        try:
+            tracer.shutdown()
+        except Exception as e:
+            logger.warning("Error shutting down tracer: %s", e)
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, parent: SpanContext | None = None, **attributes):
+    """Context manager around a block of work (a no-op when tracing is off)."""
+    if _tracer is None:
+        return nullcontext(NOOP_SPAN)
+    return _tracer.span(name, parent=parent, **attributes)
+
+
+def set_attribute(key: str, value):
+    """Set an attribute on the current span (no-op when tracing is off or nothing is traced)."""
+    if _tracer is not None and value is not None:
+        _tracer.current_span().set_attribute(key, value)
+
+
+def _call_attributes(signature: inspect.Signature, args: tuple, kwargs: dict) -> dict:
+    try:
+        arguments = signature.bind_partial(*args, **kwargs).arguments
+    except TypeError:
+        return {}
+    attributes = {}
+    for name in TRACED_ARGUMENTS:
+        value = arguments.get(name)
+        if isinstance(value, (int, float, str, bool)):
+            attributes[name] = value
+    for name in COUNTED_ARGUMENTS:
+        value = arguments.get(name)
+        if isinstance(value, (list, tuple, np.ndarray)):
+            attributes[f"{name}.count"] = len(value)
+    request = arguments.get("request")
+    if "project_id" not in attributes and isinstance(getattr(request, "project_id", None), int):
+        attributes["project_id"] = request.project_id
+    return attributes
+
+
+def _record_result(span, result):
+    if isinstance(result, (list, tuple, np.ndarray)):
+        span.set_attribute("result.count", len(result))
+    elif isinstance(result, int) and not isinstance(result, bool):
+        span.set_attribute("result.count", result)
+
+
+def traced(name: str):
+    """
+    Decorator: run every call in a span called `name`, with the call's
+    project_id / counts as attributes (see TRACED_ARGUMENTS). Works on sync
+    and async functions; the signature seen by FastAPI is unchanged.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return await fn(*args, **kwargs)
+                with span(name, **_call_attributes(signature, args, kwargs)) as s:
+                    result = await fn(*args, **kwargs)
+                    _record_result(s, result)
+                    return result
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return fn(*args, **kwargs)
+                with span(name, **_call_attributes(signature, args, kwargs)) as s:
+                    result = fn(*args, **kwargs)
+                    _record_result(s, result)
+                    return result
+
+        return wrapper
+
+    return decorator
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware: one server span per HTTP request, joined to the
+    caller's trace through its `traceparent` header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for key, value in scope.get("headers", ()):
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        method = scope["method"]
+        with span(
+            f"{method} {scope['path']}",
+            parent=parse_traceparent(traceparent),
+            **{"http.method": method, "http.target": scope["path"]},
+        ) as server_span:
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    server_span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None and getattr(route, "path", None):
+                    server_span.update_name(f"{method} {route.path}")
+                    server_span.set_attribute("http.route", route.path)
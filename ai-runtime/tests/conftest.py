@@ -10,10 +10,14 @@ Why conftest.py?
   - Keeps test files focused on test logic, not setup boilerplate
 """
 
+import base64
+
+import numpy as np
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 
 from ai_runtime.config import Settings
+from ai_runtime.services.cache_service import InMemoryCacheBackend, TieredCache
 
 
 @pytest.fixture
@@ -88,15 +92,17 @@ def mock_openai_client(fake_embedding):
 
     Simulates: client.embeddings.create(model=..., input=[...])
     returning a response with .data[i].embedding = fake_embedding
+    (base64-encoded float32 when encoding_format="base64", like the real API)
     """
     mock_client = Mock()
+    packed = base64.b64encode(np.asarray(fake_embedding, dtype="<f4").tobytes()).decode()
 
-    def make_embedding_response(model, input):
+    def make_embedding_response(model, input, encoding_format=None, **kwargs):
         """Build a fake response with one embedding per input text."""
         mock_items = []
         for _ in input:
             item = Mock()
-            item.embedding = fake_embedding
+            item.embedding = packed if encoding_format == "base64" else fake_embedding
             mock_items.append(item)
 
         response = Mock()
@@ -105,3 +111,12 @@ def mock_openai_client(fake_embedding):
 
     mock_client.embeddings.create.side_effect = make_embedding_response
     return mock_client
+
+
+@pytest.fixture
+def memory_cache(base_settings) -> TieredCache:
+    """
+    A TieredCache backed by the in-memory stand-in for Redis.
+    Fresh per test, so cached values never leak between tests.
+    """
+    return TieredCache(InMemoryCacheBackend(), base_settings)
@@ -0,0 +1,86 @@
+"""
+Unit tests for AnswerCache.
+
+Runs on a TieredCache with the in-memory backend — no Redis needed.
+We check key construction, exact and semantic hits, TTL expiry, and
+per-project invalidation.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from ai_runtime.services.answer_cache import AnswerCache
+
+
+@pytest.fixture
+def cache(base_settings, memory_cache) -> AnswerCache:
+    base_settings.answer_cache_ttl_seconds = 60
+    base_settings.answer_cache_similarity_threshold = None
+    return AnswerCache(base_settings, memory_cache)
+
+
+@pytest.fixture
+def semantic_cache(base_settings, memory_cache) -> AnswerCache:
+    base_settings.answer_cache_similarity_threshold = 0.95
+    return AnswerCache(base_settings, memory_cache)
+
+
+class TestMakeKey:
+    def test_chunk_order_does_not_matter(self):
+        """The retrieved set is compared as a set, not as a ranking."""
+        k1 = AnswerCache.make_key(1, "gpt-4o-mini", "v1", [(10, 0), (11, 2)])
+        k2 = AnswerCache.make_key(1, "gpt-4o-mini", "v1", [(11, 2), (10, 0)])
+        assert k1 == k2
+
+    def test_model_and_prompt_version_are_part_of_key(self):
+        base = AnswerCache.make_key(1, "gpt-4o-mini", "v1", [(10, 0)])
+        assert base != AnswerCache.make_key(1, "gpt-4o", "v1", [(10, 0)])
+        assert base != AnswerCache.make_key(1, "gpt-4o-mini", "v2", [(10, 0)])
+
+
+class TestGetPut:
+    def test_exact_query_hit(self, cache):
+        key = AnswerCache.make_key(1, "m", "v1", [(10, 0)])
+        cache.put(key, "what is x?", "x is y")
+
+        assert cache.get(key, "what is x?") == "x is y"
+
+    def test_different_query_misses_without_threshold(self, cache):
+        key = AnswerCache.make_key(1, "m", "v1", [(10, 0)])
+        cache.put(key, "what is x?", "x is y", query_embedding=[1.0, 0.0])
+
+        assert cache.get(key, "what's x?", query_embedding=[1.0, 0.0]) is None
+
+    def test_semantic_hit_above_threshold(self, semantic_cache):
+        key = AnswerCache.make_key(1, "m", "v1", [(10, 0)])
+        semantic_cache.put(key, "what is x?", "x is y", query_embedding=[1.0, 0.0])
+
+        assert semantic_cache.get(key, "what's x?", query_embedding=[0.99, 0.05]) == "x is y"
+        assert semantic_cache.get(key, "unrelated", query_embedding=[0.0, 1.0]) is None
+
+    def test_expired_entry_misses(self, cache):
+        key = AnswerCache.make_key(1, "m", "v1", [(10, 0)])
+        with patch("ai_runtime.services.answer_cache.time.time", return_value=1000.0):
+            cache.put(key, "q", "a")
+        with patch("ai_runtime.services.answer_cache.time.time", return_value=1061.0):
+            assert cache.get(key, "q") is None
+
+    def test_keeps_several_phrasings_per_key(self, cache):
+        key = AnswerCache.make_key(1, "m", "v1", [(10, 0)])
+        cache.put(key, "what is x?", "a1")
+        cache.put(key, "define x", "a2")
+
+        assert cache.get(key, "what is x?") == "a1"
+        assert cache.get(key, "define x") == "a2"
+
+
+class TestInvalidateProject:
+    def test_drops_only_that_project(self, cache):
+        k1 = AnswerCache.make_key(1, "m", "v1", [(10, 0)])
+        k2 = AnswerCache.make_key(2, "m", "v1", [(10, 0)])
+        cache.put(k1, "q", "a1")
+        cache.put(k2, "q", "a2")
+
+        cache.invalidate_project(1)
+        assert cache.get(k1, "q") is None
+        assert cache.get(k2, "q") == "a2"
@@ -0,0 +1,83 @@
+"""
+Unit tests for AnswerService.
+
+Strategy: patch openai.OpenAI so no real chat completion happens.
+We verify prompt building, cache use, and error wrapping.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from ai_runtime.models import ChunkResult
+from ai_runtime.services.answer_cache import AnswerCache
+from ai_runtime.services.answer_service import AnswerService
+from ai_runtime.exceptions import AnswerGenerationError
+
+
+RESULTS = [
+    ChunkResult(doc_id=10, chunk_id=0, text="hello", score=0.9, title="Doc A"),
+    ChunkResult(doc_id=11, chunk_id=3, text="world", score=0.8, title="Doc B"),
+]
+
+
+def make_chat_response(content: str):
+    response = Mock()
+    response.choices = [Mock()]
+    response.choices[0].message.content = content
+    return response
+
+
+@pytest.fixture
+def mock_chat_client():
+    client = Mock()
+    client.chat.completions.create.return_value = make_chat_response("the answer")
+    return client
+
+
+@pytest.fixture
+def answer_svc(base_settings, mock_chat_client, memory_cache):
+    with patch("ai_runtime.services.rate_limiter.openai.OpenAI", return_value=mock_chat_client):
+        return AnswerService(base_settings, cache=AnswerCache(base_settings, memory_cache))
+
+
+class TestBuildMessages:
+    def test_context_contains_sources_and_question(self, answer_svc):
+        messages = answer_svc.build_messages("what?", RESULTS)
+
+        assert messages[0]["role"] == "system"
+        assert "[Source: Doc A]\nhello" in messages[1]["content"]
+        assert messages[1]["content"].endswith("## Question\n\nwhat?")
+
+
+class TestGenerate:
+    def test_calls_chat_model(self, answer_svc, mock_chat_client):
+        answer = answer_svc.generate(project_id=1, query="what?", results=RESULTS)
+
+        assert answer == "the answer"
+        assert mock_chat_client.chat.completions.create.call_args[1]["model"] == "gpt-4o-mini"
+
+    def test_repeat_question_served_from_cache(self, answer_svc, mock_chat_client):
+        answer_svc.generate(project_id=1, query="what?", results=RESULTS)
+        answer = answer_svc.generate(project_id=1, query="what?", results=list(reversed(RESULTS)))
+
+        assert answer == "the answer"
+        mock_chat_client.chat.completions.create.assert_called_once()
+
+    def test_invalidated_project_calls_model_again(self, answer_svc, mock_chat_client):
+        answer_svc.generate(project_id=1, query="what?", results=RESULTS)
+        answer_svc.cache.invalidate_project(1)
+        answer_svc.generate(project_id=1, query="what?", results=RESULTS)
+
+        assert mock_chat_client.chat.completions.create.call_count == 2
+
+    def test_uncacheable_answers_are_not_stored(self, answer_svc, mock_chat_client):
+        answer_svc.generate(project_id=1, query="what?", results=RESULTS, cacheable=False)
+        answer_svc.generate(project_id=1, query="what?", results=RESULTS)
+
+        assert mock_chat_client.chat.completions.create.call_count == 2
+
+    def test_wraps_error_as_answer_generation_error(self, answer_svc, mock_chat_client):
+        mock_chat_client.chat.completions.create.side_effect = RuntimeError("timeout")
+
+        with pytest.raises(AnswerGenerationError, match="Chat completion failed"):
+            answer_svc.generate(project_id=1, query="what?", results=RESULTS)
@@ -0,0 +1,118 @@
+"""
+Unit tests for BatchAnswerService.
+
+Runs against LocalBatchClient (the in-process Batch API stand-in) with the
+job work dir in tmp_path; AnswerService uses a mocked OpenAI client.
+"""
+
+import json
+import os
+
+import pytest
+from unittest.mock import Mock, patch
+
+from ai_runtime.exceptions import BatchJobError, BatchJobNotFoundError
+from ai_runtime.models import ChunkResult
+from ai_runtime.services.answer_cache import AnswerCache
+from ai_runtime.services.answer_service import PROMPT_VERSION, AnswerService
+from ai_runtime.services.batch_answer_service import BatchAnswerService, LocalBatchClient
+
+RESULTS = [ChunkResult(doc_id=10, chunk_id=0, text="hello", score=0.9, title="Doc A")]
+
+
+@pytest.fixture
+def answer_svc(base_settings, memory_cache):
+    with patch("ai_runtime.services.rate_limiter.openai.OpenAI", return_value=Mock()):
+        return AnswerService(base_settings, cache=AnswerCache(base_settings, memory_cache))
+
+
+@pytest.fixture
+def make_batch_svc(base_settings, answer_svc, tmp_path):
+    base_settings.batch_work_dir = str(tmp_path)
+
+    def factory(client=None) -> BatchAnswerService:
+        return BatchAnswerService(base_settings, answer_svc, client or LocalBatchClient())
+    return factory
+
+
+def cases():
+    return [
+        {"custom_id": "a", "query": "what is hello?", "results": RESULTS},
+        {"custom_id": "b", "query": "no context", "results": []},
+    ]
+
+
+class TestSubmit:
+    def test_writes_jsonl_and_manifest(self, make_batch_svc, tmp_path):
+        manifest = make_batch_svc().submit(project_id=1, cases=cases())
+
+        job_dir = tmp_path / manifest["job_id"]
+        lines = [json.loads(line) for line in (job_dir / "input.jsonl").read_text().splitlines()]
+        assert [line["custom_id"] for line in lines] == ["a"]   # case without chunks isn't sent
+        assert lines[0]["url"] == "/v1/chat/completions"
+        assert lines[0]["body"]["model"] == "gpt-4o-mini"
+        assert lines[0]["body"]["messages"][1]["content"].endswith("what is hello?")
+        assert json.loads((job_dir / "manifest.json").read_text())["status"] == "validating"
+
+    def test_submit_failure_raises_batch_job_error(self, make_batch_svc):
+        client = Mock()
+        client.upload.side_effect = RuntimeError("quota")
+
+        with pytest.raises(BatchJobError, match="Failed to submit"):
+            make_batch_svc(client).submit(project_id=1, cases=cases())
+
+
+class TestPoll:
+    def test_answers_joined_back_and_cached(self, make_batch_svc, answer_svc):
+        svc = make_batch_svc()
+        job_id = svc.submit(project_id=1, cases=cases())["job_id"]
+
+        manifest = svc.poll(job_id)
+
+        assert manifest["status"] == "completed"
+        by_id = {c["custom_id"]: c for c in manifest["cases"]}
+        assert by_id["a"]["answer"] == "[local batch answer] what is hello?"
+        assert by_id["b"]["answer"] is None and by_id["b"]["error"] is None
+        # Asking the same question interactively is now an answer-cache hit
+        assert answer_svc.generate(project_id=1, query="what is hello?", results=RESULTS) == by_id["a"]["answer"]
+        answer_svc.client.chat.completions.create.assert_not_called()
+
+    def test_not_cached_when_project_reindexed_before_poll(self, make_batch_svc, answer_svc):
+        svc = make_batch_svc()
+        job_id = svc.submit(project_id=1, cases=cases())["job_id"]
+        answer_svc.cache.invalidate_project(1)   # re-indexed while the batch ran
+
+        manifest = svc.poll(job_id)
+
+        assert manifest["cases"][0]["answer"] == "[local batch answer] what is hello?"
+        assert answer_svc.cache.get(
+            AnswerCache.make_key(1, answer_svc.model, PROMPT_VERSION, [(10, 0)]), "what is hello?",
+        ) is None
+
+    def test_per_case_errors_are_reported(self, make_batch_svc):
+        def complete(body):
+            raise ValueError("context_length_exceeded")
+
+        svc = make_batch_svc(LocalBatchClient(complete=complete))
+        job_id = svc.submit(project_id=1, cases=cases())["job_id"]
+
+        [case, _] = svc.poll(job_id)["cases"]
+        assert case["answer"] is None
+        assert "context_length_exceeded" in case["error"]
+
+    def test_finished_job_is_read_from_manifest(self, make_batch_svc):
+        client = LocalBatchClient()
+        svc = make_batch_svc(client)
+        job_id = svc.submit(project_id=1, cases=cases())["job_id"]
+        svc.poll(job_id)
+
+        # Another worker (fresh service, no in-memory state) sees the same result
+        other = make_batch_svc(Mock())
+        assert other.poll(job_id)["cases"][0]["answer"].startswith("[local batch answer]")
+        other.client.retrieve_batch.assert_not_called()
+
+    def test_unknown_job(self, make_batch_svc):
+        with pytest.raises(BatchJobNotFoundError):
+            make_batch_svc().poll("doesnotexist")
+        with pytest.raises(BatchJobNotFoundError):
+            make_batch_svc().poll("../etc")
@@ -0,0 +1,185 @@
+"""
+Unit tests for the two-level cache (TieredCache + backends).
+
+Strategy: use InMemoryCacheBackend as the shared L2 and create several
+TieredCache instances on top of it to simulate multiple workers.
+RedisCacheBackend is tested against a mock redis client.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from ai_runtime.services.cache_service import (
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    TieredCache,
+    build_cache,
+    decode_vector,
+    encode_vector,
+)
+
+
+@pytest.fixture
+def shared_backend():
+    return InMemoryCacheBackend()
+
+
+@pytest.fixture
+def make_worker(base_settings, shared_backend):
+    """Factory for TieredCache instances sharing one L2 — one per simulated worker."""
+    def factory() -> TieredCache:
+        return TieredCache(shared_backend, base_settings)
+    return factory
+
+
+class TestVectorEncoding:
+    def test_round_trip_is_float32_packed(self):
+        vector = [0.5, -1.25, 3.0]
+        packed = encode_vector(vector)
+
+        assert len(packed) == 4 * len(vector)
+        assert decode_vector(packed) == vector
+
+
+class TestTieredCache:
+    def test_value_written_by_one_worker_is_seen_by_another(self, make_worker):
+        worker_a, worker_b = make_worker(), make_worker()
+        worker_a.set("emb", "model|hello", b"vector-bytes")
+
+        assert worker_b.get("emb", "model|hello") == b"vector-bytes"
+
+    def test_l1_serves_without_backend(self, make_worker, shared_backend):
+        worker = make_worker()
+        worker.set("emb", "k", b"v")
+
+        with patch.object(shared_backend, "get", side_effect=AssertionError("L2 should not be hit")):
+            assert worker.get("emb", "k") == b"v"
+
+    def test_l1_is_bounded(self, base_settings, shared_backend):
+        base_settings.cache_local_max_entries = 2
+        worker = TieredCache(shared_backend, base_settings)
+        for i in range(3):
+            worker.set("emb", f"k{i}", b"v")
+
+        assert len(worker._local) == 2
+
+    def test_l1_copy_of_l2_hit_expires_with_the_l2_entry(self, make_worker):
+        writer, reader = make_worker(), make_worker()
+        with patch("ai_runtime.services.cache_service.time.monotonic", return_value=0.0):
+            writer.set("answer", "k", b"v", ttl_seconds=5)   # shorter than the default TTL
+            assert reader.get("answer", "k") == b"v"         # L2 hit, copied into L1
+
+        with patch("ai_runtime.services.cache_service.time.monotonic", return_value=6.0):
+            assert reader.get("answer", "k") is None
+
+    def test_invalidate_project_is_namespaced(self, make_worker):
+        worker = make_worker()
+        worker.set("retrieval", "q", b"r", project_id=1)
+        worker.set("retrieval", "q", b"r2", project_id=2)
+        worker.set("emb", "q", b"e")
+
+        worker.invalidate_project(1)
+
+        assert worker.get("retrieval", "q", project_id=1) is None
+        assert worker.get("retrieval", "q", project_id=2) == b"r2"
+        assert worker.get("emb", "q") == b"e"
+
+    def test_invalidation_reaches_other_workers(self, base_settings, shared_backend):
+        base_settings.cache_generation_check_seconds = 0.0   # always re-read generations
+        worker_a = TieredCache(shared_backend, base_settings)
+        worker_b = TieredCache(shared_backend, base_settings)
+        worker_b.set("answer", "k", b"old", project_id=1)
+        assert worker_b.get("answer", "k", project_id=1) == b"old"
+
+        worker_a.invalidate_project(1)
+
+        assert worker_b.get("answer", "k", project_id=1) is None
+
+
+class TestInMemoryBackend:
+    def test_ttl_expiry(self):
+        backend = InMemoryCacheBackend()
+        with patch("ai_runtime.services.cache_service.time.monotonic", return_value=0.0):
+            backend.set("k", b"v", ttl_seconds=10)
+        with patch("ai_runtime.services.cache_service.time.monotonic", return_value=11.0):
+            assert backend.get("k") is None
+
+    def test_incr(self):
+        backend = InMemoryCacheBackend()
+        assert backend.incr("gen") == 1
+        assert backend.incr("gen") == 2
+        assert backend.get_int("gen") == 2
+
+    def test_lru_bound(self):
+        backend = InMemoryCacheBackend(max_entries=2)
+        backend.set("a", b"1", ttl_seconds=60)
+        backend.set("b", b"2", ttl_seconds=60)
+        backend.get("a")                       # "b" is now least recently used
+        backend.set("c", b"3", ttl_seconds=60)
+
+        assert len(backend) == 2
+        assert backend.get("b") is None
+        assert backend.get("a") == b"1" and backend.get("c") == b"3"
+
+    def test_expired_entries_swept_without_reads(self):
+        with patch("ai_runtime.services.cache_service.time.monotonic", return_value=0.0):
+            backend = InMemoryCacheBackend(sweep_seconds=30)
+            backend.set("old", b"v", ttl_seconds=10)
+        with patch("ai_runtime.services.cache_service.time.monotonic", return_value=31.0):
+            backend.set("new", b"v", ttl_seconds=10)
+
+        assert len(backend) == 1
+
+    def test_counters_are_never_evicted(self):
+        backend = InMemoryCacheBackend(max_entries=1)
+        backend.incr("gen")
+        backend.set("a", b"1", ttl_seconds=60)
+        backend.set("b", b"2", ttl_seconds=60)
+
+        assert backend.get_int("gen") == 1
+
+
+class TestRedisBackend:
+    def test_delegates_to_redis_client(self):
+        client = MagicMock()
+        client.get.return_value = b"v"
+        backend = RedisCacheBackend("redis://x", client=client)
+
+        backend.set("k", b"v", ttl_seconds=30)
+        assert backend.get("k") == b"v"
+        client.set.assert_called_once_with("k", b"v", ex=30)
+
+    def test_get_with_ttl_reads_pttl(self):
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = [b"v", 2500]
+        backend = RedisCacheBackend("redis://x", client=client)
+
+        assert backend.get_with_ttl("k") == (b"v", 2.5)
+
+    def test_errors_are_treated_as_misses(self):
+        client = MagicMock()
+        client.get.side_effect = ConnectionError("redis down")
+        client.set.side_effect = ConnectionError("redis down")
+        client.pipeline.side_effect = ConnectionError("redis down")
+        backend = RedisCacheBackend("redis://x", client=client)
+
+        assert backend.get("k") is None
+        assert backend.get_with_ttl("k") == (None, None)
+        backend.set("k", b"v", ttl_seconds=30)   # must not raise
+
+    def test_failed_incr_still_invalidates_locally(self, base_settings):
+        client = MagicMock()
+        client.get.return_value = None
+        client.incr.side_effect = ConnectionError("redis down")
+        cache = TieredCache(RedisCacheBackend("redis://x", client=client), base_settings)
+        cache.set("retrieval", "q", b"r", project_id=1)
+
+        cache.invalidate_project(1)
+
+        assert cache.get("retrieval", "q", project_id=1) is None
+
+
+class TestBuildCache:
+    def test_memory_backend_by_default(self, base_settings):
+        cache = build_cache(base_settings)
+        assert isinstance(cache.backend, InMemoryCacheBackend)
@@ -0,0 +1,105 @@
+"""
+Unit tests for context packing (services/context_packer.py).
+"""
+
+from ai_runtime.models import ChunkResult
+from ai_runtime.services.context_packer import (
+    drop_near_duplicates,
+    fit_budget,
+    merge_adjacent,
+    overlap_length,
+    pack_context,
+)
+
+
+def chunk(doc_id, chunk_id, text, title="Doc", project_id=1):
+    return ChunkResult(doc_id=doc_id, chunk_id=chunk_id, text=text, score=0.5, title=title, project_id=project_id)
+
+
+class TestOverlapLength:
+    def test_finds_longest_shared_suffix_prefix(self):
+        assert overlap_length("alpha beta gamma delta", "gamma delta epsilon", max_overlap=50) == len("gamma delta")
+
+    def test_respects_max_overlap(self):
+        assert overlap_length("xx shared part here", "shared part here yy", max_overlap=5) == 0
+
+    def test_short_coincidental_match_is_ignored(self):
+        assert overlap_length("end of the", "the start", max_overlap=50) == 0
+
+
+class TestMergeAdjacent:
+    def test_consecutive_chunks_merge_without_repeating_overlap(self):
+        results = [
+            chunk(1, 1, "the second part continues here"),
+            chunk(1, 0, "first part of text, the second part"),
+        ]
+
+        passages = merge_adjacent(results, max_overlap=50)
+
+        assert len(passages) == 1
+        assert passages[0].chunk_ids == [0, 1]
+        assert passages[0].text == "first part of text, the second part continues here"
+        assert passages[0].rank == 0
+
+    def test_gaps_and_other_documents_stay_separate(self):
+        results = [chunk(1, 0, "a"), chunk(1, 2, "c"), chunk(2, 1, "b")]
+
+        passages = merge_adjacent(results, max_overlap=50)
+
+        assert [(p.doc_id, p.chunk_ids) for p in passages] == [(1, [0]), (1, [2]), (2, [1])]
+
+    def test_same_doc_in_different_projects_not_merged(self):
+        results = [chunk(1, 0, "a", project_id=1), chunk(1, 1, "b", project_id=2)]
+
+        assert len(merge_adjacent(results, max_overlap=50)) == 2
+
+    def test_passages_ordered_by_best_chunk_rank(self):
+        results = [chunk(2, 0, "best"), chunk(1, 0, "second"), chunk(2, 5, "third")]
+
+        passages = merge_adjacent(results, max_overlap=50)
+
+        assert [p.text for p in passages] == ["best", "second", "third"]
+
+
+class TestDropNearDuplicates:
+    def test_keeps_better_ranked_copy(self):
+        boilerplate = "this document is confidential and intended for internal use only"
+        passages = merge_adjacent(
+            [chunk(1, 0, boilerplate, title="A"), chunk(2, 0, "unrelated text about cats"), chunk(3, 0, boilerplate, title="B")],
+            max_overlap=50,
+        )
+
+        kept = drop_near_duplicates(passages, threshold=0.9)
+
+        assert [p.title for p in kept] == ["A", "Doc"]
+
+
+class TestFitBudget:
+    def test_skips_passages_that_do_not_fit(self):
+        passages = merge_adjacent(
+            [chunk(1, 0, "x" * 40), chunk(2, 0, "y" * 400), chunk(3, 0, "z" * 40)], max_overlap=50,
+        )
+
+        packed = fit_budget(passages, token_budget=30)
+
+        assert [p.doc_id for p in packed] == [1, 3]
+
+    def test_truncates_best_passage_when_nothing_fits(self):
+        passages = merge_adjacent([chunk(1, 0, "x" * 1000)], max_overlap=50)
+
+        packed = fit_budget(passages, token_budget=10)
+
+        assert len(packed) == 1
+        assert len(packed[0].text) == 40
+
+
+class TestPackContext:
+    def test_citations_survive_packing(self):
+        results = [chunk(1, 0, "alpha beta gamma delta", title="Guide"), chunk(1, 1, "gamma delta epsilon", title="Guide")]
+
+        passages = pack_context(results, token_budget=1000, max_overlap=50, dedup_threshold=0.9)
+
+        assert [(p.title, p.text) for p in passages] == [("Guide", "alpha beta gamma delta epsilon")]
+
+    def test_empty_results(self):
+        assert pack_context([], token_budget=1000, max_overlap=50, dedup_threshold=0.9) == []
@@ -0,0 +1,97 @@
+"""
+Unit tests for Deadline.
+
+A fake clock makes expiry deterministic; only Deadline.run() uses real
+threads (with a blocking Event instead of sleeps).
+"""
+
+import threading
+import time
+
+import pytest
+
+from ai_runtime.deadline import Deadline, abandoned_in_flight
+from ai_runtime.exceptions import DeadlineExceededError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFromRequest:
+    def test_no_budget_is_unbounded(self):
+        deadline = Deadline.from_request(None, None)
+        assert not deadline.bounded
+        assert deadline.remaining() is None
+        assert not deadline.expired()
+
+    def test_tightest_of_body_and_header_wins(self):
+        deadline = Deadline.from_request(5000, "2000")
+        assert deadline.timeout_seconds == 2.0
+
+    def test_default_applies_only_without_caller_budget(self):
+        assert Deadline.from_request(None, None, default_timeout_ms=3000).timeout_seconds == 3.0
+        assert Deadline.from_request(8000, None, default_timeout_ms=3000).timeout_seconds == 8.0
+
+    def test_invalid_header_is_ignored(self):
+        assert not Deadline.from_request(None, "soon").bounded
+
+
+class TestExpiry:
+    def test_check_raises_once_expired(self):
+        clock = FakeClock()
+        deadline = Deadline(1.0, clock=clock)
+
+        deadline.check("search")
+        assert deadline.remaining() == pytest.approx(1.0)
+
+        clock.now += 1.5
+        assert deadline.remaining() == 0.0
+        with pytest.raises(DeadlineExceededError, match="before rerank"):
+            deadline.check("rerank")
+
+    def test_timeout_for_returns_remaining_budget(self):
+        clock = FakeClock()
+        deadline = Deadline(2.0, clock=clock)
+        clock.now += 0.5
+        assert deadline.timeout_for("embedding") == pytest.approx(1.5)
+
+
+class TestRun:
+    def test_returns_result_within_budget(self):
+        assert Deadline(5.0).run("search", lambda: 42) == 42
+
+    def test_unbounded_runs_inline(self):
+        assert Deadline.none().run("search", threading.get_ident) == threading.get_ident()
+
+    def test_stops_waiting_when_budget_is_spent(self):
+        release = threading.Event()
+        try:
+            with pytest.raises(DeadlineExceededError, match="during rerank"):
+                Deadline(0.05).run("rerank", release.wait)
+        finally:
+            release.set()
+
+    def test_abandoned_calls_are_counted_until_they_return(self):
+        release = threading.Event()
+        returned = threading.Event()
+
+        def slow_sdk_call():
+            release.wait(5)
+            returned.set()
+
+        with pytest.raises(DeadlineExceededError):
+            Deadline(0.05).run("hybrid search", slow_sdk_call)
+        assert abandoned_in_flight() >= 1
+
+        release.set()
+        returned.wait(5)
+        for _ in range(100):   # the done-callback runs right after the call returns
+            if abandoned_in_flight() == 0:
+                break
+            time.sleep(0.01)
+        assert abandoned_in_flight() == 0
@@ -0,0 +1,93 @@
+"""
+Unit tests for the startup / shutdown lifecycle in dependencies.py.
+
+The provider functions are swapped for fakes via the same `overrides`
+mapping FastAPI uses (app.dependency_overrides), so nothing connects.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from ai_runtime import dependencies
+from ai_runtime.dependencies import (
+    close_services,
+    get_answer_service,
+    get_cache,
+    get_document_service,
+    get_embedding_service,
+    get_rerank_service,
+    get_settings,
+    get_weaviate_service,
+    warm_up_services,
+)
+
+
+@pytest.fixture
+def overrides(base_settings):
+    return {
+        get_settings: lambda: base_settings,
+        get_cache: Mock(),
+        get_embedding_service: Mock(),
+        get_weaviate_service: Mock(),
+        get_answer_service: Mock(),
+        get_document_service: Mock(),
+        get_rerank_service: Mock(),
+    }
+
+
+class TestWarmUp:
+    def test_builds_every_service(self, overrides):
+        status = warm_up_services(overrides)
+
+        assert status["get_weaviate_service"] == "ok"
+        overrides[get_weaviate_service].assert_called_once()
+        overrides[get_embedding_service].assert_called_once()
+        overrides[get_rerank_service].assert_not_called()   # rerank disabled
+
+    def test_builds_rerank_when_enabled(self, overrides, base_settings):
+        base_settings.rerank_enabled = True
+
+        warm_up_services(overrides)
+
+        overrides[get_rerank_service].assert_called_once()
+
+    def test_upstream_failure_is_reported_not_raised(self, overrides):
+        overrides[get_weaviate_service].side_effect = ConnectionError("refused")
+
+        status = warm_up_services(overrides)
+
+        assert "refused" in status["get_weaviate_service"]
+        assert status["get_embedding_service"] == "ok"
+
+    def test_settings_failure_is_raised(self, overrides):
+        overrides[get_settings] = Mock(side_effect=ValueError("OPENAI_API_KEY missing"))
+
+        with pytest.raises(ValueError):
+            warm_up_services(overrides)
+
+
+class TestCloseServices:
+    def test_closes_created_singletons_and_resets_them(self, base_settings):
+        weaviate = Mock()
+        with (
+            patch.object(dependencies, "get_settings", lambda: base_settings),
+            patch.object(dependencies, "WeaviateService", return_value=weaviate),
+        ):
+            get_weaviate_service.cache_clear()
+            assert get_weaviate_service() is weaviate
+
+            close_services()
+
+        weaviate.close.assert_called_once()
+        assert get_weaviate_service.cache_info().currsize == 0
+
+
+class TestOptionalBackends:
+    def test_rerank_service_is_none_when_disabled(self, base_settings):
+        """RERANK_ENABLED=false → no Bedrock client is built at all."""
+        with patch.object(dependencies, "get_settings", lambda: base_settings):
+            get_rerank_service.cache_clear()
+            try:
+                assert get_rerank_service() is None
+            finally:
+                get_rerank_service.cache_clear()
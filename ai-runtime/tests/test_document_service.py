@@ -27,7 +27,10 @@ def mock_milvus():
 
 @pytest.fixture
 def mock_weaviate():
-    return Mock()
+    weaviate = Mock()
+    weaviate.project_route.return_value = None   # not rebuilt: global chunk settings
+    weaviate.delete_chunk_range.return_value = 0
+    return weaviate
 
 
 @pytest.fixture
@@ -65,6 +68,7 @@ class TestProcessDocument:
         mock_embedding.embed_texts.assert_called_once()
         chunk_texts = mock_embedding.embed_texts.call_args[0][0]
         assert len(chunk_texts) > 0
+        assert mock_embedding.embed_texts.call_args[1] == {"use_cache": False}   # chunk embeddings aren't cached
 
         # Milvus is dead code — must NOT be called
         mock_milvus.insert_chunks.assert_not_called()
@@ -133,3 +137,124 @@ class TestDeleteDocument:
 
         mock_milvus.delete_by_doc_id.assert_not_called()
         mock_weaviate.delete_by_doc_id.assert_called_once_with(1, 10)
+
+    def test_delete_documents_is_one_weaviate_call(self, doc_service, mock_weaviate):
+        doc_service.delete_documents(project_id=1, doc_ids=[10, 11])
+
+        mock_weaviate.delete_documents.assert_called_once_with(1, [10, 11])
+
+
+class TestStreamingIndexer:
+    """Tests for DocumentService.open_stream() — windowed streaming ingestion."""
+
+    @pytest.fixture
+    def stream_service(self, mock_weaviate, mock_embedding, base_settings):
+        """DocumentService with a small window so tests cross several window boundaries."""
+        base_settings.chunk_size = 100
+        base_settings.chunk_overlap = 10
+        base_settings.ingest_window_chunks = 4
+        mock_embedding.embed_texts.side_effect = lambda texts, **_: [[0.1] * 1536 for _ in texts]
+        return DocumentService(
+            milvus_service=None,
+            weaviate_service=mock_weaviate,
+            embedding_service=mock_embedding,
+            settings=base_settings,
+        )
+
+    def test_stores_in_bounded_windows_with_contiguous_chunk_ids(
+        self, stream_service, mock_weaviate, mock_embedding
+    ):
+        """Many small pieces → several windows, none larger than ingest_window_chunks."""
+        indexer = stream_service.open_stream(project_id=1, doc_id=10, title="Big Doc")
+        for i in range(200):
+            indexer.feed(f"Sentence number {i} of a very long export. ")
+
+        total = indexer.finish()
+
+        assert mock_embedding.embed_texts.call_count > 1
+        assert all(len(c[0][0]) <= 4 for c in mock_embedding.embed_texts.call_args_list)
+
+        chunk_ids = []
+        for call in mock_weaviate.insert_chunks.call_args_list:
+            chunk_ids.extend(call[1]["chunk_ids"])
+            assert all(d == 10 for d in call[1]["doc_ids"])
+        assert chunk_ids == list(range(total))
+
+    def test_no_text_lost_across_piece_boundaries(self, stream_service, mock_weaviate):
+        """Pieces that split words mid-way are rejoined before chunking."""
+        content = "".join(f"word{i} " for i in range(300))
+        indexer = stream_service.open_stream(project_id=1, doc_id=10, title="Doc")
+        for start in range(0, len(content), 37):
+            indexer.feed(content[start:start + 37])
+        indexer.finish()
+
+        stored = []
+        for call in mock_weaviate.insert_chunks.call_args_list:
+            stored.extend(call[1]["texts"])
+        joined = " ".join(stored)
+        assert all(f"word{i}" in joined for i in range(300))
+        assert all(len(t) <= 100 for t in stored)
+
+    def test_char_starts_point_into_the_document(self, stream_service, mock_weaviate):
+        """Stored chunk offsets are document offsets, across buffer carry-overs."""
+        content = "".join(f"word{i} " for i in range(300))
+        indexer = stream_service.open_stream(project_id=1, doc_id=10, title="Doc")
+        for start in range(0, len(content), 37):
+            indexer.feed(content[start:start + 37])
+        indexer.finish()
+
+        for call in mock_weaviate.insert_chunks.call_args_list:
+            for text, start in zip(call[1]["texts"], call[1]["char_starts"]):
+                assert content[start:start + len(text)] == text
+
+    def test_empty_stream_returns_zero(self, stream_service, mock_embedding, mock_weaviate):
+        """No text fed → 0 chunks, nothing embedded or stored."""
+        indexer = stream_service.open_stream(project_id=1, doc_id=10, title="Empty")
+
+        assert indexer.finish() == 0
+        mock_embedding.embed_texts.assert_not_called()
+        mock_weaviate.insert_chunks.assert_not_called()
+
+    def test_wraps_unexpected_error_as_document_processing_error(self, stream_service, mock_embedding):
+        """Non-AIRuntimeError exceptions get wrapped, same as process_document."""
+        mock_embedding.embed_texts.side_effect = ValueError("unexpected")
+        indexer = stream_service.open_stream(project_id=1, doc_id=10, title="Doc")
+        indexer.feed("Some content " * 10)
+
+        with pytest.raises(DocumentProcessingError, match="Failed to process"):
+            indexer.finish()
+
+    def test_failure_after_a_stored_window_removes_the_partial_document(
+        self, stream_service, mock_weaviate, mock_embedding
+    ):
+        """A mid-stream failure must not leave the first windows searchable."""
+        mock_weaviate.insert_chunks.side_effect = [None, WeaviateError("down")]
+        indexer = stream_service.open_stream(project_id=1, doc_id=10, title="Doc")
+
+        with pytest.raises(WeaviateError):
+            for i in range(200):
+                indexer.feed(f"Sentence number {i} of a very long export. ")
+
+        # Only the chunk ids of both attempted windows — a previous version's later chunks stay
+        mock_weaviate.delete_chunk_range.assert_called_once_with(1, 10, 0, 8)
+        mock_weaviate.delete_by_doc_id.assert_not_called()
+
+    def test_failure_before_any_write_keeps_existing_chunks(self, stream_service, mock_weaviate, mock_embedding):
+        """Nothing was written, so a re-indexed document's previous chunks stay as they were."""
+        mock_embedding.embed_texts.side_effect = EmbeddingError("OpenAI is down")
+        indexer = stream_service.open_stream(project_id=1, doc_id=10, title="Doc")
+        indexer.feed("Some content " * 10)
+
+        with pytest.raises(EmbeddingError):
+            indexer.finish()
+        mock_weaviate.delete_chunk_range.assert_not_called()
+        mock_weaviate.delete_by_doc_id.assert_not_called()
+
+    def test_finish_removes_previous_versions_trailing_chunks(self, stream_service, mock_weaviate):
+        """Re-indexing a shorter version: chunk ids past the new count are deleted."""
+        indexer = stream_service.open_stream(project_id=1, doc_id=10, title="Doc")
+        indexer.feed("Some content " * 10)
+
+        total = indexer.finish()
+
+        mock_weaviate.delete_chunk_range.assert_called_once_with(1, 10, total)
@@ -6,12 +6,16 @@ We're testing OUR logic (error wrapping, empty input handling, etc.),
 not OpenAI's servers.
 """
 
+import base64
+
+import numpy as np
 import openai
 import pytest
 from unittest.mock import patch, Mock
 
-from ai_runtime.services.embedding_service import EmbeddingService
-from ai_runtime.exceptions import EmbeddingError
+from ai_runtime.deadline import Deadline
+from ai_runtime.services.embedding_service import EmbeddingService, decode_embeddings
+from ai_runtime.exceptions import DeadlineExceededError, EmbeddingError
 
 
 class TestEmbedTexts:
@@ -25,21 +29,23 @@ class TestEmbedTexts:
         texts = ["hello", "world", "test"]
         result = service.embed_texts(texts)
 
-        assert len(result) == 3
-        assert all(len(vec) == 1536 for vec in result)
+        assert result.shape == (3, 1536)
+        assert result.dtype == np.float32 and result.flags["C_CONTIGUOUS"]
+        assert result[0, 0] == pytest.approx(0.1)
         mock_openai_client.embeddings.create.assert_called_once_with(
             model="text-embedding-3-small",
             input=texts,
+            encoding_format="base64",
         )
 
     def test_returns_empty_list_for_empty_input(self, fake_settings, mock_openai_client):
-        """Edge case: empty list → empty list, no API call."""
+        """Edge case: empty list → empty array, no API call."""
         with patch("ai_runtime.services.embedding_service.openai.OpenAI", return_value=mock_openai_client):
             service = EmbeddingService(fake_settings)
 
         result = service.embed_texts([])
 
-        assert result == []
+        assert len(result) == 0
         mock_openai_client.embeddings.create.assert_not_called()
 
     def test_wraps_auth_error_as_embedding_error(self, fake_settings, mock_openai_client):
@@ -91,6 +97,19 @@ class TestEmbedTexts:
             service.embed_texts(["test"])
 
 
+class TestDecodeEmbeddings:
+    def test_base64_payloads_become_one_float32_matrix(self):
+        vectors = np.array([[0.5, -1.0], [2.0, 0.25]], dtype="<f4")
+        data = [Mock(embedding=base64.b64encode(v.tobytes()).decode()) for v in vectors]
+
+        np.testing.assert_array_equal(decode_embeddings(data), vectors)
+
+    def test_plain_float_lists_still_work(self):
+        result = decode_embeddings([Mock(embedding=[0.5, -1.0])])
+
+        assert result.dtype == np.float32 and result.tolist() == [[0.5, -1.0]]
+
+
 class TestEmbedSingle:
     """Tests for EmbeddingService.embed_single()."""
 
@@ -101,9 +120,88 @@ class TestEmbedSingle:
 
         result = service.embed_single("hello")
 
-        assert len(result) == 1536
+        assert isinstance(result, list) and len(result) == 1536
         # Verify it passed a single-element list to the API
         mock_openai_client.embeddings.create.assert_called_once_with(
             model="text-embedding-3-small",
             input=["hello"],
+            encoding_format="base64",
         )
+
+
+class TestEmbeddingCache:
+    """Tests for the TieredCache integration in EmbeddingService."""
+
+    def test_only_uncached_texts_are_sent(self, fake_settings, mock_openai_client, memory_cache):
+        """Cached texts are served from the cache; the API only sees the misses."""
+        with patch("ai_runtime.services.embedding_service.openai.OpenAI", return_value=mock_openai_client):
+            service = EmbeddingService(fake_settings, cache=memory_cache)
+
+        service.embed_texts(["hello", "world"])
+        result = service.embed_texts(["hello", "new"])
+
+        assert result.shape == (2, 1536)
+        assert result[0, 0] == pytest.approx(0.1) and result[1, 0] == pytest.approx(0.1)
+        assert mock_openai_client.embeddings.create.call_args_list[-1][1]["input"] == ["new"]
+
+    def test_use_cache_false_bypasses_cache(self, fake_settings, mock_openai_client, memory_cache):
+        """The indexing path neither reads nor fills the cache (it would grow with the corpus)."""
+        with patch("ai_runtime.services.embedding_service.openai.OpenAI", return_value=mock_openai_client):
+            service = EmbeddingService(fake_settings, cache=memory_cache)
+
+        service.embed_texts(["chunk"], use_cache=False)
+        service.embed_texts(["chunk"])
+
+        assert mock_openai_client.embeddings.create.call_count == 2
+
+    def test_fully_cached_batch_makes_no_api_call(self, fake_settings, mock_openai_client, memory_cache):
+        with patch("ai_runtime.services.embedding_service.openai.OpenAI", return_value=mock_openai_client):
+            service = EmbeddingService(fake_settings, cache=memory_cache)
+
+        service.embed_single("hello")
+        service.embed_single("hello")
+
+        mock_openai_client.embeddings.create.assert_called_once()
+
+
+class TestRateLimitedEmbedding:
+    """EmbeddingService with a shared RateLimiter: 429s are retried instead of failing."""
+
+    def test_rate_limit_is_retried(self, base_settings, mock_openai_client):
+        from ai_runtime.services.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(base_settings, sleep=lambda s: None)
+        real_create = mock_openai_client.embeddings.create.side_effect
+        mock_openai_client.embeddings.create.side_effect = [
+            openai.RateLimitError(message="Rate limit", response=Mock(status_code=429, headers={}), body=None),
+            real_create(model="m", input=["test"]),
+        ]
+        with patch("ai_runtime.services.embedding_service.openai.OpenAI", return_value=mock_openai_client):
+            service = EmbeddingService(base_settings, rate_limiter=limiter)
+
+        result = service.embed_texts(["test"])
+
+        assert len(result) == 1
+        assert mock_openai_client.embeddings.create.call_count == 2
+
+
+class TestEmbeddingDeadline:
+    """A bounded Deadline becomes the OpenAI call's HTTP timeout."""
+
+    def test_remaining_budget_is_passed_as_timeout(self, fake_settings, mock_openai_client):
+        with patch("ai_runtime.services.embedding_service.openai.OpenAI", return_value=mock_openai_client):
+            service = EmbeddingService(fake_settings)
+
+        service.embed_texts(["hello"], deadline=Deadline(2.0))
+
+        timeout = mock_openai_client.embeddings.create.call_args[1]["timeout"]
+        assert 0 < timeout <= 2.0
+
+    def test_expired_deadline_skips_api_call(self, fake_settings, mock_openai_client):
+        with patch("ai_runtime.services.embedding_service.openai.OpenAI", return_value=mock_openai_client):
+            service = EmbeddingService(fake_settings)
+
+        with pytest.raises(DeadlineExceededError):
+            service.embed_single("hello", deadline=Deadline(0))
+
+        mock_openai_client.embeddings.create.assert_not_called()
@@ -0,0 +1,50 @@
+"""
+Unit tests for the compact response encodings (ai_runtime/encoding.py).
+"""
+
+import json
+
+import msgpack
+import pytest
+
+from ai_runtime.encoding import compact_result, encode, wants_msgpack
+
+
+RESULT = {"doc_id": 10, "chunk_id": 2, "title": "Doc A", "text": "hello", "score": 0.5, "char_start": 40}
+
+
+class TestWantsMsgpack:
+    @pytest.mark.parametrize("accept, expected", [
+        ("application/msgpack", True),
+        ("application/json, application/x-msgpack;q=0.9", True),
+        ("application/json", False),
+        (None, False),
+    ])
+    def test_media_types(self, accept, expected):
+        assert wants_msgpack(accept) is expected
+
+
+class TestCompactResult:
+    def test_without_text_offsets_replace_text_and_title(self):
+        assert compact_result(RESULT, include_text=False) == {
+            "doc_id": 10, "chunk_id": 2, "score": 0.5, "char_start": 40, "char_end": 45,
+        }
+
+    def test_unset_optional_fields_are_left_out(self):
+        out = compact_result({**RESULT, "char_start": None, "project_id": None}, include_text=True)
+
+        assert out == {"doc_id": 10, "chunk_id": 2, "score": 0.5, "title": "Doc A", "text": "hello"}
+
+
+class TestEncode:
+    def test_json_by_default(self):
+        response = encode({"results": [1, 2]}, accept=None)
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {"results": [1, 2]}
+
+    def test_msgpack_round_trip(self):
+        response = encode({"results": [compact_result(RESULT, include_text=False)]}, accept="application/msgpack")
+
+        assert response.media_type == "application/msgpack"
+        assert msgpack.unpackb(response.body)["results"][0]["char_end"] == 45
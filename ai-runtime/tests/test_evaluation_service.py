@@ -0,0 +1,122 @@
+"""
+Unit tests for retrieval evaluation.
+
+Metric functions are checked against hand-computed values; EvaluationService
+runs on a mocked RetrievalService.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from ai_runtime.models import EvaluationCase, RelevantItem
+from ai_runtime.services.evaluation_service import (
+    EvaluationService,
+    latency_summary,
+    relevance_row,
+    retrieval_metrics,
+)
+
+
+def result(doc_id, chunk_id=0):
+    return {"doc_id": doc_id, "chunk_id": chunk_id, "title": "", "text": "", "score": 0.0}
+
+
+class TestRelevanceRow:
+    def test_chunk_and_document_level_labels(self):
+        case = EvaluationCase(query="q", relevant=[
+            RelevantItem(doc_id=1, chunk_id=2),
+            RelevantItem(doc_id=5),
+        ])
+        results = [result(1, 0), result(5, 3), result(1, 2), result(5, 4)]
+
+        row, n_relevant = relevance_row(results, case, depth=5)
+
+        # doc 5 is credited once, at its first chunk
+        assert row.tolist() == [False, True, True, False, False]
+        assert n_relevant == 2
+
+
+class TestRetrievalMetrics:
+    def test_hand_computed_values(self):
+        relevance = np.array([
+            [True, False, False],    # first hit at rank 1
+            [False, False, True],    # first hit at rank 3
+            [False, False, False],   # miss
+        ])
+        n_relevant = np.array([1, 2, 1])
+
+        metrics = retrieval_metrics(relevance, n_relevant, [1, 3])
+
+        assert metrics["hit_rate@1"] == pytest.approx(1 / 3)
+        assert metrics["hit_rate@3"] == pytest.approx(2 / 3)
+        assert metrics["recall@3"] == pytest.approx((1 + 0.5 + 0) / 3)
+        assert metrics["mrr"] == pytest.approx((1 + 1 / 3 + 0) / 3)
+        ndcg_case2 = (1 / math.log2(4)) / (1 + 1 / math.log2(3))
+        assert metrics["ndcg@3"] == pytest.approx((1 + ndcg_case2 + 0) / 3)
+
+    def test_latency_summary_in_ms(self):
+        summary = latency_summary(np.array([0.010, 0.020, 0.030]))
+        assert summary["p50"] == 20.0
+        assert summary["max"] == 30.0
+
+
+@pytest.fixture
+def cases():
+    return [
+        EvaluationCase(query="alpha", relevant=[RelevantItem(doc_id=1)]),
+        EvaluationCase(query="beta", relevant=[RelevantItem(doc_id=2, chunk_id=0)]),
+        EvaluationCase(query="gamma", relevant=[RelevantItem(doc_id=9)]),
+    ]
+
+
+@pytest.fixture
+def retrieval():
+    svc = Mock()
+    svc.embed_queries.side_effect = lambda queries, batch_size: [[0.1] for _ in queries]
+    return svc
+
+
+class TestEvaluate:
+    def test_serving_pipeline_metrics(self, retrieval, cases, base_settings):
+        rankings = {"alpha": [result(1)], "beta": [result(3), result(2)], "gamma": [result(4)]}
+        retrieval.search.side_effect = lambda query, **kw: rankings[query]
+
+        report = EvaluationService(retrieval, base_settings).evaluate(
+            project_id=1, cases=cases, k_values=[1, 2],
+        )
+
+        [run] = report["runs"]
+        assert run["alpha"] == base_settings.weaviate_alpha
+        assert run["metrics"]["hit_rate@1"] == pytest.approx(1 / 3)
+        assert run["metrics"]["hit_rate@2"] == pytest.approx(2 / 3)
+        assert run["metrics"]["mrr"] == pytest.approx((1 + 0.5) / 3)
+        assert set(report["latency_ms"]) == {"p50", "p95", "p99", "mean", "max"}
+        assert retrieval.search.call_args[1]["top_k"] == 2
+
+    def test_queries_embedded_up_front_in_batches(self, retrieval, cases, base_settings):
+        base_settings.eval_embedding_batch_size = 2
+        retrieval.search.return_value = []
+
+        EvaluationService(retrieval, base_settings).evaluate(project_id=1, cases=cases, k_values=[1])
+
+        retrieval.embed_queries.assert_called_once_with(["alpha", "beta", "gamma"], batch_size=2)
+        retrieval.embed_query.assert_not_called()
+
+    def test_alpha_grid_uses_one_candidate_fetch_per_case(self, retrieval, cases, base_settings):
+        retrieval.search_alpha_grid.side_effect = lambda query, alphas, **kw: {
+            0.0: [result(1), result(2)],
+            1.0: [result(2), result(1)],
+        }
+
+        report = EvaluationService(retrieval, base_settings).evaluate(
+            project_id=1, cases=cases, k_values=[1], alphas=[0.0, 1.0],
+        )
+
+        by_alpha = {run["alpha"]: run["metrics"] for run in report["runs"]}
+        assert by_alpha[0.0]["hit_rate@1"] == pytest.approx(1 / 3)   # only "alpha" hits at rank 1
+        assert by_alpha[1.0]["hit_rate@1"] == pytest.approx(1 / 3)   # only "beta"
+        assert retrieval.search_alpha_grid.call_count == 3
+        retrieval.search.assert_not_called()
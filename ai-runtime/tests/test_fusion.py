@@ -0,0 +1,99 @@
+"""
+Unit tests for rank fusion (services/fusion.py).
+"""
+
+import numpy as np
+import pytest
+
+from ai_runtime.services.fusion import (
+    candidate_scores,
+    fuse_alpha_grid,
+    merge_ranked_lists,
+    normalize_scores,
+    top_k_indices,
+)
+
+
+def chunk(project_id, doc_id, score):
+    return {"project_id": project_id, "doc_id": doc_id, "chunk_id": 0, "title": "", "text": "", "score": score}
+
+
+class TestNormalizeScores:
+    def test_min_max(self):
+        results = [chunk(1, 1, 0.9), chunk(1, 2, 0.5), chunk(1, 3, 0.1)]
+        assert normalize_scores(results) == pytest.approx([1.0, 0.5, 0.0])
+
+    def test_equal_scores_are_all_one(self):
+        assert normalize_scores([chunk(1, 1, 0.3), chunk(1, 2, 0.3)]) == [1.0, 1.0]
+
+
+class TestMergeRankedLists:
+    def test_rrf_interleaves_by_rank_not_raw_score(self):
+        # Project 2's scores are on a much lower scale, but its #1 still ranks with project 1's #1
+        a = [chunk(1, 1, 0.95), chunk(1, 2, 0.90), chunk(1, 3, 0.85)]
+        b = [chunk(2, 7, 0.20), chunk(2, 8, 0.10)]
+
+        merged = merge_ranked_lists([a, b], top_k=4, method="rrf")
+
+        assert [(r["project_id"], r["doc_id"]) for r in merged] == [(1, 1), (2, 7), (1, 2), (2, 8)]
+        assert merged[0]["score"] == pytest.approx(1 / 61)
+
+    def test_score_fusion_uses_normalized_scores(self):
+        a = [chunk(1, 1, 0.9), chunk(1, 2, 0.8), chunk(1, 3, 0.1)]
+        b = [chunk(2, 7, 0.5), chunk(2, 8, 0.1)]
+
+        merged = merge_ranked_lists([a, b], top_k=5, method="score")
+
+        # (1,2) normalizes to 0.875 in its list, above (2,8) at 0.0
+        assert [(r["project_id"], r["doc_id"]) for r in merged][2] == (1, 2)
+        assert merged[-1]["score"] == 0.0
+
+    def test_duplicates_are_merged(self):
+        a = [chunk(1, 1, 0.9), chunk(1, 2, 0.5)]
+        b = [chunk(1, 2, 0.8)]
+
+        merged = merge_ranked_lists([a, b], top_k=10)
+
+        assert [r["doc_id"] for r in merged] == [2, 1]
+        assert len(merged) == 2
+
+    def test_top_k_and_empty_lists(self):
+        assert merge_ranked_lists([[], []], top_k=3) == []
+        assert len(merge_ranked_lists([[chunk(1, i, 1 - i / 10) for i in range(5)]], top_k=3)) == 3
+
+
+class TestAlphaGrid:
+    CANDIDATES = [
+        {"bm25_score": 4.0, "vector_score": None},   # keyword-only hit
+        {"bm25_score": 2.0, "vector_score": 0.80},
+        {"bm25_score": None, "vector_score": 0.90},  # vector-only hit
+        {"bm25_score": 1.0, "vector_score": 0.70},
+    ]
+
+    def test_relative_score_matches_weaviate_formula(self):
+        bm25, vector = candidate_scores(self.CANDIDATES)
+
+        fused = fuse_alpha_grid(bm25, vector, np.array([0.0, 0.5, 1.0]))
+
+        # bm25 normalized: [1, 1/3, 0, 0]; vector normalized: [0, 0.5, 1, 0]
+        assert fused.shape == (3, 4)
+        assert fused[0] == pytest.approx([1.0, 1 / 3, 0.0, 0.0])
+        assert fused[1] == pytest.approx([0.5, (1 / 3 + 0.5) / 2, 0.5, 0.0])
+        assert fused[2] == pytest.approx([0.0, 0.5, 1.0, 0.0])
+
+    def test_rrf_uses_per_modality_ranks(self):
+        bm25, vector = candidate_scores(self.CANDIDATES)
+
+        fused = fuse_alpha_grid(bm25, vector, np.array([0.5]), method="rrf", rrf_k=60)
+
+        assert fused[0, 1] == pytest.approx(0.5 / 62 + 0.5 / 62)   # bm25 rank 2, vector rank 2
+        assert fused[0, 2] == pytest.approx(0.5 / 61)              # vector rank 1 only
+
+    def test_top_k_indices_per_alpha(self):
+        bm25, vector = candidate_scores(self.CANDIDATES)
+        fused = fuse_alpha_grid(bm25, vector, np.array([0.0, 1.0]))
+
+        best = top_k_indices(fused, 2)
+
+        assert best.tolist() == [[0, 1], [2, 1]]
+        assert top_k_indices(fused, 10).shape == (2, 4)
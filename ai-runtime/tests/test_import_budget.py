@@ -0,0 +1,55 @@
+"""
+Import-time budget for the application module.
+
+Workers are scaled horizontally, so startup time and per-worker memory
+matter. Optional backends (pymilvus for Milvus, boto3 for Bedrock rerank)
+must only be imported when configured.
+
+Each check runs `import ai_runtime.main` in a fresh interpreter — imports
+already done by other tests in this process would hide regressions.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Modules that must NOT be loaded just by importing the app
+LAZY_MODULES = ("pymilvus", "boto3", "botocore", "pandas")
+
+# Generous wall-clock budget for `import ai_runtime.main` (seconds); the
+# weaviate client (gRPC) and openai SDK dominate. Catches big regressions only.
+IMPORT_TIME_BUDGET_SECONDS = 5.0
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        env=env, capture_output=True, text=True, timeout=60, check=True,
+    )
+
+
+def test_optional_backends_not_imported_at_startup():
+    result = run_python(
+        "import sys, ai_runtime.main; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    loaded = result.stdout.strip()
+    assert loaded == "", f"optional backends imported eagerly: {loaded}"
+
+
+def test_app_import_time_within_budget():
+    result = run_python("import ai_runtime.main", "-X", "importtime")
+
+    # -X importtime lines: "import time: self [us] | cumulative | package"
+    match = re.search(r"\|\s*(\d+)\s*\|\s*ai_runtime\.main\s*$", result.stderr, re.MULTILINE)
+    assert match, "ai_runtime.main not found in -X importtime output"
+    cumulative_seconds = int(match.group(1)) / 1_000_000
+    assert cumulative_seconds < IMPORT_TIME_BUDGET_SECONDS, (
+        f"import ai_runtime.main took {cumulative_seconds:.2f}s "
+        f"(budget {IMPORT_TIME_BUDGET_SECONDS}s)"
+    )
@@ -9,6 +9,7 @@ import pytest
 from unittest.mock import patch, Mock, MagicMock, call
 
 from ai_runtime.services.milvus_service import MilvusService
+from ai_runtime.models import SearchFilter
 from ai_runtime.exceptions import MilvusError
 
 
@@ -96,6 +97,7 @@ class TestInsertChunks:
     def test_inserts_and_flushes(self, milvus_service):
         """Happy path: insert 2 chunks, flush, return count."""
         mock_collection = Mock()
+        mock_collection.schema.fields = []   # collection created before indexed_at
 
         with patch.object(milvus_service, "ensure_collection", return_value=mock_collection):
             result = milvus_service.insert_chunks(
@@ -110,6 +112,19 @@ class TestInsertChunks:
         assert result == 2
         mock_collection.insert.assert_called_once()
         mock_collection.flush.assert_called_once()
+        assert len(mock_collection.insert.call_args[0][0]) == 5
+
+    def test_writes_indexed_at_when_schema_has_it(self, milvus_service):
+        mock_collection = Mock()
+        field = Mock()
+        field.name = "indexed_at"
+        mock_collection.schema.fields = [field]
+
+        with patch.object(milvus_service, "ensure_collection", return_value=mock_collection):
+            milvus_service.insert_chunks(1, [10], [0], ["Doc A"], ["chunk 0"], [[0.1] * 1536])
+
+        columns = mock_collection.insert.call_args[0][0]
+        assert len(columns) == 6 and isinstance(columns[5][0], int)
 
     def test_wraps_insert_error_as_milvus_error(self, milvus_service):
         """If insert fails, wrap as MilvusError."""
@@ -128,6 +143,30 @@ class TestInsertChunks:
                 )
 
 
+class TestIterChunks:
+    """Tests for MilvusService.iter_chunks() (snapshot export)."""
+
+    def test_pages_through_query_iterator(self, milvus_service):
+        field = Mock()
+        field.name = "indexed_at"
+        mock_collection = Mock()
+        mock_collection.schema.fields = [field]
+        row = {"doc_id": 10, "chunk_id": 0, "title": "T", "text": "t", "embedding": [0.1], "indexed_at": 0}
+        iterator = mock_collection.query_iterator.return_value
+        iterator.next.side_effect = [[row, row], [row], []]
+
+        with patch("ai_runtime.services.milvus_service.utility") as mock_utility, \
+             patch("ai_runtime.services.milvus_service.Collection", return_value=mock_collection):
+            mock_utility.has_collection.return_value = True
+            batches = list(milvus_service.iter_chunks(1, batch_size=2))
+
+        assert [len(b) for b in batches] == [2, 1]
+        assert batches[0][0]["vector"] == [0.1]
+        assert batches[0][0]["indexed_at"].year == 1970
+        assert "embedding" in mock_collection.query_iterator.call_args.kwargs["output_fields"]
+        iterator.close.assert_called_once()
+
+
 class TestSearch:
     """Tests for MilvusService.search()."""
 
@@ -170,6 +209,40 @@ class TestSearch:
         assert result[1]["text"] == "world"
         mock_collection.load.assert_called_once()
 
+    def test_filters_become_milvus_expression(self, milvus_service):
+        field = Mock()
+        field.name = "indexed_at"
+        mock_collection = Mock()
+        mock_collection.schema.fields = [field]
+        mock_collection.search.return_value = [[]]
+        filters = SearchFilter(doc_ids=[10, 11], title_like='Release "notes"*', indexed_after="2024-01-01T00:00:00")
+
+        with (
+            patch("ai_runtime.services.milvus_service.utility") as mock_util,
+            patch("ai_runtime.services.milvus_service.Collection", return_value=mock_collection),
+        ):
+            mock_util.has_collection.return_value = True
+            milvus_service.search(project_id=1, query_embedding=[0.1] * 1536, filters=filters)
+
+        assert mock_collection.search.call_args[1]["expr"] == (
+            'doc_id in [10, 11] and title like "Release \\"notes\\"%" and indexed_at > 1704067200'
+        )
+
+    def test_indexed_after_rejected_on_collection_without_indexed_at(self, milvus_service):
+        mock_collection = Mock()
+        mock_collection.schema.fields = []   # created before indexed_at existed
+        filters = SearchFilter(indexed_after="2024-01-01T00:00:00")
+
+        with (
+            patch("ai_runtime.services.milvus_service.utility") as mock_util,
+            patch("ai_runtime.services.milvus_service.Collection", return_value=mock_collection),
+            pytest.raises(MilvusError, match="indexed_after"),
+        ):
+            mock_util.has_collection.return_value = True
+            milvus_service.search(project_id=1, query_embedding=[0.1] * 1536, filters=filters)
+
+        mock_collection.search.assert_not_called()
+
 
 class TestDeleteByDocId:
     """Tests for MilvusService.delete_by_doc_id()."""
@@ -0,0 +1,86 @@
+"""
+Unit tests for opt-in request profiling (ai_runtime/profiling.py).
+
+Route-level behavior (header, window endpoints) is covered in test_routers.py.
+"""
+
+import pstats
+
+import pytest
+
+from ai_runtime import profiling
+from ai_runtime.profiling import Profiler
+
+
+@pytest.fixture
+def now():
+    return [0.0]
+
+
+@pytest.fixture
+def profiler(base_settings, tmp_path, now):
+    base_settings.profiling_token = "secret"
+    base_settings.profiling_dir = str(tmp_path)
+    base_settings.profiling_max_files = 2
+    return Profiler(base_settings, clock=lambda: now[0], sampler=lambda: 0.5)
+
+
+def work():
+    return sum(i * i for i in range(1000))
+
+
+class TestSession:
+    def test_off_without_header_or_window(self, profiler):
+        assert profiler.session("retrieve", 1, None) is None
+
+    def test_profile_is_readable_by_pstats(self, profiler):
+        session = profiler.session("retrieve", 1, "secret")
+        session.run(work)
+        profiler.finish(session)
+
+        stats = pstats.Stats(session.path)
+        assert any(func[2] == "work" for func in stats.stats)
+
+    def test_one_profile_at_a_time(self, profiler):
+        first = profiler.session("retrieve", 1, "secret")
+
+        assert profiler.session("retrieve", 1, "secret") is None
+        profiler.finish(first)
+        assert profiler.session("retrieve", 1, "secret") is not None
+
+    def test_call_profiles_only_inside_a_session(self, profiler):
+        assert profiling.call(work) == work()
+
+        session = profiler.session("index_stream", 1, "secret")
+        reset = profiling._current.set(session)
+        try:
+            profiling.call(work)
+        finally:
+            profiling._current.reset(reset)
+        profiler.finish(session)
+        assert any(func[2] == "work" for func in pstats.Stats(session.path).stats)
+
+    def test_oldest_profiles_pruned(self, profiler, tmp_path):
+        for _ in range(3):
+            profiler.finish(profiler.session("retrieve", 1, "secret"))
+
+        assert len(list(tmp_path.glob("*.prof"))) == 2
+
+
+class TestWindow:
+    def test_window_expires(self, profiler, now):
+        profiler.start_window(10)
+
+        session = profiler.session("index", 1, None)
+        assert session is not None
+        profiler.finish(session)
+
+        now[0] = 10.0
+        assert profiler.session("index", 1, None) is None
+        assert profiler.status()["window_remaining_seconds"] is None
+
+    def test_window_sample_rate(self, profiler):
+        profiler.start_window(10, sample_rate=0.4)   # sampler returns 0.5
+
+        assert profiler.session("index", 1, None) is None
+
@@ -0,0 +1,124 @@
+"""
+Unit tests for RateLimiter.
+
+A fake clock + fake sleep make time deterministic: sleeping just advances
+the clock, so tests run instantly and we can assert exact wait times.
+"""
+
+import openai
+import pytest
+from unittest.mock import Mock
+
+from ai_runtime.services.rate_limiter import RateLimiter, estimate_tokens, parse_duration
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(base_settings, clock) -> RateLimiter:
+    base_settings.openai_rpm_limit = 60        # 1 request / second
+    base_settings.openai_tpm_limit = 6000      # 100 tokens / second
+    base_settings.openai_max_retries = 3
+    base_settings.openai_retry_base_seconds = 0.5
+    base_settings.rate_limit_max_wait_seconds = 120
+    return RateLimiter(base_settings, clock=clock, sleep=clock.sleep)
+
+
+def rate_limit_error(headers: dict | None = None) -> openai.RateLimitError:
+    response = Mock(status_code=429, headers=headers or {})
+    return openai.RateLimitError(message="Rate limit exceeded", response=response, body=None)
+
+
+class TestHelpers:
+    def test_estimate_tokens(self):
+        assert estimate_tokens(["a" * 400, "b" * 400]) == 200
+        assert estimate_tokens([""]) == 1
+
+    @pytest.mark.parametrize("value,seconds", [
+        ("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("1m30.5s", 90.5), ("2", 2.0), (None, None),
+    ])
+    def test_parse_duration(self, value, seconds):
+        assert parse_duration(value) == seconds
+
+
+class TestAcquire:
+    def test_within_budget_does_not_wait(self, limiter, clock):
+        limiter.acquire(estimated_tokens=100)
+        assert clock.sleeps == []
+
+    def test_waits_for_token_budget(self, limiter, clock):
+        limiter.acquire(estimated_tokens=6000)    # drains the TPM bucket
+        limiter.acquire(estimated_tokens=300)     # needs 3 s of refill at 100 tokens/s
+
+        assert sum(clock.sleeps) == pytest.approx(3.0)
+
+    def test_waits_for_request_budget(self, limiter, clock):
+        for _ in range(60):
+            limiter.acquire(estimated_tokens=1)
+        limiter.acquire(estimated_tokens=1)
+
+        assert sum(clock.sleeps) == pytest.approx(1.0, abs=0.1)
+
+
+class TestHeaders:
+    def test_adopts_server_limits_and_remaining(self, limiter):
+        limiter.update_from_headers({
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-remaining-requests": "10",
+            "x-ratelimit-limit-tokens": "200000",
+            "x-ratelimit-remaining-tokens": "150000",
+        })
+
+        assert limiter.requests.capacity == 500
+        assert limiter.requests.tokens == 10
+        assert limiter.tokens.capacity == 200000
+
+    def test_exhausted_budget_blocks_until_reset(self, limiter, clock):
+        limiter.update_from_headers({
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "2s",
+        })
+        limiter.acquire(estimated_tokens=1)
+
+        assert sum(clock.sleeps) >= 2.0
+
+
+class TestCall:
+    def test_retries_rate_limit_then_succeeds(self, limiter, clock):
+        fn = Mock(side_effect=[rate_limit_error({"retry-after": "1"}), "ok"])
+
+        assert limiter.call(fn, estimated_tokens=10) == "ok"
+        assert fn.call_count == 2
+        assert sum(clock.sleeps) >= 1.0   # honored Retry-After
+
+    def test_reraises_after_max_retries(self, limiter):
+        fn = Mock(side_effect=rate_limit_error())
+
+        with pytest.raises(openai.RateLimitError):
+            limiter.call(fn, estimated_tokens=10)
+        assert fn.call_count == 4    # 1 try + 3 retries
+
+    def test_non_retryable_error_is_raised_immediately(self, limiter):
+        fn = Mock(side_effect=openai.AuthenticationError(
+            message="bad key", response=Mock(status_code=401, headers={}), body=None,
+        ))
+
+        with pytest.raises(openai.AuthenticationError):
+            limiter.call(fn, estimated_tokens=10)
+        fn.assert_called_once()
@@ -0,0 +1,157 @@
+"""
+Unit tests for project rebuilds (services/rebuild_service.py).
+
+WeaviateService and EmbeddingService are mocks; the live collection is a
+dict of documents served through document_index / fetch_document.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from ai_runtime.exceptions import RebuildInProgressError, RebuildJobNotFoundError, WeaviateError
+from ai_runtime.services.rebuild_service import TERMINAL_STATUSES, RebuildService, reassemble
+from ai_runtime.services.weaviate_routing import ProjectRoute
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def chunk(doc_id, chunk_id, text, char_start, vector=None):
+    return {
+        "doc_id": doc_id, "chunk_id": chunk_id, "title": f"Doc {doc_id}",
+        "text": text, "char_start": char_start, "vector": vector,
+    }
+
+
+@pytest.fixture
+def live():
+    """doc_id → chunks of the live collection Kb1."""
+    return {
+        10: [chunk(10, 0, "alpha beta", 0, [0.1]), chunk(10, 1, "gamma delta", 11, [0.2])],
+        11: [chunk(11, 0, "epsilon", 0, [0.3])],
+    }
+
+
+@pytest.fixture
+def mock_weaviate(live):
+    weaviate = Mock()
+    weaviate.project_route.return_value = None
+    weaviate.collection_name.return_value = "Kb1"
+    weaviate.document_index.side_effect = lambda name: {doc_id: T0 for doc_id in live}
+    weaviate.fetch_document.side_effect = lambda name, doc_id, include_vector=False: live.get(doc_id, [])
+    return weaviate
+
+
+@pytest.fixture
+def mock_embedding():
+    embedding = Mock()
+    embedding.embed_texts.side_effect = lambda texts, **_: np.zeros((len(texts), 2), dtype="<f4")
+    return embedding
+
+
+@pytest.fixture
+def rebuild_service(mock_weaviate, mock_embedding, memory_cache, base_settings):
+    base_settings.rebuild_drop_grace_seconds = 0
+    base_settings.rebuild_max_chunks_per_second = 0   # no throttling in tests
+    return RebuildService(mock_weaviate, mock_embedding, memory_cache, base_settings)
+
+
+def run(service, **kwargs):
+    job = service.start(project_id=1, **kwargs)
+    deadline = time.monotonic() + 5
+    while job.status not in TERMINAL_STATUSES and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+class TestReassemble:
+    def test_places_chunks_at_their_offsets(self):
+        chunks = [chunk(1, 0, "one two", 0), chunk(1, 1, "two three", 4), chunk(1, 2, "four", 15)]
+
+        assert reassemble(chunks) == "one two three\n four"
+
+    def test_chunks_without_offsets_joined_on_overlap(self):
+        chunks = [chunk(1, 0, "the quick brown fox", None), chunk(1, 1, "quick brown fox jumps", None)]
+
+        assert reassemble(chunks) == "the quick brown fox jumps"
+
+
+class TestRebuild:
+    def test_same_chunking_copies_vectors_and_swaps(self, rebuild_service, mock_weaviate, mock_embedding):
+        job = run(rebuild_service)
+
+        assert job.status == "completed", job.error
+        assert job.vectors_reused
+        assert (job.documents_total, job.documents_done, job.chunks_written) == (2, 2, 3)
+        mock_embedding.embed_texts.assert_not_called()
+
+        first = mock_weaviate.insert_chunks.call_args_list[0].kwargs
+        assert first["collection"] == job.target_collection
+        assert first["embeddings"] == [[0.1], [0.2]]
+        assert first["indexed_at"] == T0
+
+        mock_weaviate.routing.set.assert_called_once_with(
+            1, ProjectRoute(job.target_collection, chunk_size=job.chunk_size, chunk_overlap=job.chunk_overlap),
+        )
+        mock_weaviate.drop_collection.assert_called_once_with("Kb1")
+
+    def test_new_chunking_resplits_and_embeds(self, rebuild_service, mock_weaviate, mock_embedding):
+        job = run(rebuild_service, chunk_size=12, chunk_overlap=0)
+
+        assert job.status == "completed", job.error
+        assert not job.vectors_reused
+        doc10 = mock_weaviate.insert_chunks.call_args_list[0].kwargs
+        assert doc10["texts"] == ["alpha beta", "gamma delta"]
+        assert doc10["char_starts"] == [0, 11]
+        assert mock_embedding.embed_texts.call_count == 2
+
+    def test_documents_changed_during_copy_are_copied_again(self, rebuild_service, mock_weaviate, live):
+        later = datetime.now(timezone.utc) + timedelta(hours=1)
+        indexes = iter([
+            {10: T0, 11: T0},      # initial listing
+            {10: later},           # catch-up: 10 re-indexed, 11 deleted
+            {10: later},           # after the swap: nothing newer
+        ])
+        mock_weaviate.document_index.side_effect = lambda name: next(indexes)
+
+        job = run(rebuild_service)
+
+        assert job.status == "completed", job.error
+        target = job.target_collection
+        mock_weaviate.delete_documents.assert_any_call(1, [10], collection=target)
+        mock_weaviate.delete_documents.assert_any_call(1, [11], collection=target)
+        copied = [c.kwargs["doc_ids"][0] for c in mock_weaviate.insert_chunks.call_args_list]
+        assert copied == [10, 11, 10]
+
+    def test_failure_before_swap_drops_shadow_and_keeps_route(self, rebuild_service, mock_weaviate):
+        mock_weaviate.insert_chunks.side_effect = WeaviateError("insert failed")
+
+        job = run(rebuild_service)
+
+        assert job.status == "failed"
+        assert "insert failed" in job.error
+        mock_weaviate.routing.set.assert_not_called()
+        mock_weaviate.drop_collection.assert_called_once_with(job.target_collection)
+
+    def test_one_rebuild_per_project(self, rebuild_service, mock_weaviate):
+        rebuild_service.drop_grace_seconds = 5
+        job = rebuild_service.start(project_id=1)
+        try:
+            with pytest.raises(RebuildInProgressError):
+                rebuild_service.start(project_id=1)
+        finally:
+            rebuild_service.close()
+            while job.status not in TERMINAL_STATUSES:
+                time.sleep(0.01)
+
+    def test_unknown_job(self, rebuild_service):
+        with pytest.raises(RebuildJobNotFoundError):
+            rebuild_service.get("nope")
+
+    def test_rebuilt_project_keeps_its_chunking(self, rebuild_service, mock_weaviate):
+        mock_weaviate.project_route.return_value = ProjectRoute("Kb1_r1", chunk_size=300, chunk_overlap=30)
+
+        assert rebuild_service.current_chunking(1) == (300, 30)
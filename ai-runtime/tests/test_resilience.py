@@ -0,0 +1,148 @@
+"""
+Unit tests for LatencyTracker, LatencyBudget, CircuitBreaker and Resilience.
+
+A fake clock drives every time-based transition.
+"""
+
+import pytest
+
+from ai_runtime.exceptions import CircuitOpenError, DeadlineExceededError
+from ai_runtime.services.resilience import CircuitBreaker, LatencyTracker, Resilience
+
+
+def out_of_time():
+    raise DeadlineExceededError("search")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLatencyTracker:
+    def test_percentile_needs_enough_samples(self):
+        tracker = LatencyTracker()
+        tracker.record("rerank", 1.0)
+        assert tracker.percentile("rerank", 95) is None
+
+    def test_nearest_rank_percentiles(self):
+        tracker = LatencyTracker()
+        for ms in range(1, 101):
+            tracker.record("search", ms / 1000)
+
+        assert tracker.percentile("search", 50) == pytest.approx(0.050)
+        assert tracker.percentile("search", 95) == pytest.approx(0.095)
+        assert tracker.snapshot()["search"]["p99"] == 99.0
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=5)
+        for _ in range(5):
+            tracker.record("answer", 10.0)
+        for _ in range(5):
+            tracker.record("answer", 0.1)
+        assert tracker.percentile("answer", 99) == pytest.approx(0.1)
+
+
+class TestLatencyBudget:
+    def test_stage_allowed_only_if_its_p95_fits(self, base_settings):
+        clock = FakeClock()
+        resilience = Resilience(base_settings, clock=clock)
+        for _ in range(10):
+            resilience.tracker.record("answer", 0.4)
+
+        budget = resilience.budget(1000)
+        clock.now += 0.5
+        assert budget.allows("answer")        # 0.5 elapsed + 0.4 ≤ 1.0
+        clock.now += 0.2
+        assert not budget.allows("answer")    # 0.7 elapsed + 0.4 > 1.0
+
+    def test_unknown_stage_allowed_while_budget_left(self, base_settings):
+        clock = FakeClock()
+        budget = Resilience(base_settings, clock=clock).budget(100)
+        assert budget.allows("rerank")
+        clock.now += 0.2
+        assert not budget.allows("rerank")
+
+    def test_no_budget_never_degrades(self, base_settings):
+        assert Resilience(base_settings).budget(None).allows("rerank")
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures_and_recovers(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("rerank", failure_threshold=3, reset_seconds=10, clock=clock)
+
+        for _ in range(3):
+            assert breaker.acquire()
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.acquire()
+        assert breaker.retry_after() == pytest.approx(10)
+
+        clock.now += 10
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.acquire()          # the single trial call
+        assert not breaker.acquire()      # others still fail fast
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_trial_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("answer", failure_threshold=1, reset_seconds=5, clock=clock)
+        breaker.record_failure()
+        clock.now += 5
+        assert breaker.acquire()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("search", failure_threshold=2, reset_seconds=5)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestResilienceCall:
+    def test_failures_open_the_stage_breaker(self, base_settings):
+        resilience = Resilience(base_settings)
+
+        def boom():
+            raise RuntimeError("weaviate down")
+
+        for _ in range(base_settings.circuit_failure_threshold):
+            with pytest.raises(RuntimeError):
+                resilience.call("search", boom)
+
+        with pytest.raises(CircuitOpenError):
+            resilience.call("search", lambda: "never called")
+        assert resilience.available("rerank")
+
+    def test_deadline_failures_leave_breaker_closed(self, base_settings):
+        """A caller's own timeout says nothing about the upstream — it must not open the breaker."""
+        resilience = Resilience(base_settings)
+
+        for _ in range(base_settings.circuit_failure_threshold + 2):
+            with pytest.raises(DeadlineExceededError):
+                resilience.call("search", out_of_time)
+
+        assert resilience.breakers["search"].state == CircuitBreaker.CLOSED
+        assert resilience.call("search", lambda: "ok") == "ok"
+
+    def test_deadline_during_half_open_trial_frees_the_slot(self, base_settings):
+        clock = FakeClock()
+        resilience = Resilience(base_settings, clock=clock)
+        breaker = resilience.breakers["search"]
+        for _ in range(base_settings.circuit_failure_threshold):
+            breaker.record_failure()
+        clock.now += base_settings.circuit_reset_seconds
+
+        with pytest.raises(DeadlineExceededError):
+            resilience.call("search", out_of_time)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert resilience.call("search", lambda: "ok") == "ok"   # next caller gets the trial
+        assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,282 @@
+"""
+Unit tests for RetrievalService.
+
+RetrievalService orchestrates embed → hybrid search → rerank. The three
+services are mocked; caching runs on the in-memory TieredCache.
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from ai_runtime.models import SearchFilter
+from ai_runtime.services.resilience import Resilience
+from ai_runtime.services.retrieval_service import RetrievalService
+
+
+CHUNKS = [
+    {"doc_id": 10, "chunk_id": 0, "title": "Doc A", "text": "hello", "score": 0.9},
+    {"doc_id": 11, "chunk_id": 1, "title": "Doc B", "text": "world", "score": 0.7},
+]
+
+
+@pytest.fixture
+def mock_weaviate():
+    svc = Mock()
+    svc.hybrid_search.return_value = CHUNKS
+    return svc
+
+
+@pytest.fixture
+def mock_rerank():
+    svc = Mock()
+    svc.rerank.side_effect = lambda query, chunks, top_n: list(reversed(chunks))[:top_n]
+    return svc
+
+
+@pytest.fixture
+def make_service(mock_weaviate, mock_rerank, base_settings, memory_cache):
+    def factory(resilience: Resilience | None = None, **overrides) -> RetrievalService:
+        for name, value in overrides.items():
+            setattr(base_settings, name, value)
+        return RetrievalService(
+            weaviate_service=mock_weaviate,
+            embedding_service=Mock(),
+            rerank_service=mock_rerank,
+            settings=base_settings,
+            cache=memory_cache,
+            resilience=resilience,
+        )
+    return factory
+
+
+class TestSearch:
+    def test_returns_hybrid_results(self, make_service, mock_weaviate, mock_rerank):
+        svc = make_service()
+
+        results = svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        assert results == CHUNKS
+        mock_weaviate.hybrid_search.assert_called_once()
+        mock_rerank.rerank.assert_not_called()
+
+    def test_reranks_when_enabled(self, make_service, mock_rerank):
+        svc = make_service(rerank_enabled=True, rerank_top_n=1)
+
+        results = svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        assert results == [CHUNKS[1]]
+        mock_rerank.rerank.assert_called_once()
+
+    def test_no_rerank_service_means_no_rerank(self, make_service):
+        """get_rerank_service returns None when disabled; the pipeline must cope."""
+        svc = make_service(rerank_enabled=True)
+        svc.rerank = None
+
+        results = svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        assert results == CHUNKS
+
+    def test_cache_hit_skips_weaviate(self, make_service, mock_weaviate):
+        svc = make_service()
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+        results = svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        assert results == CHUNKS
+        mock_weaviate.hybrid_search.assert_called_once()
+
+    def test_different_alpha_is_a_different_entry(self, make_service, mock_weaviate):
+        svc = make_service()
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.7, top_k=5)
+
+        assert mock_weaviate.hybrid_search.call_count == 2
+
+    def test_different_embedding_model_is_a_different_entry(self, make_service, mock_weaviate):
+        make_service().search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+        svc = make_service(openai_embedding_model="text-embedding-3-large")
+        svc.search(project_id=1, query="q", query_embedding=[0.2], alpha=0.5, top_k=5)
+
+        assert mock_weaviate.hybrid_search.call_count == 2
+
+    def test_project_invalidation_forces_new_search(self, make_service, mock_weaviate, memory_cache):
+        svc = make_service()
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+        memory_cache.invalidate_project(1)
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        assert mock_weaviate.hybrid_search.call_count == 2
+
+    def test_returns_copies_safe_to_mutate(self, make_service):
+        """Results can be shared by coalesced callers, so each caller gets its own dicts."""
+        svc = make_service()
+        first = svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+        first[0]["score"] = -1.0
+
+        second = svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        assert second[0]["score"] == 0.9
+
+    def test_cache_disabled(self, make_service, mock_weaviate):
+        svc = make_service(retrieval_cache_enabled=False)
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        assert mock_weaviate.hybrid_search.call_count == 2
+
+
+class TestBatchHelpers:
+    def test_embed_queries_uses_one_call_per_batch(self, make_service):
+        svc = make_service()
+        svc.embedding.embed_texts.side_effect = lambda texts: np.full((len(texts), 1), 0.1, dtype=np.float32)
+
+        embeddings = svc.embed_queries(["a", "b", "c"], batch_size=2)
+
+        assert len(embeddings) == 3
+        assert [c[0][0] for c in svc.embedding.embed_texts.call_args_list] == [["a", "b"], ["c"]]
+
+    def test_search_each_keeps_query_order(self, make_service, mock_weaviate):
+        mock_weaviate.hybrid_search.side_effect = lambda query, **kw: [{**CHUNKS[0], "text": query}]
+        svc = make_service()
+
+        rankings = svc.search_each(1, ["x", "y", "z"], [[0.1]] * 3, alpha=0.5, top_k=5, concurrency=3)
+
+        assert [r[0]["text"] for r in rankings] == ["x", "y", "z"]
+
+
+class TestFilters:
+    def test_filters_reach_weaviate_and_split_the_cache(self, make_service, mock_weaviate):
+        svc = make_service()
+        scoped = SearchFilter(doc_ids=[10])
+
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5, filters=scoped)
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5, filters=scoped)
+
+        calls = mock_weaviate.hybrid_search.call_args_list
+        assert [c[1]["filters"] for c in calls] == [None, scoped]
+
+
+class TestSearchMany:
+    def test_fans_out_per_project_and_merges(self, make_service, mock_weaviate):
+        mock_weaviate.hybrid_search.side_effect = lambda project_id, **kw: [
+            {**c, "score": c["score"] / project_id} for c in CHUNKS
+        ]
+        svc = make_service()
+
+        results = svc.search_many(
+            project_ids=[1, 2], query="q", query_embedding=[0.1], alpha=0.5, top_k=3,
+        )
+
+        assert mock_weaviate.hybrid_search.call_count == 2
+        assert [(r["project_id"], r["doc_id"]) for r in results] == [(1, 10), (2, 10), (1, 11)]
+
+    def test_each_project_is_cached_separately(self, make_service, mock_weaviate):
+        svc = make_service()
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        svc.search_many(project_ids=[1, 2], query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        searched = [c[1]["project_id"] for c in mock_weaviate.hybrid_search.call_args_list]
+        assert searched == [1, 2]
+
+
+class TestExpandNeighbors:
+    def test_one_fetch_per_project_with_deduplicated_neighbors(self, make_service, mock_weaviate):
+        mock_weaviate.fetch_chunks.side_effect = lambda project_id, keys: [
+            {"doc_id": d, "chunk_id": c, "title": "T", "text": f"{project_id}-{d}-{c}"} for d, c in keys
+        ]
+        hits = [
+            {"project_id": 1, "doc_id": 10, "chunk_id": 2, "title": "T", "text": "hit a", "score": 0.9},
+            {"project_id": 1, "doc_id": 10, "chunk_id": 3, "title": "T", "text": "hit b", "score": 0.8},
+            {"project_id": 2, "doc_id": 10, "chunk_id": 0, "title": "T", "text": "hit c", "score": 0.7},
+        ]
+        svc = make_service()
+
+        expanded = svc.expand_neighbors(hits, window=1)
+
+        assert [(r["project_id"], r["chunk_id"]) for r in expanded] == [(1, 1), (1, 2), (1, 3), (1, 4), (2, 0), (2, 1)]
+        assert mock_weaviate.fetch_chunks.call_count == 2
+        fetched = {c[0][0]: c[0][1] for c in mock_weaviate.fetch_chunks.call_args_list}
+        assert fetched == {1: [(10, 1), (10, 4)], 2: [(10, 1)]}
+        assert expanded[0]["neighbor_of"] == 2 and expanded[0]["score"] == 0.9
+        assert "neighbor_of" not in expanded[1]
+
+    def test_missing_neighbors_are_skipped(self, make_service, mock_weaviate):
+        mock_weaviate.fetch_chunks.return_value = []
+        hit = {"project_id": 1, "doc_id": 10, "chunk_id": 0, "title": "T", "text": "only", "score": 0.5}
+
+        assert make_service().expand_neighbors([hit], window=2) == [hit]
+
+    def test_window_zero_is_a_no_op(self, make_service, mock_weaviate):
+        assert make_service().expand_neighbors(CHUNKS, window=0) == CHUNKS
+        mock_weaviate.fetch_chunks.assert_not_called()
+
+
+class TestDegradation:
+    """Rerank is optional: skipped (and not cached) when over budget or its breaker is open."""
+
+    def test_rerank_skipped_when_over_latency_budget(self, make_service, mock_weaviate, mock_rerank, base_settings):
+        resilience = Resilience(base_settings)
+        for _ in range(10):
+            resilience.tracker.record("rerank", 2.0)   # recent reranks took 2s
+        svc = make_service(resilience=resilience, rerank_enabled=True, rerank_top_n=1)
+
+        results = svc.search(
+            project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5,
+            budget=resilience.budget(500),
+        )
+
+        assert results == CHUNKS[:1]
+        assert svc.skipped_stages == ["rerank"]
+        mock_rerank.rerank.assert_not_called()
+
+        # The degraded result was not cached: the next search runs the full pipeline
+        make_service(rerank_enabled=True, rerank_top_n=1).search(
+            project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5,
+        )
+        assert mock_weaviate.hybrid_search.call_count == 2
+        mock_rerank.rerank.assert_called_once()
+
+    def test_budget_skipped_result_not_shared_with_followers(self, make_service, base_settings):
+        """Rerank skipped for the leader's budget is the leader's alone; an open circuit is everyone's."""
+        resilience = Resilience(base_settings)
+        for _ in range(10):
+            resilience.tracker.record("rerank", 2.0)
+        svc = make_service(resilience=resilience, rerank_enabled=True, rerank_top_n=1)
+        shared = []
+        flight_do = svc.search_flight.do
+
+        def do(key, fn, timeout=None, shareable=None):
+            outcome = flight_do(key, fn, timeout=timeout, shareable=shareable)
+            shared.append(shareable(outcome))
+            return outcome
+
+        svc.search_flight.do = do
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5, budget=resilience.budget(500))
+        for _ in range(base_settings.circuit_failure_threshold):
+            resilience.breakers["rerank"].record_failure()
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        assert shared == [False, True]
+
+    def test_rerank_skipped_while_circuit_open(self, make_service, mock_rerank, base_settings):
+        resilience = Resilience(base_settings)
+        for _ in range(base_settings.circuit_failure_threshold):
+            resilience.breakers["rerank"].record_failure()
+        svc = make_service(resilience=resilience, rerank_enabled=True, rerank_top_n=1)
+
+        svc.search(project_id=1, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        assert svc.skipped_stages == ["rerank"]
+        mock_rerank.rerank.assert_not_called()
+
+    def test_search_latency_is_recorded(self, make_service, base_settings):
+        resilience = Resilience(base_settings)
+        svc = make_service(resilience=resilience)
+
+        for project_id in range(5):
+            svc.search(project_id=project_id, query="q", query_embedding=[0.1], alpha=0.5, top_k=5)
+
+        assert resilience.tracker.percentile("search", 95) is not None
+        assert svc.skipped_stages == []
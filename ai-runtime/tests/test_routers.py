@@ -9,10 +9,14 @@ needing real OpenAI/Milvus/Weaviate connections.
 This is the Python equivalent of Spring's @WebMvcTest + @MockBean.
 """
 
+import json
+
+import numpy as np
 import pytest
 from unittest.mock import Mock, patch
 from fastapi.testclient import TestClient
 
+from ai_runtime import tracing
 from ai_runtime.main import app
 from ai_runtime.dependencies import (
     get_document_service,
@@ -20,10 +24,22 @@ from ai_runtime.dependencies import (
     get_weaviate_service,
     get_embedding_service,
     get_rerank_service,
+    get_answer_service,
+    get_batch_answer_service,
+    get_rebuild_service,
+    get_snapshot_service,
+    get_shadow_traffic,
+    get_profiler,
+    get_cache,
+    get_evaluation_resilience,
+    get_resilience,
     get_settings,
 )
 from ai_runtime.config import Settings
-from ai_runtime.exceptions import EmbeddingError, MilvusError, WeaviateError
+from ai_runtime.services.resilience import Resilience
+from ai_runtime.services.shadow_traffic import ShadowTraffic
+from ai_runtime.profiling import Profiler
+from ai_runtime.exceptions import EmbeddingError, MilvusError, WeaviateError, AnswerGenerationError
 
 
 # ──────────────────────────────────────
@@ -59,9 +75,39 @@ def mock_rerank_svc():
     return svc
 
 
+@pytest.fixture
+def mock_answer_svc():
+    svc = Mock()
+    svc.generate.return_value = "generated answer"
+    return svc
+
+
+@pytest.fixture
+def resilience(fake_settings):
+    """Fresh breakers / latency history per test (the real one is a per-worker singleton)."""
+    return Resilience(fake_settings)
+
+
+@pytest.fixture
+def shadow(fake_settings, mock_milvus_svc):
+    """Shadow traffic off (sample rate 0) unless a test turns it on; mirrors to mock_milvus_svc."""
+    shadow = ShadowTraffic(fake_settings, backend="milvus", backend_factory=lambda: mock_milvus_svc)
+    yield shadow
+    shadow.close()
+
+
+@pytest.fixture
+def profiler(base_settings, tmp_path):
+    """Profiling enabled with token "secret", profiles written to tmp_path."""
+    base_settings.profiling_token = "secret"
+    base_settings.profiling_dir = str(tmp_path / "profiles")
+    return Profiler(base_settings)
+
+
 @pytest.fixture
 def client(fake_settings, mock_doc_service, mock_milvus_svc,
-           mock_weaviate_svc, mock_embedding_svc, mock_rerank_svc):
+           mock_weaviate_svc, mock_embedding_svc, mock_rerank_svc,
+           mock_answer_svc, memory_cache, resilience, shadow, profiler):
     """
     FastAPI TestClient with all service dependencies replaced by mocks.
 
@@ -74,6 +120,12 @@ def client(fake_settings, mock_doc_service, mock_milvus_svc,
     app.dependency_overrides[get_weaviate_service] = lambda: mock_weaviate_svc
     app.dependency_overrides[get_embedding_service] = lambda: mock_embedding_svc
     app.dependency_overrides[get_rerank_service] = lambda: mock_rerank_svc
+    app.dependency_overrides[get_answer_service] = lambda: mock_answer_svc
+    app.dependency_overrides[get_cache] = lambda: memory_cache
+    app.dependency_overrides[get_resilience] = lambda: resilience
+    app.dependency_overrides[get_evaluation_resilience] = lambda: Resilience(fake_settings)
+    app.dependency_overrides[get_shadow_traffic] = lambda: shadow
+    app.dependency_overrides[get_profiler] = lambda: profiler
 
     with TestClient(app) as c:
         yield c
@@ -105,6 +157,17 @@ class TestIndexEndpoint:
         assert data["chunks_count"] == 3
         assert data["doc_id"] == 10
 
+    def test_success_invalidates_project_cache(self, client, mock_doc_service, memory_cache):
+        """Re-indexing changes the KB, so the project's cached retrievals and answers are dropped."""
+        mock_doc_service.process_document.return_value = 3
+
+        with patch.object(memory_cache, "invalidate_project") as invalidate:
+            client.post("/index-document", json={
+                "project_id": 1, "doc_id": 10, "title": "Test Doc", "content": "Hello",
+            })
+
+        invalidate.assert_called_once_with(1)
+
     def test_validation_error_returns_422(self, client):
         """Missing required fields → 422 (FastAPI auto-validation)."""
         response = client.post("/index-document", json={
@@ -137,6 +200,147 @@ class TestIndexEndpoint:
         assert response.json()["error"] == "milvus_error"
 
 
+class TestIndexStreamEndpoint:
+    """Tests for POST /index-document/stream."""
+
+    def test_streams_body_into_indexer(self, client, mock_doc_service):
+        """Body pieces are decoded and fed to the indexer; finish() gives the count."""
+        indexer = Mock()
+        indexer.finish.return_value = 7
+        mock_doc_service.open_stream.return_value = indexer
+
+        def body():
+            yield "first part, ".encode()
+            yield "caf\u00e9".encode()[:4]     # split inside a multi-byte character
+            yield "caf\u00e9".encode()[4:]
+
+        response = client.post(
+            "/index-document/stream",
+            params={"project_id": 1, "doc_id": 10, "title": "Big Doc"},
+            content=body(),
+            headers={"Content-Type": "text/markdown"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["chunks_count"] == 7
+        mock_doc_service.open_stream.assert_called_once_with(project_id=1, doc_id=10, title="Big Doc")
+        fed = "".join(c[0][0] for c in indexer.feed.call_args_list)
+        assert fed == "first part, caf\u00e9"
+
+    def test_missing_query_params_returns_422(self, client):
+        """project_id / doc_id / title are required query parameters."""
+        response = client.post("/index-document/stream", content=b"text")
+        assert response.status_code == 422
+
+    def test_profiled_with_header(self, client, mock_doc_service, profiler):
+        mock_doc_service.open_stream.return_value.finish.return_value = 1
+
+        response = client.post(
+            "/index-document/stream",
+            params={"project_id": 3, "doc_id": 10, "title": "Doc"},
+            content=b"text",
+            headers={"X-Profile": "secret"},
+        )
+
+        assert response.status_code == 200
+        assert [p["name"].split("-")[:2] for p in profiler.profiles()] == [["index_stream", "p3"]]
+
+    def test_embedding_error_returns_502(self, client, mock_doc_service):
+        """EmbeddingError raised mid-stream → global handler → 502."""
+        indexer = Mock()
+        indexer.feed.side_effect = EmbeddingError("OpenAI is down")
+        mock_doc_service.open_stream.return_value = indexer
+
+        response = client.post(
+            "/index-document/stream",
+            params={"project_id": 1, "doc_id": 10, "title": "Doc"},
+            content=b"some text",
+        )
+
+        assert response.status_code == 502
+        assert response.json()["error"] == "embedding_error"
+
+    def test_invalid_utf8_returns_400_and_removes_partial_document(self, client, mock_doc_service):
+        """Undecodable bytes are rejected instead of being indexed as U+FFFD."""
+        indexer = Mock()
+        mock_doc_service.open_stream.return_value = indexer
+
+        def body():
+            yield b"valid start, "
+            yield b"\xff\xfe broken"
+
+        response = client.post(
+            "/index-document/stream",
+            params={"project_id": 1, "doc_id": 10, "title": "Doc"},
+            content=body(),
+        )
+
+        assert response.status_code == 400
+        assert "UTF-8" in response.json()["detail"]
+        indexer.abort.assert_called_once()
+        indexer.finish.assert_not_called()
+
+
+# ──────────────────────────────────────
+# DELETE /documents
+# ──────────────────────────────────────
+
+class TestDeleteDocumentsEndpoint:
+    """Tests for DELETE /documents/{project_id}[/{doc_id}]."""
+
+    def test_delete_one_document(self, client, mock_doc_service, memory_cache):
+        mock_doc_service.delete_document.return_value = 4
+
+        with patch.object(memory_cache, "invalidate_project") as invalidate:
+            response = client.delete("/documents/1/10")
+
+        assert response.status_code == 200
+        assert response.json()["deleted_chunks"] == 4
+        mock_doc_service.delete_document.assert_called_once_with(project_id=1, doc_id=10)
+        invalidate.assert_called_once_with(1)
+
+    def test_delete_many_documents_in_one_call(self, client, mock_doc_service):
+        """Duplicate ids are collapsed; all ids go to one delete_documents call."""
+        mock_doc_service.delete_documents.return_value = 9
+
+        response = client.delete("/documents/1", params={"doc_ids": [10, 11, 10]})
+
+        assert response.status_code == 200
+        assert response.json()["doc_ids"] == [10, 11]
+        mock_doc_service.delete_documents.assert_called_once_with(project_id=1, doc_ids=[10, 11])
+
+    def test_delete_whole_project(self, client, mock_doc_service, memory_cache):
+        mock_doc_service.delete_project.return_value = True
+
+        with patch.object(memory_cache, "invalidate_project") as invalidate:
+            response = client.delete("/documents/1", params={"all": "true"})
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "SUCCESS"
+        mock_doc_service.delete_project.assert_called_once_with(1)
+        invalidate.assert_called_once_with(1)
+
+    def test_missing_project_reports_not_found(self, client, mock_doc_service):
+        mock_doc_service.delete_project.return_value = False
+
+        response = client.delete("/documents/1", params={"all": "true"})
+
+        assert response.json()["status"] == "NOT_FOUND"
+
+    def test_requires_doc_ids_or_all(self, client, mock_doc_service):
+        """Neither (or both) → 422, never an accidental project wipe."""
+        assert client.delete("/documents/1").status_code == 422
+        assert client.delete("/documents/1", params={"all": "true", "doc_ids": [1]}).status_code == 422
+        mock_doc_service.delete_project.assert_not_called()
+
+    def test_too_many_doc_ids_returns_422(self, client, fake_settings):
+        fake_settings.delete_max_doc_ids = 2
+
+        response = client.delete("/documents/1", params={"doc_ids": [1, 2, 3]})
+
+        assert response.status_code == 422
+
+
 # ──────────────────────────────────────
 # POST /retrieve-document
 # ──────────────────────────────────────
@@ -216,6 +420,51 @@ class TestRetrieveEndpoint:
         assert data["results"][0]["score"] == 0.9
         assert data["answer"] is None
 
+    def test_generate_answer_uses_answer_service(
+        self, client, mock_embedding_svc, mock_weaviate_svc, mock_answer_svc
+    ):
+        """generate_answer=True: AnswerService gets the project, query and final chunks."""
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+
+        response = client.post("/retrieve-document", json={
+            "project_id": 1, "query": "test query",
+        })
+
+        assert response.status_code == 200
+        assert response.json()["answer"] == "generated answer"
+        call_kwargs = mock_answer_svc.generate.call_args[1]
+        assert call_kwargs["project_id"] == 1
+        assert call_kwargs["results"][0].doc_id == 10
+
+    def test_answer_failure_still_returns_results(
+        self, client, mock_embedding_svc, mock_weaviate_svc, mock_answer_svc
+    ):
+        """AnswerGenerationError → 200 with results and answer=None."""
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+        mock_answer_svc.generate.side_effect = AnswerGenerationError("chat down")
+
+        response = client.post("/retrieve-document", json={
+            "project_id": 1, "query": "test query",
+        })
+
+        assert response.status_code == 200
+        assert response.json()["answer"] is None
+        assert len(response.json()["results"]) == 1
+
+    def test_repeat_query_served_from_retrieval_cache(self, client, mock_embedding_svc, mock_weaviate_svc):
+        """Second identical request skips Weaviate; re-indexing the project invalidates it."""
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+        body = {"project_id": 1, "query": "test query", "generate_answer": False}
+
+        first = client.post("/retrieve-document", json=body)
+        second = client.post("/retrieve-document", json=body)
+
+        assert first.json()["results"] == second.json()["results"]
+        mock_weaviate_svc.hybrid_search.assert_called_once()
+
     def test_validation_error_missing_query(self, client):
         """Missing 'query' field → 422."""
         response = client.post("/retrieve-document", json={"project_id": 1})
@@ -232,6 +481,544 @@ class TestRetrieveEndpoint:
         assert response.status_code == 502
         assert response.json()["error"] == "embedding_error"
 
+    def test_spent_timeout_header_returns_504(self, client, mock_embedding_svc, mock_weaviate_svc):
+        """X-Request-Timeout-Ms is enforced: an exhausted budget stops before the search → 504."""
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+
+        response = client.post(
+            "/retrieve-document",
+            json={"project_id": 1, "query": "test", "generate_answer": False},
+            headers={"X-Request-Timeout-Ms": "0"},
+        )
+
+        assert response.status_code == 504
+        assert response.json()["error"] == "deadline_exceeded"
+        mock_weaviate_svc.hybrid_search.assert_not_called()
+
+    def test_project_ids_fan_out_and_merge(
+        self, client, mock_embedding_svc, mock_weaviate_svc, mock_answer_svc,
+    ):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.side_effect = lambda project_id, **kw: [
+            {**FAKE_CHUNKS[0], "doc_id": project_id * 100},
+        ]
+
+        response = client.post("/retrieve-document", json={
+            "project_id": 1, "project_ids": [2, 1, 3], "query": "test", "fusion": "score",
+        })
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["project_ids"] == [1, 2, 3]
+        assert {(r["project_id"], r["doc_id"]) for r in body["results"]} == {(1, 100), (2, 200), (3, 300)}
+        mock_embedding_svc.embed_single.assert_called_once()
+        # Answers over several projects are not cached (invalidation is per project)
+        assert mock_answer_svc.generate.call_args[1]["cacheable"] is False
+
+    def test_expand_neighbors_adds_adjacent_chunks(self, client, mock_embedding_svc, mock_weaviate_svc):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = [{**FAKE_CHUNKS[0], "chunk_id": 4}]
+        mock_weaviate_svc.fetch_chunks.return_value = [
+            {"doc_id": FAKE_CHUNKS[0]["doc_id"], "chunk_id": 5, "title": "Next", "text": "after"},
+        ]
+
+        response = client.post("/retrieve-document", json={
+            "project_id": 1, "query": "test", "generate_answer": False, "expand_neighbors": 1,
+        })
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [(r["chunk_id"], r["neighbor_of"]) for r in results] == [(4, None), (5, 4)]
+        mock_weaviate_svc.fetch_chunks.assert_called_once()
+
+    def test_filters_are_passed_to_weaviate(self, client, mock_embedding_svc, mock_weaviate_svc):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+
+        response = client.post("/retrieve-document", json={
+            "project_id": 1, "query": "test", "generate_answer": False,
+            "filters": {"doc_ids": [10], "title_like": "Guide*", "indexed_after": "2024-06-01T00:00:00Z"},
+        })
+
+        assert response.status_code == 200
+        filters = mock_weaviate_svc.hybrid_search.call_args[1]["filters"]
+        assert filters.doc_ids == [10] and filters.title_like == "Guide*"
+        assert filters.indexed_after.year == 2024
+
+    def test_include_text_false_returns_offsets_only(self, client, mock_embedding_svc, mock_weaviate_svc):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = [{**FAKE_CHUNKS[0], "char_start": 120}]
+
+        response = client.post("/retrieve-document", json={
+            "project_id": 1, "query": "test", "generate_answer": False, "include_text": False,
+        })
+
+        assert response.status_code == 200
+        assert response.json()["results"] == [
+            {"doc_id": 10, "chunk_id": 0, "score": 0.9, "project_id": 1, "char_start": 120, "char_end": 125},
+        ]
+
+    def test_msgpack_requested_without_msgpack_falls_back_to_json(
+        self, client, mock_embedding_svc, mock_weaviate_svc,
+    ):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+
+        with patch.dict("sys.modules", {"msgpack": None}):
+            response = client.post(
+                "/retrieve-document",
+                json={"project_id": 1, "query": "test", "generate_answer": False},
+                headers={"Accept": "application/msgpack"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["results"][0]["text"] == "hello"
+
+    def test_large_response_is_gzipped(self, client, mock_embedding_svc, mock_weaviate_svc):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = [{**FAKE_CHUNKS[0], "text": "x" * 5000}]
+
+        response = client.post(
+            "/retrieve-document",
+            json={"project_id": 1, "query": "test", "generate_answer": False},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["results"][0]["text"] == "x" * 5000
+
+    def test_expand_neighbors_over_limit_returns_422(self, client, fake_settings):
+        response = client.post("/retrieve-document", json={
+            "project_id": 1, "query": "test", "expand_neighbors": fake_settings.retrieve_max_expand_neighbors + 1,
+        })
+
+        assert response.status_code == 422
+
+    def test_too_many_projects_returns_422(self, client, fake_settings):
+        response = client.post("/retrieve-document", json={
+            "project_id": 1,
+            "project_ids": list(range(2, fake_settings.retrieve_max_projects + 2)),
+            "query": "test",
+        })
+        assert response.status_code == 422
+
+    def test_answer_skipped_when_over_latency_budget(
+        self, client, mock_embedding_svc, mock_weaviate_svc, mock_answer_svc, resilience,
+    ):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+        for _ in range(10):
+            resilience.tracker.record("answer", 5.0)   # recent answers took 5s
+
+        response = client.post("/retrieve-document", json={
+            "project_id": 1, "query": "test", "latency_budget_ms": 1000,
+        })
+
+        assert response.status_code == 200
+        assert response.json()["answer"] is None
+        assert response.json()["skipped_stages"] == ["answer"]
+        mock_answer_svc.generate.assert_not_called()
+
+    def test_answer_skipped_while_circuit_open(
+        self, client, mock_embedding_svc, mock_weaviate_svc, mock_answer_svc, resilience, fake_settings,
+    ):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+        for _ in range(fake_settings.circuit_failure_threshold):
+            resilience.breakers["answer"].record_failure()
+
+        response = client.post("/retrieve-document", json={"project_id": 1, "query": "test"})
+
+        assert response.status_code == 200
+        assert response.json()["skipped_stages"] == ["answer"]
+        mock_answer_svc.generate.assert_not_called()
+
+    def test_open_search_circuit_fails_fast_with_503(
+        self, client, mock_embedding_svc, mock_weaviate_svc, resilience, fake_settings,
+    ):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        for _ in range(fake_settings.circuit_failure_threshold):
+            resilience.breakers["search"].record_failure()
+
+        response = client.post("/retrieve-document", json={"project_id": 1, "query": "test"})
+
+        assert response.status_code == 503
+        assert response.json()["error"] == "upstream_unavailable"
+        assert "Retry-After" in response.headers
+        mock_weaviate_svc.hybrid_search.assert_not_called()
+
+    def test_timeout_ms_deadline_reaches_embedding(self, client, mock_embedding_svc, mock_weaviate_svc):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+
+        response = client.post("/retrieve-document", json={
+            "project_id": 1, "query": "test", "generate_answer": False, "timeout_ms": 10000,
+        })
+
+        assert response.status_code == 200
+        deadline = mock_embedding_svc.embed_single.call_args[1]["deadline"]
+        assert deadline.timeout_seconds == 10.0
+
+    def test_shadow_failure_does_not_affect_response(
+        self, client, shadow, mock_embedding_svc, mock_weaviate_svc, mock_milvus_svc,
+    ):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+        mock_milvus_svc.search.side_effect = MilvusError("down")
+        shadow.sample_rate = 1.0
+
+        response = client.post("/retrieve-document", json={"project_id": 1, "query": "test", "generate_answer": False})
+        shadow.close()
+
+        assert response.status_code == 200
+        assert len(response.json()["results"]) == 1
+        assert mock_milvus_svc.search.call_args.kwargs["top_k"] == 5
+        assert shadow.stats()["errors"] == 1
+
+    def test_shadow_stats(self, client, shadow, mock_embedding_svc, mock_weaviate_svc, mock_milvus_svc):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+        mock_milvus_svc.search.return_value = FAKE_CHUNKS
+        shadow.sample_rate = 1.0
+
+        client.post("/retrieve-document", json={"project_id": 1, "query": "test", "generate_answer": False})
+        shadow.close()
+        stats = client.get("/shadow/stats").json()
+
+        assert stats["mirrored"] == 1
+        assert stats["topk_overlap"]["mean"] == 1.0
+        assert stats["latency_ms"]["primary"]["count"] == 1
+
+
+class TestAlphaSweepEndpoint:
+    """Tests for POST /retrieve-document/alpha-sweep."""
+
+    def test_one_candidate_fetch_serves_every_alpha(self, client, mock_embedding_svc, mock_weaviate_svc):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.fetch_candidates.return_value = [
+            {"doc_id": 1, "chunk_id": 0, "title": "Kw", "text": "a", "bm25_score": 5.0, "vector_score": None},
+            {"doc_id": 2, "chunk_id": 0, "title": "Vec", "text": "b", "bm25_score": None, "vector_score": 0.9},
+        ]
+
+        response = client.post("/retrieve-document/alpha-sweep", json={
+            "project_id": 1, "query": "test", "alphas": [0.0, 1.0], "top_k": 1,
+        })
+
+        assert response.status_code == 200
+        rankings = response.json()["rankings"]
+        assert [r["alpha"] for r in rankings] == [0.0, 1.0]
+        assert rankings[0]["results"][0]["title"] == "Kw"
+        assert rankings[1]["results"][0]["title"] == "Vec"
+        mock_weaviate_svc.fetch_candidates.assert_called_once()
+        mock_weaviate_svc.hybrid_search.assert_not_called()
+
+
+class TestEvaluateEndpoint:
+    """Tests for POST /evaluate-retrieval."""
+
+    def test_scores_labeled_cases(self, client, mock_embedding_svc, mock_weaviate_svc):
+        mock_embedding_svc.embed_texts.side_effect = lambda texts: np.full((len(texts), 1536), 0.1, dtype=np.float32)
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS   # doc 10 at rank 1
+
+        response = client.post("/evaluate-retrieval", json={
+            "project_id": 1,
+            "cases": [
+                {"query": "q1", "relevant": [{"doc_id": 10}]},
+                {"query": "q2", "relevant": [{"doc_id": 99}]},
+            ],
+            "k_values": [1],
+        })
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["cases"] == 2
+        assert body["runs"][0]["metrics"]["hit_rate@1"] == 0.5
+        assert body["runs"][0]["metrics"]["mrr"] == 0.5
+        mock_embedding_svc.embed_texts.assert_called_once()
+
+    def test_invalid_k_returns_422(self, client):
+        response = client.post("/evaluate-retrieval", json={
+            "project_id": 1, "cases": [], "k_values": [0],
+        })
+        assert response.status_code == 422
+
+    def test_k_above_limit_returns_422(self, client, fake_settings):
+        response = client.post("/evaluate-retrieval", json={
+            "project_id": 1, "cases": [], "k_values": [1, fake_settings.eval_max_k + 1],
+        })
+        assert response.status_code == 422
+
+    def test_bypasses_retrieval_cache_and_serving_breakers(
+        self, client, mock_embedding_svc, mock_weaviate_svc, resilience, fake_settings,
+    ):
+        mock_embedding_svc.embed_texts.side_effect = lambda texts: np.full((len(texts), 1536), 0.1, dtype=np.float32)
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+        for _ in range(fake_settings.circuit_failure_threshold):
+            resilience.breakers["search"].record_failure()   # serving search circuit open
+        payload = {"project_id": 1, "cases": [{"query": "q1", "relevant": [{"doc_id": 10}]}], "k_values": [1]}
+
+        assert client.post("/evaluate-retrieval", json=payload).status_code == 200
+        assert client.post("/evaluate-retrieval", json=payload).status_code == 200
+
+        assert mock_weaviate_svc.hybrid_search.call_count == 2   # second run not served from cache
+
+
+class TestBatchEndpoints:
+    """Tests for POST/GET /retrieve-document/batch (LocalBatchClient stand-in)."""
+
+    @pytest.fixture
+    def batch_svc(self, base_settings, tmp_path):
+        from ai_runtime.services.batch_answer_service import BatchAnswerService, LocalBatchClient
+
+        base_settings.batch_work_dir = str(tmp_path)
+        answers = Mock(model="gpt-4o-mini")
+        answers.build_messages.side_effect = lambda query, results: [{"role": "user", "content": query}]
+        answers.cache_generation.return_value = 0
+        svc = BatchAnswerService(base_settings, answers, LocalBatchClient(complete=lambda body: "batched"))
+        app.dependency_overrides[get_batch_answer_service] = lambda: svc
+        return svc
+
+    def test_submit_then_poll_joins_answers(self, client, batch_svc, mock_embedding_svc, mock_weaviate_svc):
+        mock_embedding_svc.embed_texts.side_effect = lambda texts: np.full((len(texts), 1536), 0.1, dtype=np.float32)
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+
+        submitted = client.post("/retrieve-document/batch", json={
+            "project_id": 1,
+            "cases": [{"query": "q1", "custom_id": "case-1"}, {"query": "q2"}],
+        })
+
+        assert submitted.status_code == 200
+        assert submitted.json()["status"] == "validating"
+        assert submitted.json()["results"] is None
+
+        polled = client.get(f"/retrieve-document/batch/{submitted.json()['job_id']}")
+
+        body = polled.json()
+        assert body["status"] == "completed"
+        assert body["answered"] == 2
+        assert [r["custom_id"] for r in body["results"]] == ["case-1", "1"]
+        assert body["results"][0]["answer"] == "batched"
+        assert body["results"][0]["results"][0]["doc_id"] == 10
+
+    def test_unknown_job_returns_404(self, client, batch_svc):
+        assert client.get("/retrieve-document/batch/nope").status_code == 404
+
+    def test_duplicate_custom_ids_return_422(self, client, batch_svc):
+        response = client.post("/retrieve-document/batch", json={
+            "project_id": 1, "cases": [{"query": "a", "custom_id": "x"}, {"query": "b", "custom_id": "x"}],
+        })
+        assert response.status_code == 422
+
+
+class TestRebuildEndpoints:
+    """Tests for POST /rebuild and GET /rebuild/{job_id} (RebuildService mocked)."""
+
+    @pytest.fixture
+    def rebuild_svc(self):
+        from ai_runtime.services.rebuild_service import RebuildJob
+
+        svc = Mock()
+        svc.current_chunking.return_value = (500, 50)
+        svc.start.side_effect = lambda project_id, chunk_size, chunk_overlap, vector_index_config: RebuildJob(
+            job_id="job-1", project_id=project_id, chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+        )
+        app.dependency_overrides[get_rebuild_service] = lambda: svc
+        return svc
+
+    def test_start_returns_202_with_job(self, client, rebuild_svc):
+        response = client.post("/rebuild", json={"project_id": 1, "chunk_size": 800, "hnsw_ef_construction": 256})
+
+        assert response.status_code == 202
+        assert response.json()["job_id"] == "job-1"
+        assert response.json()["chunk_overlap"] == 50   # unset: kept from the project
+        kwargs = rebuild_svc.start.call_args.kwargs
+        assert kwargs["vector_index_config"].efConstruction == 256
+
+    def test_overlap_not_smaller_than_size_returns_422(self, client, rebuild_svc):
+        response = client.post("/rebuild", json={"project_id": 1, "chunk_size": 40})
+
+        assert response.status_code == 422
+        rebuild_svc.start.assert_not_called()
+
+    def test_rebuild_in_progress_returns_409(self, client, rebuild_svc):
+        from ai_runtime.exceptions import RebuildInProgressError
+
+        rebuild_svc.start.side_effect = RebuildInProgressError("busy")
+
+        assert client.post("/rebuild", json={"project_id": 1}).status_code == 409
+
+    def test_unknown_job_returns_404(self, client, rebuild_svc):
+        from ai_runtime.exceptions import RebuildJobNotFoundError
+
+        rebuild_svc.get.side_effect = RebuildJobNotFoundError("nope")
+
+        assert client.get("/rebuild/nope").status_code == 404
+
+
+class TestProfiling:
+    """Tests for opt-in request profiling (X-Profile header, /profiling window endpoints)."""
+
+    @pytest.fixture(autouse=True)
+    def search_results(self, mock_embedding_svc, mock_weaviate_svc):
+        mock_embedding_svc.embed_single.return_value = [0.1] * 1536
+        mock_weaviate_svc.hybrid_search.return_value = FAKE_CHUNKS
+
+    def retrieve(self, client, project_id=1, **headers):
+        return client.post(
+            "/retrieve-document",
+            json={"project_id": project_id, "query": "test", "generate_answer": False},
+            headers=headers,
+        )
+
+    def test_header_profiles_request(self, client, profiler):
+        response = self.retrieve(client, project_id=7, **{"X-Profile": "secret"})
+
+        assert response.status_code == 200
+        profiles = profiler.profiles()
+        assert len(profiles) == 1
+        assert profiles[0]["name"].startswith("retrieve-p7-")
+        assert profiles[0]["name"].endswith(".prof")
+
+    def test_invalid_token_not_profiled(self, client, profiler):
+        assert self.retrieve(client, **{"X-Profile": "guess"}).status_code == 200
+        assert profiler.profiles() == []
+
+    def test_window_profiles_matching_project_only(self, client, profiler):
+        response = client.post(
+            "/profiling/window", json={"duration_seconds": 60, "project_id": 2}, headers={"X-Profile": "secret"},
+        )
+        assert response.status_code == 200
+        assert response.json()["window_project_id"] == 2
+
+        self.retrieve(client, project_id=1)
+        self.retrieve(client, project_id=2)
+
+        status = client.get("/profiling", headers={"X-Profile": "secret"}).json()
+        assert [p["name"].split("-")[1] for p in status["profiles"]] == ["p2"]
+
+        client.delete("/profiling/window", headers={"X-Profile": "secret"})
+        assert profiler.window() is None
+
+    def test_admin_endpoints_need_token(self, client):
+        assert client.get("/profiling").status_code == 403
+        assert client.post("/profiling/window", json={"duration_seconds": 60}).status_code == 403
+
+    def test_window_longer_than_limit_returns_422(self, client):
+        response = client.post("/profiling/window", json={"duration_seconds": 86400}, headers={"X-Profile": "secret"})
+
+        assert response.status_code == 422
+
+    def test_disabled_without_token(self, client, profiler):
+        profiler.token = None
+
+        assert client.get("/profiling", headers={"X-Profile": "secret"}).status_code == 404
+        assert self.retrieve(client, **{"X-Profile": "secret"}).status_code == 200
+        assert profiler.profiles() == []
+
+
+class TestSnapshotEndpoints:
+    """Tests for /snapshots (SnapshotService mocked)."""
+
+    MANIFEST = {
+        "snapshot_id": "abc123", "project_id": 1, "backend": "weaviate", "chunks": 3, "dimensions": 1536,
+        "embedding_model": "text-embedding-3-small", "chunk_size": 500, "chunk_overlap": 50, "created_at": 0.0,
+    }
+
+    @pytest.fixture
+    def snapshot_svc(self):
+        svc = Mock()
+        svc.export.return_value = self.MANIFEST
+        svc.load.return_value = self.MANIFEST
+        app.dependency_overrides[get_snapshot_service] = lambda: svc
+        return svc
+
+    def test_export_returns_manifest(self, client, snapshot_svc):
+        response = client.post("/snapshots/export", json={"project_id": 1, "backend": "milvus"})
+
+        assert response.status_code == 200
+        assert response.json()["chunks"] == 3
+        snapshot_svc.export.assert_called_once_with(1, backend="milvus")
+
+    def test_import_into_other_project(self, client, snapshot_svc):
+        snapshot_svc.import_snapshot.return_value = {
+            "snapshot_id": "abc123", "project_id": 2, "backend": "weaviate", "chunks": 3,
+        }
+
+        response = client.post("/snapshots/import", json={"snapshot_id": "abc123", "project_id": 2})
+
+        assert response.status_code == 200
+        assert response.json()["project_id"] == 2
+
+    def test_unknown_backend_returns_422(self, client, snapshot_svc):
+        assert client.post("/snapshots/export", json={"project_id": 1, "backend": "qdrant"}).status_code == 422
+
+    def test_incompatible_snapshot_returns_422(self, client, snapshot_svc):
+        from ai_runtime.exceptions import SnapshotError
+
+        snapshot_svc.import_snapshot.side_effect = SnapshotError("other embedding model")
+
+        response = client.post("/snapshots/import", json={"snapshot_id": "abc123"})
+
+        assert response.status_code == 422
+        assert response.json()["error"] == "snapshot_error"
+
+    def test_unknown_snapshot_returns_404(self, client, snapshot_svc):
+        from ai_runtime.exceptions import SnapshotNotFoundError
+
+        snapshot_svc.load.side_effect = SnapshotNotFoundError("nope")
+
+        assert client.get("/snapshots/nope").status_code == 404
+
+
+# ──────────────────────────────────────
+# Tracing
+# ──────────────────────────────────────
+
+class TestTracing:
+    """Tests for request tracing (TracingMiddleware + @traced routes)."""
+
+    TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+    PARENT_ID = "00f067aa0ba902b7"
+
+    @pytest.fixture
+    def spans(self, client, base_settings, tmp_path):
+        """Tracing to a file for the test; returns a reader for the recorded spans."""
+        base_settings.tracing_exporter = "file"
+        base_settings.tracing_file = str(tmp_path / "traces.jsonl")
+        tracing.configure(base_settings)
+        yield lambda: [json.loads(line) for line in (tmp_path / "traces.jsonl").read_text().splitlines()]
+        tracing.shutdown()
+
+    def test_request_joins_incoming_trace(self, client, spans, mock_doc_service):
+        mock_doc_service.process_document.return_value = 3
+
+        response = client.post(
+            "/index-document",
+            json={"project_id": 4, "doc_id": 10, "title": "T", "content": "Hello"},
+            headers={"traceparent": f"00-{self.TRACE_ID}-{self.PARENT_ID}-01"},
+        )
+
+        assert response.status_code == 200
+        by_name = {span["name"]: span for span in spans()}
+        server = by_name["POST /index-document"]
+        route = by_name["route.index"]
+        assert server["trace_id"] == route["trace_id"] == self.TRACE_ID
+        assert server["parent_id"] == self.PARENT_ID
+        assert route["parent_id"] == server["span_id"]
+        assert server["attributes"]["http.status_code"] == 200
+        assert route["attributes"] == {"project_id": 4}
+
+    def test_error_status_recorded(self, client, spans, mock_doc_service):
+        mock_doc_service.process_document.side_effect = EmbeddingError("down")
+
+        client.post("/index-document", json={"project_id": 4, "doc_id": 10, "title": "T", "content": "Hello"})
+
+        by_name = {span["name"]: span for span in spans()}
+        assert by_name["POST /index-document"]["attributes"]["http.status_code"] == 502
+        assert by_name["route.index"]["status"] == "error"
+
 
 # ──────────────────────────────────────
 # Built-in endpoints
@@ -245,7 +1032,26 @@ class TestBuiltinEndpoints:
         assert response.status_code == 200
         assert response.json()["status"] == "OK"
 
+    def test_ready_when_upstreams_respond(self, client, mock_weaviate_svc, mock_embedding_svc):
+        mock_weaviate_svc.is_ready.return_value = True
+        mock_embedding_svc.is_ready.return_value = True
+
+        response = client.get("/ready")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "READY"
+
+    def test_not_ready_when_weaviate_down(self, client, mock_weaviate_svc, mock_embedding_svc):
+        mock_weaviate_svc.is_ready.return_value = False
+        mock_embedding_svc.is_ready.return_value = True
+
+        response = client.get("/ready")
+
+        assert response.status_code == 503
+        assert response.json()["checks"]["weaviate"] == "unreachable"
+
     def test_root(self, client):
         response = client.get("/")
         assert response.status_code == 200
         assert "AI Runtime Service" in response.json()["message"]
+
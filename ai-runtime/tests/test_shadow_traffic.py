@@ -0,0 +1,98 @@
+"""
+Unit tests for shadow traffic (services/shadow_traffic.py).
+
+The secondary backend is a Mock; close() waits for mirrored searches, so
+tests call it before reading the stats.
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from ai_runtime.services.shadow_traffic import ShadowTraffic, rank_correlation, topk_overlap
+
+
+def hit(doc_id, chunk_id, score):
+    return {"doc_id": doc_id, "chunk_id": chunk_id, "title": "T", "text": "t", "score": score}
+
+
+PRIMARY = [hit(1, 0, 0.9), hit(1, 1, 0.8), hit(2, 0, 0.7), hit(3, 0, 0.6)]
+
+
+@pytest.fixture
+def backend():
+    backend = Mock()
+    backend.search.return_value = [hit(1, 0, 0.95), hit(1, 1, 0.9), hit(2, 0, 0.85), hit(4, 0, 0.8)]
+    return backend
+
+
+@pytest.fixture
+def shadow(base_settings, backend):
+    base_settings.shadow_sample_rate = 1.0
+    shadow = ShadowTraffic(base_settings, backend="milvus", backend_factory=lambda: backend)
+    yield shadow
+    shadow.close()
+
+
+class TestMetrics:
+    def test_overlap(self):
+        assert topk_overlap([(1, 0), (1, 1)], [(1, 1), (2, 0)]) == 0.5
+        assert topk_overlap([], []) is None
+
+    def test_rank_correlation_ignores_score_scale(self):
+        primary = {(1, 0): 0.03, (1, 1): 0.02, (2, 0): 0.01}
+        assert rank_correlation(primary, {(1, 0): 0.9, (1, 1): 0.8, (2, 0): 0.1}) == pytest.approx(1.0)
+        assert rank_correlation(primary, {(1, 0): 0.1, (1, 1): 0.8, (2, 0): 0.9}) == pytest.approx(-1.0)
+
+    def test_rank_correlation_needs_enough_shared_chunks(self):
+        assert rank_correlation({(1, 0): 0.9, (1, 1): 0.8}, {(1, 0): 0.9, (1, 1): 0.8}) is None
+
+
+class TestMirror:
+    def test_records_latency_overlap_and_correlation(self, shadow, backend):
+        assert shadow.maybe_mirror(1, [0.1], 4, None, PRIMARY, primary_seconds=0.02)
+        shadow.close()
+
+        stats = shadow.stats()
+        assert stats["mirrored"] == 1
+        assert stats["topk_overlap"]["mean"] == 0.75
+        assert stats["score_correlation"]["mean"] == pytest.approx(1.0)
+        assert stats["latency_ms"]["primary"]["count"] == 1
+        assert stats["latency_ms"]["shadow"]["count"] == 1
+        backend.search.assert_called_once_with(project_id=1, query_embedding=[0.1], top_k=4, filters=None)
+
+    def test_off_by_default(self, fake_settings, backend):
+        shadow = ShadowTraffic(fake_settings, backend="milvus", backend_factory=lambda: backend)
+
+        assert not shadow.maybe_mirror(1, [0.1], 4, None, PRIMARY, primary_seconds=None)
+        assert shadow.stats()["enabled"] is False
+        shadow.close()
+
+    def test_unsampled_queries_not_mirrored(self, base_settings, backend):
+        base_settings.shadow_sample_rate = 0.1
+        shadow = ShadowTraffic(base_settings, backend="milvus", backend_factory=lambda: backend, sampler=lambda: 0.5)
+
+        assert not shadow.maybe_mirror(1, [0.1], 4, None, PRIMARY, primary_seconds=None)
+        shadow.close()
+        backend.search.assert_not_called()
+
+    def test_samples_beyond_in_flight_limit_are_dropped(self, shadow, backend):
+        release = threading.Event()
+        backend.search.side_effect = lambda **kwargs: release.wait(5) and []
+
+        scheduled = [shadow.maybe_mirror(1, [0.1], 4, None, PRIMARY, None) for _ in range(shadow.max_in_flight + 2)]
+        release.set()
+        shadow.close()
+
+        assert scheduled.count(True) == shadow.max_in_flight
+        assert shadow.stats()["dropped"] == 2
+
+    def test_backend_errors_are_counted(self, shadow, backend):
+        backend.search.side_effect = RuntimeError("connection refused")
+
+        shadow.maybe_mirror(1, [0.1], 4, None, PRIMARY, None)
+        shadow.close()
+
+        assert shadow.stats()["errors"] == 1
+        assert shadow.stats()["mirrored"] == 0
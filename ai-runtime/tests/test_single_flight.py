@@ -0,0 +1,160 @@
+"""
+Unit tests for SingleFlight.
+
+Threads simulate concurrent requests. The leader's function blocks on an
+Event until every follower has joined, so coalescing is deterministic.
+"""
+
+import threading
+import time
+
+import pytest
+
+from ai_runtime.exceptions import DeadlineExceededError
+from ai_runtime.services.single_flight import SingleFlight
+
+
+def run_concurrently(flight: SingleFlight, key, fn, n: int) -> list:
+    """Start n threads calling flight.do(key, fn); return their results/exceptions."""
+    outcomes = [None] * n
+
+    def worker(i):
+        try:
+            outcomes[i] = flight.do(key, fn)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    return threads, outcomes
+
+
+def wait_for_followers(flight: SingleFlight, key, expected: int):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        with flight._lock:
+            call = flight._calls.get(key)
+            if call is not None and call.followers >= expected:
+                return
+        time.sleep(0.001)
+    pytest.fail("followers never joined")
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+
+        threads, outcomes = run_concurrently(flight, "k", fn, 5)
+        wait_for_followers(flight, "k", 4)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert outcomes == ["result"] * 5
+        assert flight.in_flight() == 0
+
+    def test_exception_is_shared_with_followers(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+
+        def fn():
+            release.wait(5)
+            raise ValueError("upstream failed")
+
+        threads, outcomes = run_concurrently(flight, "k", fn, 3)
+        wait_for_followers(flight, "k", 2)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert all(isinstance(o, ValueError) for o in outcomes)
+
+    def test_leader_deadline_error_not_shared(self):
+        """A leader that ran out of its own deadline sends followers to run the call themselves."""
+        flight = SingleFlight("test")
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+                raise DeadlineExceededError("leader's budget ran out")
+            return "result"
+
+        threads, outcomes = run_concurrently(flight, "k", fn, 3)
+        wait_for_followers(flight, "k", 2)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert sum(isinstance(o, DeadlineExceededError) for o in outcomes) == 1
+        assert outcomes.count("result") == 2
+
+    def test_unshareable_result_is_rerun_by_followers(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+                return "degraded"
+            return "full"
+
+        outcomes = [None] * 3
+
+        def worker(i):
+            outcomes[i] = flight.do("k", fn, shareable=lambda result: result != "degraded")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+        for t in threads:
+            t.start()
+        wait_for_followers(flight, "k", 2)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert sorted(outcomes) == ["degraded", "full", "full"]
+
+    def test_follower_timeout_covers_reruns(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+
+        def fn():
+            release.wait(5)
+            raise DeadlineExceededError("leader's budget ran out")
+
+        leader = threading.Thread(target=lambda: pytest.raises(DeadlineExceededError, flight.do, "k", fn))
+        leader.start()
+        wait_for_followers(flight, "k", 0)
+        with pytest.raises(TimeoutError):
+            flight.do("k", lambda: "never", timeout=0.05)
+        release.set()
+        leader.join()
+
+    def test_different_keys_run_independently(self):
+        flight = SingleFlight("test")
+
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("b", lambda: 2) == 2
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Single-flight only merges overlapping calls — it is not a cache."""
+        flight = SingleFlight("test")
+        calls = []
+
+        flight.do("k", lambda: calls.append(1))
+        flight.do("k", lambda: calls.append(1))
+
+        assert len(calls) == 2
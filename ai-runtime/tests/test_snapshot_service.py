@@ -0,0 +1,146 @@
+"""
+Unit tests for knowledge-base snapshots (services/snapshot_service.py).
+
+The stores are mocks: iter_chunks serves a fixed project in pages,
+insert_chunks records what an import writes. Snapshots go to tmp_path.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from ai_runtime.exceptions import SnapshotError, SnapshotNotFoundError
+from ai_runtime.services.snapshot_service import SnapshotService
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+DIM = 4
+
+
+def chunks(n):
+    return [
+        {
+            "doc_id": 10 + i // 2, "chunk_id": i % 2, "title": f"Doc {10 + i // 2}", "text": f"text {i} ü",
+            "char_start": (i % 2) * 20, "indexed_at": T0, "vector": [float(i)] * DIM,
+        }
+        for i in range(n)
+    ]
+
+
+def pages(items, size):
+    return iter([items[i:i + size] for i in range(0, len(items), size)])
+
+
+@pytest.fixture
+def mock_weaviate():
+    weaviate = Mock()
+    weaviate.project_route.return_value = None
+    project = chunks(5)
+    weaviate.iter_chunks.side_effect = lambda project_id, batch_size: pages(project, batch_size)
+    return weaviate
+
+
+@pytest.fixture
+def mock_milvus():
+    return Mock()
+
+
+@pytest.fixture
+def snapshot_service(base_settings, mock_weaviate, mock_milvus, memory_cache, tmp_path):
+    base_settings.snapshot_dir = str(tmp_path)
+    base_settings.snapshot_batch_size = 2
+    base_settings.embedding_dimensions = DIM
+    return SnapshotService(base_settings, mock_weaviate, memory_cache, milvus_factory=lambda: mock_milvus)
+
+
+class TestExport:
+    def test_writes_vectors_chunks_and_manifest(self, snapshot_service, tmp_path):
+        manifest = snapshot_service.export(1)
+
+        snapshot_dir = tmp_path / manifest["snapshot_id"]
+        assert sorted(os.listdir(snapshot_dir)) == ["chunks.jsonl", "manifest.json", "vectors.npy"]
+        vectors = np.load(snapshot_dir / "vectors.npy")
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (5, DIM)
+        assert vectors[3].tolist() == [3.0] * DIM
+        lines = [json.loads(line) for line in (snapshot_dir / "chunks.jsonl").read_text(encoding="utf-8").splitlines()]
+        assert lines[3] == {
+            "doc_id": 11, "chunk_id": 1, "title": "Doc 11", "text": "text 3 ü",
+            "char_start": 20, "indexed_at": T0.isoformat(),
+        }
+        assert (manifest["chunks"], manifest["dimensions"], manifest["chunk_size"]) == (5, DIM, 500)
+        assert snapshot_service.load(manifest["snapshot_id"]) == manifest
+
+    def test_reads_through_the_cursor_in_pages(self, snapshot_service, mock_weaviate):
+        snapshot_service.export(1)
+
+        mock_weaviate.iter_chunks.assert_called_once_with(1, batch_size=2)
+
+    def test_failed_export_leaves_nothing_behind(self, snapshot_service, mock_weaviate, tmp_path):
+        def broken(project_id, batch_size):
+            yield chunks(2)
+            raise RuntimeError("cursor lost")
+
+        mock_weaviate.iter_chunks.side_effect = broken
+
+        with pytest.raises(RuntimeError):
+            snapshot_service.export(1)
+        assert os.listdir(tmp_path) == []
+
+    def test_empty_project(self, snapshot_service, mock_weaviate):
+        mock_weaviate.iter_chunks.side_effect = lambda project_id, batch_size: iter([])
+
+        manifest = snapshot_service.export(1)
+
+        assert manifest["chunks"] == 0
+        assert snapshot_service.import_snapshot(manifest["snapshot_id"])["chunks"] == 0
+
+
+class TestImport:
+    def test_round_trip_into_milvus(self, snapshot_service, mock_milvus):
+        manifest = snapshot_service.export(1)
+
+        result = snapshot_service.import_snapshot(manifest["snapshot_id"], project_id=2, backend="milvus")
+
+        assert result == {"snapshot_id": manifest["snapshot_id"], "project_id": 2, "backend": "milvus", "chunks": 5}
+        calls = [c.kwargs for c in mock_milvus.insert_chunks.call_args_list]
+        assert [len(c["doc_ids"]) for c in calls] == [2, 2, 1]
+        assert calls[1]["project_id"] == 2
+        assert calls[1]["doc_ids"] == [11, 11]
+        assert calls[1]["embeddings"] == [[2.0] * DIM, [3.0] * DIM]
+        assert calls[1]["indexed_at"] == [T0, T0]
+
+    def test_weaviate_import_keeps_offsets(self, snapshot_service, mock_weaviate):
+        manifest = snapshot_service.export(1)
+
+        snapshot_service.import_snapshot(manifest["snapshot_id"])
+
+        first = mock_weaviate.insert_chunks.call_args_list[0].kwargs
+        assert first["project_id"] == 1
+        assert first["char_starts"] == [0, 20]
+        assert first["embeddings"].tolist() == [[0.0] * DIM, [1.0] * DIM]
+
+    def test_import_invalidates_cache(self, snapshot_service, memory_cache):
+        manifest = snapshot_service.export(1)
+        memory_cache.invalidate_project = Mock()
+
+        snapshot_service.import_snapshot(manifest["snapshot_id"], project_id=3)
+
+        memory_cache.invalidate_project.assert_called_once_with(3)
+
+    def test_other_embedding_model_refused(self, snapshot_service, mock_milvus):
+        manifest = snapshot_service.export(1)
+        snapshot_service.settings.openai_embedding_model = "text-embedding-3-large"
+
+        with pytest.raises(SnapshotError, match="text-embedding-3-small"):
+            snapshot_service.import_snapshot(manifest["snapshot_id"], backend="milvus")
+        mock_milvus.insert_chunks.assert_not_called()
+
+    def test_unknown_snapshot(self, snapshot_service):
+        with pytest.raises(SnapshotNotFoundError):
+            snapshot_service.import_snapshot("missing")
+        with pytest.raises(SnapshotNotFoundError):
+            snapshot_service.load("../etc")
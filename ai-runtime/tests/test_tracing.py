@@ -0,0 +1,197 @@
+"""
+Unit tests for request tracing (ai_runtime/tracing.py).
+
+The middleware joining an incoming traceparent is covered in test_routers.py.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from ai_runtime import tracing
+from ai_runtime.tracing import SpanContext, Tracer, format_traceparent, parse_traceparent, traced
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+        self.closed = False
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def exporter():
+    """Tracing on (built-in tracer, everything sampled), spans collected in a list."""
+    exporter = ListExporter()
+    tracing._tracer = Tracer(exporter, sample_rate=1.0)
+    yield exporter
+    tracing.shutdown()
+
+
+class TestTraceparent:
+    def test_parse(self):
+        context = parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01")
+
+        assert context == SpanContext(TRACE_ID, PARENT_ID, sampled=True)
+
+    def test_parse_unsampled(self):
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00").sampled is False
+
+    @pytest.mark.parametrize("value", [
+        None,
+        "",
+        "garbage",
+        f"ff-{TRACE_ID}-{PARENT_ID}-01",          # invalid version
+        f"00-{'0' * 32}-{PARENT_ID}-01",           # all-zero trace id
+        f"00-{TRACE_ID}-{'0' * 16}-01",            # all-zero span id
+        f"00-{TRACE_ID[:-1]}-{PARENT_ID}-01",      # short trace id
+        f"00-{TRACE_ID}-{PARENT_ID}-zz",
+    ])
+    def test_parse_rejects_malformed(self, value):
+        assert parse_traceparent(value) is None
+
+    def test_format_round_trips(self):
+        value = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+        assert format_traceparent(parse_traceparent(value)) == value
+
+
+class TestSpans:
+    def test_child_span_shares_trace_and_points_at_parent(self, exporter):
+        with tracing.span("outer") as outer:
+            with tracing.span("inner"):
+                pass
+
+        inner, recorded_outer = exporter.spans
+        assert recorded_outer is outer
+        assert inner.context.trace_id == outer.context.trace_id
+        assert inner.parent_id == outer.context.span_id
+        assert outer.parent_id is None
+        assert inner.duration_ms is not None
+
+    def test_remote_parent_is_joined(self, exporter):
+        with tracing.span("server", parent=SpanContext(TRACE_ID, PARENT_ID)):
+            pass
+
+        assert exporter.spans[0].context.trace_id == TRACE_ID
+        assert exporter.spans[0].parent_id == PARENT_ID
+
+    def test_unsampled_parent_records_nothing(self, exporter):
+        with tracing.span("server", parent=SpanContext(TRACE_ID, PARENT_ID, sampled=False)):
+            with tracing.span("inner"):
+                tracing.set_attribute("ignored", 1)
+
+        assert exporter.spans == []
+
+    def test_sample_rate_zero_records_nothing(self, exporter):
+        tracing._tracer.sample_rate = 0.0
+
+        with tracing.span("root"):
+            pass
+
+        assert exporter.spans == []
+
+    def test_exception_marks_span_as_error(self, exporter):
+        with pytest.raises(ValueError):
+            with tracing.span("failing"):
+                raise ValueError("boom")
+
+        assert exporter.spans[0].status == "error"
+        assert exporter.spans[0].error == "ValueError: boom"
+
+    def test_set_attribute_applies_to_current_span(self, exporter):
+        with tracing.span("work"):
+            tracing.set_attribute("openai.total_tokens", 42)
+            tracing.set_attribute("skipped", None)
+
+        assert exporter.spans[0].attributes == {"openai.total_tokens": 42}
+
+
+class TestTraced:
+    def test_records_arguments_and_result_count(self, exporter):
+        @traced("svc.search")
+        def search(project_id: int, texts: list[str], top_k: int = 5):
+            return ["a", "b"]
+
+        search(3, ["x", "y", "z"], top_k=10)
+
+        span = exporter.spans[0]
+        assert span.name == "svc.search"
+        assert span.attributes == {"project_id": 3, "top_k": 10, "texts.count": 3, "result.count": 2}
+
+    def test_project_id_from_request_body(self, exporter):
+        class Body:
+            project_id = 9
+
+        @traced("route.retrieve")
+        def route(request):
+            return None
+
+        route(request=Body())
+
+        assert exporter.spans[0].attributes == {"project_id": 9}
+
+    def test_async_function(self, exporter):
+        @traced("route.stream")
+        async def route(project_id: int):
+            return 4
+
+        assert asyncio.run(route(project_id=1)) == 4
+        assert exporter.spans[0].attributes == {"project_id": 1, "result.count": 4}
+
+    def test_noop_when_tracing_off(self):
+        @traced("svc.search")
+        def search(project_id: int):
+            return project_id
+
+        assert not tracing.enabled()
+        assert search(5) == 5
+
+
+class TestConfigure:
+    def test_file_exporter_writes_json_lines(self, base_settings, tmp_path):
+        base_settings.tracing_exporter = "file"
+        base_settings.tracing_file = str(tmp_path / "traces" / "spans.jsonl")
+        tracing.configure(base_settings)
+
+        with tracing.span("outer", project_id=1):
+            with tracing.span("inner"):
+                pass
+        tracing.shutdown()
+
+        lines = [json.loads(line) for line in (tmp_path / "traces" / "spans.jsonl").read_text().splitlines()]
+        assert [line["name"] for line in lines] == ["inner", "outer"]
+        assert lines[0]["parent_id"] == lines[1]["span_id"]
+        assert lines[1]["attributes"] == {"project_id": 1}
+
+    def test_none_leaves_tracing_off(self, base_settings):
+        base_settings.tracing_exporter = "none"
+        tracing.configure(base_settings)
+
+        assert not tracing.enabled()
+
+    def test_otlp_without_opentelemetry_leaves_tracing_off(self, base_settings):
+        try:
+            import opentelemetry.sdk  # noqa: F401
+            pytest.skip("OpenTelemetry SDK is installed")
+        except ImportError:
+            pass
+        base_settings.tracing_exporter = "otlp"
+        tracing.configure(base_settings)
+
+        assert not tracing.enabled()
+
+    def test_shutdown_closes_exporter(self, exporter):
+        tracing.shutdown()
+
+        assert exporter.closed
+        assert not tracing.enabled()
@@ -0,0 +1,111 @@
+"""
+Unit tests for the Weaviate batch writer (services/weaviate_batch.py).
+
+The collection is a MagicMock; insert_many returns a result whose .errors
+maps object index → ErrorObject (only .message is used).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from ai_runtime.services.weaviate_batch import ProjectBatchWriter, WeaviateBatchWriter
+
+
+@pytest.fixture
+def collection():
+    collection = MagicMock()
+    collection.data.insert_many.return_value = Mock(errors={})
+    return collection
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def make_writer(collection, executor, batch_size=3, flush_interval=1.0, max_retries=2, clock=None):
+    return ProjectBatchWriter(
+        collection, "Kb1", batch_size, flush_interval, max_retries, executor,
+        clock=clock or (lambda: 0.0),
+    )
+
+
+class TestBatching:
+    def test_documents_share_a_full_batch(self, collection, executor):
+        """Objects of two writes are sent together once batch_size is reached."""
+        writer = make_writer(collection, executor)
+
+        first = writer.write(["a1", "a2"])
+        collection.data.insert_many.assert_not_called()
+        second = writer.write(["b1", "b2"])
+
+        assert first.wait(5).inserted == 2
+        collection.data.insert_many.assert_called_once_with(["a1", "a2", "b1"])
+        assert not second._done.is_set()   # b2 is still queued
+
+        writer.flush()
+        assert second.wait(5).inserted == 2
+
+    def test_partial_batch_sent_when_due(self, collection, executor):
+        now = [0.0]
+        writer = make_writer(collection, executor, flush_interval=0.5, clock=lambda: now[0])
+        ticket = writer.write(["a"])
+
+        now[0] = 0.4
+        writer.flush_if_due()
+        collection.data.insert_many.assert_not_called()
+
+        now[0] = 0.5
+        writer.flush_if_due()
+        assert ticket.wait(5).inserted == 1
+
+    def test_empty_write_is_done_immediately(self, collection, executor):
+        assert make_writer(collection, executor).write([]).wait(0).inserted == 0
+
+
+class TestFailures:
+    def test_failed_call_counts_every_object(self, collection, executor):
+        """An exception from insert_many fails the whole batch after the retries."""
+        collection.data.insert_many.side_effect = ConnectionError("refused")
+        writer = make_writer(collection, executor, max_retries=1)
+
+        with patch("ai_runtime.services.weaviate_batch.time.sleep"):
+            result = writer.write(["a", "b"])
+            writer.flush()
+            result = result.wait(5)
+
+        assert result.inserted == 0
+        assert result.errors == ["refused", "refused"]
+        assert collection.data.insert_many.call_count == 2
+
+    def test_errors_reported_to_the_owning_write(self, collection, executor):
+        collection.data.insert_many.side_effect = lambda objects: Mock(
+            errors={i: Mock(message="bad") for i, obj in enumerate(objects) if obj.startswith("b")}
+        )
+        writer = make_writer(collection, executor, max_retries=0)
+
+        good = writer.write(["a1", "a2"])
+        bad = writer.write(["b1"])
+
+        assert good.wait(5).errors == []
+        assert bad.wait(5).errors == ["bad"]
+
+
+class TestWeaviateBatchWriter:
+    def test_writer_is_reused_and_discard_flushes(self, collection):
+        batch_writer = WeaviateBatchWriter(batch_size=10, flush_interval=60)
+        try:
+            writer = batch_writer.writer("Kb1", collection)
+            assert batch_writer.writer("Kb1", collection) is writer
+
+            ticket = writer.write(["a"])
+            batch_writer.discard("Kb1")
+
+            assert ticket.wait(5).inserted == 1
+            assert batch_writer.get("Kb1") is None
+        finally:
+            batch_writer.close()
@@ -0,0 +1,99 @@
+"""
+Unit tests for the project → collection routing table (services/weaviate_routing.py).
+"""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from ai_runtime.exceptions import WeaviateError
+from ai_runtime.services.weaviate_routing import ROUTING_COLLECTION, ProjectRoute, RoutingTable
+
+
+def route_object(project_id, collection, chunk_size=None, chunk_overlap=None):
+    return Mock(properties={
+        "project_id": project_id, "collection": collection,
+        "chunk_size": chunk_size, "chunk_overlap": chunk_overlap,
+    })
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.collections.exists.return_value = True
+    client.collections.get.return_value.iterator.return_value = [route_object(1, "Kb1_r5", 300, 30)]
+    return client
+
+
+@pytest.fixture
+def now():
+    return [0.0]
+
+
+@pytest.fixture
+def table(client, now):
+    return RoutingTable(client, ttl_seconds=5, clock=lambda: now[0])
+
+
+class TestLookup:
+    def test_routed_and_unrouted_projects(self, table):
+        assert table.get(1) == ProjectRoute("Kb1_r5", chunk_size=300, chunk_overlap=30)
+        assert table.get(2) is None
+
+    def test_no_routing_collection_means_no_routes(self, table, client):
+        client.collections.exists.return_value = False
+
+        assert table.get(1) is None
+        client.collections.get.assert_not_called()
+
+    def test_table_cached_for_ttl(self, table, client, now):
+        table.get(1)
+        table.get(2)
+        assert client.collections.get.return_value.iterator.call_count == 1
+
+        now[0] = 5.0
+        table.get(1)
+        assert client.collections.get.return_value.iterator.call_count == 2
+
+    def test_failed_reload_keeps_last_copy(self, table, client, now):
+        table.get(1)
+        client.collections.get.return_value.iterator.side_effect = RuntimeError("timeout")
+        now[0] = 10.0
+
+        assert table.get(1).collection == "Kb1_r5"
+
+    def test_failed_first_load_raises(self, table, client):
+        client.collections.exists.side_effect = RuntimeError("refused")
+
+        with pytest.raises(WeaviateError, match="routing table"):
+            table.get(1)
+
+
+class TestSet:
+    def test_new_route_inserted_and_table_reloaded(self, table, client):
+        routes = client.collections.get.return_value
+        routes.data.exists.return_value = False
+        table.get(1)
+
+        table.set(2, ProjectRoute("Kb2_r9", chunk_size=200, chunk_overlap=20))
+
+        properties = routes.data.insert.call_args.kwargs["properties"]
+        assert properties == {"project_id": 2, "collection": "Kb2_r9", "chunk_size": 200, "chunk_overlap": 20}
+        table.get(1)
+        assert routes.iterator.call_count == 2
+
+    def test_existing_route_replaced(self, table, client):
+        routes = client.collections.get.return_value
+        routes.data.exists.return_value = True
+
+        table.set(1, ProjectRoute("Kb1_r6"))
+
+        routes.data.replace.assert_called_once()
+        routes.data.insert.assert_not_called()
+
+    def test_routing_collection_created_on_first_route(self, table, client):
+        client.collections.exists.return_value = False
+
+        table.set(1, ProjectRoute("Kb1_r6"))
+
+        assert client.collections.create.call_args.kwargs["name"] == ROUTING_COLLECTION
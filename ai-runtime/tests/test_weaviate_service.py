@@ -11,8 +11,7 @@ Mock structure:
         ├── create(...)           → None
         ├── get(name)             → mock_collection
         └── mock_collection
-            ├── batch.dynamic()   → context manager → mock_batch
-            │   └── add_object(properties, vector)
+            ├── data.insert_many(objects) → result with .errors {index: ErrorObject}
             ├── query.hybrid(...) → response with .objects
             └── data.delete_many(where=...)
 """
@@ -22,6 +21,7 @@ from unittest.mock import patch, Mock, MagicMock
 
 from ai_runtime.services.weaviate_service import WeaviateService
 from ai_runtime.exceptions import WeaviateError
+from ai_runtime.models import SearchFilter
 
 
 # ──────────────────────────────────────
@@ -42,6 +42,8 @@ def mock_weaviate_service(fake_settings, mock_client):
     """
     with patch("ai_runtime.services.weaviate_service.weaviate.connect_to_local", return_value=mock_client):
         service = WeaviateService(fake_settings)
+    service.routing = MagicMock()
+    service.routing.get.return_value = None   # no project rebuilt: Kb{project_id}
     return service
 
 
@@ -107,19 +109,18 @@ class TestEnsureCollection:
 # ──────────────────────────────────────
 
 class TestInsertChunks:
-    def test_happy_path_inserts_all_chunks(self, mock_weaviate_service, mock_client):
-        """
-        insert_chunks calls batch.add_object once per chunk with correct properties and vector.
-        """
+    @pytest.fixture
+    def mock_collection(self, mock_client):
         mock_client.collections.exists.return_value = True
-        mock_collection = MagicMock()
-        mock_client.collections.get.return_value = mock_collection
-
-        # batch.dynamic() is a context manager — set it up correctly
-        mock_batch = MagicMock()
-        mock_collection.batch.dynamic.return_value.__enter__ = Mock(return_value=mock_batch)
-        mock_collection.batch.dynamic.return_value.__exit__ = Mock(return_value=False)
+        collection = MagicMock()
+        collection.data.insert_many.return_value = Mock(errors={})
+        mock_client.collections.get.return_value = collection
+        return collection
 
+    def test_happy_path_inserts_all_chunks(self, mock_weaviate_service, mock_collection):
+        """
+        insert_chunks sends every chunk through insert_many with correct properties and vector.
+        """
         result = mock_weaviate_service.insert_chunks(
             project_id=1,
             doc_ids=[10, 10],
@@ -130,20 +131,71 @@ class TestInsertChunks:
         )
 
         assert result == 2
-        assert mock_batch.add_object.call_count == 2
+        objects = mock_collection.data.insert_many.call_args[0][0]
+        assert len(objects) == 2
 
         # Verify first chunk's properties
-        first_call_kwargs = mock_batch.add_object.call_args_list[0][1]
-        assert first_call_kwargs["properties"]["doc_id"] == 10
-        assert first_call_kwargs["properties"]["text"] == "hello"
-        assert first_call_kwargs["vector"] == [0.1] * 1536
+        assert objects[0].properties["doc_id"] == 10
+        assert objects[0].properties["text"] == "hello"
+        assert objects[0].vector == [0.1] * 1536
+
+    def test_uuids_are_deterministic_per_chunk(self, mock_weaviate_service, mock_collection):
+        """Re-inserting the same (doc_id, chunk_id) reuses its UUID, so retries overwrite."""
+        for _ in range(2):
+            mock_weaviate_service.insert_chunks(
+                project_id=1, doc_ids=[10, 10], chunk_ids=[0, 1], titles=["A", "A"],
+                texts=["a", "b"], embeddings=[[0.1], [0.2]],
+            )
+
+        first, second = (call[0][0] for call in mock_collection.data.insert_many.call_args_list)
+        assert [o.uuid for o in first] == [o.uuid for o in second]
+        assert first[0].uuid != first[1].uuid
+
+    def test_collection_checked_once_per_project(self, mock_weaviate_service, mock_client, mock_collection):
+        """The long-lived writer is reused: ensure_collection runs only for the first document."""
+        for doc_id in (10, 11):
+            mock_weaviate_service.insert_chunks(
+                project_id=1, doc_ids=[doc_id], chunk_ids=[0], titles=["A"], texts=["a"], embeddings=[[0.1]],
+            )
+
+        assert mock_client.collections.exists.call_count == 1
+
+    def test_rejected_objects_retried(self, mock_weaviate_service, mock_collection):
+        """Objects reported in result.errors are sent again; the count covers them once they land."""
+        mock_collection.data.insert_many.side_effect = [
+            Mock(errors={1: Mock(message="timeout")}),
+            Mock(errors={}),
+        ]
+
+        with patch("ai_runtime.services.weaviate_batch.time.sleep"):
+            result = mock_weaviate_service.insert_chunks(
+                project_id=1, doc_ids=[10, 10], chunk_ids=[0, 1], titles=["A", "A"],
+                texts=["a", "b"], embeddings=[[0.1], [0.2]],
+            )
+
+        assert result == 2
+        retried = mock_collection.data.insert_many.call_args_list[1][0][0]
+        assert [o.properties["chunk_id"] for o in retried] == [1]
+
+    def test_objects_failing_after_retries_raise(self, mock_weaviate_service, mock_collection):
+        """What still fails after max_retries is reported, not silently dropped."""
+        mock_collection.data.insert_many.side_effect = lambda objects: Mock(
+            errors={len(objects) - 1: Mock(message="invalid vector")}
+        )
+
+        with patch("ai_runtime.services.weaviate_batch.time.sleep"):
+            with pytest.raises(WeaviateError, match="1 inserted, 1 failed \\(invalid vector\\)"):
+                mock_weaviate_service.insert_chunks(
+                    project_id=1, doc_ids=[10, 10], chunk_ids=[0, 1], titles=["A", "A"],
+                    texts=["a", "b"], embeddings=[[0.1], [0.2]],
+                )
+
+        assert mock_collection.data.insert_many.call_count == 1 + mock_weaviate_service.settings.weaviate_batch_max_retries
 
     def test_wraps_error_as_weaviate_error(self, mock_weaviate_service, mock_client):
-        """If batch insert fails, wrap as WeaviateError."""
+        """If the collection cannot be opened, wrap as WeaviateError."""
         mock_client.collections.exists.return_value = True
-        mock_collection = MagicMock()
-        mock_client.collections.get.return_value = mock_collection
-        mock_collection.batch.dynamic.side_effect = RuntimeError("write failed")
+        mock_client.collections.get.side_effect = RuntimeError("write failed")
 
         with pytest.raises(WeaviateError, match="Failed to insert"):
             mock_weaviate_service.insert_chunks(
@@ -215,6 +267,33 @@ class TestHybridSearch:
 
         call_kwargs = mock_collection.query.hybrid.call_args[1]
         assert call_kwargs["alpha"] == 0.3
+        assert call_kwargs["filters"] is None
+
+    def test_filters_are_pushed_down(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+        mock_collection = MagicMock()
+        mock_client.collections.get.return_value = mock_collection
+        mock_collection.query.hybrid.return_value = Mock(objects=[])
+
+        mock_weaviate_service.hybrid_search(
+            project_id=1, query="test", query_embedding=[0.1] * 1536, alpha=0.5, top_k=5,
+            filters=SearchFilter(doc_ids=[10, 11], indexed_after="2024-01-01T00:00:00Z"),
+        )
+
+        where = mock_collection.query.hybrid.call_args[1]["filters"]
+        assert [f.target for f in where.filters] == ["doc_id", "indexed_at"]
+        assert where.filters[0].value == [10, 11]
+
+    def test_empty_doc_ids_match_nothing(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+
+        result = mock_weaviate_service.hybrid_search(
+            project_id=1, query="test", query_embedding=[0.1] * 1536, alpha=0.5, top_k=5,
+            filters=SearchFilter(doc_ids=[]),
+        )
+
+        assert result == []
+        mock_client.collections.get.assert_not_called()
 
     def test_wraps_error_as_weaviate_error(self, mock_weaviate_service, mock_client):
         """Weaviate SDK errors are wrapped as WeaviateError."""
@@ -230,6 +309,126 @@ class TestHybridSearch:
             )
 
 
+# ──────────────────────────────────────
+# fetch_candidates
+# ──────────────────────────────────────
+
+class TestFetchCandidates:
+    def test_merges_bm25_and_vector_hits_with_raw_scores(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+        mock_collection = MagicMock()
+        mock_client.collections.get.return_value = mock_collection
+
+        def obj(chunk_id, **metadata):
+            o = Mock()
+            o.properties = {"doc_id": 10, "chunk_id": chunk_id, "title": "Doc A", "text": f"t{chunk_id}"}
+            o.metadata = Mock(**metadata)
+            return o
+
+        mock_collection.query.bm25.return_value = Mock(objects=[obj(0, score=3.5), obj(1, score=1.0)])
+        mock_collection.query.near_vector.return_value = Mock(objects=[obj(1, distance=0.25), obj(2, distance=0.5)])
+
+        result = mock_weaviate_service.fetch_candidates(
+            project_id=1, query="hello", query_embedding=[0.1] * 1536, limit=50,
+        )
+
+        by_chunk = {c["chunk_id"]: c for c in result}
+        assert by_chunk[0]["bm25_score"] == 3.5 and by_chunk[0]["vector_score"] is None
+        assert by_chunk[1]["bm25_score"] == 1.0 and by_chunk[1]["vector_score"] == 0.75
+        assert by_chunk[2]["bm25_score"] is None and by_chunk[2]["vector_score"] == 0.5
+        assert mock_collection.query.bm25.call_args[1]["limit"] == 50
+
+    def test_returns_empty_if_collection_missing(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = False
+        assert mock_weaviate_service.fetch_candidates(1, "q", [0.1], 10) == []
+
+    def test_wraps_error_as_weaviate_error(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+        mock_client.collections.get.return_value.query.bm25.side_effect = RuntimeError("boom")
+
+        with pytest.raises(WeaviateError, match="Candidate fetch failed"):
+            mock_weaviate_service.fetch_candidates(1, "q", [0.1], 10)
+
+
+class TestFetchChunks:
+    def test_one_query_for_all_wanted_chunks(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+        mock_collection = MagicMock()
+        mock_client.collections.get.return_value = mock_collection
+
+        def obj(doc_id, chunk_id):
+            o = Mock()
+            o.properties = {"doc_id": doc_id, "chunk_id": chunk_id, "title": "T", "text": f"{doc_id}-{chunk_id}"}
+            return o
+
+        mock_collection.query.fetch_objects.return_value = Mock(objects=[obj(10, 1), obj(10, 2), obj(11, 7)])
+
+        result = mock_weaviate_service.fetch_chunks(project_id=1, keys=[(10, 1), (10, 2), (10, 5), (11, 7)])
+
+        assert [(c["doc_id"], c["chunk_id"]) for c in result] == [(10, 1), (10, 2), (11, 7)]
+        mock_collection.query.fetch_objects.assert_called_once()
+        assert mock_collection.query.fetch_objects.call_args[1]["limit"] == 4
+
+    def test_no_keys_no_query(self, mock_weaviate_service, mock_client):
+        assert mock_weaviate_service.fetch_chunks(1, []) == []
+        mock_client.collections.get.assert_not_called()
+
+    def test_wraps_error_as_weaviate_error(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+        mock_client.collections.get.return_value.query.fetch_objects.side_effect = RuntimeError("boom")
+
+        with pytest.raises(WeaviateError, match="Chunk fetch failed"):
+            mock_weaviate_service.fetch_chunks(1, [(10, 0)])
+
+
+class TestIterChunks:
+    def test_pages_through_the_cursor_with_vectors(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+        objects = [
+            Mock(properties={"doc_id": 10, "chunk_id": i, "title": "T", "text": str(i)}, vector={"default": [float(i)]})
+            for i in range(5)
+        ]
+        mock_client.collections.get.return_value.iterator.return_value = iter(objects)
+
+        batches = list(mock_weaviate_service.iter_chunks(1, batch_size=2))
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert batches[1][0]["chunk_id"] == 2
+        assert batches[1][0]["vector"] == [2.0]
+        assert batches[1][0]["char_start"] is None
+        mock_client.collections.get.return_value.iterator.assert_called_once_with(include_vector=True, cache_size=2)
+
+    def test_missing_collection_yields_nothing(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = False
+
+        assert list(mock_weaviate_service.iter_chunks(1, batch_size=2)) == []
+
+
+class TestFetchDocument:
+    def test_pages_past_the_page_size_by_chunk_id(self, mock_weaviate_service, mock_client):
+        """A document larger than one page comes back complete (rebuilds must not truncate it)."""
+        pages = [
+            [Mock(properties={"doc_id": 10, "chunk_id": i, "title": "T", "text": str(i)}) for i in ids]
+            for ids in ([0, 1], [2, 3], [4])
+        ]
+        fetch = mock_client.collections.get.return_value.query.fetch_objects
+        fetch.side_effect = [Mock(objects=page) for page in pages]
+
+        with patch("ai_runtime.services.weaviate_service.FETCH_DOCUMENT_PAGE_SIZE", 2):
+            chunks = mock_weaviate_service.fetch_document("KB_1", 10)
+
+        assert [c["chunk_id"] for c in chunks] == [0, 1, 2, 3, 4]
+        assert fetch.call_count == 3
+        assert fetch.call_args_list[0][1]["filters"].target == "doc_id"      # first page: doc filter only
+        assert fetch.call_args_list[2][1]["filters"].filters[1].value == 3   # chunk_id > last of page 2
+
+    def test_wraps_error_as_weaviate_error(self, mock_weaviate_service, mock_client):
+        mock_client.collections.get.return_value.query.fetch_objects.side_effect = Exception("down")
+
+        with pytest.raises(WeaviateError):
+            mock_weaviate_service.fetch_document("KB_1", 10)
+
+
 # ──────────────────────────────────────
 # delete_by_doc_id
 # ──────────────────────────────────────
@@ -248,9 +447,10 @@ class TestDeleteByDocId:
         """Happy path: delete_many is called with correct doc_id filter."""
         mock_client.collections.exists.return_value = True
         mock_collection = MagicMock()
+        mock_collection.data.delete_many.return_value = Mock(successful=3, failed=0, matches=3)
         mock_client.collections.get.return_value = mock_collection
 
-        mock_weaviate_service.delete_by_doc_id(project_id=1, doc_id=42)
+        assert mock_weaviate_service.delete_by_doc_id(project_id=1, doc_id=42) == 3
 
         mock_collection.data.delete_many.assert_called_once()
 
@@ -263,3 +463,84 @@ class TestDeleteByDocId:
 
         with pytest.raises(WeaviateError, match="Failed to delete"):
             mock_weaviate_service.delete_by_doc_id(project_id=1, doc_id=42)
+
+
+class TestDeleteChunkRange:
+    def test_filters_on_doc_and_chunk_id_range(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+        mock_collection = MagicMock()
+        mock_collection.data.delete_many.return_value = Mock(successful=4, failed=0, matches=4)
+        mock_client.collections.get.return_value = mock_collection
+
+        assert mock_weaviate_service.delete_chunk_range(project_id=1, doc_id=42, start=0, stop=4) == 4
+
+        where = mock_collection.data.delete_many.call_args[1]["where"]
+        assert {f.target for f in where.filters[0].filters} | {where.filters[1].target} == {"doc_id", "chunk_id"}
+
+    def test_skips_if_collection_missing(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = False
+
+        assert mock_weaviate_service.delete_chunk_range(project_id=1, doc_id=42, start=3) == 0
+        mock_client.collections.get.assert_not_called()
+
+
+# ──────────────────────────────────────
+# delete_documents / delete_project
+# ──────────────────────────────────────
+
+class TestDeleteDocuments:
+    def test_one_contains_any_delete(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+        mock_collection = MagicMock()
+        mock_collection.data.delete_many.return_value = Mock(successful=7, failed=0, matches=7)
+        mock_client.collections.get.return_value = mock_collection
+
+        with patch("ai_runtime.services.weaviate_service.wvc.query.Filter") as Filter:
+            deleted = mock_weaviate_service.delete_documents(project_id=1, doc_ids=[10, 11])
+
+        assert deleted == 7
+        Filter.by_property.return_value.contains_any.assert_called_once_with([10, 11])
+        mock_collection.data.delete_many.assert_called_once()
+
+    def test_repeats_while_server_cap_is_hit(self, mock_weaviate_service, mock_client):
+        from ai_runtime.services.weaviate_service import DELETE_MANY_LIMIT
+
+        mock_client.collections.exists.return_value = True
+        mock_collection = MagicMock()
+        mock_collection.data.delete_many.side_effect = [
+            Mock(successful=DELETE_MANY_LIMIT, failed=0, matches=DELETE_MANY_LIMIT),
+            Mock(successful=5, failed=0, matches=5),
+        ]
+        mock_client.collections.get.return_value = mock_collection
+
+        assert mock_weaviate_service.delete_documents(project_id=1, doc_ids=[10]) == DELETE_MANY_LIMIT + 5
+
+    def test_partial_failure_raises(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+        mock_collection = MagicMock()
+        mock_collection.data.delete_many.return_value = Mock(successful=2, failed=1, matches=3)
+        mock_client.collections.get.return_value = mock_collection
+
+        with pytest.raises(WeaviateError, match="Failed to delete 1 of 3"):
+            mock_weaviate_service.delete_documents(project_id=1, doc_ids=[10])
+
+    def test_empty_list_is_a_no_op(self, mock_weaviate_service, mock_client):
+        assert mock_weaviate_service.delete_documents(project_id=1, doc_ids=[]) == 0
+        mock_client.collections.get.assert_not_called()
+
+
+class TestDeleteProject:
+    def test_drops_collection_and_discards_writer(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = True
+
+        with patch.object(mock_weaviate_service.batch_writer, "discard") as discard:
+            assert mock_weaviate_service.delete_project(project_id=1) is True
+
+        discard.assert_called_once_with("Kb1")
+        mock_client.collections.delete.assert_called_once_with("Kb1")
+
+    def test_missing_collection_returns_false(self, mock_weaviate_service, mock_client):
+        mock_client.collections.exists.return_value = False
+
+        assert mock_weaviate_service.delete_project(project_id=1) is False
+        mock_client.collections.delete.assert_not_called()
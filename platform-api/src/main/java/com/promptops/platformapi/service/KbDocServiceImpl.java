@@ -14,6 +14,7 @@ import org.springframework.stereotype.Service;
 import org.springframework.web.client.RestClient;
 
 import java.net.http.HttpClient;
+import java.time.Duration;
 import java.util.List;
 import java.util.Map;
 
@@ -29,9 +30,14 @@ public class KbDocServiceImpl implements KbDocService {
 
     private static final Logger log = LoggerFactory.getLogger(KbDocServiceImpl.class);
 
+    /** Extra wait past the search budget, so ai-runtime's own 504 arrives before our read timeout fires. */
+    private static final long SEARCH_TIMEOUT_MARGIN_MS = 1000;
+
     private final KbDocRepository kbDocRepository;
     private final ProjectRepository projectRepository;
     private final RestClient restClient;
+    private final RestClient searchClient;
+    private final long searchTimeoutMs;
 
     /**
      * Constructor injection.
@@ -43,9 +49,11 @@ public class KbDocServiceImpl implements KbDocService {
     public KbDocServiceImpl(
             KbDocRepository kbDocRepository,
             ProjectRepository projectRepository,
-            @Value("${ai-runtime.base-url}") String aiRuntimeBaseUrl) {
+            @Value("${ai-runtime.base-url}") String aiRuntimeBaseUrl,
+            @Value("${ai-runtime.search-timeout-ms:15000}") long searchTimeoutMs) {
         this.kbDocRepository = kbDocRepository;
         this.projectRepository = projectRepository;
+        this.searchTimeoutMs = searchTimeoutMs;
         // Force HTTP/1.1 because uvicorn (ai-runtime) does not support HTTP/2.
         // JDK 21's HttpClient defaults to HTTP/2, which causes "Invalid HTTP request" errors.
         HttpClient httpClient = HttpClient.newBuilder()
@@ -57,6 +65,16 @@ public class KbDocServiceImpl implements KbDocService {
                 .requestFactory(new JdkClientHttpRequestFactory(httpClient))
                 .defaultHeader("Content-Type", "application/json")
                 .build();
+
+        // Searches get a read timeout matching the X-Request-Timeout-Ms budget (plus a margin),
+        // so both sides give up together. Indexing keeps the client without one: large documents take long.
+        JdkClientHttpRequestFactory searchRequestFactory = new JdkClientHttpRequestFactory(httpClient);
+        searchRequestFactory.setReadTimeout(Duration.ofMillis(searchTimeoutMs + SEARCH_TIMEOUT_MARGIN_MS));
+        this.searchClient = RestClient.builder()
+                .baseUrl(aiRuntimeBaseUrl)
+                .requestFactory(searchRequestFactory)
+                .defaultHeader("Content-Type", "application/json")
+                .build();
     }
 
     @Override
@@ -158,9 +176,11 @@ public class KbDocServiceImpl implements KbDocService {
         );
 
         try {
-            Map<String, Object> response = restClient.post()
+            Map<String, Object> response = searchClient.post()
                     .uri("/retrieve-document")
                     .contentType(MediaType.APPLICATION_JSON)
+                    // ai-runtime abandons the search once this budget is spent (→ 504)
+                    .header("X-Request-Timeout-Ms", String.valueOf(searchTimeoutMs))
                     .body(requestBody)
                     .retrieve()
                     .body(Map.class);